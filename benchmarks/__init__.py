@@ -0,0 +1,5 @@
+"""
+Benchmarks package.
+Performance benchmark scripts, run from the top level folder, e.g.
+python -m benchmarks.ioPoints
+"""
\ No newline at end of file
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+from concurrent import futures
+import argparse
+import os
+import tempfile
+import time
+
+import grpc
+import sprinklers.ui_pb2_grpc as sprinklers_ui_pb2_grpc
+
+from sprinklers.uiMessages import *
+from webUI import create_app
+from webUI.db import init_db
+from benchmarks.edgeLatency import makeController
+
+# *******************************************
+# Benchmark of authenticated webUI throughput.
+# Logged in clients request pages concurrently,
+# with the controller status cached so only the
+# web server (session, user and database) is measured.
+# Reports pages/s of each page.
+# *******************************************
+
+
+def makeApp(port: int) -> object:
+    """
+    Create the webUI application, with a registered user.
+    Parameters:
+        port : Controller UI server port.
+    Returns:
+        Flask application.
+    """
+
+    app = create_app({
+        "SECRET_KEY" : "bench",
+        "DATABASE" : os.path.join(tempfile.mkdtemp(), "webUI.sqlite"),
+        "UI_IP" : "127.0.0.1",
+        "UI_PORT" : f'{port}',
+        "UI_REFRESH_PERIOD_SLOW" : 3,
+        "UI_REFRESH_PERIOD_FAST" : 1,
+        "UI_STATUS_DEADLINE" : 2.0,
+        "UI_CONTROL_DEADLINE" : 2.0,
+        "UI_BREAKER_FAILURES" : 3,
+        "UI_BREAKER_RESET" : 5.0,
+        "STATUS_CACHE_TTL" : 3600.0,
+        "STATUS_CACHE_DIR" : "",
+        "LOGIN_ADDR_BURST" : 1000,
+        "LOGIN_USER_BURST" : 1000
+    })
+    with app.app_context():
+        init_db()
+
+    client = app.test_client()
+    client.post("/auth/register", data={"username" : "bench", "password" : "bench"})
+
+    return app
+
+def throughput(app, path: str, numClients: int, numRequests: int) -> float:
+    """
+    Request a page from concurrent logged in clients.
+    Parameters:
+        app : Flask application.
+        path : Page path.
+        numClients : Number of concurrent clients.
+        numRequests : Number of requests per client.
+    Returns:
+        Pages/s.
+    """
+
+    # Clients log in before timing starts.
+    clients = []
+    for _ in range(numClients):
+        c = app.test_client()
+        c.post("/auth/login", data={"username" : "bench", "password" : "bench"})
+        c.get(path)
+        clients.append(c)
+
+    def client(c) -> None:
+        for _ in range(numRequests):
+            c.get(path)
+
+    tStart = time.perf_counter()
+    with futures.ThreadPoolExecutor(max_workers=numClients) as pool:
+        for f in [pool.submit(client, c) for c in clients]:
+            f.result()
+    elapsed = time.perf_counter() - tStart
+
+    return numClients * numRequests / elapsed
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Authenticated throughput benchmark.")
+    parser.add_argument("-c", "--clients", type=int, default=8, help="Number of concurrent clients.")
+    parser.add_argument("-n", "--requests", type=int, default=500, help="Number of requests per client.")
+    args = parser.parse_args()
+
+    ctrl = makeController(1.0)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    sprinklers_ui_pb2_grpc.add_UiMessagesServicer_to_server(UiCommands(ctrl.cfg, ctrl.log, ctrl), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+
+    app = makeApp(port)
+    for path in ("/", "/api/status", "/static/style.css"):
+        print(f'{path:18s}: {throughput(app, path, args.clients, args.requests):7.1f} pages/s')
+
+    server.stop(None)
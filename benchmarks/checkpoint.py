@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from sprinklers.checkpoint import *
+from sprinklers.interlocks import *
+
+# *******************************************
+# Benchmark of controller state checkpoints.
+# Reports the cost of a checkpoint each control
+# cycle when the state is unchanged, the cost of
+# a checkpoint write, and the cost of loading it.
+# *******************************************
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="State checkpoint benchmark.")
+    parser.add_argument("-n", "--cycles", type=int, default=100000, help="Number of unchanged cycles.")
+    parser.add_argument("-w", "--writes", type=int, default=200, help="Number of checkpoint writes.")
+    parser.add_argument("-r", "--rules", type=int, default=3, help="Number of interlock rules.")
+    args = parser.parse_args()
+
+    log = logging.getLogger("bench")
+    log.addHandler(logging.NullHandler())
+    log.propagate = False
+
+    rules = [InterlockRule(f'R{n}', 1 << n, 0xFF, 60.0) for n in range(args.rules)]
+    ckpt = ControllerCheckpoint(log, os.path.join(tempfile.mkdtemp(), "sprinklers.ckpt"), 60.0)
+    now = time.monotonic()
+    ckpt.save(1, 0x0F, rules, now)
+
+    # Unchanged state, as for most control cycles.
+    tStart = time.perf_counter()
+    for _ in range(args.cycles):
+        ckpt.save(1, 0x0F, rules, now)
+    tUnchanged = (time.perf_counter() - tStart) / args.cycles
+
+    # State changes every cycle, so every cycle writes.
+    tStart = time.perf_counter()
+    for n in range(args.writes):
+        ckpt.save(1, n, rules, now)
+    tWrite = (time.perf_counter() - tStart) / args.writes
+
+    tStart = time.perf_counter()
+    for _ in range(args.writes):
+        ckpt.load()
+    tLoad = (time.perf_counter() - tStart) / args.writes
+
+    print(f'Checkpoint size : {os.path.getsize(ckpt.sFile)} bytes')
+    print(f'Unchanged state : {tUnchanged * 1e6:.2f} us per cycle')
+    print(f'Write (with fsync) : {tWrite * 1e6:.1f} us; load : {tLoad * 1e6:.1f} us')
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+from threading import Thread
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+from sprinklers.controller import *
+
+# *******************************************
+# Benchmark of the controller command queue.
+# Clients turn stations on and off concurrently
+# (commands run on the controller thread), and the
+# program is replaced. Reports command latencies
+# and throughput, with commands run one per control
+# cycle and in batches.
+# *******************************************
+
+
+def makeController(batchSize: int) -> SprinklerController:
+    """
+    Create a controller with default IO and program configuration.
+    Parameters:
+        batchSize : Maximum commands run each control cycle.
+    Returns:
+        Controller, running and in the ACTIVE state (MANUAL mode).
+    """
+
+    log = logging.getLogger("bench")
+    log.addHandler(logging.NullHandler())
+    log.propagate = False
+
+    tmpDir = tempfile.mkdtemp()
+    cfg = Config(os.path.join(tmpDir, "sprinklers.json"))
+    cfg.Timers["ControllerSleep"] = 1.0
+    cfg.Commands["BatchSize"] = batchSize
+
+    ctrl = SprinklerController(cfg, log, "Bench", "./config/inputs.json", "./config/outputs.json", "./config/program.json", "./config/interlocks.json", "")
+    ctrl.daemon = True
+    ctrl.start()
+    while ctrl.state != ControllerState.ACTIVE:
+        time.sleep(0.01)
+    ctrl.setMode(ControllerMode.MANUAL)
+
+    return ctrl
+
+def stationCommands(ctrl: SprinklerController, clients: int, numCommands: int) -> tuple:
+    """
+    Turn stations on and off from many clients at once.
+    Parameters:
+        ctrl : Controller.
+        clients : Number of client threads.
+        numCommands : Number of commands from each client.
+    Returns:
+        Command latencies (ms), and commands per second.
+    """
+
+    numStations = len(ctrl.digitalOutputs) - 1
+    latencies = []
+
+    def client(n):
+        station = n % numStations + 1
+        for i in range(numCommands):
+            tStart = time.perf_counter()
+            ctrl.setStation(station, i % 2 == 0)
+            latencies.append((time.perf_counter() - tStart) * 1000.0)
+
+    threads = [Thread(target=client, args=(n,)) for n in range(clients)]
+    tStart = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - tStart
+
+    return latencies, clients * numCommands / elapsed
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Controller command queue benchmark.")
+    parser.add_argument("-c", "--clients", type=int, default=16, help="Number of client threads.")
+    parser.add_argument("-n", "--commands", type=int, default=200, help="Number of commands from each client.")
+    parser.add_argument("-p", "--programs", type=int, default=20, help="Number of program replacements.")
+    args = parser.parse_args()
+
+    for batchSize in (1, 16):
+        ctrl = makeController(batchSize)
+        latencies, rate = stationCommands(ctrl, args.clients, args.commands)
+        latencies.sort()
+        stats = ctrl.commands.stats()
+        print(f'Batch size {batchSize:2d} : {rate:7.0f} commands per s; latency p50 {statistics.median(latencies):6.2f} ms; '
+              f'p99 {latencies[int(len(latencies) * 0.99) - 1]:6.2f} ms; {stats["batches"]} batches (largest {stats["largestBatch"]}); '
+              f'wait p50 {stats["wait"]["p50"]:.2f} ms; run mean {stats["run"]["mean"] * 1000.0:.1f} us')
+
+    tStart = time.perf_counter()
+    for _ in range(args.programs):
+        ctrl.replaceProgram("./config/program.json")
+    print(f'Program replacement : {(time.perf_counter() - tStart) / args.programs * 1000.0:.1f} ms, '
+          f'of which on the controller thread {ctrl.commands.runs.maximum * 1000.0:.3f} ms at most')
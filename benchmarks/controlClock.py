@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+import argparse
+import logging
+import os
+import random
+import tempfile
+import time
+
+from sprinklers.replay import *
+
+# *******************************************
+# Benchmark and checks of controller timing.
+# Runs cycles with varying work, on fixed rate
+# (monotonic deadline) and fixed delay timing,
+# reporting drift, lateness and jitter. Then
+# injects wall clock jumps into a controller,
+# and replays days of daylight saving changes,
+# against the schedule looked at by wall clock
+# minute of the week.
+# *******************************************
+
+
+def timedCycles(period: float, numCycles: int, maxWork: float, fixedRate: bool, seed: int) -> tuple:
+    """
+    Run cycles of random work, waiting for the next cycle after each.
+    Parameters:
+        period : Period of the cycles (seconds).
+        numCycles : Number of cycles.
+        maxWork : Maximum work time of a cycle (seconds).
+        fixedRate : True for fixed rate deadlines, False for fixed delay (a period after the work).
+        seed : Random number seed.
+    Returns:
+        Drift from the expected elapsed time (ms), and timer statistics.
+    """
+
+    rnd = random.Random(seed)
+    timer = FixedRateTimer(period, time.monotonic())
+    tStart = time.monotonic()
+    cycles = 0
+    while cycles < numCycles:
+        if timer.due(time.monotonic()):
+            cycles += 1
+            time.sleep(rnd.uniform(0.0, maxWork))
+            if not fixedRate:
+                # Next cycle a period after the work is done.
+                timer.deadline = time.monotonic() + period
+        time.sleep(max(0.0, timer.deadline - time.monotonic()))
+
+    return (time.monotonic() - tStart - (numCycles - 1) * period) * 1000.0, timer.stats()
+
+
+class FakeClocks():
+    """
+    Class to represent monotonic and wall clocks moved on by hand,
+    with jumps of the wall clock injected.
+    """
+
+    def __init__(self, wall: float) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            wall : Wall clock time to start at (epoch seconds).
+        """
+
+        self.mono = 0.0
+        self.offset = wall
+
+    def monotonic(self) -> float:
+        """
+        Monotonic time (seconds).
+        """
+        return self.mono
+
+    def wall(self) -> float:
+        """
+        Wall clock time (epoch seconds).
+        """
+        return self.mono + self.offset
+
+
+def jumpedMinutes(ctrl: ReplayController, start: datetime, hours: float, jumpAt: float, jump: float, guard: bool) -> tuple:
+    """
+    Run the schedule of a controller a second at a time, with a wall clock jump.
+    Parameters:
+        ctrl : Controller, not started.
+        start : Wall clock time to start at.
+        hours : Time to run for (hours).
+        jumpAt : Time of the jump from the start (hours).
+        jump : Jump of the wall clock (seconds).
+        guard : False to look at the schedule as if the wall clock never went back.
+    Returns:
+        Station minutes run, and wall clock jumps seen forward and back.
+    """
+
+    clocks = FakeClocks(ctrl.zoned.wallEpoch(start))
+    ctrl.clock = WallClock(ctrl.log, ctrl.cfg.Clock["JumpThreshold"], ctrl.cfg.Clock["TimeZone"], clocks.wall, clocks.monotonic)
+    ctrl.scheduleHighWater = float("-inf")
+    ctrl.lastScheduled = 0
+
+    seconds = 0
+    for n in range(int(hours * 3600)):
+        if n == int(jumpAt * 3600):
+            clocks.offset += jump
+        now, wall = ctrl.clock.read()
+        if not guard:
+            ctrl.scheduleHighWater = float("-inf")
+        seconds += bin(ctrl.scheduledOutputs(wall, now) & ~1).count("1")
+        clocks.mono += 1.0
+
+    return seconds / 60.0, ctrl.clock.forwardJumps, ctrl.clock.backwardJumps
+
+
+def dstMinutes(zoneName: str, day: datetime, start: str, duration: int) -> tuple:
+    """
+    Run a schedule of one run a minute at a time over a day, in real time.
+    Parameters:
+        zoneName : Time zone (IANA name).
+        day : Day of the run (a Sunday), e.g. of a daylight saving change.
+        start : Start time of the run (HHMM).
+        duration : Duration of the run (minutes).
+    Returns:
+        Minutes run, and start times (local) in real time, and by wall
+        clock minute of the week.
+    """
+
+    log = logging.getLogger("bench")
+    scheduler = Scheduler(log)
+    scheduler.compile(parseProgram({"MyDays": ["Sunday"], "Programs": [{"Name": "DST", "OnTimes": [{"Start": start, "Duration": duration, "Stations": [1]}]}]}), {}, 0.0)
+    zone = ZoneInfo(zoneName)
+    zoned = ZonedSchedule(scheduler, zone)
+
+    results = []
+    for stationsAt in (zoned.stationsAt, lambda epoch: scheduler.stationsAt(minuteOfWeek(datetime.fromtimestamp(epoch, zone)))):
+        minutes = 0
+        starts = []
+        last = 0
+        epoch = zoned.wallEpoch(day)
+        for _ in range(26 * 60):
+            active = stationsAt(epoch)
+            if active and not last:
+                starts.append(datetime.fromtimestamp(epoch, zone).strftime("%H:%M"))
+            minutes += 1 if active else 0
+            last = active
+            epoch += 60.0
+        results.append((minutes, starts))
+
+    return results
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Controller timing benchmark and clock checks.")
+    parser.add_argument("-p", "--period", type=float, default=0.02, help="Cycle period (seconds).")
+    parser.add_argument("-n", "--cycles", type=int, default=200, help="Number of cycles.")
+    parser.add_argument("-w", "--work", type=float, default=0.015, help="Maximum work time of a cycle (seconds).")
+    args = parser.parse_args()
+
+    for fixedRate in (False, True):
+        drift, stats = timedCycles(args.period, args.cycles, args.work, fixedRate, 1)
+        print(f'{"Fixed rate " if fixedRate else "Fixed delay"} : drift {drift:8.1f} ms over {args.cycles} cycles; {stats["missed"]} missed; '
+              f'late p50 {stats["lateness"]["p50"]:.2f} ms; p99 {stats["lateness"]["p99"]:.2f} ms; jitter p99 {stats["jitter"]["p99"]:.2f} ms')
+
+    # Wall clock jumps during Monday morning runs (06:45).
+    log = logging.getLogger("bench")
+    log.addHandler(logging.NullHandler())
+    log.propagate = False
+    cfg = Config(os.path.join(tempfile.mkdtemp(), "sprinklers.json"))
+    ctrl = ReplayController(cfg, log, "./config/inputs.json", "./config/outputs.json", "./config/program.json", "./config/interlocks.json")
+    ctrl.mode = ControllerMode.AUTO
+    monday = datetime(2021, 1, 4, 6, 0)
+    expected, _, _ = jumpedMinutes(ctrl, monday, 2.0, 0.0, 0.0, True)
+    for name, jumpAt, jump in (("back 30 min at 06:50", 0.84, -1800.0), ("forward 5 min at 06:40", 0.67, 300.0), ("back 1 s (no jump)", 0.84, -1.0)):
+        unguarded, _, _ = jumpedMinutes(ctrl, monday, 2.0, jumpAt, jump, False)
+        minutes, forward, back = jumpedMinutes(ctrl, monday, 2.0, jumpAt, jump, True)
+        print(f'Wall clock {name:22s} : {minutes:5.1f} station minutes (no jump {expected:.1f}; without guard {unguarded:.1f}); '
+              f'jumps seen {forward} forward, {back} back')
+
+    # Daylight saving changes, 02:30 runs on the change days (Sydney).
+    for name, day in (("Spring forward", datetime(2021, 10, 3)), ("Fall back", datetime(2021, 4, 4))):
+        (minutes, starts), (wallMinutes, wallStarts) = dstMinutes("Australia/Sydney", day, "0230", 20)
+        print(f'{name:14s} : 20 minute run at 02:30, runs {minutes} minutes starting {starts}; '
+              f'by wall clock minute runs {wallMinutes} minutes starting {wallStarts}')
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+from sprinklers.controller import *
+
+# *******************************************
+# Benchmark of input edge reaction latency.
+# Injects input edges into a controller running
+# with FAKE IO backends, and reports the latency
+# from the edge to the outputs being written.
+# Also reports CPU used while idle between edges.
+# *******************************************
+
+
+def makeController(sleep: float) -> SprinklerController:
+    """
+    Create a controller with default IO and program configuration.
+    Parameters:
+        sleep : Controller (periodic) sleep time (seconds).
+    Returns:
+        Controller, running and in the ACTIVE state.
+    """
+
+    log = logging.getLogger("bench")
+    log.addHandler(logging.NullHandler())
+    log.propagate = False
+
+    tmpDir = tempfile.mkdtemp()
+    cfg = Config(os.path.join(tmpDir, "sprinklers.json"))
+    cfg.Timers["ControllerSleep"] = sleep
+
+    ctrl = SprinklerController(cfg, log, "Bench", "./config/inputs.json", "./config/outputs.json", "./config/program.json", "./config/interlocks.json", os.path.join(tmpDir, "sprinklers.ckpt"))
+    ctrl.daemon = True
+    ctrl.start()
+    while ctrl.state != ControllerState.ACTIVE:
+        time.sleep(0.01)
+
+    return ctrl
+
+
+def edgeLatencies(ctrl: SprinklerController, numEdges: int, gap: float) -> list:
+    """
+    Inject input edges and measure time until outputs are written.
+    Parameters:
+        ctrl : Running controller.
+        numEdges : Number of edges to inject.
+        gap : Time between edges (seconds).
+    Returns:
+        Edge to output write latencies (microseconds).
+    """
+
+    latencies = []
+    inBackend = ctrl.inputBackend
+    outBackend = ctrl.outputBackend
+
+    for _ in range(numEdges):
+        time.sleep(gap)
+        writes = outBackend.writes
+        tEdge = time.monotonic_ns()
+        inBackend.inject(inBackend.levels ^ 1)
+        while outBackend.writes == writes:
+            time.sleep(0.0001)
+        latencies.append((outBackend.history[-1][0] - tEdge) / 1000.0)
+
+    return latencies
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Input edge latency benchmark.")
+    parser.add_argument("-n", "--edges", type=int, default=200, help="Number of edges to inject.")
+    parser.add_argument("-g", "--gap", type=float, default=0.01, help="Time between edges (seconds).")
+    parser.add_argument("-i", "--idle", type=float, default=2.0, help="Idle time to measure CPU over (seconds).")
+    args = parser.parse_args()
+
+    # Long periodic sleep, so that output writes are due to edges.
+    ctrl = makeController(60.0)
+
+    lat = sorted(edgeLatencies(ctrl, args.edges, args.gap))
+    print(f'Edge to output latency : p50 {statistics.median(lat):8.1f} us; '
+          f'p99 {lat[int(len(lat) * 0.99) - 1]:8.1f} us; max {lat[-1]:8.1f} us')
+
+    cpuStart = time.process_time()
+    time.sleep(args.idle)
+    cpuUsed = time.process_time() - cpuStart
+    print(f'CPU while idle : {cpuUsed * 1000.0:.2f} ms over {args.idle:.1f} s')
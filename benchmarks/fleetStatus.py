@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+from concurrent import futures
+import argparse
+import logging
+import os
+import tempfile
+import json
+import time
+
+import grpc
+import fleet.ui_pb2 as ui_pb2
+import fleet.ui_pb2_grpc as ui_pb2_grpc
+
+from fleet.aggregator import *
+
+# *******************************************
+# Benchmark of fleet status aggregation.
+# Serves many simulated controllers (one port each)
+# that respond after a delay, some unreachable, and
+# reports the time to poll them all concurrently
+# against polling them one after the other.
+# *******************************************
+
+
+class SlowController(ui_pb2_grpc.UiMessages):
+    """
+    Simulated controller, responding to status requests after a delay.
+    """
+
+    def __init__(self, delay: float) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            delay : Time to respond (seconds).
+        """
+
+        self.delay = delay
+
+    def GetControllerStatus(self, request, context):
+        """
+        Respond to controller status request, after the delay.
+        """
+
+        time.sleep(self.delay)
+        resp = ui_pb2.ControllerStatusResp()
+        resp.status = ui_pb2.StatusCmdStatus.US_GOOD
+        resp.state = "ACTIVE"
+        resp.mode = "AUTO"
+        resp.outputs = json.dumps({"gName" : "Stations", "outputs" : []})
+        return resp
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Fleet status benchmark.")
+    parser.add_argument("-n", "--controllers", type=int, default=200, help="Number of controllers.")
+    parser.add_argument("-d", "--delay", type=float, default=0.05, help="Controller response time (seconds).")
+    parser.add_argument("-u", "--unreachable", type=int, default=20, help="Number of unreachable controllers.")
+    args = parser.parse_args()
+
+    log = logging.getLogger("bench")
+    log.addHandler(logging.NullHandler())
+    log.propagate = False
+
+    # All the simulated controllers on one server, a port each.
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=args.controllers))
+    ui_pb2_grpc.add_UiMessagesServicer_to_server(SlowController(args.delay), server)
+    ports = [server.add_insecure_port("127.0.0.1:0") for _ in range(args.controllers - args.unreachable)]
+    server.start()
+
+    # Unreachable controllers are on ports nothing listens on.
+    addresses = [f'127.0.0.1:{p}' for p in ports] + [f'127.0.0.1:{1 + n}' for n in range(args.unreachable)]
+    tmpDir = tempfile.mkdtemp()
+    fFile = os.path.join(tmpDir, "controllers.json")
+    with open(fFile, "w") as f:
+        json.dump({"Controllers" : [{"Name" : f'C{n}', "Address" : a} for n, a in enumerate(addresses)]}, f)
+
+    cfg = Config(os.path.join(tmpDir, "fleet.json"))
+    cfg.Timers["PollPeriod"] = 0.0
+    cfg.MaxConcurrent = args.controllers
+
+    # Concurrent polls, timed over a few rounds once channels are connected.
+    agg = FleetAggregator(cfg, log, fFile)
+    agg.daemon = True
+    agg.start()
+    while agg.polls < 2:
+        time.sleep(0.01)
+    polls = agg.polls
+    tStart = time.perf_counter()
+    while agg.polls < polls + 5:
+        time.sleep(0.001)
+    tConcurrent = (time.perf_counter() - tStart) / 5
+    agg.stopPolling()
+    stale = sum(1 for s in agg.fleetStatus() if s["stale"])
+
+    # Sequential polls, one blocking request per controller.
+    stubs = [ui_pb2_grpc.UiMessagesStub(grpc.insecure_channel(a)) for a in addresses]
+    cmd = ui_pb2.ControllerStatusCmd()
+    cmd.cmd = ui_pb2.UiCmd.U_CNTRL_STATUS
+    tStart = time.perf_counter()
+    for stub in stubs:
+        try:
+            stub.GetControllerStatus(cmd, timeout=cfg.Timers["Deadline"])
+        except grpc.RpcError:
+            pass
+    tSequential = time.perf_counter() - tStart
+
+    print(f'Controllers : {args.controllers}; unreachable : {args.unreachable}; response time : {args.delay * 1000.0:.0f} ms')
+    print(f'Fleet poll : {tConcurrent * 1000.0:.0f} ms concurrent; {tSequential * 1000.0:.0f} ms sequential; stale : {stale}')
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+
+from concurrent import futures
+from threading import Event, Thread
+import argparse
+import logging
+import statistics
+import time
+
+import grpc
+import sprinklers.ui_pb2 as ui_pb2
+import sprinklers.ui_pb2_grpc as ui_pb2_grpc
+
+from generic.grpcInterceptors import *
+from sprinklers.uiMessages import *
+from benchmarks.edgeLatency import makeController
+
+# *******************************************
+# Benchmark of the UI server interceptors.
+# Reports controller status call times over gRPC
+# with each interceptor and the full stack, and
+# the latency of setting the controller mode
+# during a flood of (slow) status calls, without
+# and with limits of calls in flight.
+# *******************************************
+
+
+class SlowStatusCommands(UiCommands):
+    """
+    UI commands with slow status calls, as if the controller was busy.
+    """
+
+    def __init__(self, config, log, ctrl, delay: float) -> None:
+        UiCommands.__init__(self, config, log, ctrl)
+        self.delay = delay
+
+    def GetControllerStatus(self, request, context):
+        time.sleep(self.delay)
+        return UiCommands.GetControllerStatus(self, request, context)
+
+
+def startServer(cmds: UiCommands, interceptors: list, workers: int):
+    """
+    Start a UI server on a free port.
+    Parameters:
+        cmds : UI commands servicer.
+        interceptors : Server interceptors.
+        workers : Number of server threads.
+    Returns:
+        Server, and channel to it.
+    """
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=workers), interceptors=interceptors)
+    ui_pb2_grpc.add_UiMessagesServicer_to_server(cmds, server)
+    ui_pb2_grpc.add_UiControlModeServicer_to_server(cmds, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+
+    return server, grpc.insecure_channel(f'127.0.0.1:{port}')
+
+def statusCmd() -> ui_pb2.ControllerStatusCmd:
+    """
+    Controller status command.
+    """
+    cmd = ui_pb2.ControllerStatusCmd()
+    cmd.cmd = ui_pb2.UiCmd.U_CNTRL_STATUS
+    return cmd
+
+def callTime(ctrl, interceptors: list, numCalls: int) -> float:
+    """
+    Time controller status calls over gRPC.
+    Parameters:
+        ctrl : Controller.
+        interceptors : Server interceptors.
+        numCalls : Number of calls.
+    Returns:
+        Time per call (microseconds).
+    """
+
+    server, channel = startServer(UiCommands(ctrl.cfg, ctrl.log, ctrl), interceptors, 4)
+    stub = ui_pb2_grpc.UiMessagesStub(channel)
+    cmd = statusCmd()
+
+    # Warm up the channel.
+    for _ in range(50):
+        stub.GetControllerStatus(cmd)
+
+    tStart = time.perf_counter()
+    for _ in range(numCalls):
+        stub.GetControllerStatus(cmd)
+    elapsed = time.perf_counter() - tStart
+
+    channel.close()
+    server.stop(None)
+
+    return elapsed / numCalls * 1e6
+
+def floodModeLatency(ctrl, interceptors: list, workers: int, flooders: int, delay: float, numSets: int) -> tuple:
+    """
+    Time setting the controller mode, while clients flood the server with slow status calls.
+    Parameters:
+        ctrl : Controller.
+        interceptors : Server interceptors.
+        workers : Number of server threads.
+        flooders : Number of flooding clients.
+        delay : Time of each status call (seconds).
+        numSets : Number of mode sets.
+    Returns:
+        Mode set latencies (ms), and status calls completed and rejected.
+    """
+
+    server, channel = startServer(SlowStatusCommands(ctrl.cfg, ctrl.log, ctrl, delay), interceptors, workers)
+    statusStub = ui_pb2_grpc.UiMessagesStub(channel)
+    modeStub = ui_pb2_grpc.UiControlModeStub(channel)
+    stop = Event()
+    counts = {"ok" : 0, "rejected" : 0}
+
+    def flood():
+        cmd = statusCmd()
+        while not stop.is_set():
+            try:
+                statusStub.GetControllerStatus(cmd)
+                counts["ok"] += 1
+            except grpc.RpcError as e:
+                if e.code() != grpc.StatusCode.RESOURCE_EXHAUSTED:
+                    raise
+                counts["rejected"] += 1
+                # Back off a little, as a client would.
+                time.sleep(delay / 2)
+
+    threads = [Thread(target=flood, daemon=True) for _ in range(flooders)]
+    for t in threads:
+        t.start()
+    time.sleep(0.5)
+
+    # Set the mode to the current mode, so the controller doesn't change.
+    modeCmd = ui_pb2.SetControllerModeCmd()
+    modeCmd.cmd = ui_pb2.UiModeControl.C_SET_MODE
+    modeCmd.reqMode = ctrl.mode.name
+    latencies = []
+    for _ in range(numSets):
+        tStart = time.perf_counter()
+        modeStub.SetControllerMode(modeCmd)
+        latencies.append((time.perf_counter() - tStart) * 1000.0)
+        time.sleep(0.02)
+
+    stop.set()
+    for t in threads:
+        t.join()
+    channel.close()
+    server.stop(None)
+
+    return latencies, counts["ok"], counts["rejected"]
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="UI server interceptors benchmark.")
+    parser.add_argument("-g", "--grpc", type=int, default=2000, help="Number of gRPC calls.")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="Number of server threads in the flood.")
+    parser.add_argument("-f", "--flooders", type=int, default=8, help="Number of clients flooding status calls.")
+    parser.add_argument("-d", "--delay", type=float, default=0.05, help="Time of each status call in the flood (seconds).")
+    parser.add_argument("-s", "--sets", type=int, default=50, help="Number of mode sets in the flood.")
+    args = parser.parse_args()
+
+    log = logging.getLogger("bench")
+    log.addHandler(logging.NullHandler())
+    log.propagate = False
+
+    ctrl = makeController(1.0)
+
+    limits = {"GetControllerStatus" : 2}
+    for name, interceptors in (("None", []),
+                               ("Request ID", [RequestIdInterceptor()]),
+                               ("Metrics", [MetricsInterceptor(log, 0.0)]),
+                               ("Limits", [ConcurrencyLimitInterceptor(limits, 0)]),
+                               ("All", makeInterceptors(["requestId", "metrics", "limits"], log, limits, 0, 0.0))):
+        print(f'{name:10s}: {callTime(ctrl, interceptors, args.grpc):7.1f} us per status call')
+
+    for name, interceptors in (("No limits", []),
+                               ("Limits", [ConcurrencyLimitInterceptor({"GetControllerStatus" : max(args.workers - 2, 1)}, 0)])):
+        latencies, ok, rejected = floodModeLatency(ctrl, interceptors, args.workers, args.flooders, args.delay, args.sets)
+        latencies.sort()
+        print(f'{name:10s}: set mode p50 {statistics.median(latencies):6.1f} ms; '
+              f'p99 {latencies[int(len(latencies) * 0.99) - 1]:6.1f} ms; '
+              f'max {latencies[-1]:6.1f} ms; status calls {ok} ok, {rejected} rejected')
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+from concurrent import futures
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+import grpc
+import sprinklers.ui_pb2_grpc as sprinklers_ui_pb2_grpc
+
+from sprinklers.uiMessages import *
+from webUI import create_app
+from webUI.db import init_db
+from benchmarks.edgeLatency import makeController
+
+# *******************************************
+# Benchmark of index page refreshes.
+# Compares refreshing by rendering the whole
+# page, with refreshing from the API (status,
+# and conditional IO and program requests),
+# reporting webUI CPU time and bytes per refresh.
+# *******************************************
+
+
+def pageRefresh(client, state: dict) -> int:
+    """
+    Refresh by rendering the whole page.
+    Parameters:
+        client : Logged in webUI test client.
+        state : Client state, not used.
+    Returns:
+        Bytes received.
+    """
+
+    return len(client.get("/").get_data())
+
+def apiRefresh(client, state: dict) -> int:
+    """
+    Refresh from the API, as the index page script does.
+    Status each refresh (time changes every refresh), IO and program
+    (conditional) only when the status version changes.
+    Parameters:
+        client : Logged in webUI test client.
+        state : Client state, status version and ETags.
+    Returns:
+        Bytes received.
+    """
+
+    resp = client.get("/api/status")
+    numBytes = len(resp.get_data())
+    version = resp.get_json()["version"]
+    if version != state.get("version"):
+        for path in ("/api/io", "/api/program"):
+            headers = {"If-None-Match" : state[path]} if path in state else {}
+            resp = client.get(path, headers=headers)
+            state[path] = resp.headers["ETag"]
+            numBytes += len(resp.get_data())
+        state["version"] = version
+
+    return numBytes
+
+def refreshCost(client, refresh, numRefreshes: int) -> tuple:
+    """
+    Refresh the index page, and measure CPU time and bytes.
+    Parameters:
+        client : Logged in webUI test client.
+        refresh : Function to refresh the page.
+        numRefreshes : Number of refreshes.
+    Returns:
+        CPU time (ms) and bytes per refresh.
+    """
+
+    state = {}
+    numBytes = 0
+    tStart = time.process_time()
+    for _ in range(numRefreshes):
+        numBytes += refresh(client, state)
+    cpu = (time.process_time() - tStart) * 1000.0
+
+    return cpu / numRefreshes, numBytes / numRefreshes
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Index page refresh benchmark.")
+    parser.add_argument("-n", "--refreshes", type=int, default=200, help="Number of refreshes.")
+    args = parser.parse_args()
+
+    ctrl = makeController(1.0)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    sprinklers_ui_pb2_grpc.add_UiMessagesServicer_to_server(UiCommands(ctrl.cfg, ctrl.log, ctrl), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+
+    app = create_app({
+        "SECRET_KEY" : "bench",
+        "DATABASE" : os.path.join(tempfile.mkdtemp(), "webUI.sqlite"),
+        "UI_IP" : "127.0.0.1",
+        "UI_PORT" : f'{port}',
+        "UI_REFRESH_PERIOD_SLOW" : 3,
+        "UI_REFRESH_PERIOD_FAST" : 1,
+        "UI_STATUS_DEADLINE" : 2.0,
+        "UI_CONTROL_DEADLINE" : 2.0,
+        "UI_BREAKER_FAILURES" : 3,
+        "UI_BREAKER_RESET" : 5.0,
+        "STATUS_CACHE_TTL" : 3600.0,
+        "STATUS_CACHE_DIR" : ""
+    })
+    with app.app_context():
+        init_db()
+
+    client = app.test_client()
+    client.post("/auth/register", data={"username" : "bench", "password" : "bench"})
+    client.post("/auth/login", data={"username" : "bench", "password" : "bench"})
+
+    # Warm up channels, templates and the status cache, so only
+    # webUI rendering is measured, not calls to the controller.
+    refreshCost(client, pageRefresh, 5)
+    refreshCost(client, apiRefresh, 5)
+
+    for name, refresh in (("Whole page", pageRefresh), ("API", apiRefresh)):
+        cpu, numBytes = refreshCost(client, refresh, args.refreshes)
+        print(f'{name:10s}: {cpu:6.2f} ms CPU per refresh; {numBytes:7.0f} bytes per refresh')
+
+    server.stop(None)
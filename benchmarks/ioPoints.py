@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+import argparse
+import timeit
+import tracemalloc
+
+from sprinklers.digitalInput import *
+from sprinklers.digitalOutput import *
+
+# *******************************************
+# Benchmark of digital IO points.
+# Reports memory used per IO point and the
+# cost of setting the level of an IO point.
+# *******************************************
+
+
+def memoryPerPoint(ioClass: type, numPoints: int) -> float:
+    """
+    Measure memory allocated per IO point.
+    Parameters:
+        ioClass : Digital IO class to instantiate.
+        numPoints : Number of IO points to create.
+    Returns:
+        Average bytes allocated per IO point.
+    """
+
+    # Names created up front so that only the IO points are measured.
+    names = [f'{n}' for n in range(numPoints)]
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    points = [ioClass(n, ActiveLevel.ACTIVE_HIGH) for n in names]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return (after - before) / len(points)
+
+
+def levelSetterTime(ioClass: type, numSets: int) -> float:
+    """
+    Measure time to set the level of an IO point.
+    Parameters:
+        ioClass : Digital IO class to instantiate.
+        numSets : Number of level sets to time.
+    Returns:
+        Average nanoseconds per level set.
+    """
+
+    # Levels bound up front so that Enum attribute lookup is not measured.
+    point = ioClass("BENCH", ActiveLevel.ACTIVE_LOW)
+    stmt = "p.level = low; p.level = high"
+    tGlobals = {"p": point, "low": Level.LOW, "high": Level.HIGH}
+    secs = min(timeit.repeat(stmt, globals=tGlobals, number=numSets // 2, repeat=5))
+
+    return secs * 1e9 / numSets
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Digital IO point benchmark.")
+    parser.add_argument("-n", "--points", type=int, default=10000, help="Number of IO points to create.")
+    parser.add_argument("-s", "--sets", type=int, default=1000000, help="Number of level sets to time.")
+    args = parser.parse_args()
+
+    for ioClass in (DigitalInput, DigitalOutput):
+        print(f'{ioClass.__name__:<14} : {memoryPerPoint(ioClass, args.points):7.1f} bytes/point; '
+              f'level setter : {levelSetterTime(ioClass, args.sets):6.1f} ns')
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+
+from concurrent import futures
+from urllib.parse import urlsplit, urlencode
+import argparse
+import http.client
+import statistics
+import time
+
+# *******************************************
+# Load test of a running webUI server.
+# Requests pages from concurrent clients, each
+# with a kept alive connection, and reports the
+# requests/s and latency percentiles of each page.
+# *******************************************
+
+
+class Client():
+    """
+    Class to represent a web client, with a kept alive connection and session cookie.
+    """
+
+    def __init__(self, host: str, port: int, encoding: str) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            host : Web server host.
+            port : Web server port.
+            encoding : Accepted content encodings.
+        """
+
+        self.host = host
+        self.port = port
+        self.encoding = encoding
+        self.cookie = ""
+        self.conn = None
+
+    def request(self, method: str, path: str, body: str = None) -> int:
+        """
+        Make a request, reconnecting if the connection was closed.
+        Parameters:
+            method : HTTP method.
+            path : Page path.
+            body : Form data to post.
+        Returns:
+            HTTP status of the response.
+        """
+
+        headers = {"Accept-Encoding" : self.encoding}
+        if self.cookie:
+            headers["Cookie"] = self.cookie
+        if body is not None:
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+
+        for attempt in range(2):
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+            try:
+                self.conn.request(method, path, body=body, headers=headers)
+                resp = self.conn.getresponse()
+                resp.read()
+                break
+            except (http.client.HTTPException, OSError):
+                self.conn.close()
+                self.conn = None
+                if attempt == 1:
+                    raise
+
+        cookie = resp.getheader("Set-Cookie")
+        if cookie:
+            self.cookie = cookie.split(";")[0]
+
+        return resp.status
+
+
+def loadPage(url: str, path: str, numClients: int, numRequests: int, encoding: str, user: str, password: str) -> dict:
+    """
+    Request a page from concurrent clients.
+    Parameters:
+        url : Web server URL.
+        path : Page path.
+        numClients : Number of concurrent clients.
+        numRequests : Number of requests per client.
+        encoding : Accepted content encodings.
+        user : User to log in as, blank to not log in.
+        password : Password of the user.
+    Returns:
+        Requests/s, latency percentiles (milliseconds) and errors.
+    """
+
+    parts = urlsplit(url)
+
+    def client() -> tuple:
+        c = Client(parts.hostname, parts.port or 80, encoding)
+        if user:
+            c.request("POST", "/auth/login", urlencode({"username" : user, "password" : password}))
+
+        latencies = []
+        errors = 0
+        for _ in range(numRequests):
+            tStart = time.perf_counter()
+            try:
+                if c.request("GET", path) >= 400:
+                    errors += 1
+            except (http.client.HTTPException, OSError):
+                errors += 1
+            latencies.append((time.perf_counter() - tStart) * 1000.0)
+
+        return latencies, errors
+
+    tStart = time.perf_counter()
+    with futures.ThreadPoolExecutor(max_workers=numClients) as pool:
+        results = [f.result() for f in [pool.submit(client) for _ in range(numClients)]]
+    elapsed = time.perf_counter() - tStart
+
+    lat = sorted(l for r in results for l in r[0])
+    return {
+        "rps" : len(lat) / elapsed,
+        "p50" : statistics.median(lat),
+        "p90" : lat[int(len(lat) * 0.90) - 1],
+        "p99" : lat[int(len(lat) * 0.99) - 1],
+        "errors" : sum(r[1] for r in results)
+    }
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="webUI load test.")
+    parser.add_argument("-u", "--url", type=str, default="http://127.0.0.1:5000", help="Web server URL.")
+    parser.add_argument("-c", "--clients", type=int, default=20, help="Number of concurrent clients.")
+    parser.add_argument("-n", "--requests", type=int, default=100, help="Number of requests per client, per page.")
+    parser.add_argument("-e", "--encoding", type=str, default="br, gzip", help="Accepted content encodings.")
+    parser.add_argument("--user", type=str, default="", help="User to log in as.")
+    parser.add_argument("--password", type=str, default="", help="Password of the user.")
+    parser.add_argument("pages", nargs="*", default=["/", "/auth/login"], help="Pages to request.")
+    args = parser.parse_args()
+
+    for page in args.pages:
+        res = loadPage(args.url, page, args.clients, args.requests, args.encoding, args.user, args.password)
+        print(f'{page:12s}: {res["rps"]:7.1f} req/s; p50 {res["p50"]:6.1f} ms; p90 {res["p90"]:6.1f} ms; '
+              f'p99 {res["p99"]:6.1f} ms; errors {res["errors"]}')
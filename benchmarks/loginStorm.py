@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+
+from concurrent import futures
+from threading import Event, Thread
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import grpc
+import sprinklers.ui_pb2_grpc as sprinklers_ui_pb2_grpc
+
+from sprinklers.uiMessages import *
+from webUI import create_app
+from webUI.db import init_db
+from benchmarks.edgeLatency import makeController
+
+# *******************************************
+# Benchmark of webUI dashboard latency during
+# a login storm. Clients at many addresses post
+# logins with wrong passwords, 20 a second each,
+# while a logged in user loads the index page.
+# Reports index page latency with unbounded hashing,
+# with the hashing pool, and with the pool and
+# rate limits.
+# *******************************************
+
+
+def dashboardLatencies(port: int, numStorm: int, stormGap: float, numPages: int, config: dict) -> tuple:
+    """
+    Load the index page during a login storm, and measure latency.
+    Parameters:
+        port : Controller UI server port.
+        numStorm : Number of storm clients.
+        stormGap : Time between logins of each storm client (seconds).
+        numPages : Number of index page requests.
+        config : Hashing and rate limit configuration.
+    Returns:
+        Page latencies (milliseconds), and storm logins checked and rejected.
+    """
+
+    app = create_app({
+        "SECRET_KEY" : "bench",
+        "DATABASE" : os.path.join(tempfile.mkdtemp(), "webUI.sqlite"),
+        "UI_IP" : "127.0.0.1",
+        "UI_PORT" : f'{port}',
+        "UI_REFRESH_PERIOD_SLOW" : 3,
+        "UI_REFRESH_PERIOD_FAST" : 1,
+        "UI_STATUS_DEADLINE" : 2.0,
+        "UI_CONTROL_DEADLINE" : 2.0,
+        "UI_BREAKER_FAILURES" : 3,
+        "UI_BREAKER_RESET" : 5.0,
+        "STATUS_CACHE_TTL" : 3600.0,
+        "STATUS_CACHE_DIR" : "",
+        **config
+    })
+    with app.app_context():
+        init_db()
+
+    user = app.test_client()
+    user.post("/auth/register", data={"username" : "bench", "password" : "bench"})
+    user.post("/auth/login", data={"username" : "bench", "password" : "bench"})
+    user.get("/")
+
+    stop = Event()
+    counts = {"checked" : 0, "rejected" : 0}
+
+    def storm(idx: int) -> None:
+        c = app.test_client()
+        addr = {"REMOTE_ADDR" : f'10.0.{idx // 250}.{idx % 250}'}
+        while not stop.is_set():
+            resp = c.post("/auth/login", data={"username" : "bench", "password" : "guess"}, environ_base=addr)
+            counts["checked" if resp.status_code == 200 else "rejected"] += 1
+            stop.wait(stormGap)
+
+    threads = [Thread(target=storm, args=(i,), daemon=True) for i in range(numStorm)]
+    for t in threads:
+        t.start()
+    time.sleep(0.5)
+
+    # Pages are loaded every 20 ms, as several users refreshing.
+    latencies = []
+    for _ in range(numPages):
+        tStart = time.perf_counter()
+        user.get("/")
+        latencies.append((time.perf_counter() - tStart) * 1000.0)
+        time.sleep(0.02)
+
+    stop.set()
+    for t in threads:
+        t.join()
+
+    return latencies, counts["checked"], counts["rejected"]
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Login storm benchmark.")
+    parser.add_argument("-s", "--storm", type=int, default=16, help="Number of storm clients.")
+    parser.add_argument("-g", "--gap", type=float, default=0.05, help="Time between logins of each storm client (seconds).")
+    parser.add_argument("-n", "--pages", type=int, default=100, help="Number of index page requests.")
+    args = parser.parse_args()
+
+    ctrl = makeController(1.0)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    sprinklers_ui_pb2_grpc.add_UiMessagesServicer_to_server(UiCommands(ctrl.cfg, ctrl.log, ctrl), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+
+    noLimits = {"LOGIN_ADDR_BURST" : 1e9, "LOGIN_USER_BURST" : 1e9}
+    for name, config in (("Unbounded", {"HASH_WORKERS" : args.storm, "HASH_QUEUE" : args.storm, **noLimits}),
+                         ("Hash pool", {"HASH_WORKERS" : 1, "HASH_QUEUE" : 4, **noLimits}),
+                         ("Pool + limits", {"HASH_WORKERS" : 1, "HASH_QUEUE" : 4})):
+        lat, checked, rejected = dashboardLatencies(port, args.storm, args.gap, args.pages, config)
+        lat.sort()
+        print(f'{name:14s}: p50 {statistics.median(lat):7.1f} ms; p99 {lat[int(len(lat) * 0.99) - 1]:7.1f} ms; '
+              f'storm logins checked {checked}, rejected {rejected}')
+
+    server.stop(None)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+from concurrent import futures
+import argparse
+import json
+import statistics
+import time
+
+import grpc
+import sprinklers.ui_pb2 as ui_pb2
+import sprinklers.ui_pb2_grpc as ui_pb2_grpc
+
+from sprinklers.uiMessages import *
+from benchmarks.edgeLatency import makeController
+
+# *******************************************
+# Benchmark of manual station runs.
+# Reports the command to relay latency of
+# StartStation and StopStation over gRPC (time
+# from the call to the output write), and how
+# late queued runs start after the run before.
+# *******************************************
+
+
+def outputWrite(ctrl, station: int, on: bool, tStart: int, timeout: float = 5.0) -> int:
+    """
+    Wait for the first output write after a time with a station on (or off).
+    Parameters:
+        ctrl : Controller.
+        station : Station number (1 onwards).
+        on : True to wait for the station on.
+        tStart : Monotonic time to look from (ns).
+        timeout : Time to wait (seconds).
+    Returns:
+        Monotonic time of the write (ns).
+    """
+
+    backend = ctrl.outputBackend
+    bank = ctrl.outputBank
+    tEnd = time.monotonic() + timeout
+    while time.monotonic() < tEnd:
+        for t, kind, levels in list(backend.history):
+            if (t >= tStart) and (kind == "WRITE") and (bool((bank.activeMask(levels) >> station) & 1) == on):
+                return t
+        time.sleep(0.0001)
+
+    raise TimeoutError(f'No write of station {station} {"on" if on else "off"}')
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Manual station runs benchmark.")
+    parser.add_argument("-n", "--runs", type=int, default=100, help="Number of start and stop commands.")
+    parser.add_argument("-q", "--queued", type=int, default=4, help="Number of queued runs (1 s each).")
+    args = parser.parse_args()
+
+    # Long periodic sleep, so that output writes are due to commands.
+    ctrl = makeController(60.0)
+    ctrl.setMode(ControllerMode.MANUAL)
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    ui_pb2_grpc.add_UiControlModeServicer_to_server(UiCommands(ctrl.cfg, ctrl.log, ctrl), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+    stub = ui_pb2_grpc.UiControlModeStub(grpc.insecure_channel(f'127.0.0.1:{port}'))
+
+    startCmd = ui_pb2.StartStationCmd()
+    startCmd.cmd = ui_pb2.UiModeControl.C_START_STATION
+    startCmd.station = 1
+    startCmd.seconds = 600
+    stopCmd = ui_pb2.StopStationCmd()
+    stopCmd.cmd = ui_pb2.UiModeControl.C_STOP_STATION
+    stopCmd.station = 1
+
+    # Warm up the channel.
+    stub.StopStation(stopCmd)
+
+    startLat = []
+    stopLat = []
+    for _ in range(args.runs):
+        for cmd, call, on, lat in ((startCmd, stub.StartStation, True, startLat), (stopCmd, stub.StopStation, False, stopLat)):
+            time.sleep(0.005)
+            tStart = time.monotonic_ns()
+            resp = call(cmd)
+            if resp.status != ui_pb2.UiModeStatus.CS_GOOD:
+                raise RuntimeError(f'Manual run command failed : {resp.reason}')
+            lat.append((outputWrite(ctrl, 1, on, tStart) - tStart) / 1000.0)
+
+    for name, lat in (("StartStation", startLat), ("StopStation", stopLat)):
+        lat.sort()
+        print(f'{name:12s} to relay : p50 {statistics.median(lat):7.1f} us; p99 {lat[int(len(lat) * 0.99) - 1]:7.1f} us; max {lat[-1]:7.1f} us')
+
+    # Queued runs, each should start as the one before ends.
+    queueCmd = ui_pb2.QueueStationsCmd()
+    queueCmd.cmd = ui_pb2.UiModeControl.C_QUEUE_STATIONS
+    numStations = len(ctrl.digitalOutputs) - 1
+    for n in range(args.queued):
+        run = queueCmd.runs.add()
+        run.station = n % numStations + 1
+        run.seconds = 1
+    tStart = time.monotonic_ns()
+    resp = stub.QueueStations(queueCmd)
+    print(f'Queued runs : {json.loads(resp.runs)["queued"]}')
+
+    late = []
+    tPrev = outputWrite(ctrl, queueCmd.runs[0].station, True, tStart)
+    for run in queueCmd.runs[1:]:
+        tNext = outputWrite(ctrl, run.station, True, tPrev + 1)
+        late.append((tNext - tPrev) / 1e6 - 1000.0)
+        tPrev = tNext
+    print(f'Queued run starts late by : {", ".join(f"{l:.2f}" for l in late)} ms')
+
+    server.stop(None)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+from concurrent import futures
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import grpc
+import webUI.ui_pb2 as ui_pb2
+import webUI.ui_pb2_grpc as ui_pb2_grpc
+
+from webUI import create_app
+import webUI.circuitBreaker as circuitBreaker
+
+# *******************************************
+# Benchmark of webUI page latency while the
+# controller is not responding (hung).
+# Requests the index page many times, and reports
+# latency with deadlines only, and with deadlines
+# and the circuit breaker.
+# *******************************************
+
+
+class HungController(ui_pb2_grpc.UiMessages):
+    """
+    Simulated controller, that accepts requests but never responds in time.
+    """
+
+    def GetControllerStatus(self, request, context):
+        """
+        Respond to controller status request, too late.
+        """
+
+        time.sleep(30.0)
+        return ui_pb2.ControllerStatusResp()
+
+
+def pageLatencies(port: int, numPages: int, maxFailures: int, deadline: float) -> list:
+    """
+    Request the index page, and measure latency.
+    Parameters:
+        port : Controller UI server port.
+        numPages : Number of page requests.
+        maxFailures : Circuit breaker failures to open.
+        deadline : Status call deadline (seconds).
+    Returns:
+        Page latencies (milliseconds).
+    """
+
+    # Each run has its own breakers.
+    circuitBreaker.breakers.clear()
+
+    app = create_app({
+        "SECRET_KEY" : "bench",
+        "DATABASE" : os.path.join(tempfile.mkdtemp(), "webUI.sqlite"),
+        "UI_IP" : "127.0.0.1",
+        "UI_PORT" : f'{port}',
+        "UI_REFRESH_PERIOD_SLOW" : 3,
+        "UI_REFRESH_PERIOD_FAST" : 1,
+        "UI_STATUS_DEADLINE" : deadline,
+        "UI_CONTROL_DEADLINE" : deadline,
+        "UI_BREAKER_FAILURES" : maxFailures,
+        "UI_BREAKER_RESET" : 60.0
+    })
+    client = app.test_client()
+
+    latencies = []
+    for _ in range(numPages):
+        tStart = time.perf_counter()
+        client.get("/")
+        latencies.append((time.perf_counter() - tStart) * 1000.0)
+
+    return latencies
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Page latency benchmark.")
+    parser.add_argument("-n", "--pages", type=int, default=100, help="Number of page requests.")
+    parser.add_argument("-d", "--deadline", type=float, default=0.2, help="Status call deadline (seconds).")
+    args = parser.parse_args()
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=args.pages))
+    ui_pb2_grpc.add_UiMessagesServicer_to_server(HungController(), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+
+    for name, maxFailures in (("Deadline only", args.pages + 1), ("Circuit breaker", 3)):
+        lat = sorted(pageLatencies(port, args.pages, maxFailures, args.deadline))
+        print(f'{name:16s}: p50 {statistics.median(lat):7.1f} ms; p99 {lat[int(len(lat) * 0.99) - 1]:7.1f} ms; '
+              f'total {sum(lat) / 1000.0:5.1f} s')
+
+    server.stop(None)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+from concurrent import futures
+from threading import Event, Thread
+import argparse
+import logging
+import statistics
+import time
+
+import grpc
+import sprinklers.ui_pb2 as ui_pb2
+import sprinklers.ui_pb2_grpc as ui_pb2_grpc
+
+from generic.priorityLanes import *
+from sprinklers.uiMessages import *
+from benchmarks.edgeLatency import makeController
+from benchmarks.grpcInterceptors import SlowStatusCommands, statusCmd
+
+# *******************************************
+# Benchmark of priority lanes of the UI server.
+# Reports the latency of setting the controller
+# mode OFF while clients saturate the server with
+# (slow) status calls, with a single queue and
+# with priority lanes.
+# *******************************************
+
+
+def setMode(stub, mode: str) -> float:
+    """
+    Set the controller mode.
+    Parameters:
+        stub : Control mode stub.
+        mode : Mode name.
+    Returns:
+        Call latency (ms).
+    """
+
+    cmd = ui_pb2.SetControllerModeCmd()
+    cmd.cmd = ui_pb2.UiModeControl.C_SET_MODE
+    cmd.reqMode = mode
+
+    tStart = time.perf_counter()
+    stub.SetControllerMode(cmd)
+    return (time.perf_counter() - tStart) * 1000.0
+
+def offLatency(ctrl, executor, interceptors: list, flooders: int, delay: float, numSets: int) -> tuple:
+    """
+    Time setting the controller mode OFF, while clients flood the server with slow status calls.
+    Parameters:
+        ctrl : Controller.
+        executor : Executor of the server.
+        interceptors : Server interceptors.
+        flooders : Number of flooding clients.
+        delay : Time of each status call (seconds).
+        numSets : Number of mode OFF sets.
+    Returns:
+        Mode OFF latencies (ms), and status calls completed and rejected.
+    """
+
+    server = grpc.server(executor, interceptors=interceptors)
+    cmds = SlowStatusCommands(ctrl.cfg, ctrl.log, ctrl, delay)
+    ui_pb2_grpc.add_UiMessagesServicer_to_server(cmds, server)
+    ui_pb2_grpc.add_UiControlModeServicer_to_server(cmds, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+
+    channel = grpc.insecure_channel(f'127.0.0.1:{port}')
+    statusStub = ui_pb2_grpc.UiMessagesStub(channel)
+    modeStub = ui_pb2_grpc.UiControlModeStub(channel)
+    stop = Event()
+    counts = {"ok" : 0, "rejected" : 0}
+
+    def flood():
+        cmd = statusCmd()
+        while not stop.is_set():
+            try:
+                statusStub.GetControllerStatus(cmd)
+                counts["ok"] += 1
+            except grpc.RpcError as e:
+                if e.code() != grpc.StatusCode.RESOURCE_EXHAUSTED:
+                    raise
+                counts["rejected"] += 1
+                # Back off a little, as a client would.
+                time.sleep(delay / 2)
+
+    threads = [Thread(target=flood, daemon=True) for _ in range(flooders)]
+    for t in threads:
+        t.start()
+    time.sleep(0.5)
+
+    # Set the mode OFF and back to AUTO, timing OFF.
+    latencies = []
+    for _ in range(numSets):
+        latencies.append(setMode(modeStub, "OFF"))
+        time.sleep(0.02)
+        setMode(modeStub, "AUTO")
+        time.sleep(0.02)
+
+    stop.set()
+    for t in threads:
+        t.join()
+    channel.close()
+    server.stop(None)
+    executor.shutdown()
+
+    return latencies, counts["ok"], counts["rejected"]
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="UI server priority lanes benchmark.")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="Number of server threads.")
+    parser.add_argument("-f", "--flooders", type=int, default=16, help="Number of clients flooding status calls.")
+    parser.add_argument("-d", "--delay", type=float, default=0.05, help="Time of each status call (seconds).")
+    parser.add_argument("-q", "--queue", type=int, default=8, help="Status calls allowed to wait.")
+    parser.add_argument("-s", "--sets", type=int, default=50, help="Number of mode OFF sets.")
+    args = parser.parse_args()
+
+    log = logging.getLogger("bench")
+    log.addHandler(logging.NullHandler())
+    log.propagate = False
+
+    ctrl = makeController(1.0)
+
+    lanes = {
+        "control" : {"Priority" : 0, "Reserved" : 1, "MaxQueue" : 0, "Methods" : ["SetControllerMode"]},
+        "read" : {"Priority" : 1, "Reserved" : 0, "MaxQueue" : args.queue, "Methods" : ["GetControllerStatus", "GetUpcomingRuns"]}
+    }
+
+    single = futures.ThreadPoolExecutor(max_workers=args.workers)
+    laned = PriorityLaneExecutor(args.workers, lanes, "read")
+    for name, executor, interceptors in (("Single queue", single, []),
+                                         ("Lanes", laned, [LaneInterceptor(laned)])):
+        latencies, ok, rejected = offLatency(ctrl, executor, interceptors, args.flooders, args.delay, args.sets)
+        latencies.sort()
+        print(f'{name:12s}: mode OFF p50 {statistics.median(latencies):6.1f} ms; '
+              f'p99 {latencies[int(len(latencies) * 0.99) - 1]:6.1f} ms; '
+              f'max {latencies[-1]:6.1f} ms; status calls {ok} ok, {rejected} rejected')
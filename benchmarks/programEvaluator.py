@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+import argparse
+import copy
+import json
+import logging
+import random
+import time
+
+from sprinklers.programEvaluator import *
+
+# *******************************************
+# Benchmark of vectorised program evaluation.
+# Makes candidate programs from the default
+# program (starts, durations, stations and days
+# changed at random), and evaluates them all at
+# once. A sample of candidates is also evaluated
+# one minute at a time in Python, to check the
+# results and compare the time per candidate.
+# *******************************************
+
+
+def makeCandidates(pFile: str, numCandidates: int, numStations: int, seed: int) -> List[dict]:
+    """
+    Make candidate program configurations, as changes of a program.
+    Parameters:
+        pFile : Name of the program configuration file to change.
+        numCandidates : Number of candidates.
+        numStations : Number of stations.
+        seed : Random number seed.
+    Returns:
+        Candidate program configurations.
+    """
+
+    with open(pFile) as programConfig:
+        base = json.load(programConfig)
+
+    rnd = random.Random(seed)
+    days = [d.name for d in ProgramDays]
+    candidates = []
+    for _ in range(numCandidates):
+        pc = copy.deepcopy(base)
+        pc["MyDays"] = rnd.sample(days, rnd.randint(1, 4))
+        for p in pc["Programs"]:
+            for ot in p["OnTimes"]:
+                ot["Start"] = f'{rnd.randint(0, 23):02d}{rnd.choice([0, 15, 30, 45]):02d}'
+                ot["Duration"] = rnd.choice([5, 10, 15, 20, 30])
+                ot["Stations"] = rnd.sample(range(1, numStations + 1), rnd.randint(1, numStations))
+        candidates.append(pc)
+
+    return candidates
+
+
+def referenceEvaluation(program: dict, flows: List[float], capacity: float) -> tuple:
+    """
+    Evaluate a program one minute at a time.
+    Parameters:
+        program : Controller program, as parsed.
+        flows : Flow rate by station number.
+        capacity : Water supply capacity, 0 for no limit.
+    Returns:
+        Total run minutes, conflict minutes, peak concurrent stations,
+        peak flow and minutes over the supply capacity.
+    """
+
+    # Runs of each station at each minute of the week.
+    counts = [dict() for _ in range(WEEK_MINUTES)]
+    total = 0
+    for day in program["MyDays"]:
+        for pg in program["Programs"]:
+            for ot in pg["OnTimes"]:
+                start = (day.value - 1) * DAY_MINUTES + int(ot["Start"][0:2]) * 60 + int(ot["Start"][2:4])
+                for st in ot["Stations"]:
+                    total += ot["Duration"]
+                    for m in range(start, start + ot["Duration"]):
+                        minute = counts[m % WEEK_MINUTES]
+                        minute[st] = minute.get(st, 0) + 1
+
+    conflicts = sum(1 for minute in counts for c in minute.values() if c > 1)
+    peakStations = max(len(minute) for minute in counts)
+    minuteFlows = [sum(flows[st] for st in minute) for minute in counts]
+    overCapacity = sum(1 for f in minuteFlows if f > capacity + 1e-6) if capacity > 0 else 0
+
+    return total, conflicts, peakStations, max(minuteFlows), overCapacity
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Vectorised program evaluation benchmark.")
+    parser.add_argument("-n", "--candidates", type=int, default=10000, help="Number of candidate programs.")
+    parser.add_argument("-r", "--reference", type=int, default=100, help="Number of candidates to check one at a time.")
+    parser.add_argument("-s", "--seed", type=int, default=1, help="Random number seed.")
+    args = parser.parse_args()
+
+    numStations, flows = loadStationFlows("./config/outputs.json")
+    capacity = 40.0
+    candidates = makeCandidates("./config/program.json", args.candidates, numStations, args.seed)
+
+    # Parse (validate) and add the candidates, then evaluate them all.
+    tStart = time.perf_counter()
+    programs = [parseProgram(pc) for pc in candidates]
+    arrays = ProgramArrays(numStations)
+    for n, program in enumerate(programs):
+        arrays.add(program, f'candidate{n}')
+    arrays.build()
+    tBuilt = time.perf_counter()
+    evaluator = ProgramEvaluator(numStations, flows, capacity)
+    result = evaluator.evaluate(arrays)
+    tEnd = time.perf_counter()
+    print(f'{args.candidates} candidates ({len(arrays.station)} rows) : parse and build {(tBuilt - tStart) * 1000.0:.0f} ms; '
+          f'evaluate {(tEnd - tBuilt) * 1000.0:.0f} ms ({(tEnd - tBuilt) / args.candidates * 1e6:.1f} us per candidate)')
+
+    # Check a sample against evaluating one minute at a time.
+    tStart = time.perf_counter()
+    mismatches = 0
+    for n in range(min(args.reference, args.candidates)):
+        expected = referenceEvaluation(programs[n], evaluator.flows.tolist(), capacity)
+        got = (result["totalMinutes"][n], result["conflictMinutes"][n], result["peakStations"][n], result["peakFlow"][n], result["overCapacityMinutes"][n])
+        if any(abs(e - g) > 1e-6 for e, g in zip(expected, got)):
+            mismatches += 1
+            print(f'Candidate {n} mismatch, expected {expected}; got {got}')
+    elapsed = time.perf_counter() - tStart
+    print(f'Checked {args.reference} candidates one minute at a time : {elapsed / args.reference * 1e6:.0f} us per candidate; {mismatches} mismatches')
+
+    best = int(np.argmin(result["overCapacityMinutes"] * 1000000 + result["conflictMinutes"] * 1000 - result["totalMinutes"]))
+    print(f'Best candidate {best} : {result["totalMinutes"][best]:.0f} minutes; {result["conflictMinutes"][best]:.0f} conflict minutes; '
+          f'peak {result["peakStations"][best]} stations; {result["overCapacityMinutes"][best]:.0f} minutes over capacity')
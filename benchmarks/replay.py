@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+from datetime import datetime, timedelta
+import argparse
+import logging
+import os
+import random
+import tempfile
+import time
+
+from sprinklers.replay import *
+
+# *******************************************
+# Benchmark of offline program replays.
+# Generates a year of input history (rain,
+# snow and tornado inputs changing at random)
+# and replays the default program against it.
+# Reports the replay time, and checks the run
+# time of a replay without interlocks tripped
+# matches the compiled schedule.
+# *******************************************
+
+
+def makeHistory(hFile: str, start: datetime, days: int, changesPerDay: float, seed: int) -> int:
+    """
+    Write an input history file, of inputs changing at random times.
+    Parameters:
+        hFile : Name of input history (csv) file.
+        start : Time of the start of the history.
+        days : Days of history.
+        changesPerDay : Mean number of input changes per day, per input.
+        seed : Random number seed.
+    Returns:
+        Number of input changes written.
+    """
+
+    rand = random.Random(seed)
+    changes = []
+    for name in ("RAIN", "SNOW", "TORNADO"):
+        t = 0.0
+        active = False
+        while True:
+            t += rand.expovariate(changesPerDay / 86400.0)
+            if t >= days * 86400.0:
+                break
+            active = not active
+            changes.append((t, name, active))
+    changes.sort()
+
+    with open(hFile, "w") as historyFile:
+        historyFile.write("Time,Input,Active\n")
+        for t, name, active in changes:
+            historyFile.write(f'{(start + timedelta(seconds=round(t))).isoformat()},{name},{int(active)}\n')
+
+    return len(changes)
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Offline program replay benchmark.")
+    parser.add_argument("-d", "--days", type=int, default=365, help="Days of input history.")
+    parser.add_argument("-n", "--changes", type=float, default=4.0, help="Mean input changes per day, per input.")
+    parser.add_argument("-s", "--seed", type=int, default=1, help="Random number seed.")
+    args = parser.parse_args()
+
+    log = logging.getLogger("bench")
+    log.addHandler(logging.NullHandler())
+    log.propagate = False
+
+    tmpDir = tempfile.mkdtemp()
+    cfg = Config(os.path.join(tmpDir, "sprinklers.json"))
+    ctrl = ReplayController(cfg, log, "./config/inputs.json", "./config/outputs.json", "./config/program.json", "./config/interlocks.json")
+    inputNames = [i.inputName for i in ctrl.digitalInputs]
+
+    # Year starting on a Monday, so whole weeks are replayed.
+    start = datetime(2021, 1, 4)
+    end = start + timedelta(days=args.days)
+    hFile = os.path.join(tmpDir, "history.csv")
+    numChanges = makeHistory(hFile, start, args.days, args.changes, args.seed)
+
+    tStart = time.perf_counter()
+    result = ctrl.replay(readHistory(hFile, inputNames, log), ControllerMode.AUTO, start, end)
+    elapsed = time.perf_counter() - tStart
+    print(f'Replay of {args.days} days, {numChanges} input changes : {elapsed:.2f} s; {result["steps"]} steps; '
+          f'{result["steps"] / elapsed:.0f} steps per s')
+    print(f'Run time {result["totalRunMinutes"]:.0f} of {sum(s["scheduledMinutes"] for s in result["stations"]):.0f} scheduled minutes, '
+          f'water {result["totalWater"]:.0f}')
+
+    # Without any inputs active, all of the schedule runs each (whole) week.
+    weeks = args.days // 7
+    emptyFile = os.path.join(tmpDir, "empty.csv")
+    open(emptyFile, "w").close()
+    ctrl = ReplayController(cfg, log, "./config/inputs.json", "./config/outputs.json", "./config/program.json", "./config/interlocks.json")
+    result = ctrl.replay(readHistory(emptyFile, inputNames, log), ControllerMode.AUTO, start, start + timedelta(weeks=weeks))
+    expected = sum(r.end - r.start for r in ctrl.scheduler.runs) * weeks
+    print(f'No inputs active, run time {result["totalRunMinutes"]:.0f} minutes; expected {expected:.0f} minutes')
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+import argparse
+import logging
+import random
+import time
+
+from generic.genericConstants import *
+from sprinklers.scheduler import *
+
+# *******************************************
+# Benchmark of program schedule compilation.
+# Compiles randomly generated programs over many
+# stations, and reports compile time and total
+# run time against running stations one at a time.
+# *******************************************
+
+
+def makeProgram(numStations: int, numPrograms: int, seed: int) -> dict:
+    """
+    Generate a random controller program.
+    Parameters:
+        numStations : Number of stations.
+        numPrograms : Number of programs.
+        seed : Random seed.
+    Returns:
+        Controller program, as imported.
+    """
+
+    rnd = random.Random(seed)
+    pgs = []
+    for n in range(numPrograms):
+        ots = []
+        for _ in range(rnd.randint(1, 3)):
+            ots.append({
+                "Start": f'{rnd.randint(0, 22):02d}{rnd.choice([0, 15, 30, 45]):02d}',
+                "Duration": rnd.choice([5, 10, 15, 20]),
+                "Stations": rnd.sample(range(1, numStations + 1), rnd.randint(1, min(12, numStations)))
+            })
+        pgs.append({"Name": f'P{n}', "OnTimes": ots})
+
+    return {"MyDays": [ProgramDays.Monday, ProgramDays.Thursday], "Programs": pgs}
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Schedule compile benchmark.")
+    parser.add_argument("-s", "--stations", type=int, default=500, help="Number of stations.")
+    parser.add_argument("-p", "--programs", type=int, default=300, help="Number of programs.")
+    parser.add_argument("-c", "--capacity", type=float, default=60.0, help="Supply capacity.")
+    args = parser.parse_args()
+
+    log = logging.getLogger("bench")
+    log.addHandler(logging.NullHandler())
+    log.propagate = False
+
+    rnd = random.Random(1)
+    flows = {st: rnd.choice([8.0, 12.0, 15.0, 20.0, 30.0]) for st in range(1, args.stations + 1)}
+    program = makeProgram(args.stations, args.programs, 2)
+
+    sched = Scheduler(log)
+    tStart = time.perf_counter()
+    sched.compile(program, flows, args.capacity)
+    tCompile = time.perf_counter() - tStart
+
+    # Stations one at a time, i.e. each run takes the whole supply.
+    single = Scheduler(log)
+    single.compile(program, {}, args.capacity)
+
+    print(f'Stations : {args.stations}; programs : {args.programs}; runs : {len(sched.runs)}')
+    print(f'Compile time : {tCompile * 1000.0:.1f} ms')
+    print(f'Total run time : {sched.totalMinutes()} minutes packed; {single.totalMinutes()} minutes one at a time')
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+from datetime import datetime, timedelta
+from threading import Event, Thread
+import argparse
+import json
+import logging
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import sprinklers.ui_pb2 as ui_pb2
+
+from sprinklers.uiMessages import *
+
+# *******************************************
+# Stress test of controller state publication.
+# Readers get the controller status (as the UI
+# server does) while writers set the mode and
+# inputs change, with a program running stations.
+# Reports reads and writes, and any responses
+# (or snapshots) with inconsistent state:
+#  - versions going backwards, or a version with
+#    different content,
+#  - outputs active in the OFF mode,
+#  - the master and stations not active together.
+# *******************************************
+
+MODES = ("OFF", "ON", "AUTO")
+
+
+def makeController() -> SprinklerController:
+    """
+    Create a controller with a program running stations 1 to 3 now.
+    Returns:
+        Controller, running and in the ACTIVE state.
+    """
+
+    log = logging.getLogger("bench")
+    log.addHandler(logging.NullHandler())
+    log.propagate = False
+
+    tmpDir = tempfile.mkdtemp()
+    start = datetime.now() - timedelta(minutes=1)
+    program = {
+        "MyDays" : [d.name for d in ProgramDays],
+        "Programs" : [{"Name" : "Stress", "OnTimes" : [{"Start" : start.strftime("%H%M"), "Duration" : 120, "Stations" : [1, 2, 3]}]}]
+    }
+    pFile = os.path.join(tmpDir, "program.json")
+    with open(pFile, "w") as f:
+        json.dump(program, f)
+
+    # No interlocks, so changing inputs don't stop the stations.
+    rFile = os.path.join(tmpDir, "interlocks.json")
+    with open(rFile, "w") as f:
+        json.dump({"Interlocks" : []}, f)
+
+    cfg = Config(os.path.join(tmpDir, "sprinklers.json"))
+    cfg.Timers["ControllerSleep"] = 0.05
+    # No supply limit, so all the stations run together.
+    cfg.Hydraulics["SupplyCapacity"] = 0.0
+
+    ctrl = SprinklerController(cfg, log, "Stress", "./config/inputs.json", "./config/outputs.json", pFile, rFile, "")
+    ctrl.daemon = True
+    ctrl.start()
+    while ctrl.state != ControllerState.ACTIVE:
+        time.sleep(0.01)
+
+    return ctrl
+
+
+def stressState(ctrl: SprinklerController, numReaders: int, numWriters: int, seconds: float) -> tuple:
+    """
+    Read the controller status and snapshots while setting the mode and changing inputs.
+    Parameters:
+        ctrl : Controller, running and in the ACTIVE state.
+        numReaders : Number of reader threads.
+        numWriters : Number of mode writer threads.
+        seconds : Time to run (seconds).
+    Returns:
+        Counts of reads, reads with stations running, mode sets (and timeouts)
+        and input changes, mode set latencies (ms), and inconsistencies seen.
+    """
+
+    cmds = UiCommands(ctrl.cfg, ctrl.log, ctrl)
+    stop = Event()
+    errors = []
+    counts = {"reads" : 0, "running" : 0, "writes" : 0, "timeouts" : 0, "inputs" : 0}
+    setLatencies = []
+
+    def reader():
+        request = ui_pb2.ControllerStatusCmd()
+        request.cmd = ui_pb2.UiCmd.U_CNTRL_STATUS
+        lastVersion = 0
+        lastSeq = 0
+        seen = {}
+        seenSnaps = {}
+        reads = 0
+        running = 0
+        while not stop.is_set():
+            resp = cmds.GetControllerStatus(request, None)
+            reads += 1
+            content = (resp.state, resp.mode, resp.inputs, resp.outputs)
+            if resp.version < lastVersion:
+                errors.append(f'Version went back : {lastVersion} to {resp.version}')
+            if seen.setdefault(resp.version, content) != content:
+                errors.append(f'Version {resp.version} has different content')
+            lastVersion = resp.version
+            actives = [o["oActive"] for o in json.loads(resp.outputs)["outputs"]]
+            if (resp.mode == "OFF") and any(actives):
+                errors.append(f'Outputs active in OFF mode, version {resp.version}')
+            if actives[0] != any(actives[1:]):
+                errors.append(f'Master and stations not active together, version {resp.version}')
+            running += actives[0]
+
+            # Snapshots as published, which must never change (be torn).
+            snap = ctrl.snapshot
+            snapContent = (snap.state, snap.mode, snap.inputMask, snap.outputMask, id(snap.program))
+            if snap.seq < lastSeq:
+                errors.append(f'Snapshot went back : {lastSeq} to {snap.seq}')
+            if seenSnaps.setdefault(snap.seq, snapContent) != snapContent:
+                errors.append(f'Snapshot {snap.seq} torn, has different content')
+            lastSeq = snap.seq
+            if (snap.mode == ControllerMode.OFF) and snap.outputMask:
+                errors.append(f'Snapshot {snap.seq} outputs active in OFF mode')
+            if bool(snap.outputMask & 1) != bool(snap.outputMask & ~1):
+                errors.append(f'Snapshot {snap.seq} master and stations not active together')
+
+            # Let other threads run between reads, as the UI server does between calls.
+            time.sleep(0)
+        counts["reads"] += reads
+        counts["running"] += running
+
+    def writer():
+        rng = random.Random()
+        while not stop.is_set():
+            tStart = time.perf_counter()
+            setStatus, setReason = ctrl.setMode(ControllerMode[rng.choice(MODES)])
+            setLatencies.append((time.perf_counter() - tStart) * 1000.0)
+            counts["writes"] += 1
+            if setReason == ControllerModeReason.TIMEOUT:
+                counts["timeouts"] += 1
+            time.sleep(rng.uniform(0.0, 0.002))
+
+    def inputs():
+        rng = random.Random()
+        backend = ctrl.inputBackend
+        while not stop.is_set():
+            backend.inject(rng.getrandbits(len(ctrl.digitalInputs)))
+            counts["inputs"] += 1
+            time.sleep(0.001)
+
+    threads = [Thread(target=reader) for _ in range(numReaders)]
+    threads += [Thread(target=writer) for _ in range(numWriters)]
+    threads.append(Thread(target=inputs))
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    return counts, sorted(setLatencies), errors
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Controller state publication stress test.")
+    parser.add_argument("-r", "--readers", type=int, default=8, help="Number of reader threads.")
+    parser.add_argument("-w", "--writers", type=int, default=2, help="Number of mode writer threads.")
+    parser.add_argument("-t", "--time", type=float, default=5.0, help="Time to run (seconds).")
+    args = parser.parse_args()
+
+    ctrl = makeController()
+    counts, setLatencies, errors = stressState(ctrl, args.readers, args.writers, args.time)
+
+    print(f'Reads : {counts["reads"]} ({counts["reads"] / args.time:.0f} per s, {counts["running"]} with stations running); '
+          f'mode sets : {counts["writes"]} ({counts["timeouts"]} timed out); input changes : {counts["inputs"]}')
+    print(f'Mode set latency : p50 {statistics.median(setLatencies):.2f} ms; '
+          f'p99 {setLatencies[int(len(setLatencies) * 0.99) - 1]:.2f} ms; max {setLatencies[-1]:.2f} ms')
+    print(f'Snapshots published : {ctrl.snapshot.seq}; inconsistent responses : {len(errors)}')
+    for e in errors[:10]:
+        print(f'  {e}')
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+from concurrent import futures
+from threading import Lock
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import grpc
+import webUI.ui_pb2 as ui_pb2
+import webUI.ui_pb2_grpc as ui_pb2_grpc
+
+from webUI import create_app
+from webUI.statusCache import get_cache
+import webUI.circuitBreaker as circuitBreaker
+
+# *******************************************
+# Benchmark of the webUI status cache.
+# Requests the index page from many concurrent
+# clients, and reports the number of calls to
+# the controller without and with the cache.
+# *******************************************
+
+
+class CountingController(ui_pb2_grpc.UiMessages):
+    """
+    Simulated controller, that counts status requests.
+    """
+
+    def __init__(self, latency: float) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            latency : Time to respond to a request (seconds).
+        """
+
+        self.latency = latency
+        self.lock = Lock()
+        self.calls = 0
+
+    def GetControllerStatus(self, request, context):
+        """
+        Respond to controller status request.
+        """
+
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.latency)
+
+        resp = ui_pb2.ControllerStatusResp()
+        resp.status = ui_pb2.StatusCmdStatus.US_GOOD
+        resp.name = "Bench"
+        resp.state = "IDLE"
+        resp.cTime = time.ctime()
+        resp.mode = "AUTO"
+        resp.inputs = json.dumps({"gName" : "Inputs", "inputs" : []})
+        resp.outputs = json.dumps({"gName" : "Outputs", "outputs" : []})
+        resp.program = json.dumps({"MyDays" : [], "Programs" : []})
+        return resp
+
+    def GetUpcomingRuns(self, request, context):
+        """
+        Respond to upcoming runs request.
+        """
+
+        time.sleep(self.latency)
+
+        resp = ui_pb2.UpcomingRunsResp()
+        resp.status = ui_pb2.StatusCmdStatus.US_GOOD
+        resp.runs = json.dumps({"next" : {}, "stations" : []})
+        return resp
+
+
+def pageLoads(port: int, numClients: int, numPages: int, ttl: float, cacheDir: str) -> dict:
+    """
+    Request the index page from concurrent clients.
+    Parameters:
+        port : Controller UI server port.
+        numClients : Number of concurrent clients.
+        numPages : Number of page requests per client.
+        ttl : Status cache time to live (seconds).
+        cacheDir : Shared cache folder, blank for none.
+    Returns:
+        Cache counters.
+    """
+
+    # Each run has its own breakers.
+    circuitBreaker.breakers.clear()
+
+    app = create_app({
+        "SECRET_KEY" : "bench",
+        "DATABASE" : os.path.join(tempfile.mkdtemp(), "webUI.sqlite"),
+        "UI_IP" : "127.0.0.1",
+        "UI_PORT" : f'{port}',
+        "UI_REFRESH_PERIOD_SLOW" : 3,
+        "UI_REFRESH_PERIOD_FAST" : 1,
+        "UI_STATUS_DEADLINE" : 2.0,
+        "UI_CONTROL_DEADLINE" : 2.0,
+        "UI_BREAKER_FAILURES" : 3,
+        "UI_BREAKER_RESET" : 5.0,
+        "STATUS_CACHE_TTL" : ttl,
+        "STATUS_CACHE_DIR" : cacheDir
+    })
+
+    def client() -> None:
+        c = app.test_client()
+        for _ in range(numPages):
+            c.get("/")
+
+    with futures.ThreadPoolExecutor(max_workers=numClients) as pool:
+        for f in [pool.submit(client) for _ in range(numClients)]:
+            f.result()
+
+    with app.app_context():
+        return get_cache().stats()
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Status cache benchmark.")
+    parser.add_argument("-c", "--clients", type=int, default=20, help="Number of concurrent clients.")
+    parser.add_argument("-n", "--pages", type=int, default=10, help="Number of page requests per client.")
+    parser.add_argument("-l", "--latency", type=float, default=0.05, help="Controller response time (seconds).")
+    args = parser.parse_args()
+
+    controller = CountingController(args.latency)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=args.clients))
+    ui_pb2_grpc.add_UiMessagesServicer_to_server(controller, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+
+    for name, ttl, cacheDir in (("Single flight", 0.0, ""), ("Process cache", 1.0, ""), ("Shared cache", 1.0, tempfile.mkdtemp())):
+        controller.calls = 0
+        tStart = time.perf_counter()
+        stats = pageLoads(port, args.clients, args.pages, ttl, cacheDir)
+        elapsed = time.perf_counter() - tStart
+        print(f'{name:14s}: {args.clients * args.pages} pages; {controller.calls:4d} status calls; '
+              f'{elapsed:5.2f} s; {stats}')
+
+    server.stop(None)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+from collections import namedtuple
+from concurrent import futures
+import argparse
+import logging
+import time
+
+import grpc
+import sprinklers.ui_pb2 as ui_pb2
+import sprinklers.ui_pb2_grpc as ui_pb2_grpc
+
+from generic.authTokens import *
+from sprinklers.uiMessages import *
+from benchmarks.edgeLatency import makeController
+
+# *******************************************
+# Benchmark of API token authentication.
+# Reports the time of the token interceptor per
+# call, for cached, not cached and invalid tokens,
+# and controller status call times over gRPC
+# without and with the interceptor.
+# *******************************************
+
+HandlerCallDetails = namedtuple("HandlerCallDetails", ("method", "invocation_metadata"))
+
+
+def interceptorTime(interceptor: TokenAuthInterceptor, metadata: tuple, numCalls: int) -> float:
+    """
+    Time the interceptor for calls with metadata.
+    Parameters:
+        interceptor : Token interceptor.
+        metadata : Call metadata.
+        numCalls : Number of calls.
+    Returns:
+        Time per call (microseconds).
+    """
+
+    details = HandlerCallDetails("/ui.UiMessages/GetControllerStatus", metadata)
+    continuation = lambda d: None
+
+    tStart = time.perf_counter()
+    for _ in range(numCalls):
+        interceptor.intercept_service(continuation, details)
+
+    return (time.perf_counter() - tStart) / numCalls * 1e6
+
+def callTime(ctrl, interceptors: list, metadata: tuple, numCalls: int) -> float:
+    """
+    Time controller status calls over gRPC.
+    Parameters:
+        ctrl : Controller.
+        interceptors : Server interceptors.
+        metadata : Call metadata.
+        numCalls : Number of calls.
+    Returns:
+        Time per call (microseconds).
+    """
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4), interceptors=interceptors)
+    ui_pb2_grpc.add_UiMessagesServicer_to_server(UiCommands(ctrl.cfg, ctrl.log, ctrl), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+
+    channel = grpc.insecure_channel(f'127.0.0.1:{port}')
+    stub = ui_pb2_grpc.UiMessagesStub(channel)
+    cmd = ui_pb2.ControllerStatusCmd()
+    cmd.cmd = ui_pb2.UiCmd.U_CNTRL_STATUS
+
+    # Warm up the channel.
+    for _ in range(50):
+        stub.GetControllerStatus(cmd, metadata=metadata)
+
+    tStart = time.perf_counter()
+    for _ in range(numCalls):
+        stub.GetControllerStatus(cmd, metadata=metadata)
+    elapsed = time.perf_counter() - tStart
+
+    channel.close()
+    server.stop(None)
+
+    return elapsed / numCalls * 1e6
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="API token authentication benchmark.")
+    parser.add_argument("-n", "--calls", type=int, default=100000, help="Number of interceptor calls.")
+    parser.add_argument("-g", "--grpc", type=int, default=2000, help="Number of gRPC calls.")
+    args = parser.parse_args()
+
+    log = logging.getLogger("bench")
+    log.addHandler(logging.NullHandler())
+    log.propagate = False
+
+    secret = b"bench-secret"
+    metadata = ((AUTH_METADATA, f'Bearer {makeToken(secret, "bench", 3600.0)}'),)
+
+    cached = TokenAuthInterceptor(TokenVerifier(secret, 1024, 1e9, 1e9), log)
+    uncached = TokenAuthInterceptor(TokenVerifier(secret, 0, 1e9, 1e9), log)
+
+    for name, interceptor, md in (("Cached token", cached, metadata),
+                                  ("Not cached", uncached, metadata),
+                                  ("Invalid token", cached, ((AUTH_METADATA, "Bearer bad.token"),))):
+        print(f'{name:14s}: {interceptorTime(interceptor, md, args.calls):6.2f} us per call')
+
+    ctrl = makeController(1.0)
+    base = callTime(ctrl, [], (), args.grpc)
+    auth = callTime(ctrl, [TokenAuthInterceptor(TokenVerifier(secret, 1024, 1e9, 1e9), log)], metadata, args.grpc)
+    print(f'gRPC status call: {base:7.1f} us without tokens; {auth:7.1f} us with tokens')
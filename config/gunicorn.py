@@ -0,0 +1,29 @@
+"""
+Gunicorn configuration for the production webUI server.
+"""
+
+import multiprocessing
+
+# Address of the web server.
+bind = "127.0.0.1:5000"
+
+# Worker processes, each with threads, as pages mostly wait for controllers.
+# Set STATUS_CACHE_DIR in instance/config.py so the workers share controller status.
+workers = min(multiprocessing.cpu_count() * 2 + 1, 8)
+worker_class = "gthread"
+threads = 4
+
+# Load the application (and precompile templates) once, before forking workers.
+preload_app = True
+
+# Keep connections open between page requests.
+keepalive = 5
+
+# Restart workers if stuck.
+timeout = 30
+graceful_timeout = 10
+
+# Log to the console.
+accesslog = "-"
+errorlog = "-"
+loglevel = "info"
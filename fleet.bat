@@ -0,0 +1,5 @@
+@ECHO OFF
+
+ECHO Creating fleet aggregator...
+
+venv\Scripts\activate.bat && python main-fleet.py
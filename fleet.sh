@@ -0,0 +1,7 @@
+#!/bin/bash
+
+source "./venv.sh"
+
+echo "Creating fleet aggregator..."
+
+python main-fleet.py
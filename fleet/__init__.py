@@ -0,0 +1,4 @@
+"""
+Fleet aggregator application package.
+Package for FLEET application, serving the status of many controllers.
+"""
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+
+from threading import Lock, Thread
+from typing import List, Tuple
+import asyncio
+import json
+import logging
+import time
+
+import grpc
+import fleet.ui_pb2 as ui_pb2
+import fleet.ui_pb2_grpc as ui_pb2_grpc
+
+from generic.authTokens import *
+from generic.genericConstants import *
+from fleet.config import *
+
+
+class FleetController():
+    """
+    Class to represent a controller of the fleet, and its latest status.
+    """
+
+    __slots__ = ('name', 'address', 'tags', 'stub', 'ctrlStub', 'status', 'lastGood', 'error')
+
+    def __init__(self, name: str, address: str, tags: List[str]) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            name : Name of the controller.
+            address : Controller UI server address, as ip:port.
+            tags : Tags to select the controller by.
+        """
+
+        self.name = name
+        self.address = address
+        self.tags = tags
+
+        # Stubs to talk to the controller, created on the polling loop.
+        self.stub = None
+        self.ctrlStub = None
+
+        # Latest good status (dictionary), (wall) time it was received,
+        # and the error of the latest poll, blank if none.
+        self.status = {}
+        self.lastGood = None
+        self.error = ""
+
+
+class FleetAggregator(Thread):
+    """
+    Class to represent the fleet aggregator.
+    Polls the status of all the controllers of the fleet concurrently, each with
+    a deadline, and caches the latest status of each controller. So the status of
+    the whole fleet is served from the cache, however many controllers are slow
+    or unreachable.
+    Derive from Thread class, polling runs on an asyncio loop in the thread.
+    """
+
+    def __init__(self, config: Config, log: logging, fFile: str) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            config : Mainline configuration object.
+            log : Mainline logging object.
+            fFile : Name of fleet controllers configuration (json) file.
+        """
+
+        Thread.__init__(self)
+        self.cfg = config
+        self.log = log
+
+        # Initialise state of the aggregator.
+        self.stayAlive = True
+
+        # Controllers of the fleet.
+        self.controllers = []
+        self.importControllers(fFile)
+
+        # Number of polls of all the controllers.
+        self.polls = 0
+
+        # Polling loop, commands are dispatched on it from other threads.
+        self.loop = None
+        self.commandLimit = None
+
+        # Commands by idempotency key, as (monotonic) time, command and
+        # future result, kept for the idempotency TTL.
+        self.commands = {}
+        self.commandLock = Lock()
+
+        # Token for controllers that require API tokens, if configured.
+        self.tokens = None
+        if self.cfg.Auth["SecretFile"]:
+            self.tokens = TokenSource(loadSecret(self.cfg.Auth["SecretFile"]), self.cfg.FleetName, self.cfg.Auth["Lifetime"])
+
+    def importControllers(self, fFile: str) -> None:
+        """
+        Import fleet controllers configuration file.
+        Parameters:
+            fFile : Name of fleet controllers configuration file.
+        """
+
+        try:
+            with open(fFile) as fleetConfig:
+                fc = json.load(fleetConfig)
+
+                for c in fc["Controllers"]:
+                    self.controllers.append(FleetController(c["Name"], c["Address"], c.get("Tags", [])))
+                    self.log.debug(f'Importing controller : {c["Name"]}; address : {c["Address"]}')
+        except Exception:
+            # Failed to import fleet controllers configuration file.
+            self.log.error(f'Failed to import fleet controllers configuration file.')
+
+    def run(self) -> None:
+        """
+        Run threaded method.
+        Runs the polling loop until self.stayAlive is False.
+        """
+
+        self.log.debug(f'Fleet aggregator running, controllers : {len(self.controllers)}')
+
+        asyncio.run(self.polling())
+
+    async def polling(self) -> None:
+        """
+        Poll all the controllers every poll period (fixed rate).
+        Controllers are polled concurrently, up to the maximum concurrent.
+        """
+
+        # Channels are created on the polling loop, and kept open.
+        channels = []
+        for fc in self.controllers:
+            channel = grpc.aio.insecure_channel(fc.address)
+            channels.append(channel)
+            fc.stub = ui_pb2_grpc.UiMessagesStub(channel)
+            fc.ctrlStub = ui_pb2_grpc.UiControlModeStub(channel)
+        limit = asyncio.Semaphore(self.cfg.MaxConcurrent)
+
+        # Commands have their own limit, so they don't wait behind polls.
+        self.commandLimit = asyncio.Semaphore(self.cfg.MaxConcurrent)
+        loop = asyncio.get_running_loop()
+        self.loop = loop
+        nextPoll = loop.time()
+        while self.stayAlive:
+            await asyncio.gather(*(self.pollController(fc, limit) for fc in self.controllers))
+            self.polls += 1
+
+            nextPoll += self.cfg.Timers["PollPeriod"]
+            await asyncio.sleep(max(0.0, nextPoll - loop.time()))
+
+        for channel in channels:
+            await channel.close()
+
+    async def pollController(self, fc: FleetController, limit: asyncio.Semaphore) -> None:
+        """
+        Poll the status of a controller, with a deadline.
+        Parameters:
+            fc : Controller to poll.
+            limit : Limit on controllers polled at the same time.
+        """
+
+        getStatusCmd = ui_pb2.ControllerStatusCmd()
+        getStatusCmd.cmd = ui_pb2.UiCmd.U_CNTRL_STATUS
+
+        async with limit:
+            try:
+                response = await fc.stub.GetControllerStatus(getStatusCmd, timeout=self.cfg.Timers["Deadline"], metadata=self.authMetadata())
+
+                if response.status == ui_pb2.StatusCmdStatus.US_GOOD:
+                    # Replace the status as a whole, so readers see one status or the other.
+                    fc.status = {
+                        "state" : response.state,
+                        "mode" : response.mode,
+                        "cTime" : response.cTime,
+                        "inputs" : response.inputs,
+                        "outputs" : response.outputs
+                    }
+                    fc.lastGood = time.time()
+                    fc.error = ""
+                else:
+                    fc.error = f'Bad status : {response.status}'
+
+            except grpc.RpcError as e:
+                # Failed to receive response from controller, keep the last status.
+                if fc.error != e.code().name:
+                    self.log.warning(f'Failed to get status of controller : {fc.name}; status : {e.code().name}')
+                fc.error = e.code().name
+
+    def selectControllers(self, names: List[str], tags: List[str], allCtrls: bool) -> List[FleetController]:
+        """
+        Select controllers of the fleet.
+        Parameters:
+            names : Names of controllers to select.
+            tags : Tags of controllers to select.
+            allCtrls : True to select all controllers.
+        Returns:
+            Controllers with any of the names or tags, or all controllers.
+        """
+
+        if allCtrls:
+            return list(self.controllers)
+
+        names = set(names)
+        tags = set(tags)
+
+        return [fc for fc in self.controllers if (fc.name in names) or (tags.intersection(fc.tags))]
+
+    def setFleetMode(self, reqMode: str, names: List[str], tags: List[str], allCtrls: bool, key: str) -> Tuple[List[dict], bool]:
+        """
+        Set the mode of the selected controllers, concurrently.
+        Called from other threads, the commands are dispatched on the polling loop.
+        A command with the idempotency key of an earlier command (within the
+        idempotency TTL) is not dispatched again, and gets the earlier results.
+        Parameters:
+            reqMode : Mode to set the controllers to.
+            names : Names of controllers to set.
+            tags : Tags of controllers to set.
+            allCtrls : True to set all controllers.
+            key : Idempotency key, blank for none.
+        Returns:
+            Result for each controller, and True if the results are of an earlier command.
+        """
+
+        if self.loop is None:
+            raise RuntimeError("Fleet aggregator not running.")
+
+        command = (reqMode, tuple(sorted(names)), tuple(sorted(tags)), allCtrls)
+        now = time.monotonic()
+        replayed = False
+        with self.commandLock:
+            # Forget commands older than the TTL, oldest are first.
+            while self.commands:
+                oldKey, (cmdTime, _, _) = next(iter(self.commands.items()))
+                if now - cmdTime < self.cfg.Timers["IdempotencyTTL"]:
+                    break
+                del self.commands[oldKey]
+
+            if key and key in self.commands:
+                _, oldCommand, result = self.commands[key]
+                if oldCommand != command:
+                    raise ValueError(f'Idempotency key reused for a different command : {key}')
+                replayed = True
+                self.log.info(f'Fleet mode command replayed, key : {key}')
+            else:
+                targets = self.selectControllers(names, tags, allCtrls)
+                self.log.info(f'Setting fleet mode to : {reqMode}; controllers : {len(targets)}')
+                result = asyncio.run_coroutine_threadsafe(self.dispatchMode(reqMode, targets), self.loop)
+                if key:
+                    self.commands[key] = (now, command, result)
+
+        # Wait outside the lock, replays of a command in progress wait for it.
+        return result.result(), replayed
+
+    async def dispatchMode(self, reqMode: str, targets: List[FleetController]) -> List[dict]:
+        """
+        Set the mode of controllers concurrently.
+        Parameters:
+            reqMode : Mode to set the controllers to.
+            targets : Controllers to set.
+        Returns:
+            Result for each controller.
+        """
+
+        return list(await asyncio.gather(*(self.setControllerMode(fc, reqMode) for fc in targets)))
+
+    async def setControllerMode(self, fc: FleetController, reqMode: str) -> dict:
+        """
+        Set the mode of a controller, with a deadline.
+        Parameters:
+            fc : Controller to set.
+            reqMode : Mode to set the controller to.
+        Returns:
+            Result of setting the mode.
+        """
+
+        setModeCmd = ui_pb2.SetControllerModeCmd()
+        setModeCmd.cmd = ui_pb2.UiModeControl.C_SET_MODE
+        setModeCmd.reqMode = reqMode
+
+        result = {
+            "name" : fc.name,
+            "status" : ui_pb2.UiModeStatus.CS_NONE,
+            "setMode" : "",
+            "reason" : ControllerModeReason.NONE.name,
+            "error" : ""
+        }
+        async with self.commandLimit:
+            try:
+                response = await fc.ctrlStub.SetControllerMode(setModeCmd, timeout=self.cfg.Timers["Deadline"], metadata=self.authMetadata())
+                result["status"] = response.status
+                result["setMode"] = response.setMode
+                result["reason"] = response.reason
+
+                # Show the mode straight away, rather than on the next poll.
+                if fc.status:
+                    fc.status = {**fc.status, "mode" : response.setMode}
+
+            except grpc.RpcError as e:
+                # Failed to receive response from controller.
+                self.log.warning(f'Failed to set mode of controller : {fc.name}; status : {e.code().name}')
+                result["error"] = e.code().name
+
+        return result
+
+    def authMetadata(self) -> tuple:
+        """
+        Get call metadata with the API token, if configured.
+        Returns:
+            Call metadata.
+        """
+
+        return self.tokens.metadata() if self.tokens is not None else ()
+
+    def fleetStatus(self) -> List[dict]:
+        """
+        Get the latest status of all the controllers, from the cache.
+        Returns:
+            Status of each controller, with staleness markers.
+        """
+
+        now = time.time()
+        statuses = []
+        for fc in self.controllers:
+            # Take a reference, status is replaced by the polling loop.
+            status = fc.status
+            lastGood = fc.lastGood
+            age = -1.0 if lastGood is None else now - lastGood
+            statuses.append({
+                "name" : fc.name,
+                "address" : fc.address,
+                "tags" : fc.tags,
+                "stale" : (lastGood is None) or (age > self.cfg.Timers["StaleAfter"]),
+                "age" : age,
+                "error" : fc.error,
+                **status
+            })
+
+        return statuses
+
+    def stopPolling(self) -> None:
+        """
+        Method to stop polling the controllers.
+        """
+
+        self.log.debug(f'Stopping fleet aggregator.')
+        self.stayAlive = False
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+
+import json
+
+
+class Config():
+    """
+    Configuration class for fleet aggregator.
+    Reads a json configuration file if supplied and updates configuration object
+    accordingly, else uses default configuration.
+
+    class variable self.ConfigVersion is checked and if the initialised values are
+    newer, the passed configuration file will be overwritten with new defaults.
+    """
+
+    def __init__(self, configFile: str) -> None:
+        """
+        Class initialisation.
+        Parameters:
+            configFile : Configuration file name.
+        """
+
+        # Configuration filename.
+        self.cf = configFile
+
+        # Version of configuration.
+        self.ConfigVersion = 0
+
+        # Custom fleet details.
+        self.FleetName = "Garden Fleet"
+
+        # Logger configuration values.
+        self.DebugLevel = 10
+        self.LogFileSize = 100000
+        self.LogBackups = 3
+
+        # Timers.
+        # PollPeriod is time between polls of all the controllers (seconds).
+        # Deadline is the time each controller has to respond (seconds).
+        # StaleAfter is the age a controller status is marked stale (seconds).
+        # IdempotencyTTL is how long command idempotency keys are kept (seconds).
+        self.Timers = {
+            "MainSleep" : 1.0,
+            "PollPeriod" : 2.0,
+            "Deadline" : 1.0,
+            "StaleAfter" : 10.0,
+            "IdempotencyTTL" : 600.0
+        }
+
+        # Maximum number of controllers talked to at the same time.
+        self.MaxConcurrent = 50
+
+        # UI server settings.
+        self.UI = {
+            "UIPort" : 50160,
+            "UISleep" : 1.0
+        }
+
+        # API authentication settings, for controllers that require tokens.
+        # SecretFile has the secret shared with the controllers, blank for no tokens.
+        # Lifetime is the time each token is valid for (seconds).
+        self.Auth = {
+            "SecretFile" : "",
+            "Lifetime" : 3600.0
+        }
+
+        # Read / update configuration from file.
+        self.readConfig()
+
+    def readConfig(self) -> None:
+        """
+        Attempt to read configuration file, and create default if it doesn't.
+        If it exists then update this configuration class object with differences.
+        """
+        try:
+            with open(self.cf) as config_file:
+                config = json.load(config_file)
+
+                # Check configuration version.
+                # If version not a match then update completely.
+                if config["ConfigVersion"] != self.ConfigVersion:
+                    print("Upgrading configuration file.")
+                    # Save configuration to file.
+                    self.saveConfig()
+
+                # Update configuration values if possible.
+                # If not, just update with default + whatever values read.
+                updateConfig = False
+                try:
+                    paramSaved = self.FleetName
+                    self.FleetName = config["FleetName"]
+                except Exception:
+                    self.FleetName = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.DebugLevel
+                    self.DebugLevel = config["DebugLevel"]
+                except Exception:
+                    self.DebugLevel = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.LogFileSize
+                    self.LogFileSize = config["LogFileSize"]
+                except Exception:
+                    self.LogFileSize = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.LogBackups
+                    self.LogBackups = config["LogBackups"]
+                except Exception:
+                    self.LogBackups = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.Timers["MainSleep"]
+                    self.Timers["MainSleep"] = config["Timers"]["MainSleep"]
+                except Exception:
+                    self.Timers["MainSleep"] = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.Timers["PollPeriod"]
+                    self.Timers["PollPeriod"] = config["Timers"]["PollPeriod"]
+                except Exception:
+                    self.Timers["PollPeriod"] = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.Timers["Deadline"]
+                    self.Timers["Deadline"] = config["Timers"]["Deadline"]
+                except Exception:
+                    self.Timers["Deadline"] = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.Timers["StaleAfter"]
+                    self.Timers["StaleAfter"] = config["Timers"]["StaleAfter"]
+                except Exception:
+                    self.Timers["StaleAfter"] = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.Timers["IdempotencyTTL"]
+                    self.Timers["IdempotencyTTL"] = config["Timers"]["IdempotencyTTL"]
+                except Exception:
+                    self.Timers["IdempotencyTTL"] = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.MaxConcurrent
+                    self.MaxConcurrent = config["MaxConcurrent"]
+                except Exception:
+                    self.MaxConcurrent = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.UI["UIPort"]
+                    self.UI["UIPort"] = config["UI"]["UIPort"]
+                except Exception:
+                    self.UI["UIPort"] = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.UI["UISleep"]
+                    self.UI["UISleep"] = config["UI"]["UISleep"]
+                except Exception:
+                    self.UI["UISleep"] = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.Auth["SecretFile"]
+                    self.Auth["SecretFile"] = config["Auth"]["SecretFile"]
+                except Exception:
+                    self.Auth["SecretFile"] = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.Auth["Lifetime"]
+                    self.Auth["Lifetime"] = config["Auth"]["Lifetime"]
+                except Exception:
+                    self.Auth["Lifetime"] = paramSaved
+                    updateConfig = True
+
+                # If required, i.e. couldn't update all data from user configuration, then save default.
+                if updateConfig:
+                    print("Saving configuration file due to user changed parameter.")
+                    self.saveConfig()
+
+        except Exception:
+            # Create default configuration file.
+            print("Saving default configuration data.")
+            self.saveConfig()
+
+    def saveConfig(self) -> None:
+        """
+        Export and save the configuration class object to a json file.
+        A default configuration file will be created if one doesn't exist,
+        or the current configuration file will be overwritten if it does.
+        """
+
+        # Format configuration data.
+        cfgDict = {
+            "ConfigVersion" : self.ConfigVersion,
+            "FleetName" : self.FleetName,
+            "DebugLevel" : self.DebugLevel,
+            "LogFileSize" : self.LogFileSize,
+            "LogBackups" : self.LogBackups,
+            "Timers" : self.Timers,
+            "MaxConcurrent" : self.MaxConcurrent,
+            "UI" : self.UI,
+            "Auth" : self.Auth
+        }
+
+        # Open file for writing.
+        try:
+            outfile = open(self.cf, "w")
+            outfile.write(json.dumps(cfgDict, sort_keys=False, indent=4, ensure_ascii=False))
+            outfile.close()
+        except Exception:
+            print("Failed to create default configuration file : {0:s}".format(self.cf))
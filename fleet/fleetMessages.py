@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+from datetime import datetime
+import logging
+
+import grpc
+import fleet.ui_pb2 as ui_pb2
+import fleet.ui_pb2_grpc as ui_pb2_grpc
+
+from fleet.config import *
+from fleet.aggregator import *
+
+
+class FleetCommands(ui_pb2_grpc.UiFleet):
+    """
+    GRPC UiFleet messaging class.
+    """
+
+    def __init__(self, config: Config, log: logging, agg: FleetAggregator) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            config : Mainline configuration object.
+            log : Mainline logging object.
+            agg : Fleet aggregator object.
+        """
+
+        self.cfg = config
+        self.log = log
+        self.agg = agg
+
+    def GetFleetStatus(self, request, context):
+        """
+        Respond to fleet status request from UI.
+        Served from the aggregator cache, no controllers are polled.
+        """
+
+        if request.cmd == ui_pb2.FleetCmd.F_FLEET_STATUS:
+            try:
+                # Respond to the UI.
+                resp = ui_pb2.FleetStatusResp()
+                resp.status = ui_pb2.StatusCmdStatus.US_GOOD
+                resp.fTime = datetime.now().strftime("%A, %d/%m/%Y, %H:%M:%S")
+                for s in self.agg.fleetStatus():
+                    cs = resp.controllers.add()
+                    cs.name = s["name"]
+                    cs.address = s["address"]
+                    cs.tags.extend(s["tags"])
+                    cs.stale = s["stale"]
+                    cs.age = s["age"]
+                    cs.error = s["error"]
+                    cs.state = s.get("state", "")
+                    cs.mode = s.get("mode", "")
+                    cs.cTime = s.get("cTime", "")
+                    cs.inputs = s.get("inputs", "")
+                    cs.outputs = s.get("outputs", "")
+                return resp
+
+            except grpc.RpcError as e:
+                # Server-side GRPC error.
+                context.set_code(ui_pb2.StatusCmdStatus.US_SERVER_EXCEPTION)
+                context.set_details(f"Server exception, status : {e.code()}; details : {e.details()}")
+                self.log.error(f'Server exception, status : {e.code()}; details : {e.details()}')
+                return ui_pb2.FleetStatusResp()
+        else:
+            # Unexpected command in fleet status request.
+            context.set_code(ui_pb2.StatusCmdStatus.US_UNEXPECTED_CMD)
+            context.set_details("Unexpected command.")
+            self.log.error(f'Unexpected command from UI : {request.cmd}')
+            return ui_pb2.FleetStatusResp()
+
+    def SetFleetMode(self, request, context):
+        """
+        Respond to fleet mode set request from UI.
+        Sets the mode of the selected controllers concurrently.
+        """
+
+        if request.cmd == ui_pb2.FleetCmd.F_SET_MODE:
+            try:
+                results, replayed = self.agg.setFleetMode(request.reqMode, list(request.names), list(request.tags), request.all, request.idempotencyKey)
+
+                # Respond to the UI, with the result of each controller.
+                # Controllers already in the mode count as succeeded.
+                resp = ui_pb2.FleetModeResp()
+                resp.status = ui_pb2.StatusCmdStatus.US_GOOD
+                resp.idempotencyKey = request.idempotencyKey
+                resp.replayed = replayed
+                for r in results:
+                    mr = resp.results.add()
+                    mr.name = r["name"]
+                    mr.status = r["status"]
+                    mr.setMode = r["setMode"]
+                    mr.reason = r["reason"]
+                    mr.error = r["error"]
+                    if (r["status"] == ui_pb2.UiModeStatus.CS_GOOD) or (r["reason"] == ControllerModeReason.NO_CHANGE.name):
+                        resp.succeeded += 1
+                    else:
+                        resp.failed += 1
+                return resp
+
+            except ValueError as e:
+                # Idempotency key reused for a different command.
+                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                context.set_details(f'{e}')
+                self.log.error(f'{e}')
+                return ui_pb2.FleetModeResp()
+            except Exception as e:
+                # Server-side error, e.g. aggregator not running.
+                context.set_code(grpc.StatusCode.UNAVAILABLE)
+                context.set_details(f"Server exception : {e}")
+                self.log.error(f'Server exception : {e}')
+                return ui_pb2.FleetModeResp()
+        else:
+            # Unexpected command in fleet mode set request.
+            context.set_code(ui_pb2.StatusCmdStatus.US_UNEXPECTED_CMD)
+            context.set_details("Unexpected command.")
+            self.log.error(f'Unexpected command from UI : {request.cmd}')
+            return ui_pb2.FleetModeResp()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+from concurrent import futures
+from threading import Thread
+import time
+import grpc
+import fleet.ui_pb2_grpc as ui_pb2_grpc
+
+from fleet.fleetMessages import *
+
+
+class FleetServer(Thread):
+    """
+    Class to present a UI server for fleet data.
+    Derive from Thread class.
+    """
+
+    def __init__(self, config: Config, log, agg: FleetAggregator) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            config : Mainline configuration object.
+            log : Mainline logging object.
+            agg : Fleet aggregator to report on.
+        """
+
+        Thread.__init__(self)
+        self.cfg = config
+        self.log = log
+        self.agg = agg
+
+        # Initialise state of the server.
+        self.stayAlive = True
+
+    def run(self) -> None:
+        """
+        Run threaded method.
+        Loop forever, checking for ui requests.
+        Mainline will kill thread when self.stayAlive is False.
+        """
+
+        # Configure and start the server to listen for messages from UI.
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+        ui_pb2_grpc.add_UiFleetServicer_to_server(FleetCommands(self.cfg, self.log, self.agg), server)
+        server.add_insecure_port(f'[::]:{self.cfg.UI["UIPort"]}')
+        server.start()
+
+        while self.stayAlive:
+            time.sleep(self.cfg.UI["UISleep"])
+
+        server.stop(None)
+
+    def stopServingUI(self) -> None:
+        """
+        Method to stop serving UI data.
+        """
+
+        self.log.debug(f'Killing off fleet UI Server.')
+        self.stayAlive = False
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: ui.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x08ui.proto\x12\x02ui\"-\n\x13\x43ontrollerStatusCmd\x12\x16\n\x03\x63md\x18\x01 \x01(\x0e\x32\t.ui.UiCmd\"\xb8\x01\n\x14\x43ontrollerStatusResp\x12#\n\x06status\x18\x01 \x01(\x0e\x32\x13.ui.StatusCmdStatus\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\r\n\x05state\x18\x03 \x01(\t\x12\r\n\x05\x63Time\x18\x04 \x01(\t\x12\x0c\n\x04mode\x18\x05 \x01(\t\x12\x0f\n\x07program\x18\x06 \x01(\t\x12\x0e\n\x06inputs\x18\x07 \x01(\t\x12\x0f\n\x07outputs\x18\x08 \x01(\t\x12\x0f\n\x07version\x18\t \x01(\x04\")\n\x0fUpcomingRunsCmd\x12\x16\n\x03\x63md\x18\x01 \x01(\x0e\x32\t.ui.UiCmd\"T\n\x10UpcomingRunsResp\x12#\n\x06status\x18\x01 \x01(\x0e\x32\x13.ui.StatusCmdStatus\x12\r\n\x05\x63Time\x18\x02 \x01(\t\x12\x0c\n\x04runs\x18\x03 \x01(\t\"G\n\x14SetControllerModeCmd\x12\x1e\n\x03\x63md\x18\x01 \x01(\x0e\x32\x11.ui.UiModeControl\x12\x0f\n\x07reqMode\x18\x02 \x01(\t\"Z\n\x15SetControllerModeResp\x12 \n\x06status\x18\x01 \x01(\x0e\x32\x10.ui.UiModeStatus\x12\x0f\n\x07setMode\x18\x02 \x01(\t\x12\x0e\n\x06reason\x18\x03 \x01(\t\"S\n\x0fStartStationCmd\x12\x1e\n\x03\x63md\x18\x01 \x01(\x0e\x32\x11.ui.UiModeControl\x12\x0f\n\x07station\x18\x02 \x01(\r\x12\x0f\n\x07seconds\x18\x03 \x01(\r\"A\n\x0eStopStationCmd\x12\x1e\n\x03\x63md\x18\x01 \x01(\x0e\x32\x11.ui.UiModeControl\x12\x0f\n\x07station\x18\x02 \x01(\r\".\n\nStationRun\x12\x0f\n\x07station\x18\x01 \x01(\r\x12\x0f\n\x07seconds\x18\x02 \x01(\r\"P\n\x10QueueStationsCmd\x12\x1e\n\x03\x63md\x18\x01 \x01(\x0e\x32\x11.ui.UiModeControl\x12\x1c\n\x04runs\x18\x02 \x03(\x0b\x32\x0e.ui.StationRun\"O\n\rManualRunResp\x12 \n\x06status\x18\x01 \x01(\x0e\x32\x10.ui.UiModeStatus\x12\x0e\n\x06reason\x18\x02 \x01(\t\x12\x0c\n\x04runs\x18\x03 \x01(\t\"+\n\x0e\x46leetStatusCmd\x12\x19\n\x03\x63md\x18\x01 \x01(\x0e\x32\x0c.ui.FleetCmd\"\xbc\x01\n\x15\x46leetControllerStatus\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0f\n\x07\x61\x64\x64ress\x18\x02 \x01(\t\x12\x0c\n\x04tags\x18\x03 \x03(\t\x12\r\n\x05stale\x18\x04 \x01(\x08\x12\x0b\n\x03\x61ge\x18\x05 \x01(\x01\x12\r\n\x05\x65rror\x18\x06 \x01(\t\x12\r\n\x05state\x18\x07 \x01(\t\x12\x0c\n\x04mode\x18\x08 \x01(\t\x12\r\n\x05\x63Time\x18\t \x01(\t\x12\x0e\n\x06inputs\x18\n \x01(\t\x12\x0f\n\x07outputs\x18\x0b \x01(\t\"u\n\x0f\x46leetStatusResp\x12#\n\x06status\x18\x01 \x01(\x0e\x32\x13.ui.StatusCmdStatus\x12\r\n\x05\x66Time\x18\x02 \x01(\t\x12.\n\x0b\x63ontrollers\x18\x03 \x03(\x0b\x32\x19.ui.FleetControllerStatus\"|\n\x0c\x46leetModeCmd\x12\x19\n\x03\x63md\x18\x01 \x01(\x0e\x32\x0c.ui.FleetCmd\x12\x0f\n\x07reqMode\x18\x02 \x01(\t\x12\r\n\x05names\x18\x03 \x03(\t\x12\x0c\n\x04tags\x18\x04 \x03(\t\x12\x0b\n\x03\x61ll\x18\x05 \x01(\x08\x12\x16\n\x0eidempotencyKey\x18\x06 \x01(\t\"q\n\x0f\x46leetModeResult\x12\x0c\n\x04name\x18\x01 \x01(\t\x12 \n\x06status\x18\x02 \x01(\x0e\x32\x10.ui.UiModeStatus\x12\x0f\n\x07setMode\x18\x03 \x01(\t\x12\x0e\n\x06reason\x18\x04 \x01(\t\x12\r\n\x05\x65rror\x18\x05 \x01(\t\"\xa7\x01\n\rFleetModeResp\x12#\n\x06status\x18\x01 \x01(\x0e\x32\x13.ui.StatusCmdStatus\x12\x16\n\x0eidempotencyKey\x18\x02 \x01(\t\x12\x10\n\x08replayed\x18\x03 \x01(\x08\x12\x11\n\tsucceeded\x18\x04 \x01(\x05\x12\x0e\n\x06\x66\x61iled\x18\x05 \x01(\x05\x12$\n\x07results\x18\x06 \x03(\x0b\x32\x13.ui.FleetModeResult*<\n\x05UiCmd\x12\n\n\x06U_NONE\x10\x00\x12\x12\n\x0eU_CNTRL_STATUS\x10\x01\x12\x13\n\x0fU_UPCOMING_RUNS\x10\x02*[\n\x0fStatusCmdStatus\x12\x0b\n\x07US_NONE\x10\x00\x12\x0b\n\x07US_GOOD\x10\x01\x12\x15\n\x11US_UNEXPECTED_CMD\x10\x62\x12\x17\n\x13US_SERVER_EXCEPTION\x10\x63*j\n\rUiModeControl\x12\n\n\x06\x43_NONE\x10\x00\x12\x0e\n\nC_SET_MODE\x10\x01\x12\x13\n\x0f\x43_START_STATION\x10\x02\x12\x12\n\x0e\x43_STOP_STATION\x10\x03\x12\x14\n\x10\x43_QUEUE_STATIONS\x10\x04*z\n\x0cUiModeStatus\x12\x0b\n\x07\x43S_NONE\x10\x00\x12\x0b\n\x07\x43S_GOOD\x10\x01\x12\x0e\n\nCS_MODE_NA\x10\x02\x12\x10\n\x0c\x43S_MODE_FAIL\x10\x03\x12\x15\n\x11\x43S_UNEXPECTED_CMD\x10\x62\x12\x17\n\x13\x43S_SERVER_EXCEPTION\x10\x63*:\n\x08\x46leetCmd\x12\n\n\x06\x46_NONE\x10\x00\x12\x12\n\x0e\x46_FLEET_STATUS\x10\x01\x12\x0e\n\nF_SET_MODE\x10\x02\x32\x98\x01\n\nUiMessages\x12J\n\x13GetControllerStatus\x12\x17.ui.ControllerStatusCmd\x1a\x18.ui.ControllerStatusResp\"\x00\x12>\n\x0fGetUpcomingRuns\x12\x13.ui.UpcomingRunsCmd\x1a\x14.ui.UpcomingRunsResp\"\x00\x32\x89\x02\n\rUiControlMode\x12J\n\x11SetControllerMode\x12\x18.ui.SetControllerModeCmd\x1a\x19.ui.SetControllerModeResp\"\x00\x12\x38\n\x0cStartStation\x12\x13.ui.StartStationCmd\x1a\x11.ui.ManualRunResp\"\x00\x12\x36\n\x0bStopStation\x12\x12.ui.StopStationCmd\x1a\x11.ui.ManualRunResp\"\x00\x12:\n\rQueueStations\x12\x14.ui.QueueStationsCmd\x1a\x11.ui.ManualRunResp\"\x00\x32}\n\x07UiFleet\x12;\n\x0eGetFleetStatus\x12\x12.ui.FleetStatusCmd\x1a\x13.ui.FleetStatusResp\"\x00\x12\x35\n\x0cSetFleetMode\x12\x10.ui.FleetModeCmd\x1a\x11.ui.FleetModeResp\"\x00\x62\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'ui_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _UICMD._serialized_start=1673
+  _UICMD._serialized_end=1733
+  _STATUSCMDSTATUS._serialized_start=1735
+  _STATUSCMDSTATUS._serialized_end=1826
+  _UIMODECONTROL._serialized_start=1828
+  _UIMODECONTROL._serialized_end=1934
+  _UIMODESTATUS._serialized_start=1936
+  _UIMODESTATUS._serialized_end=2058
+  _FLEETCMD._serialized_start=2060
+  _FLEETCMD._serialized_end=2118
+  _CONTROLLERSTATUSCMD._serialized_start=16
+  _CONTROLLERSTATUSCMD._serialized_end=61
+  _CONTROLLERSTATUSRESP._serialized_start=64
+  _CONTROLLERSTATUSRESP._serialized_end=248
+  _UPCOMINGRUNSCMD._serialized_start=250
+  _UPCOMINGRUNSCMD._serialized_end=291
+  _UPCOMINGRUNSRESP._serialized_start=293
+  _UPCOMINGRUNSRESP._serialized_end=377
+  _SETCONTROLLERMODECMD._serialized_start=379
+  _SETCONTROLLERMODECMD._serialized_end=450
+  _SETCONTROLLERMODERESP._serialized_start=452
+  _SETCONTROLLERMODERESP._serialized_end=542
+  _STARTSTATIONCMD._serialized_start=544
+  _STARTSTATIONCMD._serialized_end=627
+  _STOPSTATIONCMD._serialized_start=629
+  _STOPSTATIONCMD._serialized_end=694
+  _STATIONRUN._serialized_start=696
+  _STATIONRUN._serialized_end=742
+  _QUEUESTATIONSCMD._serialized_start=744
+  _QUEUESTATIONSCMD._serialized_end=824
+  _MANUALRUNRESP._serialized_start=826
+  _MANUALRUNRESP._serialized_end=905
+  _FLEETSTATUSCMD._serialized_start=907
+  _FLEETSTATUSCMD._serialized_end=950
+  _FLEETCONTROLLERSTATUS._serialized_start=953
+  _FLEETCONTROLLERSTATUS._serialized_end=1141
+  _FLEETSTATUSRESP._serialized_start=1143
+  _FLEETSTATUSRESP._serialized_end=1260
+  _FLEETMODECMD._serialized_start=1262
+  _FLEETMODECMD._serialized_end=1386
+  _FLEETMODERESULT._serialized_start=1388
+  _FLEETMODERESULT._serialized_end=1501
+  _FLEETMODERESP._serialized_start=1504
+  _FLEETMODERESP._serialized_end=1671
+  _UIMESSAGES._serialized_start=2121
+  _UIMESSAGES._serialized_end=2273
+  _UICONTROLMODE._serialized_start=2276
+  _UICONTROLMODE._serialized_end=2541
+  _UIFLEET._serialized_start=2543
+  _UIFLEET._serialized_end=2668
+# @@protoc_insertion_point(module_scope)
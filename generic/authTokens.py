@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+
+from threading import Lock
+from typing import Tuple
+import argparse
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import time
+
+import grpc
+
+from generic.rateLimiter import *
+
+"""
+Bearer tokens for machine clients (e.g. fleet tools, the webUI) of the
+controller gRPC services. A token is signed (HMAC-SHA256) with a secret
+shared by the controllers and the clients that issue tokens:
+    base64url(subject|expiry) . base64url(signature)
+so checking a token is a hash, not a password KDF. Verified tokens are
+cached, so most calls are a dictionary lookup.
+Tokens are sent in the "authorization" metadata of each call, as "Bearer <token>".
+"""
+
+# Metadata key of the token.
+AUTH_METADATA = "authorization"
+
+
+class TokenError(Exception):
+    """
+    Error for a missing, invalid or expired token.
+    """
+    pass
+
+
+class TokenRateLimitedError(TokenError):
+    """
+    Error for a call rejected, as too many calls with the token.
+    """
+    pass
+
+
+def b64encode(data: bytes) -> str:
+    """
+    Encode as base64url, without padding.
+    """
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+def b64decode(data: str) -> bytes:
+    """
+    Decode base64url, without padding.
+    """
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+def loadSecret(sFile: str, create: bool = False) -> bytes:
+    """
+    Load the token signing secret from a file.
+    Parameters:
+        sFile : Secret file name.
+        create : Create a new secret if the file doesn't exist.
+    Returns:
+        Secret.
+    """
+
+    try:
+        with open(sFile) as f:
+            return f.read().strip().encode()
+    except FileNotFoundError:
+        if not create:
+            raise
+
+    # Only the owner can read the secret.
+    secret = secrets.token_hex(32)
+    fd = os.open(sFile, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(secret + "\n")
+
+    return secret.encode()
+
+def makeToken(secret: bytes, subject: str, lifetime: float) -> str:
+    """
+    Make a signed token.
+    Parameters:
+        secret : Token signing secret.
+        subject : Client the token is for, e.g. "fleet".
+        lifetime : Time the token is valid for (seconds).
+    Returns:
+        Token.
+    """
+
+    payload = b64encode(f'{subject}|{int(time.time() + lifetime)}'.encode())
+    signature = b64encode(hmac.new(secret, payload.encode(), hashlib.sha256).digest())
+
+    return f'{payload}.{signature}'
+
+
+class TokenVerifier():
+    """
+    Class to represent verification of tokens, with a cache of verified tokens
+    and a rate limit of calls for each token.
+    """
+
+    def __init__(self, secret: bytes, cacheSize: int, rate: float, burst: float) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            secret : Token signing secret.
+            cacheSize : Number of verified tokens cached, 0 for none.
+            rate : Calls per second allowed for each token.
+            burst : Calls allowed in a burst for each token.
+        """
+
+        self.secret = secret
+        self.cacheSize = cacheSize
+        self.limiter = RateLimiter(rate, burst)
+        self.lock = Lock()
+
+        # Verified tokens, as subject and expiry time, oldest first.
+        self.cache = {}
+
+    def check(self, token: str) -> Tuple[str, float]:
+        """
+        Check the signature of a token.
+        Parameters:
+            token : Token.
+        Returns:
+            Subject and expiry time of the token.
+        """
+
+        try:
+            payload, signature = token.split(".")
+            expected = hmac.new(self.secret, payload.encode(), hashlib.sha256).digest()
+            if not hmac.compare_digest(expected, b64decode(signature)):
+                raise TokenError("Invalid token signature.")
+            subject, expiry = b64decode(payload).decode().rsplit("|", 1)
+            return subject, float(expiry)
+        except TokenError:
+            raise
+        except Exception:
+            raise TokenError("Malformed token.")
+
+    def verify(self, token: str) -> str:
+        """
+        Verify a token, and the rate limit of calls with the token.
+        Parameters:
+            token : Token.
+        Returns:
+            Subject of the token.
+        """
+
+        if not token:
+            raise TokenError("Missing token.")
+
+        entry = self.cache.get(token)
+        if entry is None:
+            # Only verified tokens are cached, so invalid tokens can't fill the cache.
+            entry = self.check(token)
+            if self.cacheSize > 0:
+                with self.lock:
+                    if len(self.cache) >= self.cacheSize:
+                        del self.cache[next(iter(self.cache))]
+                    self.cache[token] = entry
+
+        if entry[1] <= time.time():
+            raise TokenError("Expired token.")
+        if not self.limiter.allow(token):
+            raise TokenRateLimitedError("Too many calls with token.")
+
+        return entry[0]
+
+
+def abortHandler(code: grpc.StatusCode, details: str) -> grpc.RpcMethodHandler:
+    """
+    Make a handler that rejects a call.
+    Parameters:
+        code : Status code of the rejection.
+        details : Details of the rejection.
+    Returns:
+        Method handler.
+    """
+
+    def abort(request, context):
+        context.abort(code, details)
+
+    return grpc.unary_unary_rpc_method_handler(abort)
+
+
+class TokenAuthInterceptor(grpc.ServerInterceptor):
+    """
+    Class to represent a gRPC server interceptor, that only lets calls with
+    a valid token through to the services.
+    """
+
+    def __init__(self, verifier: TokenVerifier, log) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            verifier : Token verifier.
+            log : Logging object.
+        """
+
+        self.verifier = verifier
+        self.log = log
+
+        # Handlers of rejected calls.
+        self.unauthenticated = abortHandler(grpc.StatusCode.UNAUTHENTICATED, "Invalid or missing token.")
+        self.rateLimited = abortHandler(grpc.StatusCode.RESOURCE_EXHAUSTED, "Too many calls with token.")
+
+    def intercept_service(self, continuation, handler_call_details):
+        """
+        Verify the token of a call before passing it to the service.
+        """
+
+        token = ""
+        for key, value in handler_call_details.invocation_metadata:
+            if key == AUTH_METADATA:
+                if value.startswith("Bearer "):
+                    token = value[7:]
+                break
+
+        try:
+            self.verifier.verify(token)
+        except TokenRateLimitedError:
+            return self.rateLimited
+        except TokenError as e:
+            self.log.debug(f'Rejected call to {handler_call_details.method} : {e}')
+            return self.unauthenticated
+
+        return continuation(handler_call_details)
+
+
+class TokenSource():
+    """
+    Class to represent the token of a client, made again before it expires.
+    """
+
+    def __init__(self, secret: bytes, subject: str, lifetime: float) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            secret : Token signing secret.
+            subject : Client the token is for.
+            lifetime : Time each token is valid for (seconds).
+        """
+
+        self.secret = secret
+        self.subject = subject
+        self.lifetime = lifetime
+        self.renewAt = 0.0
+        self.callMetadata = ()
+
+    def metadata(self) -> tuple:
+        """
+        Get call metadata with the token.
+        Returns:
+            Call metadata.
+        """
+
+        now = time.time()
+        if now >= self.renewAt:
+            token = makeToken(self.secret, self.subject, self.lifetime)
+            self.callMetadata = ((AUTH_METADATA, f'Bearer {token}'),)
+            # Renew with a tenth of the lifetime left, so calls don't use an expired token.
+            self.renewAt = now + self.lifetime * 0.9
+
+        return self.callMetadata
+
+
+if __name__ == "__main__":
+
+    # Make a token for a client, e.g. a fleet tool.
+    parser = argparse.ArgumentParser(description="Make a controller API token.")
+    parser.add_argument("-k", "--key", type=str, default="./config/auth.key", help="Token signing secret file.")
+    parser.add_argument("-s", "--subject", type=str, required=True, help="Client the token is for.")
+    parser.add_argument("-l", "--lifetime", type=float, default=86400.0, help="Time the token is valid for (seconds).")
+    args = parser.parse_args()
+
+    print(makeToken(loadSecret(args.key), args.subject, args.lifetime))
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+from concurrent import futures
+import contextvars
+import queue
+import time
+
+from generic.latencyHistogram import *
+
+"""
+Command queue of a controller. Other threads (e.g. UI servers) submit
+commands that change the controller state, and the controller thread runs
+them in batches, so only the controller thread changes its state and the
+control loop needs no locks. Each command has a future for its result.
+The queue is bounded, so a flood of commands can't use unbounded memory or
+delay the control loop; commands are rejected when it is full. Commands run
+in the context (contextvars) they were submitted in, so e.g. the request ID
+of the UI call is logged by the command on the controller thread.
+"""
+
+
+class CommandQueueFullError(Exception):
+    """
+    Error for a command rejected, as the command queue is full.
+    """
+    pass
+
+
+class CommandTimeoutError(Exception):
+    """
+    Error for a command not run in time, e.g. the controller is not running.
+    """
+    pass
+
+
+class CommandQueue():
+    """
+    Class to represent a bounded queue of commands, with latency statistics.
+    """
+
+    def __init__(self, size: int, batchSize: int) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            size : Commands allowed to wait.
+            batchSize : Maximum commands run in each batch.
+        """
+
+        self.queue = queue.Queue(maxsize=size)
+        self.batchSize = batchSize
+
+        # Time commands wait to be run, and time to run them.
+        self.waits = LatencyHistogram()
+        self.runs = LatencyHistogram()
+
+        # Commands submitted and rejected, and batches run.
+        self.submitted = 0
+        self.rejected = 0
+        self.batches = 0
+        self.largestBatch = 0
+
+    def submit(self, fn, *args) -> futures.Future:
+        """
+        Submit a command, to run in the current context.
+        Parameters:
+            fn : Function of the command.
+            args : Arguments of the function.
+        Returns:
+            Future of the result of the command.
+        """
+
+        future = futures.Future()
+        try:
+            self.queue.put_nowait((future, contextvars.copy_context(), fn, args, time.perf_counter()))
+        except queue.Full:
+            self.rejected += 1
+            raise CommandQueueFullError()
+        self.submitted += 1
+
+        return future
+
+    def drain(self) -> int:
+        """
+        Run a batch of the commands waiting.
+        Must only be called on the controller thread.
+        Returns:
+            Number of commands run.
+        """
+
+        numRun = 0
+        while numRun < self.batchSize:
+            try:
+                future, ctx, fn, args, tSubmit = self.queue.get_nowait()
+            except queue.Empty:
+                break
+
+            # Commands cancelled (e.g. timed out) are not run.
+            if not future.set_running_or_notify_cancel():
+                continue
+            tStart = time.perf_counter()
+            self.waits.record(tStart - tSubmit)
+            try:
+                future.set_result(ctx.run(fn, *args))
+            except Exception as e:
+                future.set_exception(e)
+            self.runs.record(time.perf_counter() - tStart)
+            numRun += 1
+
+        if numRun:
+            self.batches += 1
+            self.largestBatch = max(self.largestBatch, numRun)
+
+        return numRun
+
+    def pending(self) -> int:
+        """
+        Number of commands waiting.
+        """
+        return self.queue.qsize()
+
+    def stats(self) -> dict:
+        """
+        Statistics of the commands.
+        Returns:
+            Commands submitted, rejected, waiting, batches run, largest batch,
+            and summaries of wait and run times (ms).
+        """
+
+        return {
+            "submitted" : self.submitted,
+            "rejected" : self.rejected,
+            "pending" : self.pending(),
+            "batches" : self.batches,
+            "largestBatch" : self.largestBatch,
+            "wait" : self.waits.summary(),
+            "run" : self.runs.summary()
+        }
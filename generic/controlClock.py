@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+
+from datetime import datetime
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
+import logging
+import time
+
+from generic.latencyHistogram import *
+
+"""
+Timing of a controller. Periodic work runs at a fixed rate on monotonic
+deadlines, so the period doesn't drift by the time the work takes, and
+isn't upset by the wall clock changing. The wall clock is only used to
+find where the controller is in its (wall clock) schedule, and is read
+alongside the monotonic clock so that steps of the wall clock (e.g. NTP
+corrections) are detected. Time sources can be replaced, e.g. to inject
+clock jumps when testing.
+"""
+
+
+class FixedRateTimer():
+    """
+    Class to represent a fixed rate periodic timer, on monotonic deadlines.
+    Each deadline is a period after the one before, not after the cycle ran.
+    Deadlines missed entirely (e.g. a cycle took longer than the period) are
+    skipped rather than run back to back, and counted.
+    """
+
+    def __init__(self, period: float, now: float) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            period : Period of the timer (seconds).
+            now : Current (monotonic) time (seconds), the first deadline.
+        """
+
+        self.period = period
+        self.deadline = now
+        self.lastCycle = None
+
+        # Lateness of each cycle after its deadline, and jitter of the
+        # time between cycles from the period.
+        self.lateness = LatencyHistogram()
+        self.jitter = LatencyHistogram()
+
+        # Cycles run, and deadlines skipped.
+        self.cycles = 0
+        self.missed = 0
+
+    def restart(self, now: float) -> None:
+        """
+        Restart the timer, keeping its statistics.
+        Parameters:
+            now : Current (monotonic) time (seconds), the first deadline.
+        """
+
+        self.deadline = now
+        self.lastCycle = None
+
+    def due(self, now: float) -> bool:
+        """
+        Check if a cycle is due, and if so move on to the next deadline.
+        Parameters:
+            now : Current (monotonic) time (seconds).
+        Returns:
+            True if a cycle is due.
+        """
+
+        if now < self.deadline:
+            return False
+
+        late = now - self.deadline
+        self.lateness.record(late)
+        if self.lastCycle is not None:
+            self.jitter.record(abs(now - self.lastCycle - self.period))
+        self.lastCycle = now
+        self.cycles += 1
+
+        missed = int(late // self.period)
+        self.missed += missed
+        self.deadline += (missed + 1) * self.period
+
+        return True
+
+    def stats(self) -> dict:
+        """
+        Statistics of the timer.
+        Returns:
+            Cycles run, deadlines missed, and summaries of the lateness and jitter (ms).
+        """
+
+        return {
+            "cycles" : self.cycles,
+            "missed" : self.missed,
+            "lateness" : self.lateness.summary(),
+            "jitter" : self.jitter.summary()
+        }
+
+
+class WallClock():
+    """
+    Class to represent the wall clock of a controller, in a time zone.
+    Each read is of both the monotonic and wall clocks, and a difference in
+    the time passed on each of more than the jump threshold is a clock jump.
+    """
+
+    def __init__(self, log: logging, jumpThreshold: float, timeZone: str = "", wall=time.time, monotonic=time.monotonic) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            log : Mainline logging object.
+            jumpThreshold : Difference of the clocks that is a jump (seconds).
+            timeZone : Time zone of the schedule (IANA name), empty for the system time zone.
+            wall : Wall clock time source (epoch seconds).
+            monotonic : Monotonic time source (seconds).
+        """
+
+        self.log = log
+        self.jumpThreshold = jumpThreshold
+        self.wall = wall
+        self.monotonic = monotonic
+
+        # Time zone, None for the system time zone.
+        self.zone = None
+        if timeZone:
+            try:
+                self.zone = ZoneInfo(timeZone)
+            except Exception:
+                self.log.error(f'Unknown time zone {timeZone}, using system time zone.')
+
+        # Clocks at the last read, and jumps of the wall clock seen.
+        self.lastWall = None
+        self.lastMono = None
+        self.forwardJumps = 0
+        self.backwardJumps = 0
+
+    def read(self) -> Tuple[float, float]:
+        """
+        Read the monotonic and wall clocks, checking for wall clock jumps.
+        Returns:
+            Monotonic time (seconds), and wall clock time (epoch seconds).
+        """
+
+        mono = self.monotonic()
+        wall = self.wall()
+
+        if self.lastWall is not None:
+            jump = (wall - self.lastWall) - (mono - self.lastMono)
+            if jump > self.jumpThreshold:
+                self.forwardJumps += 1
+                self.log.warning(f'Wall clock jumped forward {jump:.1f} s.')
+            elif jump < -self.jumpThreshold:
+                self.backwardJumps += 1
+                self.log.warning(f'Wall clock jumped back {-jump:.1f} s.')
+        self.lastWall = wall
+        self.lastMono = mono
+
+        return mono, wall
+
+    def localTime(self, wall: Optional[float] = None) -> datetime:
+        """
+        Get the local time in the time zone.
+        Parameters:
+            wall : Wall clock time (epoch seconds), None for now.
+        Returns:
+            Local time, naive for the system time zone.
+        """
+
+        return datetime.fromtimestamp(self.wall() if wall is None else wall, self.zone)
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-from enum import Enum
+from enum import Enum, IntEnum
 
 """"
 Generic constants defined here.
@@ -8,6 +8,10 @@ Application specific constants defined in specific application scope.
 """
 
 
+# Time to wait for the controller thread to run a command (seconds).
+COMMAND_TIMEOUT = 5.0
+
+
 class ControllerState(Enum):
     """
     Controller states.
@@ -36,6 +40,8 @@ class ControllerModeReason(Enum):
     NONE = 0
     NOT_ACTIVE = 1
     NO_CHANGE = 2
+    TIMEOUT = 3
+    BUSY = 4
 
 
 class ControllerScope(Enum):
@@ -54,17 +60,19 @@ class DigtialIoType(Enum):
     DIGITAL_OUTPUT = 1
 
 
-class ActiveLevel(Enum):
+class ActiveLevel(IntEnum):
     """
     Digital IO active level
+    Integer valued so that IO points can hold it as a plain int.
     """
     ACTIVE_LOW = 0
     ACTIVE_HIGH = 1
 
 
-class Level(Enum):
+class Level(IntEnum):
     """
     Digital IO level
+    Integer valued so that IO points can hold it as a plain int.
     """
     LOW = 0
     HIGH = 1
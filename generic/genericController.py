@@ -1,12 +1,48 @@
 #!/usr/bin/env python3
 
 from abc import ABC, abstractmethod
+from concurrent import futures
 from typing import Tuple
 import logging
+import os
+import select
+import threading
 
 import sprinklers.ui_pb2 as ui_pb2
 
+from generic.commandQueue import *
 from generic.genericConstants import *
+from generic.genericPolarity import *
+
+
+class ControllerSnapshot():
+    """
+    Class to represent a snapshot of the controller state, published by the
+    controller thread. Snapshots are never changed once published, so other
+    threads (e.g. UI servers) can read them without locks, and always see
+    state, mode, inputs and outputs from the same control cycle.
+    """
+
+    __slots__ = ("seq", "state", "mode", "inputMask", "outputMask", "program")
+
+    def __init__(self, seq: int, state: ControllerState, mode: ControllerMode, inputMask: int, outputMask: int, program: dict) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            seq : Sequence number of the snapshot, increases with each change.
+            state : Controller state.
+            mode : Controller mode.
+            inputMask : Active inputs, bit n for input n.
+            outputMask : Active outputs, bit n for output n.
+            program : Controller program (replaced, never changed, when the program changes).
+        """
+
+        self.seq = seq
+        self.state = state
+        self.mode = mode
+        self.inputMask = inputMask
+        self.outputMask = outputMask
+        self.program = program
 
 
 class GenericController():   
@@ -14,12 +50,14 @@ class GenericController():
     Class to represent a generic controller.
     """
 
-    def __init__(self, name: str, log: logging) -> None:
+    def __init__(self, name: str, log: logging, queueSize: int = 64, batchSize: int = 16) -> None:
         """
         Initialisation method.
         Parameters:
             name : Name for this instance of generic controller.
             log : Shared logging object.
+            queueSize : Commands allowed to wait for the controller thread.
+            batchSize : Maximum commands run each control cycle.
         """
 
         self._ctrlName = name
@@ -41,6 +79,28 @@ class GenericController():
         # Initialise controller output states.
         self.digitalOutputs = []
 
+        # Latest published snapshot of the controller state, for other threads.
+        self.snapshot = None
+
+        # Commands from other threads, run on the controller thread, so that
+        # only the controller thread changes the controller state.
+        self.commands = CommandQueue(queueSize, batchSize)
+
+        # Initialise banks of IO, built once the IO has been configured.
+        self.inputBank = None
+        self.outputBank = None
+
+        # Initialise hardware backends for the banks of IO.
+        self.inputBackend = None
+        self.outputBackend = None
+
+        # Poller to wait on for input edges (or a wakeup), rather than
+        # polling the inputs. Pipe is used to wake up the controller.
+        self.poller = select.poll()
+        self._wakeRead, self._wakeWrite = os.pipe()
+        os.set_blocking(self._wakeRead, False)
+        self.poller.register(self._wakeRead, select.POLLIN)
+
     @property
     def ctrlName(self) -> None:
         """
@@ -143,6 +203,157 @@ class GenericController():
 
         return digPacked
 
+    def buildIoBanks(self) -> None:
+        """
+        Build the input and output banks from the configured digital IO.
+        Must be called once the digital IO has been configured.
+        """
+
+        self.inputBank = PolarityBank(self.digitalInputs)
+        self.outputBank = PolarityBank(self.digitalOutputs)
+
+        self.log.debug(f'Built IO banks, inputs : {len(self.digitalInputs)}; outputs : {len(self.digitalOutputs)}')
+
+    def readInputs(self) -> int:
+        """
+        Read all the digital inputs from hardware, once for the whole bank.
+        Returns:
+            Active conditions of the inputs, bit n for input n.
+        """
+
+        return self.inputBank.applyLevels(self.inputBackend.readAll())
+
+    def writeOutputs(self, activeMask: int) -> None:
+        """
+        Write all the digital outputs to hardware, once for the whole bank.
+        Parameters:
+            activeMask : Active conditions of the outputs, bit n for output n.
+        """
+
+        self.outputBackend.writeMask(self.outputBank.applyActive(activeMask))
+
+    def registerInputEdges(self) -> None:
+        """
+        Register the input backend edge file descriptors with the poller,
+        so that the controller is woken up by input edges.
+        Must be called once the input backend has been created.
+        """
+
+        for fd, events in self.inputBackend.edgeFds():
+            self.poller.register(fd, events)
+
+    def wakeup(self) -> None:
+        """
+        Wake up the controller if waiting, e.g. when there is work to do.
+        """
+
+        os.write(self._wakeWrite, b"\0")
+
+    def waitForEdge(self, timeout: float) -> bool:
+        """
+        Wait for an input edge or wakeup, or until the timeout.
+        Uses no CPU while waiting.
+        Parameters:
+            timeout : Maximum time to wait (seconds).
+        Returns:
+            True if woken by an input edge or wakeup, False if timed out.
+        """
+
+        events = self.poller.poll(max(0.0, timeout) * 1000.0)
+        if not events:
+            return False
+
+        # Acknowledge edges and wakeups so that they don't fire again.
+        edge = False
+        for fd, _ in events:
+            if fd == self._wakeRead:
+                try:
+                    while os.read(self._wakeRead, 4096):
+                        pass
+                except BlockingIOError:
+                    pass
+            else:
+                edge = True
+        if edge:
+            self.inputBackend.clearEdges()
+
+        return True
+
+    def publishState(self) -> ControllerSnapshot:
+        """
+        Publish a snapshot of the controller state, if it has changed.
+        Must only be called on the controller thread, once the IO banks have been built.
+        Returns:
+            Latest snapshot.
+        """
+
+        inputMask = self.inputBank.actives
+        outputMask = self.outputBank.actives
+        snap = self.snapshot
+        if (snap is not None) and (snap.state == self.state) and (snap.mode == self.mode) and (snap.inputMask == inputMask) \
+                and (snap.outputMask == outputMask) and (snap.program is self.program):
+            return snap
+
+        # Readers get the old or the new snapshot, swapping the reference is atomic.
+        seq = 0 if snap is None else snap.seq + 1
+        self.snapshot = ControllerSnapshot(seq, self.state, self.mode, inputMask, outputMask, self.program)
+
+        return self.snapshot
+
+    def submit(self, fn, *args) -> futures.Future:
+        """
+        Submit a command to run on the controller thread.
+        The controller is woken up to run it.
+        Parameters:
+            fn : Function of the command.
+            args : Arguments of the function.
+        Returns:
+            Future of the result of the command.
+        """
+
+        future = self.commands.submit(fn, *args)
+        self.wakeup()
+
+        return future
+
+    def call(self, fn, *args, timeout: float = COMMAND_TIMEOUT):
+        """
+        Run a command on the controller thread, and wait for its result.
+        Run straight away if called on the controller thread.
+        Parameters:
+            fn : Function of the command.
+            args : Arguments of the function.
+            timeout : Time to wait for the command to be run (seconds).
+        Returns:
+            Result of the command.
+        """
+
+        if threading.current_thread() is self:
+            return fn(*args)
+
+        future = self.submit(fn, *args)
+        try:
+            return future.result(timeout)
+        except futures.TimeoutError:
+            # Not run if not started yet, otherwise wait for it.
+            if future.cancel():
+                raise CommandTimeoutError()
+            return future.result()
+
+    def runCommands(self) -> int:
+        """
+        Run a batch of the commands waiting, on the controller thread.
+        If more are waiting, the controller is woken up to run them next.
+        Returns:
+            Number of commands run.
+        """
+
+        numRun = self.commands.drain()
+        if self.commands.pending():
+            self.wakeup()
+
+        return numRun
+
     def stateMachine(self) -> None:
         """
         State machine method.
@@ -186,6 +397,26 @@ class GenericController():
     def setMode(self, reqMode: ControllerMode) -> Tuple[Enum, ControllerModeReason]:
         """
         SeoFilet the controller mode as required.
+        The mode is set on the controller thread, waiting for it to be set.
+        Parameters:
+            reqMode : Required controller mode (to set to).
+        Returns:
+            setStatus : Enum representing status of setting mode.
+            setReason : Enum representing reason (used if setStatus not CD_GOOD)
+        """
+
+        try:
+            return self.call(self.applyMode, reqMode)
+        except CommandQueueFullError:
+            self.log.warning(f'Failed to set mode as too many commands waiting.')
+            return ui_pb2.UiModeStatus.CS_MODE_FAIL, ControllerModeReason.BUSY
+        except CommandTimeoutError:
+            self.log.warning(f'Failed to set mode as controller not responding.')
+            return ui_pb2.UiModeStatus.CS_MODE_FAIL, ControllerModeReason.TIMEOUT
+
+    def applyMode(self, reqMode: ControllerMode) -> Tuple[Enum, ControllerModeReason]:
+        """
+        Set the controller mode, on the controller thread.
         Parameters:
             reqMode : Required controller mode (to set to).
         Returns:
@@ -1,36 +1,39 @@
 #!/usr/bin/env python3
 
 from abc import ABC, abstractmethod
-import logging
 
 from generic.genericConstants import *
+from generic.genericPolarity import *
 
 
-class GenericDigitalOutput():   
+class GenericDigitalOutput():
     """
     Class to represent a generic digital output.
+    Class is slotted to keep the size of each IO point small, as a controller
+    may have a large number of them. Level and active condition are held as
+    a plain int and bool.
     """
 
-    def __init__(self, log: logging, activeLevel: ActiveLevel) -> None:
+    __slots__ = ('polarity', '_level', '_active')
+
+    # IO type is the same for all outputs so is held by the class.
+    ioType = DigtialIoType.DIGITAL_OUTPUT
+
+    def __init__(self, activeLevel: ActiveLevel) -> None:
         """
         Initialisation method.
         Parameters:
-            log : Shared logging object.
             activeLevel : Active level, high or low.
         """
 
-        self.log = log
-
         # Initialise IO.
-        self.ioType = DigtialIoType.DIGITAL_OUTPUT
-        self.activeLevel = activeLevel
+        # Active level is held as its polarity bit.
+        self.polarity = polarityOf(activeLevel)
         self._level = None
         self._active = False
 
-        self.log.debug(f'Instantiated digital output : active level : {self.activeLevel}')
-
     @property
-    def active(self) -> None:
+    def active(self) -> bool:
         """
         Getter property for output state (active or not).
         This whether or not the output is in the active condition.
@@ -39,10 +42,19 @@ class GenericDigitalOutput():
         return self._active
 
     @property
-    def level(self) -> None:
+    def activeLevel(self) -> ActiveLevel:
+        """
+        Getter property for output active level (high or low).
+        """
+
+        return ACTIVE_LEVELS[self.polarity]
+
+    @property
+    def level(self) -> int:
         """
         Getter property for output level (high or low).
         This is the raw value of the output written, not whether the signal is active or not.
+        Level is None until the output has been written.
         """
         return self._level
 
@@ -57,18 +69,8 @@ class GenericDigitalOutput():
         """
         self._level = l
 
-        # Set active condition accordingly.
-        # If level is the same as the active state then output is active.
-        if l == Level.LOW:
-            if self.activeLevel == ActiveLevel.ACTIVE_LOW:
-                self._active = True
-            else:
-                self._active = False
-        else:
-            if self.activeLevel == ActiveLevel.ACTIVE_LOW:
-                self._active = False
-            else:
-                self._active = True
+        # Set active condition accordingly, from the shared polarity table.
+        self._active = LEVEL_TO_ACTIVE[self.polarity][l]
 
     @abstractmethod
     def writeDigitalOuputLevel(self) -> None:
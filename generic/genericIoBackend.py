@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+from abc import ABC, abstractmethod
+from typing import List, Tuple
+import logging
+
+
+class GenericIoBackend():
+    """
+    Class to represent a generic hardware backend for a bank of digital IO.
+    Backends read and write the whole bank at once, as a level mask where
+    point n in the bank is bit n in the mask.
+    Backends that can notify of input edges provide file descriptors that
+    become ready (for poll) on an edge, so edges wake up the controller.
+    """
+
+    def __init__(self, log: logging, numPoints: int) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            log : Shared logging object.
+            numPoints : Number of IO points in the bank.
+        """
+
+        self.log = log
+        self.numPoints = numPoints
+
+        # Mask of all points in the bank.
+        self.allMask = (1 << numPoints) - 1
+
+    @abstractmethod
+    def readAll(self) -> int:
+        """
+        Abstract method to read the levels of all points in the bank.
+        This method must be overriden by specific backend class.
+        Returns:
+            Levels of the bank, bit n for point n.
+        """
+
+        pass
+
+    @abstractmethod
+    def writeMask(self, levelMask: int) -> None:
+        """
+        Abstract method to write the levels of all points in the bank.
+        This method must be overriden by specific backend class.
+        Parameters:
+            levelMask : Levels to write, bit n for point n.
+        """
+
+        pass
+
+    def edgeFds(self) -> List[Tuple[int, int]]:
+        """
+        Get file descriptors to poll for input edges.
+        Returns:
+            List of (file descriptor, poll event mask), empty if not supported.
+        """
+
+        return []
+
+    def clearEdges(self) -> None:
+        """
+        Acknowledge input edges, once woken by an edge file descriptor.
+        """
+
+        pass
+
+    def close(self) -> None:
+        """
+        Release any hardware resources held by the backend.
+        """
+
+        pass
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+
+from typing import List
+
+from generic.genericConstants import *
+
+"""
+Polarity of digital IO shared by inputs and outputs.
+An IO point has a polarity bit, 0 for active high and 1 for active low, so that:
+    active = level XOR polarity
+    level = active XOR polarity
+Tables below are indexed by [polarity][level] and [polarity][active], and a
+PolarityBank applies the same mapping to a whole bank of IO with one XOR.
+"""
+
+# Level for a bit value.
+LEVELS = (Level.LOW, Level.HIGH)
+
+# Active level for a polarity bit.
+ACTIVE_LEVELS = (ActiveLevel.ACTIVE_HIGH, ActiveLevel.ACTIVE_LOW)
+
+# Active condition for a level, indexed by [polarity][level].
+LEVEL_TO_ACTIVE = (
+    (False, True),
+    (True, False)
+)
+
+# Level for an active condition, indexed by [polarity][active].
+ACTIVE_TO_LEVEL = (
+    (Level.LOW, Level.HIGH),
+    (Level.HIGH, Level.LOW)
+)
+
+
+def polarityOf(activeLevel: ActiveLevel) -> int:
+    """
+    Get the polarity bit for an active level.
+    Parameters:
+        activeLevel : Active level, high or low.
+    Returns:
+        Polarity bit, 1 if active low, else 0.
+    """
+
+    return 1 if activeLevel == ActiveLevel.ACTIVE_LOW else 0
+
+
+class PolarityBank():
+    """
+    Class to represent a bank of digital IO points of the same type.
+    Point n in the bank is bit n in the bank level and active masks.
+    The polarity of all points is precomputed into a single mask, so mapping
+    levels to active conditions (and back) is one operation for the bank.
+    Bank levels are those last applied through the bank.
+    """
+
+    def __init__(self, points: List) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            points : Digital IO points (inputs or outputs) in the bank.
+        """
+
+        self.points = points
+
+        # Mask of all points in the bank.
+        self.allMask = (1 << len(points)) - 1
+
+        # Precompute polarity mask, and current levels of the points.
+        # Points that have not been read or written yet are taken as LOW.
+        self.polarityMask = 0
+        self.levels = 0
+        for n, p in enumerate(points):
+            self.polarityMask |= p.polarity << n
+            if p.level:
+                self.levels |= 1 << n
+
+    @property
+    def actives(self) -> int:
+        """
+        Getter property for the active mask of the bank.
+        """
+
+        return self.levels ^ self.polarityMask
+
+    def activeMask(self, levelMask: int) -> int:
+        """
+        Map a level mask to an active mask for the bank.
+        Parameters:
+            levelMask : Levels of the bank, bit n for point n.
+        Returns:
+            Active conditions of the bank, bit n for point n.
+        """
+
+        return (levelMask ^ self.polarityMask) & self.allMask
+
+    def levelMask(self, activeMask: int) -> int:
+        """
+        Map an active mask to a level mask for the bank.
+        Parameters:
+            activeMask : Active conditions of the bank, bit n for point n.
+        Returns:
+            Levels of the bank, bit n for point n.
+        """
+
+        return (activeMask ^ self.polarityMask) & self.allMask
+
+    def applyLevels(self, levelMask: int) -> int:
+        """
+        Set the levels of all points in the bank.
+        Active conditions of the bank are mapped with the precomputed mask,
+        and each point sets its own active condition by table lookup.
+        Parameters:
+            levelMask : Levels to set, bit n for point n.
+        Returns:
+            Active conditions of the bank, bit n for point n.
+        """
+
+        levelMask &= self.allMask
+        self.levels = levelMask
+
+        for n, p in enumerate(self.points):
+            p.level = LEVELS[(levelMask >> n) & 1]
+
+        return levelMask ^ self.polarityMask
+
+    def applyActive(self, activeMask: int) -> int:
+        """
+        Set the active conditions of all points in the bank.
+        This is the reverse mapping, used when writing outputs.
+        Parameters:
+            activeMask : Active conditions to set, bit n for point n.
+        Returns:
+            Levels of the bank, bit n for point n.
+        """
+
+        levelMask = self.levelMask(activeMask)
+        self.applyLevels(levelMask)
+
+        return levelMask
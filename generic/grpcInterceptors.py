@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+
+from threading import Lock
+from typing import Dict, List
+import contextvars
+import logging
+import time
+import uuid
+
+import grpc
+
+from generic.latencyHistogram import *
+
+"""
+gRPC server interceptors, for the UI servers of controllers.
+Interceptors wrap the behaviour of unary calls, so they run on the server
+thread pool with the call:
+    RequestIdInterceptor : Request ID of each call, from the client or new,
+                           added to log records while the call runs.
+    MetricsInterceptor : Latency histogram of each method.
+    ConcurrencyLimitInterceptor : Maximum calls in flight of each method,
+                                  further calls are rejected.
+"""
+
+# Metadata key of the request ID.
+REQUEST_ID_METADATA = "x-request-id"
+
+# Request ID of the call being run by the thread.
+requestIdVar = contextvars.ContextVar("requestId", default="-")
+
+
+def wrapUnary(handler: grpc.RpcMethodHandler, wrapper) -> grpc.RpcMethodHandler:
+    """
+    Wrap the behaviour of a unary call handler.
+    Parameters:
+        handler : Method handler, None if no method.
+        wrapper : Function of the behaviour, request and context, that calls the behaviour.
+    Returns:
+        Method handler, unchanged if not unary.
+    """
+
+    if (handler is None) or (handler.unary_unary is None):
+        return handler
+
+    behaviour = handler.unary_unary
+
+    def wrapped(request, context):
+        return wrapper(behaviour, request, context)
+
+    return grpc.unary_unary_rpc_method_handler(wrapped, request_deserializer=handler.request_deserializer,
+                                               response_serializer=handler.response_serializer)
+
+def methodName(fullMethod: str) -> str:
+    """
+    Name of a method, without the service, e.g. "GetControllerStatus".
+    """
+    return fullMethod.rsplit("/", 1)[-1]
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Logging filter that adds the request ID of the call (or "-") to log records.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        Add the request ID to a log record.
+        """
+        record.requestId = requestIdVar.get()
+        return True
+
+
+class RequestIdInterceptor(grpc.ServerInterceptor):
+    """
+    Class to represent an interceptor that gives each call a request ID,
+    from the client metadata if it has one, else a new ID. The ID is in log
+    records while the call runs, and is returned to the client.
+    """
+
+    def intercept_service(self, continuation, handler_call_details):
+        """
+        Wrap the call with its request ID.
+        """
+
+        requestId = ""
+        for key, value in handler_call_details.invocation_metadata:
+            if key == REQUEST_ID_METADATA:
+                requestId = value[:64]
+                break
+        if not requestId:
+            requestId = uuid.uuid4().hex[:16]
+
+        def withRequestId(behaviour, request, context):
+            token = requestIdVar.set(requestId)
+            try:
+                context.set_trailing_metadata(((REQUEST_ID_METADATA, requestId),))
+                return behaviour(request, context)
+            finally:
+                requestIdVar.reset(token)
+
+        return wrapUnary(continuation(handler_call_details), withRequestId)
+
+
+class MetricsInterceptor(grpc.ServerInterceptor):
+    """
+    Class to represent an interceptor that records a latency histogram of
+    each method, and logs calls slower than a limit.
+    """
+
+    def __init__(self, log, slowCall: float) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            log : Logging object.
+            slowCall : Calls slower than this are logged (seconds), 0 for none.
+        """
+
+        self.log = log
+        self.slowCall = slowCall
+        self.lock = Lock()
+
+        # Latency histograms, by method name.
+        self.histograms = {}
+
+    def histogram(self, method: str) -> LatencyHistogram:
+        """
+        Get the histogram of a method, creating it if it doesn't exist.
+        """
+
+        hist = self.histograms.get(method)
+        if hist is None:
+            with self.lock:
+                hist = self.histograms.setdefault(method, LatencyHistogram())
+
+        return hist
+
+    def intercept_service(self, continuation, handler_call_details):
+        """
+        Wrap the call to record its latency.
+        """
+
+        method = methodName(handler_call_details.method)
+        hist = self.histogram(method)
+
+        def timed(behaviour, request, context):
+            tStart = time.perf_counter()
+            try:
+                return behaviour(request, context)
+            finally:
+                latency = time.perf_counter() - tStart
+                hist.record(latency)
+                if self.slowCall and (latency > self.slowCall):
+                    self.log.warning(f'Slow call to {method} : {latency * 1000.0:.1f} ms')
+
+        return wrapUnary(continuation(handler_call_details), timed)
+
+    def summary(self) -> Dict[str, dict]:
+        """
+        Summary of the latency histograms.
+        Returns:
+            Histogram summary by method name.
+        """
+
+        return {method : hist.summary() for method, hist in list(self.histograms.items())}
+
+
+class ConcurrencyLimitInterceptor(grpc.ServerInterceptor):
+    """
+    Class to represent an interceptor that limits the calls of each method in
+    flight, so a flood of one method (e.g. status) can't take all the server
+    threads from another (e.g. setting the mode). Calls over the limit are
+    rejected (resource exhausted) rather than waiting.
+    """
+
+    def __init__(self, limits: Dict[str, int], default: int) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            limits : Maximum calls in flight, by method name.
+            default : Maximum calls in flight of other methods, 0 for no limit.
+        """
+
+        self.limits = limits
+        self.default = default
+        self.lock = Lock()
+
+        # Calls in flight, and calls rejected, by method name.
+        self.inFlight = {}
+        self.rejected = {}
+
+    def intercept_service(self, continuation, handler_call_details):
+        """
+        Wrap the call to count it in flight, or reject it if over the limit.
+        """
+
+        method = methodName(handler_call_details.method)
+        limit = self.limits.get(method, self.default)
+        if limit <= 0:
+            return continuation(handler_call_details)
+
+        def limited(behaviour, request, context):
+            with self.lock:
+                if self.inFlight.get(method, 0) >= limit:
+                    self.rejected[method] = self.rejected.get(method, 0) + 1
+                    admitted = False
+                else:
+                    self.inFlight[method] = self.inFlight.get(method, 0) + 1
+                    admitted = True
+            if not admitted:
+                context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, f'Too many calls in flight : {method}')
+            try:
+                return behaviour(request, context)
+            finally:
+                with self.lock:
+                    self.inFlight[method] -= 1
+
+        return wrapUnary(continuation(handler_call_details), limited)
+
+
+def makeInterceptors(names: List[str], log, limits: Dict[str, int], defaultLimit: int, slowCall: float) -> List[grpc.ServerInterceptor]:
+    """
+    Make the interceptors of a server, in order.
+    Parameters:
+        names : Interceptor names, "requestId", "metrics" and "limits".
+        log : Logging object.
+        limits : Maximum calls in flight, by method name.
+        defaultLimit : Maximum calls in flight of other methods, 0 for no limit.
+        slowCall : Calls slower than this are logged (seconds), 0 for none.
+    Returns:
+        Interceptors.
+    """
+
+    interceptors = []
+    for name in names:
+        if name == "requestId":
+            interceptors.append(RequestIdInterceptor())
+        elif name == "metrics":
+            interceptors.append(MetricsInterceptor(log, slowCall))
+        elif name == "limits":
+            interceptors.append(ConcurrencyLimitInterceptor(limits, defaultLimit))
+        else:
+            log.error(f'Unknown gRPC interceptor : {name}')
+
+    return interceptors
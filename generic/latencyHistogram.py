@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+from bisect import bisect_left
+from threading import Lock
+
+
+class LatencyHistogram():
+    """
+    Class to represent a histogram of call latencies, with buckets
+    from 50 us doubling up to about 13 s.
+    """
+
+    # Upper bounds of the buckets (seconds), the last bucket has no bound.
+    BOUNDS = [50e-6 * (2 ** i) for i in range(19)]
+
+    def __init__(self) -> None:
+        """
+        Initialisation method.
+        """
+
+        self.lock = Lock()
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def record(self, latency: float) -> None:
+        """
+        Record the latency of a call.
+        Parameters:
+            latency : Latency of the call (seconds).
+        """
+
+        idx = bisect_left(self.BOUNDS, latency)
+        with self.lock:
+            self.counts[idx] += 1
+            self.count += 1
+            self.total += latency
+            if latency > self.maximum:
+                self.maximum = latency
+
+    def percentile(self, pc: float) -> float:
+        """
+        Latency percentile, as the upper bound of its bucket (or the maximum, if less).
+        Parameters:
+            pc : Percentile, e.g. 99.0.
+        Returns:
+            Latency (seconds), 0 if no calls.
+        """
+
+        if self.count == 0:
+            return 0.0
+
+        rank = self.count * pc / 100.0
+        seen = 0
+        for idx, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(self.BOUNDS[idx], self.maximum) if idx < len(self.BOUNDS) else self.maximum
+
+        return self.maximum
+
+    def summary(self) -> dict:
+        """
+        Summary of the histogram.
+        Returns:
+            Number of calls, and mean, p50, p99 and maximum latency (ms).
+        """
+
+        return {
+            "count" : self.count,
+            "mean" : (self.total / self.count * 1000.0) if self.count else 0.0,
+            "p50" : self.percentile(50.0) * 1000.0,
+            "p99" : self.percentile(99.0) * 1000.0,
+            "max" : self.maximum * 1000.0
+        }
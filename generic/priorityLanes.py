@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+
+from collections import deque
+from concurrent import futures
+from threading import Condition, Thread
+from typing import Dict, List
+import threading
+
+import grpc
+
+from generic.authTokens import abortHandler
+from generic.grpcInterceptors import methodName
+
+"""
+Priority lanes of a gRPC server, so control calls (e.g. setting the mode OFF)
+don't queue behind a burst of status calls.
+Each method is in a lane. Calls wait in the queue of their lane, and threads
+take calls from the highest priority lane first. Lanes can have reserved
+threads, that only run calls of the lane, so a lane always has capacity.
+Calls of a lane are rejected (resource exhausted) if its queue is full.
+The lane of a call is found by the LaneInterceptor, that runs on the server
+thread just before the call is submitted to the executor, so the lane is
+passed to the executor by a thread local hint.
+"""
+
+
+class Lane():
+    """
+    Class to represent a lane of calls.
+    """
+
+    def __init__(self, name: str, priority: int, reserved: int, maxQueue: int, methods: List[str]) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            name : Lane name.
+            priority : Priority of the lane, lowest first.
+            reserved : Threads that only run calls of the lane.
+            maxQueue : Calls allowed to wait, further calls are rejected, 0 for no limit.
+            methods : Method names of the lane.
+        """
+
+        self.name = name
+        self.priority = priority
+        self.reserved = reserved
+        self.maxQueue = maxQueue
+        self.methods = methods
+
+        # Calls waiting, as future, function and arguments.
+        self.queue = deque()
+
+        # Calls submitted, and calls rejected as the queue was full.
+        self.submitted = 0
+        self.shed = 0
+
+
+class PriorityLaneExecutor(futures.Executor):
+    """
+    Class to represent an executor of calls with priority lanes.
+    """
+
+    def __init__(self, workers: int, lanes: Dict[str, dict], default: str) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            workers : Number of threads, including reserved threads.
+            lanes : Lanes by name, each with Priority, Reserved, MaxQueue and Methods.
+            default : Lane of methods not in any lane.
+        """
+
+        self.cond = Condition()
+        self.stopping = False
+        self.hint = threading.local()
+
+        self.lanes = sorted((Lane(name, lane["Priority"], lane["Reserved"], lane["MaxQueue"], lane["Methods"])
+                             for name, lane in lanes.items()), key=lambda lane: lane.priority)
+        self.byName = {lane.name : lane for lane in self.lanes}
+        self.default = self.byName[default]
+        self.byMethod = {method : lane for lane in self.lanes for method in lane.methods}
+
+        # Rejections are quick, so are run before any other calls.
+        self.rejects = Lane("rejects", -1, 0, 0, [])
+
+        # Reserved threads run calls of their lane (and rejections), others run calls of all lanes.
+        self.threads = []
+        for lane in self.lanes:
+            for _ in range(lane.reserved):
+                self.threads.append(Thread(target=self.worker, args=([lane, self.rejects],), name=f'lane-{lane.name}', daemon=True))
+        shared = max(workers - len(self.threads), 1)
+        for _ in range(shared):
+            self.threads.append(Thread(target=self.worker, args=([self.rejects] + self.lanes,), name="lane-shared", daemon=True))
+        for t in self.threads:
+            t.start()
+
+    def laneOf(self, method: str) -> Lane:
+        """
+        Get the lane of a method.
+        Parameters:
+            method : Method name.
+        Returns:
+            Lane.
+        """
+        return self.byMethod.get(method, self.default)
+
+    def setHint(self, lane: Lane) -> None:
+        """
+        Set the lane of the next call submitted by this thread.
+        Parameters:
+            lane : Lane.
+        """
+        self.hint.lane = lane
+
+    def submit(self, fn, *args, **kwargs) -> futures.Future:
+        """
+        Submit a call to the queue of its lane.
+        Parameters:
+            fn : Function of the call.
+            args : Arguments of the function.
+        Returns:
+            Future of the call.
+        """
+
+        lane = getattr(self.hint, "lane", None) or self.default
+        self.hint.lane = None
+
+        future = futures.Future()
+        with self.cond:
+            if self.stopping:
+                raise RuntimeError("Cannot submit calls after shutdown.")
+            lane.queue.append((future, fn, args, kwargs))
+            lane.submitted += 1
+            self.cond.notify_all()
+
+        return future
+
+    def take(self, lanes: List[Lane]):
+        """
+        Take the next call from the highest priority lane with calls waiting.
+        Must be called with the condition held.
+        Parameters:
+            lanes : Lanes, highest priority first.
+        Returns:
+            Call, None if no calls waiting.
+        """
+
+        for lane in lanes:
+            if lane.queue:
+                return lane.queue.popleft()
+
+        return None
+
+    def worker(self, lanes: List[Lane]) -> None:
+        """
+        Run calls of lanes until shut down.
+        Parameters:
+            lanes : Lanes the thread runs calls of, highest priority first.
+        """
+
+        while True:
+            with self.cond:
+                call = self.take(lanes)
+                while (call is None) and (not self.stopping):
+                    self.cond.wait()
+                    call = self.take(lanes)
+            if call is None:
+                return
+
+            future, fn, args, kwargs = call
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """
+        Shut down the executor, after the calls waiting are run (or cancelled).
+        Parameters:
+            wait : Wait for the threads to finish.
+            cancel_futures : Cancel calls waiting.
+        """
+
+        with self.cond:
+            self.stopping = True
+            if cancel_futures:
+                for lane in [self.rejects] + self.lanes:
+                    while lane.queue:
+                        lane.queue.popleft()[0].cancel()
+            self.cond.notify_all()
+
+        if wait:
+            for t in self.threads:
+                t.join()
+
+    def stats(self) -> Dict[str, dict]:
+        """
+        Statistics of the lanes.
+        Returns:
+            Calls waiting, submitted and rejected, by lane name.
+        """
+
+        with self.cond:
+            return {lane.name : {"queued" : len(lane.queue), "submitted" : lane.submitted, "shed" : lane.shed} for lane in self.lanes}
+
+
+class LaneInterceptor(grpc.ServerInterceptor):
+    """
+    Class to represent an interceptor that puts each call in its lane of the
+    executor, and rejects calls if the queue of the lane is full.
+    Must be the first interceptor, so all calls are put in a lane.
+    """
+
+    def __init__(self, executor: PriorityLaneExecutor) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            executor : Priority lane executor of the server.
+        """
+
+        self.executor = executor
+        self.queueFull = abortHandler(grpc.StatusCode.RESOURCE_EXHAUSTED, "Server busy, try again later.")
+
+    def intercept_service(self, continuation, handler_call_details):
+        """
+        Set the lane of the call, or reject it.
+        """
+
+        lane = self.executor.laneOf(methodName(handler_call_details.method))
+        if lane.maxQueue and (len(lane.queue) >= lane.maxQueue):
+            lane.shed += 1
+            self.executor.setHint(self.executor.rejects)
+            return self.queueFull
+
+        self.executor.setHint(lane)
+        return continuation(handler_call_details)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+from threading import Lock
+import time
+
+
+class TokenBucket():
+    """
+    Class to represent a token bucket, allowing bursts of requests up to the
+    bucket size, and on average a number of requests per second.
+    """
+
+    __slots__ = ('tokens', 'updated')
+
+    def __init__(self, burst: float, now: float) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            burst : Size of the bucket, starts full.
+            now : Current (monotonic) time.
+        """
+
+        self.tokens = burst
+        self.updated = now
+
+    def take(self, rate: float, burst: float, now: float) -> bool:
+        """
+        Take a token from the bucket, refilling it for the time since last taken.
+        Parameters:
+            rate : Tokens added per second.
+            burst : Size of the bucket.
+            now : Current (monotonic) time.
+        Returns:
+            True if a token was taken, False if the bucket is empty.
+        """
+
+        self.tokens = min(burst, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+
+        return True
+
+
+class RateLimiter():
+    """
+    Class to represent rate limits of requests by key, e.g. client address or user.
+    Buckets that have refilled are removed, so only recent keys are kept.
+    """
+
+    # Number of requests between removing refilled buckets.
+    PRUNE_EVERY = 1000
+
+    def __init__(self, rate: float, burst: float) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            rate : Requests per second allowed for each key.
+            burst : Requests allowed in a burst for each key.
+        """
+
+        self.rate = rate
+        self.burst = burst
+        self.lock = Lock()
+        self.buckets = {}
+        self.requests = 0
+
+        # Number of requests rejected.
+        self.rejected = 0
+
+    def allow(self, key: str) -> bool:
+        """
+        Check if a request for a key is allowed.
+        Parameters:
+            key : Key of the request.
+        Returns:
+            True if the request is allowed, False if rate limited.
+        """
+
+        now = time.monotonic()
+        with self.lock:
+            self.requests += 1
+            if self.requests % self.PRUNE_EVERY == 0:
+                self.prune(now)
+
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = TokenBucket(self.burst, now)
+            if bucket.take(self.rate, self.burst, now):
+                return True
+            self.rejected += 1
+
+        return False
+
+    def prune(self, now: float) -> None:
+        """
+        Remove buckets that would have refilled (must hold the lock).
+        Parameters:
+            now : Current (monotonic) time.
+        """
+
+        refill = self.burst / self.rate
+        for key in [k for k, b in self.buckets.items() if now - b.updated > refill]:
+            del self.buckets[key]
@@ -8,3 +8,51 @@ UI_PORT = "50150"
 # Main (Index) view parameters
 UI_REFRESH_PERIOD_SLOW = 3
 UI_REFRESH_PERIOD_FAST = 1
+
+# Fleet aggregator server.
+FLEET_IP = "127.0.0.1"
+FLEET_PORT = "50160"
+
+# Deadlines of calls to controllers and the fleet aggregator (seconds).
+# Fleet commands wait for all the controllers of the fleet.
+UI_STATUS_DEADLINE = 1.0
+UI_CONTROL_DEADLINE = 2.0
+FLEET_CONTROL_DEADLINE = 10.0
+
+# Circuit breaker, number of failed calls in a row to stop calling a server,
+# and time before probing if it is back (seconds).
+UI_BREAKER_FAILURES = 3
+UI_BREAKER_RESET = 5.0
+
+# Controller status cache, time status is cached for (seconds),
+# and folder to share the cache between web server processes (blank for none).
+STATUS_CACHE_TTL = 1.0
+STATUS_CACHE_DIR = ""
+
+# Production serving (webUI.wsgi), time browsers cache static files for (seconds),
+# and compression of responses, minimum size (bytes) and level.
+STATIC_MAX_AGE = 31536000
+COMPRESS_MIN_SIZE = 500
+COMPRESS_LEVEL = 6
+
+# Authentication database, time to wait for other writers (ms), and
+# time logged in users are cached for (seconds).
+DB_BUSY_TIMEOUT = 5000
+USER_CACHE_TTL = 60.0
+
+# Password hashing, method with cost parameters (passwords are hashed again
+# at login if changed), number of hashes at the same time, and waiting.
+PASSWORD_HASH_METHOD = "scrypt:32768:8:1"
+HASH_WORKERS = 2
+HASH_QUEUE = 8
+
+# Login rate limits, attempts per second and in a burst, by client address and by user.
+LOGIN_ADDR_RATE = 1.0
+LOGIN_ADDR_BURST = 10
+LOGIN_USER_RATE = 0.2
+LOGIN_USER_BURST = 5
+
+# API token for controllers that require tokens, file with the secret shared
+# with the controllers (blank for no tokens), and time each token is valid for (seconds).
+UI_AUTH_SECRET_FILE = ""
+UI_AUTH_LIFETIME = 3600.0
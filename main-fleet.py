@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+import argparse
+import logging
+import logging.handlers
+import time
+import os
+
+from fleet.config import *
+from fleet.aggregator import *
+from fleet.fleetServer import *
+from utils.filePaths import *
+
+# *******************************************
+# Program history.
+# 0.1   MDC 09/10/2021  Original.
+# *******************************************
+
+# Program name, version, and date.
+progName = "fleet"
+progVersion = "0.1"
+progDate = "2021"
+
+# Program main.
+def main(cFile: str, lFile: str, fFile: str) -> None:
+    """
+    Fleet aggregator mainline.
+    Parameters:
+        cFile : Json configuration file.
+        lFile : Program log file.
+        fFile : Fleet controllers configuration file.
+    """
+
+    # Check if paths for config and logs exists and create if not.
+    chkPath(cFile)
+    chkPath(lFile)
+    chkPath(fFile)
+
+    # Create configuration values class object.
+    cfg = Config(cFile)
+
+    # Create logger. Use rotating log files.
+    logger = logging.getLogger(progName)
+    logger.setLevel(cfg.DebugLevel)
+    handler = logging.handlers.RotatingFileHandler(lFile, maxBytes=cfg.LogFileSize, backupCount=cfg.LogBackups)
+    handler.setFormatter(logging.Formatter(fmt=f"%(asctime)s.%(msecs)03d [{cfg.FleetName}] [%(levelname)-8s] %(message)s", datefmt="%Y%m%d-%H:%M:%S", style="%"))
+    logging.Formatter.converter = time.localtime
+    logger.addHandler(handler)
+
+    # Log program version.
+    logger.info(f'Program version : {progVersion}')
+
+    # Create an instance of the fleet aggregator.
+    # Aggregator is a threaded class so start the thread running.
+    logger.info(f'Creating fleet aggregator, and starting thread : {cfg.FleetName}')
+    agg = FleetAggregator(cfg, logger, fFile)
+    agg.start()
+
+    # Create an instance of a fleet UI server.
+    # This will present fleet data to UIs.
+    logger.info(f'Creating fleet UI server, and starting thread.')
+    ui = FleetServer(cfg, logger, agg)
+    ui.start()
+
+    # Keep checking if aggregator is still alive,
+    # if so, keep processing.
+    while agg.is_alive():
+        time.sleep(cfg.Timers["MainSleep"])
+
+    # Aggregator not alive, so exit.
+    logger.info('Fleet aggregator is dead!')
+    ui.stopServingUI()
+    exit(0)
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Fleet Aggregator.")
+    parser.add_argument("-c", "--config", help="Json configuration file.")
+    parser.add_argument("-l", "--log", help="Log file.")
+    parser.add_argument("-f", "--fleet", help="Json fleet controllers configuration file.")
+    parser.add_argument("-v", "--version", help="Program version.", action="store_true")
+    args = parser.parse_args()
+
+    # Check if program version requested.
+    # Only show version and don't do anything else.
+    if args.version:
+        print(f"Program version : {progVersion}")
+    else:
+        # Use default config & log file names if not specified.
+        cFile = os.path.join("./config", progName + "." + "json")
+        lFile = os.path.join("./logs", progName + "." + "log")
+        fFile = os.path.join("./config", "controllers.json")
+
+        # Check for configuration options different to default.
+        if args.config:
+            cFile = args.config
+        if args.log:
+            lFile = args.log
+        if args.fleet:
+            fFile = args.fleet
+        main(cFile, lFile, fFile)
@@ -29,7 +29,7 @@ progVersion = "0.1"
 progDate = "2021"
 
 # Program main.
-def main(cFile: str, lFile: str, iFile: str, oFile: str, pFile: str) -> None:
+def main(cFile: str, lFile: str, iFile: str, oFile: str, pFile: str, rFile: str, sFile: str) -> None:
     """
     Controller mainline.
     Parameters:
@@ -38,6 +38,8 @@ def main(cFile: str, lFile: str, iFile: str, oFile: str, pFile: str) -> None:
         iFile : Inputs configuration file.
         oFile : Outputs configuration file.
         pFile : Program (watering) configuration file.
+        rFile : Interlock rules configuration file.
+        sFile : Controller state checkpoint file.
     """
 
     # Check if paths for config and logs exists and create if not.
@@ -46,6 +48,8 @@ def main(cFile: str, lFile: str, iFile: str, oFile: str, pFile: str) -> None:
     chkPath(iFile)
     chkPath(oFile)
     chkPath(pFile)
+    chkPath(rFile)
+    chkPath(sFile)
 
     # Create configuration values class object.
     cfg = Config(cFile)
@@ -54,7 +58,9 @@ def main(cFile: str, lFile: str, iFile: str, oFile: str, pFile: str) -> None:
     logger = logging.getLogger(progName)
     logger.setLevel(cfg.DebugLevel)
     handler = logging.handlers.RotatingFileHandler(lFile, maxBytes=cfg.LogFileSize, backupCount=cfg.LogBackups)
-    handler.setFormatter(logging.Formatter(fmt=f"%(asctime)s.%(msecs)03d [{cfg.ControllerName}] [%(levelname)-8s] %(message)s", datefmt="%Y%m%d-%H:%M:%S", style="%"))
+    # Log records include the request ID of UI calls, "-" if not in a call.
+    handler.addFilter(RequestIdFilter())
+    handler.setFormatter(logging.Formatter(fmt=f"%(asctime)s.%(msecs)03d [{cfg.ControllerName}] [%(levelname)-8s] [%(requestId)s] %(message)s", datefmt="%Y%m%d-%H:%M:%S", style="%"))
     logging.Formatter.converter = time.localtime
     logger.addHandler(handler)
 
@@ -64,7 +70,7 @@ def main(cFile: str, lFile: str, iFile: str, oFile: str, pFile: str) -> None:
     # Create an instance of a controller.
     # Controller is a threaded class so start the thread running.
     logger.info(f'Creating controller, and starting thread : {cfg.ControllerName}')
-    c = SprinklerController(cfg, logger, cfg.ControllerName, iFile, oFile, pFile)
+    c = SprinklerController(cfg, logger, cfg.ControllerName, iFile, oFile, pFile, rFile, sFile)
     c.start()
 
     # Create an instance of a UI server.
@@ -91,6 +97,8 @@ if __name__ == "__main__":
     parser.add_argument("-i", "--inputs", help="Json inputs configuration file.")
     parser.add_argument("-o", "--outputs", help="Json outputs configuration file.")
     parser.add_argument("-p", "--program", help="Json (watering) program configuration file.")
+    parser.add_argument("-r", "--rules", help="Json interlock rules configuration file.")
+    parser.add_argument("-s", "--state", help="Controller state checkpoint file.")
     parser.add_argument("-v", "--version", help="Program version.", action="store_true")
     args = parser.parse_args()
 
@@ -105,6 +113,8 @@ if __name__ == "__main__":
         iFile = os.path.join("./config", "inputs.json")
         oFile = os.path.join("./config", "outputs.json")
         pFile = os.path.join("./config", "program.json")
+        rFile = os.path.join("./config", "interlocks.json")
+        sFile = os.path.join("./state", progName + "." + "ckpt")
 
         # Check for configuration options different to default.
         if args.config:
@@ -117,4 +127,8 @@ if __name__ == "__main__":
             oFile = args.outputs
         if args.program:
             pFile = args.program
-        main(cFile, lFile, iFile, oFile, pFile)
+        if args.rules:
+            rFile = args.rules
+        if args.state:
+            sFile = args.state
+        main(cFile, lFile, iFile, oFile, pFile, rFile, sFile)
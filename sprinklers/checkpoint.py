@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+
+from typing import List, Optional
+import logging
+import os
+import struct
+import time
+import zlib
+
+from sprinklers.interlocks import *
+from sprinklers.manualRuns import *
+
+# Checkpoint file layout (little endian).
+# Header : magic, format version, wall time saved (seconds since epoch).
+# State : controller mode, number of interlock rules, output mask length (bytes),
+# then the output mask, then per rule tripped flag and resume time remaining
+# (seconds, negative if not counting down).
+# Manual runs (from version 2) : number of running and queued runs, and the
+# station of the queued run running (0 if none), then per running run the
+# station and time remaining (seconds, negative until stopped), then per
+# queued run the station and time (seconds).
+# Trailer : CRC32 of the header and state.
+CHECKPOINT_MAGIC = b'SPCK'
+CHECKPOINT_VERSION = 2
+HEADER = struct.Struct('<4sBd')
+STATE = struct.Struct('<BHH')
+RULE = struct.Struct('<Bd')
+MANUAL = struct.Struct('<HHH')
+RUN = struct.Struct('<Hd')
+TRAILER = struct.Struct('<I')
+
+
+class ControllerCheckpoint():
+    """
+    Class to represent the state checkpoint of a controller.
+    The controller state (mode, outputs, interlocks and manual runs) is saved to a small
+    binary file, so that after a restart the controller resumes where it was.
+    Saving is cheap enough to be called every control cycle, as the file is
+    only written when the state changes, or every checkpoint period.
+    Writes are atomic, to a temporary file that then replaces the checkpoint.
+    """
+
+    def __init__(self, log: logging, sFile: str, period: float) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            log : Mainline logging object.
+            sFile : Name of checkpoint file, empty for no checkpoints.
+            period : Maximum time between checkpoint writes (seconds).
+        """
+
+        self.log = log
+        self.sFile = sFile
+        self.period = period
+
+        # State last written and (monotonic) time it was written.
+        self._lastKey = None
+        self._lastWrite = 0.0
+
+        # Number of checkpoint writes.
+        self.writes = 0
+
+    def save(self, mode: int, outputMask: int, rules: List[InterlockRule], now: float, manual: Optional[ManualRuns] = None) -> bool:
+        """
+        Save the controller state, if it has changed or the period is up.
+        Parameters:
+            mode : Controller mode (value).
+            outputMask : Active outputs, bit n for output n.
+            rules : Interlock rules.
+            now : Current (monotonic) time (seconds).
+            manual : Manual runs, None if none.
+        Returns:
+            True if the checkpoint was written.
+        """
+
+        if not self.sFile:
+            return False
+
+        # Rule resume times are fixed once counting down, so the state only
+        # changes if a rule trips, starts counting down or resumes. Likewise
+        # manual run end times are fixed once started.
+        trippedMask = 0
+        countingMask = 0
+        for n, r in enumerate(rules):
+            if r.tripped:
+                trippedMask |= 1 << n
+            if r.resumeTime is not None:
+                countingMask |= 1 << n
+        manualKey = None
+        if manual is not None:
+            manualKey = (tuple(manual.ends.items()), tuple(manual.queue), manual.queued)
+        key = (mode, outputMask, trippedMask, countingMask, manualKey)
+        if key == self._lastKey and (now - self._lastWrite) < self.period:
+            return False
+
+        try:
+            self.write(self.pack(mode, outputMask, rules, now, time.time(), manual))
+        except Exception:
+            self.log.error(f'Failed to write checkpoint file : {self.sFile}')
+            return False
+
+        self._lastKey = key
+        self._lastWrite = now
+        self.writes += 1
+
+        return True
+
+    def pack(self, mode: int, outputMask: int, rules: List[InterlockRule], now: float, wallTime: float, manual: Optional[ManualRuns] = None) -> bytes:
+        """
+        Pack the controller state into a checkpoint record.
+        Parameters:
+            mode : Controller mode (value).
+            outputMask : Active outputs, bit n for output n.
+            rules : Interlock rules.
+            now : Current (monotonic) time (seconds).
+            wallTime : Current wall time (seconds since epoch).
+            manual : Manual runs, None if none.
+        Returns:
+            Checkpoint record.
+        """
+
+        maskLen = (outputMask.bit_length() + 7) // 8
+        parts = [HEADER.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION, wallTime),
+                 STATE.pack(mode, len(rules), maskLen),
+                 outputMask.to_bytes(maskLen, "little")]
+        for r in rules:
+            remaining = -1.0 if r.resumeTime is None else max(0.0, r.resumeTime - now)
+            parts.append(RULE.pack(r.tripped, remaining))
+        running = [] if manual is None else sorted(manual.ends.items())
+        queued = [] if manual is None else list(manual.queue)
+        queuedStation = 0 if (manual is None) or (manual.queued is None) else manual.queued
+        parts.append(MANUAL.pack(len(running), len(queued), queuedStation))
+        for st, end in running:
+            parts.append(RUN.pack(st, -1.0 if end is None else max(0.0, end - now)))
+        for st, seconds in queued:
+            parts.append(RUN.pack(st, seconds))
+        record = b"".join(parts)
+
+        return record + TRAILER.pack(zlib.crc32(record))
+
+    def write(self, record: bytes) -> None:
+        """
+        Write a checkpoint record to file atomically.
+        Parameters:
+            record : Checkpoint record.
+        """
+
+        tmpFile = self.sFile + ".tmp"
+        fd = os.open(tmpFile, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, record)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmpFile, self.sFile)
+
+    def load(self) -> Optional[dict]:
+        """
+        Load the controller state from the checkpoint file.
+        Returns:
+            Checkpoint state, as mode, outputMask, rules (tripped, resume time
+            remaining), manual runs (running as station and time remaining,
+            queued as station and time, and the queued run running) and age
+            (seconds), or None if there is no valid checkpoint.
+        """
+
+        if not self.sFile:
+            return None
+
+        try:
+            with open(self.sFile, "rb") as f:
+                record = f.read()
+        except FileNotFoundError:
+            return None
+        except Exception:
+            self.log.error(f'Failed to read checkpoint file : {self.sFile}')
+            return None
+
+        try:
+            # Check the record is complete and not corrupted.
+            body, trailer = record[:-TRAILER.size], record[-TRAILER.size:]
+            if TRAILER.unpack(trailer)[0] != zlib.crc32(body):
+                raise ValueError("CRC mismatch")
+            magic, version, wallTime = HEADER.unpack_from(body, 0)
+            if magic != CHECKPOINT_MAGIC or not (1 <= version <= CHECKPOINT_VERSION):
+                raise ValueError("Unknown format")
+
+            offset = HEADER.size
+            mode, numRules, maskLen = STATE.unpack_from(body, offset)
+            offset += STATE.size
+            outputMask = int.from_bytes(body[offset:offset + maskLen], "little")
+            offset += maskLen
+            rules = []
+            for _ in range(numRules):
+                tripped, remaining = RULE.unpack_from(body, offset)
+                offset += RULE.size
+                rules.append((bool(tripped), None if remaining < 0.0 else remaining))
+
+            # Version 1 checkpoints have no manual runs.
+            manual = {"running" : [], "queued" : [], "queuedStation" : None}
+            if version >= 2:
+                numRunning, numQueued, queuedStation = MANUAL.unpack_from(body, offset)
+                offset += MANUAL.size
+                for _ in range(numRunning):
+                    st, remaining = RUN.unpack_from(body, offset)
+                    offset += RUN.size
+                    manual["running"].append((st, None if remaining < 0.0 else remaining))
+                for _ in range(numQueued):
+                    manual["queued"].append(RUN.unpack_from(body, offset))
+                    offset += RUN.size
+                manual["queuedStation"] = queuedStation if queuedStation else None
+        except Exception:
+            self.log.error(f'Invalid checkpoint file, ignoring : {self.sFile}')
+            return None
+
+        return {
+            "mode" : mode,
+            "outputMask" : outputMask,
+            "rules" : rules,
+            "manual" : manual,
+            "age" : max(0.0, time.time() - wallTime)
+        }
@@ -47,9 +47,87 @@ class Config():
         }
 
         # UI server settings.
+        # Workers is the number of calls served at the same time.
+        # Interceptors are run on each call in order, from "requestId" (request IDs in logs),
+        # "metrics" (latency histograms) and "limits" (maximum calls in flight).
+        # MaxInFlight is the maximum calls in flight by method, DefaultInFlight of
+        # other methods (0 for no limit), so status calls can't take all the workers.
+        # Calls slower than SlowCall are logged (seconds), and latencies are
+        # logged every StatsPeriod (seconds), 0 for never.
+        # Lanes are the priority lanes of calls, each with a Priority (lowest first),
+        # threads Reserved for the lane, MaxQueue calls allowed to wait (0 for no limit),
+        # and its Methods; DefaultLane for other methods. No lanes for a single queue.
         self.UI = {
             "UIPort" : 50150,
-            "UISleep" : 1.0
+            "UISleep" : 1.0,
+            "Workers" : 10,
+            "Interceptors" : ["requestId", "metrics", "limits"],
+            "MaxInFlight" : {
+                "GetControllerStatus" : 4,
+                "GetUpcomingRuns" : 2
+            },
+            "DefaultInFlight" : 0,
+            "SlowCall" : 0.5,
+            "StatsPeriod" : 300.0,
+            "Lanes" : {
+                "control" : {
+                    "Priority" : 0,
+                    "Reserved" : 2,
+                    "MaxQueue" : 0,
+                    "Methods" : ["SetControllerMode", "StartStation", "StopStation", "QueueStations"]
+                },
+                "read" : {
+                    "Priority" : 1,
+                    "Reserved" : 0,
+                    "MaxQueue" : 20,
+                    "Methods" : ["GetControllerStatus", "GetUpcomingRuns"]
+                }
+            },
+            "DefaultLane" : "read"
+        }
+
+        # Hydraulic settings.
+        # Supply capacity in the same units as station flow rates, 0 for no limit.
+        self.Hydraulics = {
+            "SupplyCapacity" : 40.0
+        }
+
+        # Checkpoint settings.
+        # Period is the maximum time between checkpoints (seconds).
+        # Outputs are only restored from a checkpoint younger than MaxAge (seconds),
+        # at least a Period and a ControllerSleep, as a checkpoint can be that old.
+        self.Checkpoint = {
+            "Period" : 60.0,
+            "MaxAge" : 70.0
+        }
+
+        # Command settings.
+        # QueueSize commands (e.g. from the UI) are allowed to wait for the controller,
+        # further commands are rejected, and at most BatchSize are run each control cycle.
+        self.Commands = {
+            "QueueSize" : 64,
+            "BatchSize" : 16
+        }
+
+        # Clock settings.
+        # TimeZone of the program schedule (IANA name, e.g. "Australia/Sydney"), empty for
+        # the system time zone. A difference in the time passed on the wall and monotonic
+        # clocks of more than JumpThreshold (seconds) is logged as a wall clock jump.
+        self.Clock = {
+            "TimeZone" : "",
+            "JumpThreshold" : 2.0
+        }
+
+        # API authentication settings, of UI and fleet clients.
+        # If Required, calls need a token signed with the secret in SecretFile (created if missing).
+        # Verified tokens are cached (CacheSize), and each token is limited to Rate calls
+        # per second, with bursts of up to Burst calls.
+        self.Auth = {
+            "Required" : False,
+            "SecretFile" : "./config/auth.key",
+            "CacheSize" : 1024,
+            "Rate" : 50.0,
+            "Burst" : 100
         }
 
         # Read / update configuration from file.
@@ -134,6 +212,132 @@ class Config():
                 except Exception:
                     self.UI["UISleep"] = paramSaved
                     updateConfig = True
+                try:
+                    paramSaved = self.UI["Workers"]
+                    self.UI["Workers"] = config["UI"]["Workers"]
+                except Exception:
+                    self.UI["Workers"] = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.UI["Interceptors"]
+                    self.UI["Interceptors"] = config["UI"]["Interceptors"]
+                except Exception:
+                    self.UI["Interceptors"] = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.UI["MaxInFlight"]
+                    self.UI["MaxInFlight"] = config["UI"]["MaxInFlight"]
+                except Exception:
+                    self.UI["MaxInFlight"] = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.UI["DefaultInFlight"]
+                    self.UI["DefaultInFlight"] = config["UI"]["DefaultInFlight"]
+                except Exception:
+                    self.UI["DefaultInFlight"] = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.UI["SlowCall"]
+                    self.UI["SlowCall"] = config["UI"]["SlowCall"]
+                except Exception:
+                    self.UI["SlowCall"] = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.UI["StatsPeriod"]
+                    self.UI["StatsPeriod"] = config["UI"]["StatsPeriod"]
+                except Exception:
+                    self.UI["StatsPeriod"] = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.UI["Lanes"]
+                    self.UI["Lanes"] = config["UI"]["Lanes"]
+                except Exception:
+                    self.UI["Lanes"] = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.UI["DefaultLane"]
+                    self.UI["DefaultLane"] = config["UI"]["DefaultLane"]
+                except Exception:
+                    self.UI["DefaultLane"] = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.Hydraulics["SupplyCapacity"]
+                    self.Hydraulics["SupplyCapacity"] = config["Hydraulics"]["SupplyCapacity"]
+                except Exception:
+                    self.Hydraulics["SupplyCapacity"] = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.Checkpoint["Period"]
+                    self.Checkpoint["Period"] = config["Checkpoint"]["Period"]
+                except Exception:
+                    self.Checkpoint["Period"] = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.Checkpoint["MaxAge"]
+                    self.Checkpoint["MaxAge"] = config["Checkpoint"]["MaxAge"]
+                except Exception:
+                    self.Checkpoint["MaxAge"] = paramSaved
+                    updateConfig = True
+                if self.Checkpoint["MaxAge"] < self.Checkpoint["Period"] + self.Timers["ControllerSleep"]:
+                    # An unchanged state is only checkpointed every Period, so a younger
+                    # MaxAge would ignore good checkpoints.
+                    print("Checkpoint MaxAge less than Period and ControllerSleep, increasing MaxAge.")
+                    self.Checkpoint["MaxAge"] = self.Checkpoint["Period"] + self.Timers["ControllerSleep"]
+                    updateConfig = True
+                try:
+                    paramSaved = self.Commands["QueueSize"]
+                    self.Commands["QueueSize"] = config["Commands"]["QueueSize"]
+                except Exception:
+                    self.Commands["QueueSize"] = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.Commands["BatchSize"]
+                    self.Commands["BatchSize"] = config["Commands"]["BatchSize"]
+                except Exception:
+                    self.Commands["BatchSize"] = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.Clock["TimeZone"]
+                    self.Clock["TimeZone"] = config["Clock"]["TimeZone"]
+                except Exception:
+                    self.Clock["TimeZone"] = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.Clock["JumpThreshold"]
+                    self.Clock["JumpThreshold"] = config["Clock"]["JumpThreshold"]
+                except Exception:
+                    self.Clock["JumpThreshold"] = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.Auth["Required"]
+                    self.Auth["Required"] = config["Auth"]["Required"]
+                except Exception:
+                    self.Auth["Required"] = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.Auth["SecretFile"]
+                    self.Auth["SecretFile"] = config["Auth"]["SecretFile"]
+                except Exception:
+                    self.Auth["SecretFile"] = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.Auth["CacheSize"]
+                    self.Auth["CacheSize"] = config["Auth"]["CacheSize"]
+                except Exception:
+                    self.Auth["CacheSize"] = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.Auth["Rate"]
+                    self.Auth["Rate"] = config["Auth"]["Rate"]
+                except Exception:
+                    self.Auth["Rate"] = paramSaved
+                    updateConfig = True
+                try:
+                    paramSaved = self.Auth["Burst"]
+                    self.Auth["Burst"] = config["Auth"]["Burst"]
+                except Exception:
+                    self.Auth["Burst"] = paramSaved
+                    updateConfig = True
 
                 # If required, i.e. couldn't update all data from user configuration, then save default.
                 if updateConfig:
@@ -162,7 +366,12 @@ class Config():
             "LogBackups" : self.LogBackups,
             "Timers" : self.Timers,
             "GRPC" : self.GRPC,
-            "UI" : self.UI
+            "UI" : self.UI,
+            "Hydraulics" : self.Hydraulics,
+            "Checkpoint" : self.Checkpoint,
+            "Commands" : self.Commands,
+            "Clock" : self.Clock,
+            "Auth" : self.Auth
         }
 
         # Open file for writing.
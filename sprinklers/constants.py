@@ -7,3 +7,15 @@ from generic.genericConstants import *
 # Application specific constants added here (below).
 # ********************************************************
 
+
+class ManualRunReason(Enum):
+    """
+    Manual station run (fail) reasons.
+    """
+    NONE = 0
+    NOT_ACTIVE = 1
+    MODE_OFF = 2
+    NO_STATION = 3
+    TIMEOUT = 4
+    BUSY = 5
+    NO_TIME = 6
@@ -1,14 +1,24 @@
 #!/usr/bin/env python3
 
+from datetime import datetime
 from threading import Thread
 import logging
 import time
 import json
-import random
 
 from generic.genericController import *
+from generic.controlClock import *
 from sprinklers.digitalInput import *
 from sprinklers.digitalOutput import *
+from sprinklers.fakeIoBackend import *
+from sprinklers.sysfsIoBackend import *
+from sprinklers.interlocks import *
+from sprinklers.scheduler import *
+from sprinklers.runCalendar import *
+from sprinklers.zonedSchedule import *
+from sprinklers.checkpoint import *
+from sprinklers.manualRuns import *
+from sprinklers.constants import *
 from sprinklers.config import *
 
 class SprinklerController(GenericController, Thread):   
@@ -17,7 +27,7 @@ class SprinklerController(GenericController, Thread):
     Derive from a generic controller class.
     """
 
-    def __init__(self, config: Config, log: logging, name: str, iFile: str, oFile: str, pFile: str) -> None:
+    def __init__(self, config: Config, log: logging, name: str, iFile: str, oFile: str, pFile: str, rFile: str, sFile: str) -> None:
         """
         Initialisation method.
         Parameters:
@@ -27,13 +37,49 @@ class SprinklerController(GenericController, Thread):
             iFile : Name of inputs configuration (json) file.
             oFile : Name of outputs configuration (json) file.
             pFile : Name of controller program configuration (json) file.
+            rFile : Name of interlock rules configuration (json) file.
+            sFile : Name of state checkpoint file, empty for no checkpoints.
         """
 
         self.cfg = config
         self.log = log
 
+        # Hardware backend configuration, and value file path of each IO point.
+        self.inputsBackend = {"Type": "FAKE"}
+        self.outputsBackend = {"Type": "FAKE"}
+        self.inputPaths = []
+        self.outputPaths = []
+
+        # Interlock engine, rules are imported with the IO.
+        self.interlocks = Interlocks(log)
+
+        # Program scheduler, and flow rate of each station output.
+        self.scheduler = Scheduler(log)
+        self.stationFlows = {}
+
+        # Run calendar, rebuilt from the schedule whenever the program changes.
+        self.calendar = RunCalendar([])
+
+        # Wall clock (in the schedule time zone), and the schedule in real time.
+        # Latest wall clock time the schedule was looked at, and the stations it
+        # had active then, so runs aren't run again if the wall clock goes back.
+        self.clock = WallClock(log, config.Clock["JumpThreshold"], config.Clock["TimeZone"])
+        self.zoned = ZonedSchedule(self.scheduler, self.clock.zone)
+        self.scheduleHighWater = float("-inf")
+        self.lastScheduled = 0
+
+        # Fixed rate timer of the periodic control cycles.
+        self.timer = FixedRateTimer(config.Timers["ControllerSleep"], time.monotonic())
+
+        # State checkpoint, and state recovered from it at startup.
+        self.checkpoint = ControllerCheckpoint(log, sFile, config.Checkpoint["Period"])
+        self.recovered = None
+
+        # Manual station runs.
+        self.manual = ManualRuns(log)
+
         # Super class initialisations.
-        GenericController.__init__(self, name, log)
+        GenericController.__init__(self, name, log, config.Commands["QueueSize"], config.Commands["BatchSize"])
         Thread.__init__(self)
 
         # Import the inputs (IO) configuration file.
@@ -45,6 +91,18 @@ class SprinklerController(GenericController, Thread):
         # Import the controller program configuration file.
         self.importControllerProgram(pFile)
 
+        # Import the interlock rules configuration file.
+        self.importInterlocks(rFile)
+
+        # Build banks of the imported IO, and the hardware backends for them.
+        self.buildIoBanks()
+        self.recoverOutputs()
+        self.createIoBackends()
+        self.registerInputEdges()
+
+        # Publish the initial state, so it can be read before the controller runs.
+        self.publishState()
+
     def run(self) -> None:
         """
         Run threaded method.
@@ -55,8 +113,12 @@ class SprinklerController(GenericController, Thread):
         self.log.debug(f'Controller thread running.')
 
         while self.stayAlive:
+            # Run any commands, e.g. to set the mode (if not controlling yet).
+            self.runCommands()
+
             # Check state in state machine.
             self.stateMachine()
+            self.publishState()
 
     def controlling(self) -> None:
         """
@@ -71,33 +133,376 @@ class SprinklerController(GenericController, Thread):
         # <TODO> Implement controll including loss of control.
         canControl = True
 
-        while canControl:
+        # Periodic control cycles are on fixed rate (monotonic) deadlines.
+        self.timer.restart(time.monotonic())
+
+        # Outputs the programs want active, held between periodic cycles.
+        demandMask = 0
+
+        # Inputs and demand interlocks were last evaluated for, and the
+        # outputs they suspended. Forces evaluation on the first cycle.
+        lastInputs = None
+        lastDemand = None
+        suspended = 0
 
-            # All the periodic activities that the controller has to do.
+        # Also ends when the controller is told to stop (stayAlive False).
+        while canControl and self.stayAlive:
+
+            # Periodic activities happen every ControllerSleep, while input
+            # edges wake up the controller between them to react straight away.
+            # The wall clock is only used for the schedule.
+            now, wall = self.clock.read()
+            periodic = self.timer.due(now)
+
+            # Run commands from other threads, e.g. to set the mode,
+            # so the demand is updated straight away.
+            commandsRun = self.runCommands()
 
             # Read the state of all the inputs.
-            for i in self.digitalInputs:
-                i.readDigitalInputLevel()
+            activeInputs = self.readInputs()
+
+            # Demand changes periodically, with commands, and when manual runs end.
+            manualTime = self.manual.nextEvent()
+            if periodic or commandsRun or (manualTime is not None and now >= manualTime):
+                # Look at the programs (and manual runs) to see which stations need to be active.
+                demandMask = self.scheduledOutputs(wall, now)
+
+            # Evaluate interlocks only if the inputs or demand have changed,
+            # or if an interlock is due to resume.
+            resumeTime = self.interlocks.nextResume()
+            if (activeInputs != lastInputs) or (demandMask != lastDemand) or (resumeTime is not None and now >= resumeTime):
+                suspended = self.interlocks.evaluate(activeInputs, now)
+                lastInputs = activeInputs
+                lastDemand = demandMask
+
+            # Write the state of all the outputs.
+            activeMask = self.interlockedOutputs(demandMask, suspended)
+            self.writeOutputs(activeMask)
+
+            # Publish the state for other threads, and checkpoint it.
+            # Both only if it has changed.
+            self.publishState()
+            self.checkpoint.save(self.mode.value, activeMask, self.interlocks.rules, now, self.manual)
+
+            # Wait for an input edge, or until the next periodic cycle
+            # (or interlock resume or manual run end if sooner).
+            wakeTime = self.timer.deadline
+            resumeTime = self.interlocks.nextResume()
+            if resumeTime is not None:
+                wakeTime = min(wakeTime, resumeTime)
+            manualTime = self.manual.nextEvent()
+            if manualTime is not None:
+                wakeTime = min(wakeTime, manualTime)
+            self.waitForEdge(wakeTime - time.monotonic())
+
+    def initialise(self) -> None:
+        """
+        Initialise class variables and state.
+        Restores the state saved in the checkpoint, if any.
+        """
+
+        GenericController.initialise(self)
+
+        if self.recovered is not None:
+            try:
+                # Mode as set before the restart, and the interlock state.
+                # Any run in progress then resumes on the first control cycle.
+                self.mode = ControllerMode(self.recovered["mode"])
+                self.interlocks.restore(self.recovered["rules"], self.recovered["age"], time.monotonic())
+                self.log.info(f'Recovered from checkpoint, mode : {self.mode.name}; age : {self.recovered["age"]:.1f} s')
+
+                # Manual runs only from a recent checkpoint (as the outputs),
+                # so a station isn't turned on long after it was started.
+                manual = self.recovered["manual"]
+                stations = [st for st, _ in manual["running"] + manual["queued"] if 1 <= st < len(self.digitalOutputs)]
+                if len(stations) < len(manual["running"]) + len(manual["queued"]):
+                    self.log.warning(f'Manual runs of stations no longer outputs, not restoring manual runs.')
+                elif stations and self.recovered["age"] > self.cfg.Checkpoint["MaxAge"]:
+                    self.log.warning(f'Checkpoint too old, manual runs of stations dropped : {stations}.')
+                elif stations:
+                    self.manual.restore(manual["running"], manual["queued"], manual["queuedStation"], self.recovered["age"], time.monotonic())
+                    self.log.info(f'Recovered manual runs of stations : {stations}.')
+            except Exception:
+                self.log.error(f'Failed to recover from checkpoint.')
+            self.recovered = None
+
+    def recoverOutputs(self) -> None:
+        """
+        Load the state checkpoint, and if it is recent set the outputs to
+        the checkpoint outputs, so that outputs active before a restart are
+        not switched off and back on while the controller starts.
+        Must be called once the IO banks have been built.
+        """
+
+        self.recovered = self.checkpoint.load()
+        if self.recovered is not None and self.recovered["age"] <= self.cfg.Checkpoint["MaxAge"]:
+            self.outputBank.applyActive(self.recovered["outputMask"] & self.outputBank.allMask)
+            self.log.debug(f'Recovered outputs from checkpoint.')
+
+    def scheduledOutputs(self, wall: float, now: float) -> int:
+        """
+        Get the outputs the program schedule and manual runs want active at a time.
+        Manual runs are merged with the scheduled runs, so they share the master.
+        Programs only run in the ON and AUTO modes, manual runs in all modes but OFF.
+        If the wall clock has gone back, runs aren't started again until it is
+        past the latest time already looked at, only runs in progress carry on.
+        Parameters:
+            wall : Wall clock time (epoch seconds), for the schedule.
+            now : Current (monotonic) time (seconds), for manual runs.
+        Returns:
+            Outputs wanted active (with the master), bit n for output n.
+        """
+
+        if self.mode == ControllerMode.OFF:
+            return 0
+
+        stations = self.manual.advance(now)
+        if self.mode in (ControllerMode.ON, ControllerMode.AUTO):
+            scheduled = self.zoned.stationsAt(wall)
+            if wall <= self.scheduleHighWater:
+                scheduled &= self.lastScheduled
+            else:
+                self.scheduleHighWater = wall
+            self.lastScheduled = scheduled
+            stations |= scheduled
+        stations &= self.outputBank.allMask & ~1
+
+        return (stations | 1) if stations else 0
+
+    def applyMode(self, reqMode: ControllerMode) -> Tuple[Enum, ControllerModeReason]:
+        """
+        Set the controller mode, on the controller thread.
+        Setting the mode OFF also stops all manual runs.
+        Parameters:
+            reqMode : Required controller mode (to set to).
+        Returns:
+            setStatus : Enum representing status of setting mode.
+            setReason : Enum representing reason (used if setStatus not CD_GOOD)
+        """
+
+        setStatus, setReason = GenericController.applyMode(self, reqMode)
+        if self.mode == ControllerMode.OFF:
+            self.manual.stop(0)
+
+        return setStatus, setReason
+
+    def setStation(self, station: int, on: bool) -> Tuple[Enum, ManualRunReason]:
+        """
+        Turn a station on (until turned off) or off manually.
+        Parameters:
+            station : Station number (1 onwards).
+            on : True to turn the station on.
+        Returns:
+            setStatus : Enum representing status of the command.
+            setReason : Enum representing reason (used if setStatus not CD_GOOD)
+        """
+
+        if on:
+            return self.manualCommand(self.applyStartStation, station, None)
+
+        return self.manualCommand(self.applyStopStation, station)
+
+    def startStation(self, station: int, seconds: float) -> Tuple[Enum, ManualRunReason]:
+        """
+        Run a station manually for a time, straight away.
+        Parameters:
+            station : Station number (1 onwards).
+            seconds : Time to run for (seconds).
+        Returns:
+            setStatus : Enum representing status of the command.
+            setReason : Enum representing reason (used if setStatus not CD_GOOD)
+        """
+        return self.manualCommand(self.applyStartStation, station, seconds)
+
+    def stopStation(self, station: int) -> Tuple[Enum, ManualRunReason]:
+        """
+        Stop a manual run of a station, and remove it from the queue.
+        Parameters:
+            station : Station number (1 onwards), 0 for all stations.
+        Returns:
+            setStatus : Enum representing status of the command.
+            setReason : Enum representing reason (used if setStatus not CD_GOOD)
+        """
+        return self.manualCommand(self.applyStopStation, station)
+
+    def queueStations(self, runs: List[Tuple[int, float]]) -> Tuple[Enum, ManualRunReason]:
+        """
+        Queue manual runs of stations, to run one after another.
+        Parameters:
+            runs : Runs, as station and time (seconds).
+        Returns:
+            setStatus : Enum representing status of the command.
+            setReason : Enum representing reason (used if setStatus not CD_GOOD)
+        """
+        return self.manualCommand(self.applyQueueStations, runs)
+
+    def manualCommand(self, fn, *args) -> Tuple[Enum, ManualRunReason]:
+        """
+        Run a manual run command on the controller thread, waiting for it.
+        Parameters:
+            fn : Function of the command.
+            args : Arguments of the function.
+        Returns:
+            setStatus : Enum representing status of the command.
+            setReason : Enum representing reason (used if setStatus not CD_GOOD)
+        """
+
+        try:
+            return self.call(fn, *args)
+        except CommandQueueFullError:
+            self.log.warning(f'Failed manual run command as too many commands waiting.')
+            return ui_pb2.UiModeStatus.CS_MODE_FAIL, ManualRunReason.BUSY
+        except CommandTimeoutError:
+            self.log.warning(f'Failed manual run command as controller not responding.')
+            return ui_pb2.UiModeStatus.CS_MODE_FAIL, ManualRunReason.TIMEOUT
+
+    def manualAllowed(self, stations: List[int]) -> ManualRunReason:
+        """
+        Check manual runs of stations are allowed, on the controller thread.
+        Parameters:
+            stations : Station numbers (1 onwards).
+        Returns:
+            Reason the runs are not allowed, NONE if allowed.
+        """
+
+        if self.state != ControllerState.ACTIVE:
+            return ManualRunReason.NOT_ACTIVE
+        if self.mode == ControllerMode.OFF:
+            return ManualRunReason.MODE_OFF
+        for st in stations:
+            if not (1 <= st < len(self.digitalOutputs)):
+                return ManualRunReason.NO_STATION
 
-            # Look at the programs to see if any action needs to be taken.
-            # <TODO> Look through programs for actions to take, i.e. outputs to assert.
-            # For now just set random output active.
-            opChoice = random.choice(range(0, len(self.digitalOutputs), 1))
+        return ManualRunReason.NONE
 
-            self.setAllOutputsInactive()
-            if opChoice > 0:
-                self.setOutputActive(opChoice)
+    def applyStartStation(self, station: int, seconds: Optional[float]) -> Tuple[Enum, ManualRunReason]:
+        """
+        Run a station manually, on the controller thread.
+        Parameters:
+            station : Station number (1 onwards).
+            seconds : Time to run for (seconds), None until stopped.
+        Returns:
+            setStatus : Enum representing status of the command.
+            setReason : Enum representing reason (used if setStatus not CD_GOOD)
+        """
+
+        reason = self.manualAllowed([station])
+        if (reason == ManualRunReason.NONE) and (seconds is not None) and (seconds <= 0):
+            # No time, e.g. left out of the request, rather than a run that ends straight away.
+            reason = ManualRunReason.NO_TIME
+        if reason != ManualRunReason.NONE:
+            return ui_pb2.UiModeStatus.CS_MODE_FAIL, reason
+
+        self.manual.start(station, seconds, time.monotonic())
+        self.log.info(f'Station {station} manually started, for {"until stopped" if seconds is None else f"{seconds} s"}.')
 
-            # Wait a bit before trying again later.
-            time.sleep(self.cfg.Timers["ControllerSleep"])
+        return ui_pb2.UiModeStatus.CS_GOOD, ManualRunReason.NONE
+
+    def applyStopStation(self, station: int) -> Tuple[Enum, ManualRunReason]:
+        """
+        Stop a manual run of a station, on the controller thread.
+        Stopping is allowed in any mode.
+        Parameters:
+            station : Station number (1 onwards), 0 for all stations.
+        Returns:
+            setStatus : Enum representing status of the command.
+            setReason : Enum representing reason (used if setStatus not CD_GOOD)
+        """
+
+        if not (0 <= station < len(self.digitalOutputs)):
+            return ui_pb2.UiModeStatus.CS_MODE_FAIL, ManualRunReason.NO_STATION
+
+        self.manual.stop(station)
+        self.log.info(f'Station {station if station else "all"} manually stopped.')
+
+        return ui_pb2.UiModeStatus.CS_GOOD, ManualRunReason.NONE
+
+    def applyQueueStations(self, runs: List[Tuple[int, float]]) -> Tuple[Enum, ManualRunReason]:
+        """
+        Queue manual runs of stations, on the controller thread.
+        Parameters:
+            runs : Runs, as station and time (seconds).
+        Returns:
+            setStatus : Enum representing status of the command.
+            setReason : Enum representing reason (used if setStatus not CD_GOOD)
+        """
+
+        reason = self.manualAllowed([st for st, _ in runs])
+        if (reason == ManualRunReason.NONE) and any(seconds <= 0 for _, seconds in runs):
+            reason = ManualRunReason.NO_TIME
+        if reason != ManualRunReason.NONE:
+            return ui_pb2.UiModeStatus.CS_MODE_FAIL, reason
+
+        self.manual.enqueue(runs, time.monotonic())
+        self.log.info(f'Queued manual runs of stations : {[st for st, _ in runs]}.')
+
+        return ui_pb2.UiModeStatus.CS_GOOD, ManualRunReason.NONE
+
+    def manualRuns(self) -> dict:
+        """
+        Get the running and queued manual runs, with station names.
+        Returns:
+            Running stations with time remaining (seconds, -1 until stopped),
+            and queued runs.
+        """
+
+        runs = self.call(self.manual.runs, time.monotonic())
+        for r in runs["running"] + runs["queued"]:
+            r["sName"] = self.digitalOutputs[r["station"]].outputName
+
+        return runs
+
+    def replaceProgram(self, pFile: str) -> None:
+        """
+        Replace the controller program with a program configuration file.
+        The program is loaded and compiled on the calling thread, and replaced
+        on the controller thread, waiting for it to be replaced.
+        Parameters:
+            pFile : Name of controller program configuration file.
+        """
+
+        program, scheduler, calendar = self.compileProgram(self.loadControllerProgram(pFile))
+        self.call(self.applyProgram, program, scheduler, calendar)
+
+    def applyProgram(self, program: dict, scheduler: Scheduler, calendar: RunCalendar) -> None:
+        """
+        Set the controller program, on the controller thread (or while initialising).
+        Parameters:
+            program : Controller program.
+            scheduler : Scheduler with the program compiled.
+            calendar : Run calendar of the compiled program.
+        """
+
+        self.program = program
+        self.scheduler = scheduler
+        self.calendar = calendar
+        self.zoned = ZonedSchedule(scheduler, self.clock.zone)
+
+        self.log.info(f'Program set, {len(scheduler.runs)} station runs.')
+
+    def interlockedOutputs(self, demandMask: int, suspended: int) -> int:
+        """
+        Get the outputs to set active, after interlocks.
+        The master (output 0) is only active if a station is active.
+        Parameters:
+            demandMask : Outputs wanted active, bit n for output n.
+            suspended : Outputs suspended by interlocks, bit n for output n.
+        Returns:
+            Outputs to set active, bit n for output n.
+        """
+
+        activeMask = demandMask & ~suspended
+        if (activeMask >> 1) == 0:
+            activeMask = 0
+
+        return activeMask
 
     def setAllOutputsInactive(self) -> None:
         """
         Set all digital outputs to inactive.
         """
 
-        for o in self.digitalOutputs:
-            o.setDigitalOuputActive(False)
+        self.writeOutputs(0)
 
         self.log.debug(f'Setting all digital outputs to INACTIVE.')
 
@@ -109,8 +514,42 @@ class SprinklerController(GenericController, Thread):
             oIdx : Number of digital output (1 onwards)
         """
 
-        self.digitalOutputs[0].setDigitalOuputActive(True)
-        self.digitalOutputs[oIdx].setDigitalOuputActive(True)
+        self.writeOutputs(self.outputBank.actives | 1 | (1 << oIdx))
+
+    def createIoBackends(self) -> None:
+        """
+        Create the hardware backends for the input and output banks,
+        as per the Backend section of the IO configuration files.
+        Initial output levels are written to the outputs backend.
+        """
+
+        # Inputs are initialised to inactive for backends that hold levels.
+        self.inputBackend = self.createIoBackend(self.inputsBackend, self.inputPaths, False, self.inputBank.levelMask(0))
+        self.outputBackend = self.createIoBackend(self.outputsBackend, self.outputPaths, True, self.outputBank.levels)
+        self.outputBackend.writeMask(self.outputBank.levels)
+
+    def createIoBackend(self, backend: dict, paths: list, writable: bool, initLevels: int) -> GenericIoBackend:
+        """
+        Create a hardware backend for a bank of IO.
+        Falls back to a fake backend if the backend can't be created.
+        Parameters:
+            backend : Backend section of the IO configuration.
+            paths : Value file path of each IO point (SYSFS backend only).
+                    Edges (SYSFS backend only) enables input edge detection.
+            writable : True if the bank is to be written (outputs).
+            initLevels : Initial levels of the bank (FAKE backend only).
+        Returns:
+            Backend for the bank of IO.
+        """
+
+        if backend.get("Type", "FAKE") == "SYSFS":
+            try:
+                edges = (not writable) and backend.get("Edges", False)
+                return SysfsIoBackend(self.log, paths, writable, edges)
+            except Exception:
+                self.log.error(f'Failed to create SYSFS IO backend, using FAKE backend.')
+
+        return FakeIoBackend(self.log, len(paths), initLevels)
 
     def importDigitalInputs(self, iFile: str) -> None:
         """
@@ -130,14 +569,19 @@ class SprinklerController(GenericController, Thread):
                 # Import the group name for the inputs.
                 self.inputsGroupName = ic["GroupName"]
                 self.log.debug(f'Importing inputs with group name : {self.inputsGroupName}')
+
+                # Import the hardware backend for the inputs.
+                self.inputsBackend = ic.get("Backend", {"Type": "FAKE"})
+
                 # Go through all the inputs in the config file.
                 # Create the digital inputs instance and add to list.
                 for i in ic["Inputs"]:
                     inputName = i["Name"]
                     # <TODO> Add checks that active level in config is a valid value.
                     inputActiveLevel = ActiveLevel[i["activeLevel"]]
-                    self.digitalInputs.append(DigitalInput(self.log, inputName, inputActiveLevel))
-                    self.log.debug(f'Importing input name : {inputName}; active level : {inputActiveLevel}')
+                    self.digitalInputs.append(DigitalInput(inputName, inputActiveLevel))
+                    self.inputPaths.append(i.get("Path"))
+                    self.log.debug(f'Importing input name : {inputName}; active level : {inputActiveLevel.name}')
         except Exception:
             # Failed to import inputs configuration file.
             self.log.error(f'Failed to import inputs configuration file.')
@@ -161,12 +605,17 @@ class SprinklerController(GenericController, Thread):
                 self.outputsGroupName = oc["GroupName"]
                 self.log.debug(f'Importing outputs with group name : {self.outputsGroupName}')
 
+                # Import the hardware backend for the outputs.
+                self.outputsBackend = oc.get("Backend", {"Type": "FAKE"})
+
                 # Get the master output, this will be digitial output 0.
                 outputName = oc["Master"]["Name"]
                 outputActiveLevel = ActiveLevel[oc["Master"]["activeLevel"]]
-                digOut = DigitalOutput(self.log, outputName, outputActiveLevel)
+                digOut = DigitalOutput(outputName, outputActiveLevel)
                 self.digitalOutputs.append(digOut)
-                self.log.debug(f'Importing MASTER output name : {outputName}; active level : {outputActiveLevel}')
+                self.outputPaths.append(oc["Master"].get("Path"))
+                digOut.level = Level[oc["Master"]["InitLevel"]]
+                self.log.debug(f'Importing MASTER output name : {outputName}; active level : {outputActiveLevel.name}')
 
                 # Go through all the (non-master) outputs in the config file.
                 # Create the digital outputs instance and add to list.
@@ -174,9 +623,14 @@ class SprinklerController(GenericController, Thread):
                     outputName = o["Name"]
                     # <TODO> Add checks that active level in config is a valid value.
                     outputActiveLevel = ActiveLevel[o["activeLevel"]]
-                    digOut = DigitalOutput(self.log, outputName, outputActiveLevel)
+                    digOut = DigitalOutput(outputName, outputActiveLevel)
                     self.digitalOutputs.append(digOut)
-                    self.log.debug(f'Importing output name : {outputName}; active level : {outputActiveLevel}')
+                    self.outputPaths.append(o.get("Path"))
+                    self.log.debug(f'Importing output name : {outputName}; active level : {outputActiveLevel.name}')
+
+                    # Flow rate of the station, stations without one run on their own.
+                    if "FlowRate" in o:
+                        self.stationFlows[len(self.digitalOutputs) - 1] = o["FlowRate"]
 
                     # Set initial output state.
                     digOut.level = Level[o["InitLevel"]]
@@ -185,11 +639,38 @@ class SprinklerController(GenericController, Thread):
             # Failed to import outputs configuration file.
             self.log.error(f'Failed to import outputs configuration file.')
 
+    def importInterlocks(self, rFile: str) -> None:
+        """
+        Import interlock rules configuration file.
+        Rules are compiled into masks over the input and output banks.
+        Parameters:
+            rFile : Name of interlock rules configuration file.
+        """
+
+        # Import the interlock rules configuration file.
+        self.log.debug(f'Importing interlock rules.')
+        inputNames = [i.inputName for i in self.digitalInputs]
+        outputNames = [o.outputName for o in self.digitalOutputs]
+        try:
+            with open(rFile) as rulesConfig:
+                rc = json.load(rulesConfig)
+
+                # Compile each of the rules.
+                # Rules with unknown inputs or outputs are not used.
+                for r in rc["Interlocks"]:
+                    try:
+                        self.interlocks.compileRule(r, inputNames, outputNames)
+                        self.log.debug(f'Importing interlock rule : {r["Name"]}')
+                    except Exception:
+                        self.log.error(f'Failed to import interlock rule : {r.get("Name")}')
+
+        except Exception:
+            # Failed to import interlock rules configuration file.
+            self.log.error(f'Failed to import interlock rules configuration file.')
+
     def importControllerProgram(self, pFile: str) -> None:
         """
         Import controller program configuration file.
-        Perform consistency and feasibility check on data, e.g. that
-        programs are achievable, days/times exist etc.
         Parameters:
             pFile : Name of controller program configuration file.
         """
@@ -197,33 +678,36 @@ class SprinklerController(GenericController, Thread):
         # Import the controller program configuration file.
         self.log.debug(f'Importing controller programs.')
         try:
-            with open(pFile) as programConfig:
-                pc = json.load(programConfig)
-
-                # Import the group name for the outputs.
-                myDays = []
-                # Get the allocated days for the controller.
-                # <TODO> Add checks that days are legitimate days.
-                for day in pc["MyDays"]:
-                    myDays.append(ProgramDays[day])
-                # Import each of the programs.
-                pgs = []
-                for p in pc["Programs"]:
-                    pg = {}
-                    progName = p["Name"]
-                    # <TODO> Add checks that start times and durations are valid,
-                    # would result in the cycke starting and ending in the same day.
-                    for ot in p["OnTimes"]:
-                        startTime = ot["Start"]
-                        duration = ot["Duration"]
-                        stations = []
-                        for st in ot["Stations"]:
-                            stations.append(st)
-                        ots = {"Start": startTime, "Duration": duration, "Stations": stations}
-                    pg = {"Name": progName, "OnTimes": ots}
-                    pgs.append(pg)
-                self.program = {"MyDays": myDays, "Programs": pgs}
+            self.applyProgram(*self.compileProgram(self.loadControllerProgram(pFile)))
 
         except Exception:
             # Failed to import controller program configuration file.
             self.log.error(f'Failed to import controller program configuration file.')
+
+    def loadControllerProgram(self, pFile: str) -> dict:
+        """
+        Load controller program configuration file.
+        Perform consistency and feasibility check on data, e.g. that
+        programs are achievable, days/times exist etc. (parseProgram).
+        Parameters:
+            pFile : Name of controller program configuration file.
+        Returns:
+            Controller program.
+        """
+
+        return loadProgram(pFile)
+
+    def compileProgram(self, program: dict) -> Tuple[dict, Scheduler, RunCalendar]:
+        """
+        Compile the program into a schedule of station runs,
+        packing stations to fit within the supply capacity.
+        Parameters:
+            program : Controller program.
+        Returns:
+            Program, scheduler with the program compiled, and run calendar.
+        """
+
+        scheduler = Scheduler(self.log)
+        scheduler.compile(program, self.stationFlows, self.cfg.Hydraulics["SupplyCapacity"])
+
+        return program, scheduler, RunCalendar(scheduler.runs)
@@ -1,7 +1,5 @@
 #!/usr/bin/env python3
 
-import logging
-
 from generic.genericDigitalOutput import *
 from sprinklers.config import *
 
@@ -11,26 +9,23 @@ class DigitalOutput(GenericDigitalOutput):
     Derive from a generic digital IO class.
     """
 
-    def __init__(self, log: logging, outputName: str, activeLevel: ActiveLevel) -> None:
+    __slots__ = ('outputName',)
+
+    def __init__(self, outputName: str, activeLevel: ActiveLevel) -> None:
         """
         Initialisation method.
         Parameters:
-            log : Mainline logging object.
             outputName : Name for this output.
             activeLevel : Active level, high or low.
         """
 
-        self.log = log
-
         # Super class initialisations.
         # Initialise digital output with active level.
-        GenericDigitalOutput.__init__(self, log, activeLevel)
+        GenericDigitalOutput.__init__(self, activeLevel)
 
         # Initialise specific class variables.
         self.outputName = outputName
 
-        self.log.debug(f'Instantiated digital output with name : {outputName}')
-
     def writeDigitalOuputLevel(self, oLevel: Level) -> None:
         """
         Write digital output.
@@ -48,14 +43,5 @@ class DigitalOutput(GenericDigitalOutput):
             oActive : True if output is to be set active.
         """
 
-        if oActive == True:
-            if self.activeLevel == ActiveLevel.ACTIVE_LOW:
-                self.level = Level.LOW
-            else:
-                self.level = Level.HIGH
-        else:
-            if self.activeLevel == ActiveLevel.ACTIVE_LOW:
-                self.level = Level.HIGH
-            else:
-                self.level = Level.LOW
-
+        # Level for the active condition from the shared polarity table.
+        self.level = ACTIVE_TO_LEVEL[self.polarity][oActive]
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+from collections import deque
+from typing import List, Tuple
+import logging
+import os
+import select
+import time
+
+from generic.genericIoBackend import *
+
+
+class FakeIoBackend(GenericIoBackend):
+    """
+    Class to represent an in-process IO backend, for use without hardware.
+    Levels written are held in memory, and input levels are injected.
+    Each read and write is timed and recorded.
+    Injected level changes are signalled as edges through a pipe.
+    """
+
+    def __init__(self, log: logging, numPoints: int, initLevels: int = 0, historyLen: int = 1000) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            log : Mainline logging object.
+            numPoints : Number of IO points in the bank.
+            initLevels : Initial levels of the bank, bit n for point n.
+            historyLen : Number of reads and writes to keep in history.
+        """
+
+        # Super class initialisations.
+        GenericIoBackend.__init__(self, log, numPoints)
+
+        self.levels = initLevels & self.allMask
+
+        # Timing of reads and writes.
+        # History entries are (monotonic time ns, operation, level mask).
+        self.reads = 0
+        self.writes = 0
+        self.readNs = 0
+        self.writeNs = 0
+        self.history = deque(maxlen=historyLen)
+
+        # Pipe to signal input edges, read end is polled by the controller.
+        self.edgeRead, self.edgeWrite = os.pipe()
+        os.set_blocking(self.edgeRead, False)
+
+    def readAll(self) -> int:
+        """
+        Read the levels of all points in the bank.
+        Returns:
+            Levels of the bank, bit n for point n.
+        """
+
+        tStart = time.monotonic_ns()
+        levels = self.levels
+        tEnd = time.monotonic_ns()
+
+        self.reads += 1
+        self.readNs += tEnd - tStart
+        self.history.append((tEnd, "READ", levels))
+
+        return levels
+
+    def writeMask(self, levelMask: int) -> None:
+        """
+        Write the levels of all points in the bank.
+        Parameters:
+            levelMask : Levels to write, bit n for point n.
+        """
+
+        tStart = time.monotonic_ns()
+        self.levels = levelMask & self.allMask
+        tEnd = time.monotonic_ns()
+
+        self.writes += 1
+        self.writeNs += tEnd - tStart
+        self.history.append((tEnd, "WRITE", self.levels))
+
+    def inject(self, levelMask: int) -> None:
+        """
+        Inject levels into the bank, as if the hardware had changed.
+        Parameters:
+            levelMask : Levels to inject, bit n for point n.
+        """
+
+        levelMask &= self.allMask
+        edge = levelMask != self.levels
+        self.levels = levelMask
+        self.history.append((time.monotonic_ns(), "INJECT", self.levels))
+
+        # Signal an edge if any level has changed.
+        if edge:
+            os.write(self.edgeWrite, b"\0")
+
+    def edgeFds(self) -> List[Tuple[int, int]]:
+        """
+        Get file descriptors to poll for input edges.
+        Returns:
+            List of (file descriptor, poll event mask).
+        """
+
+        return [(self.edgeRead, select.POLLIN)]
+
+    def clearEdges(self) -> None:
+        """
+        Acknowledge input edges, by draining the edge pipe.
+        """
+
+        try:
+            while os.read(self.edgeRead, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self) -> None:
+        """
+        Close the edge pipe.
+        """
+
+        os.close(self.edgeRead)
+        os.close(self.edgeWrite)
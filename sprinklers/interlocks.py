@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+
+from typing import List, Optional
+import logging
+
+
+class InterlockRule():
+    """
+    Class to represent a compiled interlock rule.
+    A rule trips when any of its inputs is active, and suspends its outputs
+    until its inputs have been clear for the resume delay.
+    """
+
+    __slots__ = ('name', 'inputMask', 'outputMask', 'resumeDelay', 'tripped', 'resumeTime')
+
+    def __init__(self, name: str, inputMask: int, outputMask: int, resumeDelay: float) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            name : Name of the rule.
+            inputMask : Inputs that trip the rule, bit n for input n.
+            outputMask : Outputs suspended by the rule, bit n for output n.
+            resumeDelay : Time inputs must be clear before resuming (seconds).
+        """
+
+        self.name = name
+        self.inputMask = inputMask
+        self.outputMask = outputMask
+        self.resumeDelay = resumeDelay
+
+        # Rule state, tripped and time at which to resume once clear.
+        self.tripped = False
+        self.resumeTime = None
+
+
+class Interlocks():
+    """
+    Class to represent the interlock engine of a controller.
+    Rules are compiled into masks over the input and output banks, so that
+    evaluating all the rules is a few mask operations per rule.
+    Rules only need to be evaluated when the inputs change, the outputs
+    wanted change, or a suspended rule is due to resume.
+    """
+
+    def __init__(self, log: logging) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            log : Mainline logging object.
+        """
+
+        self.log = log
+        self.rules = []
+
+        # Outputs currently suspended, bit n for output n.
+        self.suspended = 0
+
+    def compileRule(self, rule: dict, inputNames: List[str], outputNames: List[str]) -> None:
+        """
+        Compile an interlock rule into masks, and add it to the rules.
+        Parameters:
+            rule : Rule from the interlocks configuration.
+            inputNames : Names of the inputs, in input bank order.
+            outputNames : Names of the outputs, in output bank order.
+        """
+
+        inputMask = 0
+        for name in rule["Inputs"]:
+            inputMask |= 1 << inputNames.index(name)
+
+        # Rule outputs are either ALL outputs or a list of output names.
+        if rule["Outputs"] == "ALL":
+            outputMask = (1 << len(outputNames)) - 1
+        else:
+            outputMask = 0
+            for name in rule["Outputs"]:
+                outputMask |= 1 << outputNames.index(f'{name}')
+
+        # Resume delay is configured in minutes.
+        resumeDelay = rule.get("ResumeDelay", 0) * 60.0
+
+        self.rules.append(InterlockRule(rule["Name"], inputMask, outputMask, resumeDelay))
+
+    def evaluate(self, activeInputs: int, now: float) -> int:
+        """
+        Evaluate the interlock rules.
+        Parameters:
+            activeInputs : Active inputs, bit n for input n.
+            now : Current (monotonic) time (seconds).
+        Returns:
+            Outputs suspended by the rules, bit n for output n.
+        """
+
+        suspended = 0
+        for r in self.rules:
+            if activeInputs & r.inputMask:
+                if not r.tripped:
+                    self.log.info(f'Interlock tripped : {r.name}')
+                r.tripped = True
+                r.resumeTime = None
+            elif r.tripped:
+                # Inputs clear, so start counting down to resuming.
+                if r.resumeTime is None:
+                    r.resumeTime = now + r.resumeDelay
+                if now >= r.resumeTime:
+                    self.log.info(f'Interlock resumed : {r.name}')
+                    r.tripped = False
+                    r.resumeTime = None
+
+            if r.tripped:
+                suspended |= r.outputMask
+
+        self.suspended = suspended
+
+        return suspended
+
+    def nextResume(self) -> Optional[float]:
+        """
+        Get the time the next rule is due to resume, if any are counting down.
+        Returns:
+            Next resume (monotonic) time (seconds), or None.
+        """
+
+        times = [r.resumeTime for r in self.rules if r.resumeTime is not None]
+
+        return min(times) if times else None
+
+    def restore(self, ruleStates: List[tuple], age: float, now: float) -> None:
+        """
+        Restore the state of the rules, e.g. from a checkpoint.
+        Time the controller was down counts towards resuming.
+        Parameters:
+            ruleStates : State of each rule, as tripped and resume time remaining (seconds, or None).
+            age : Time since the rule states were saved (seconds).
+            now : Current (monotonic) time (seconds).
+        """
+
+        # Rules are only restored if they are the same rules.
+        if len(ruleStates) != len(self.rules):
+            self.log.warning(f'Interlock rules changed, not restoring interlock state.')
+            return
+
+        for r, (tripped, remaining) in zip(self.rules, ruleStates):
+            r.tripped = tripped
+            r.resumeTime = None if remaining is None else now + max(0.0, remaining - age)
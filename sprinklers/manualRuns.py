@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+
+from collections import deque
+from typing import List, Optional, Tuple
+import heapq
+import itertools
+import logging
+
+
+class ManualRuns():
+    """
+    Class to represent the manual station runs of a controller.
+    Started runs are active straight away, for a time or until stopped.
+    Queued runs run one after another, each starting when the one before ends.
+    The end of each run is an event in a heap (monotonic time), so the
+    controller wakes up when a run ends rather than polling, and the next
+    queued run starts in the same control cycle.
+    """
+
+    def __init__(self, log: logging) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            log : Mainline logging object.
+        """
+
+        self.log = log
+
+        # End time of each running station, None if running until stopped.
+        self.ends = {}
+
+        # Run end events, as time, sequence and station. Events of runs since
+        # stopped or restarted are left in the heap, and skipped.
+        self.events = []
+        self.seq = itertools.count()
+
+        # Queued runs waiting, as station and time (seconds), and the station
+        # of the queued run running, if any.
+        self.queue = deque()
+        self.queued = None
+
+    @property
+    def mask(self) -> int:
+        """
+        Getter property for the running stations, bit n for station n.
+        """
+
+        stations = 0
+        for st in self.ends:
+            stations |= 1 << st
+
+        return stations
+
+    def start(self, station: int, seconds: Optional[float], now: float) -> None:
+        """
+        Start a station, or change the time of a running station.
+        Parameters:
+            station : Station number (1 onwards).
+            seconds : Time to run for (seconds), None until stopped.
+            now : Current (monotonic) time (seconds).
+        """
+
+        if seconds is None:
+            self.ends[station] = None
+        else:
+            end = now + seconds
+            self.ends[station] = end
+            heapq.heappush(self.events, (end, next(self.seq), station))
+
+    def stop(self, station: int) -> None:
+        """
+        Stop a station, and remove it from the queue.
+        Parameters:
+            station : Station number (1 onwards), 0 for all stations.
+        """
+
+        if station == 0:
+            self.ends.clear()
+            self.events.clear()
+            self.queue.clear()
+            self.queued = None
+            return
+
+        self.ends.pop(station, None)
+        self.queue = deque(r for r in self.queue if r[0] != station)
+        if self.queued == station:
+            self.queued = None
+
+    def enqueue(self, runs: List[Tuple[int, float]], now: float) -> None:
+        """
+        Queue runs, to run one after another after any runs already queued.
+        Parameters:
+            runs : Runs, as station and time (seconds).
+            now : Current (monotonic) time (seconds).
+        """
+
+        self.queue.extend(runs)
+        self.advance(now)
+
+    def advance(self, now: float) -> int:
+        """
+        End the runs due to end, and start the next queued run.
+        Parameters:
+            now : Current (monotonic) time (seconds).
+        Returns:
+            Running stations, bit n for station n.
+        """
+
+        while self.events and self.events[0][0] <= now:
+            end, _, station = heapq.heappop(self.events)
+            if self.ends.get(station, -1.0) == end:
+                del self.ends[station]
+                if self.queued == station:
+                    self.queued = None
+                self.log.debug(f'Manual run of station {station} ended.')
+
+        if (self.queued is None) and self.queue:
+            station, seconds = self.queue.popleft()
+            self.queued = station
+            self.start(station, seconds, now)
+            self.log.debug(f'Queued manual run of station {station} started, for {seconds} s.')
+
+        return self.mask
+
+    def restore(self, running: List[Tuple[int, Optional[float]]], queued: List[Tuple[int, float]], queuedStation: Optional[int], age: float, now: float) -> None:
+        """
+        Restore the runs, e.g. from a checkpoint.
+        Time the controller was down counts towards runs ending, and the next
+        queued run starts (on the next advance) if the queued run running ended.
+        Parameters:
+            running : Running stations, as station and time remaining (seconds, None until stopped).
+            queued : Queued runs waiting, as station and time (seconds).
+            queuedStation : Station of the queued run running, None if none.
+            age : Time since the runs were saved (seconds).
+            now : Current (monotonic) time (seconds).
+        """
+
+        self.stop(0)
+        for station, remaining in running:
+            if remaining is None:
+                self.start(station, None, now)
+            elif remaining > age:
+                self.start(station, remaining - age, now)
+        self.queued = queuedStation if queuedStation in self.ends else None
+        self.queue.extend(queued)
+
+    def nextEvent(self) -> Optional[float]:
+        """
+        Get the time of the next run end.
+        Returns:
+            Monotonic time of the next run end, None if none.
+        """
+
+        # Drop events of runs stopped or restarted.
+        while self.events and (self.ends.get(self.events[0][2], -1.0) != self.events[0][0]):
+            heapq.heappop(self.events)
+
+        return self.events[0][0] if self.events else None
+
+    def runs(self, now: float) -> dict:
+        """
+        Get the running and queued runs.
+        Parameters:
+            now : Current (monotonic) time (seconds).
+        Returns:
+            Running stations with time remaining (seconds, -1 until stopped),
+            and queued runs.
+        """
+
+        return {
+            "running" : [{"station" : st, "remaining" : -1.0 if end is None else max(0.0, end - now)} for st, end in sorted(self.ends.items())],
+            "queued" : [{"station" : st, "seconds" : seconds} for st, seconds in self.queue]
+        }
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+
+from typing import Dict, List, Tuple
+import argparse
+import json
+import logging
+
+import numpy as np
+
+from sprinklers.scheduler import *
+from sprinklers.config import *
+
+"""
+What-if evaluation of many candidate controller programs at once, e.g. when
+tuning schedules. Each candidate is validated as it is imported by the
+controller (parseProgram), and held as rows of arrays, one row for each
+station of each on time (candidate, station, start minute of the day,
+duration and day mask). Weekly run time of each station, minutes stations are
+double booked (conflicts), peak concurrent stations, and peak flow against
+the supply capacity are worked out for all candidates together with array
+operations, rather than a loop for each candidate.
+
+Programs are evaluated as written, i.e. before the scheduler packs runs to
+fit the supply capacity, so the results show how much packing a program needs.
+"""
+
+
+def loadStationFlows(oFile: str) -> Tuple[int, Dict[int, float]]:
+    """
+    Load the stations and their flow rates from an outputs configuration file.
+    Parameters:
+        oFile : Name of outputs configuration (json) file.
+    Returns:
+        Number of stations, and flow rate of each station number with one.
+    """
+
+    with open(oFile) as outputsConfig:
+        oc = json.load(outputsConfig)
+
+    flows = {}
+    for n, o in enumerate(oc["Outputs"], 1):
+        if "FlowRate" in o:
+            flows[n] = o["FlowRate"]
+
+    return len(oc["Outputs"]), flows
+
+
+class ProgramArrays():
+    """
+    Class to represent candidate programs, as arrays of station runs.
+    Programs are added one at a time, then built into arrays.
+    """
+
+    def __init__(self, numStations: int) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            numStations : Number of stations (outputs other than the master).
+        """
+
+        self.numStations = numStations
+
+        # Names of the candidates, and their rows as lists until built.
+        self.names = []
+        self.rows = ([], [], [], [], [])
+
+        # Arrays of the rows, one row for each station of each on time.
+        self.candidate = None
+        self.station = None
+        self.start = None
+        self.duration = None
+        self.dayMask = None
+
+    @property
+    def numCandidates(self) -> int:
+        """
+        Getter property for the number of candidate programs.
+        """
+        return len(self.names)
+
+    def add(self, program: dict, name: str) -> int:
+        """
+        Add a candidate program, checking its stations exist.
+        Parameters:
+            program : Controller program, as parsed (parseProgram).
+            name : Name of the candidate, e.g. program file name.
+        Returns:
+            Index of the candidate.
+        """
+
+        # Day mask of the program, bit n for day n (Monday 0).
+        dayMask = 0
+        for day in program["MyDays"]:
+            dayMask |= 1 << (day.value - 1)
+
+        rows = []
+        for pg in program["Programs"]:
+            for ot in pg["OnTimes"]:
+                start = int(ot["Start"][0:2]) * 60 + int(ot["Start"][2:4])
+                for st in ot["Stations"]:
+                    if st > self.numStations:
+                        raise ValueError(f'Program {pg["Name"]} station not an output : {st}')
+                    rows.append((st, start, ot["Duration"]))
+
+        idx = len(self.names)
+        self.names.append(name)
+        candidates, stations, starts, durations, dayMasks = self.rows
+        for st, start, duration in rows:
+            candidates.append(idx)
+            stations.append(st)
+            starts.append(start)
+            durations.append(duration)
+            dayMasks.append(dayMask)
+
+        return idx
+
+    def build(self) -> None:
+        """
+        Build the arrays of the candidate programs added.
+        """
+
+        self.candidate, self.station, self.start, self.duration, self.dayMask = (np.array(r, dtype=np.int64) for r in self.rows)
+
+
+class ProgramEvaluator():
+    """
+    Class to represent the evaluation of candidate programs.
+    Runs are expanded to the days of the week, and each measure is a sweep
+    over sorted start and end events, with cumulative sums for the number
+    of stations (and flow) active, for all candidates at once.
+    """
+
+    def __init__(self, numStations: int, flows: Dict[int, float], capacity: float) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            numStations : Number of stations (outputs other than the master).
+            flows : Flow rate of each station number.
+            capacity : Water supply capacity, 0 for no limit.
+        """
+
+        self.numStations = numStations
+        self.capacity = capacity
+
+        # Flow rate by station number, stations without one use the whole
+        # capacity, as when scheduled.
+        self.flows = np.array([flows.get(st, capacity) for st in range(numStations + 1)], dtype=np.float64)
+
+    def weekRuns(self, arrays: ProgramArrays) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Expand the rows of the candidates to runs on each of their days.
+        Runs past the end of the week wrap to the start of the week.
+        Parameters:
+            arrays : Candidate programs, built.
+        Returns:
+            Candidate, station, start and end (minute of week) of each run.
+        """
+
+        rowIdx, day = np.nonzero((arrays.dayMask[:, None] >> np.arange(7)) & 1)
+        candidate = arrays.candidate[rowIdx]
+        station = arrays.station[rowIdx]
+        start = arrays.start[rowIdx] + day * DAY_MINUTES
+        end = start + arrays.duration[rowIdx]
+
+        wrap = end > WEEK_MINUTES
+        candidate = np.concatenate((candidate, candidate[wrap]))
+        station = np.concatenate((station, station[wrap]))
+        start = np.concatenate((start, np.zeros(np.count_nonzero(wrap), dtype=np.int64)))
+        end = np.concatenate((np.minimum(end, WEEK_MINUTES), end[wrap] - WEEK_MINUTES))
+
+        return candidate, station, start, end
+
+    def sweep(self, group: np.ndarray, start: np.ndarray, end: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """
+        Sort the start and end events of intervals by group and time, ends
+        before starts at the same time, and count the intervals active.
+        Counts of each group return to 0, so one cumulative sum covers all groups.
+        Parameters:
+            group : Group of each interval.
+            start : Start of each interval.
+            end : End of each interval.
+        Returns:
+            Sorted event order, and for each event its group, time, delta
+            (1 start, -1 end), intervals active after it, and time to the
+            next event of the group (0 for the last).
+        """
+
+        groups = np.concatenate((group, group))
+        times = np.concatenate((start, end))
+        deltas = np.concatenate((np.ones(len(start), dtype=np.int64), -np.ones(len(end), dtype=np.int64)))
+
+        order = np.lexsort((deltas, times, groups))
+        groups = groups[order]
+        times = times[order]
+        deltas = deltas[order]
+        level = np.cumsum(deltas)
+
+        held = np.zeros(len(times), dtype=np.int64)
+        if len(times):
+            held[:-1] = np.where(groups[1:] == groups[:-1], times[1:] - times[:-1], 0)
+
+        return order, groups, times, deltas, level, held
+
+    def evaluate(self, arrays: ProgramArrays) -> dict:
+        """
+        Evaluate the candidate programs.
+        Parameters:
+            arrays : Candidate programs, built.
+        Returns:
+            For each candidate, weekly run minutes of each station (station 0
+            not used), total run minutes, conflict minutes (stations double
+            booked), peak concurrent stations, peak flow, and minutes over the
+            supply capacity.
+        """
+
+        numCandidates = arrays.numCandidates
+        width = self.numStations + 1
+        candidate, station, start, end = self.weekRuns(arrays)
+
+        # Run time of each station, runs of the same station counted separately.
+        runMinutes = np.bincount(candidate * width + station, weights=end - start, minlength=numCandidates * width).reshape(numCandidates, width)
+
+        # Sweep the runs of each station, time with more than one run of the
+        # station is a conflict. Runs of a station are merged for concurrency.
+        key = candidate * width + station
+        _, keys, times, deltas, level, held = self.sweep(key, start, end)
+        conflictMinutes = np.bincount(keys // width, weights=held * (level >= 2), minlength=numCandidates)
+
+        prevLevel = level - deltas
+        mergedKey = keys[(prevLevel == 0) & (level > 0)]
+        mergedStart = times[(prevLevel == 0) & (level > 0)]
+        mergedEnd = times[(prevLevel > 0) & (level == 0)]
+
+        # Sweep the merged station runs of each candidate, for the stations
+        # and flow active at once.
+        order, cands, _, deltas, active, held = self.sweep(mergedKey // width, mergedStart, mergedEnd)
+        flows = self.flows[np.concatenate((mergedKey, mergedKey)) % width][order]
+        flowLevel = np.cumsum(deltas * flows)
+
+        peakStations = np.zeros(numCandidates, dtype=np.int64)
+        peakFlow = np.zeros(numCandidates, dtype=np.float64)
+        overCapacityMinutes = np.zeros(numCandidates, dtype=np.float64)
+        if len(cands):
+            firsts = np.flatnonzero(np.concatenate(([True], cands[1:] != cands[:-1])))
+            peakStations[cands[firsts]] = np.maximum.reduceat(active, firsts)
+            peakFlow[cands[firsts]] = np.maximum.reduceat(flowLevel, firsts)
+            if self.capacity > 0:
+                # Allow for rounding of the cumulative flow.
+                overCapacityMinutes = np.bincount(cands, weights=held * (flowLevel > self.capacity + 1e-6), minlength=numCandidates)
+
+        return {
+            "runMinutes" : runMinutes,
+            "totalMinutes" : runMinutes.sum(axis=1),
+            "conflictMinutes" : conflictMinutes,
+            "peakStations" : peakStations,
+            "peakFlow" : peakFlow,
+            "overCapacityMinutes" : overCapacityMinutes
+        }
+
+
+def evaluationList(arrays: ProgramArrays, result: dict) -> List[dict]:
+    """
+    Get the evaluation of each candidate, e.g. to output as json.
+    Parameters:
+        arrays : Candidate programs.
+        result : Evaluation of the candidates.
+    Returns:
+        Evaluation of each candidate.
+    """
+
+    return [{
+        "name" : name,
+        "runMinutes" : {st: int(result["runMinutes"][n, st]) for st in range(1, arrays.numStations + 1) if result["runMinutes"][n, st]},
+        "totalMinutes" : int(result["totalMinutes"][n]),
+        "conflictMinutes" : int(result["conflictMinutes"][n]),
+        "peakStations" : int(result["peakStations"][n]),
+        "peakFlow" : float(result["peakFlow"][n]),
+        "overCapacityMinutes" : int(result["overCapacityMinutes"][n])
+    } for n, name in enumerate(arrays.names)]
+
+
+if __name__ == "__main__":
+
+    # Evaluate candidate program files.
+    parser = argparse.ArgumentParser(description="Evaluate candidate controller programs.")
+    parser.add_argument("programs", type=str, nargs="+", help="Candidate program configuration files.")
+    parser.add_argument("-c", "--config", type=str, default="./config/sprinklers.json", help="Controller configuration file (supply capacity).")
+    parser.add_argument("-o", "--outputs", type=str, default="./config/outputs.json", help="Outputs configuration file.")
+    parser.add_argument("-j", "--json", action="store_true", help="Print the results as json.")
+    args = parser.parse_args()
+
+    log = logging.getLogger("evaluate")
+    log.addHandler(logging.StreamHandler())
+
+    numStations, flows = loadStationFlows(args.outputs)
+    arrays = ProgramArrays(numStations)
+    for pFile in args.programs:
+        try:
+            arrays.add(loadProgram(pFile), pFile)
+        except Exception as e:
+            # Candidates that would fail to import are not evaluated.
+            log.error(f'Failed to import program {pFile} : {e}')
+    arrays.build()
+
+    evaluator = ProgramEvaluator(numStations, flows, Config(args.config).Hydraulics["SupplyCapacity"])
+    evaluations = evaluationList(arrays, evaluator.evaluate(arrays))
+
+    if args.json:
+        print(json.dumps(evaluations, indent=4))
+    else:
+        print(f'{"Program":30s} {"Minutes":>8s} {"Conflicts":>10s} {"Peak":>5s} {"Peak flow":>10s} {"Over cap":>9s}')
+        for e in evaluations:
+            print(f'{e["name"]:30s} {e["totalMinutes"]:8d} {e["conflictMinutes"]:10d} {e["peakStations"]:5d} {e["peakFlow"]:10.1f} {e["overCapacityMinutes"]:9d}')
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+
+from datetime import datetime
+from typing import Iterator, Optional, Tuple
+import argparse
+import csv
+import json
+import logging
+
+from sprinklers.controller import *
+
+"""
+Offline replay of a controller program against a recorded input history,
+e.g. what a program would have done last month given the actual rain inputs.
+The program, outputs and interlock rules are imported and compiled by the
+controller itself, and the scheduler (in the schedule time zone, Clock
+TimeZone) and interlock engine are run with a virtual clock. Time jumps
+straight from one event to the next (input change, schedule change point or
+interlock resume), so a year of history replays in seconds, and the history
+is read a line at a time.
+
+History files are CSV lines of (local) ISO time, input name and active
+(1 or 0), in time order, e.g.
+    2021-11-02T06:40:00,RAIN,1
+Blank lines, lines starting with # and a Time header line are skipped.
+"""
+
+
+def readHistory(hFile: str, inputNames: List[str], log: logging) -> Iterator[Tuple[datetime, int, bool]]:
+    """
+    Read an input history file, one line at a time.
+    Lines of unknown inputs, or out of time order, are skipped.
+    Parameters:
+        hFile : Name of input history (csv) file.
+        inputNames : Names of the inputs, in input bank order.
+        log : Mainline logging object.
+    Returns:
+        Iterator of input changes, as time, input number and active.
+    """
+
+    inputIdxs = {name: n for n, name in enumerate(inputNames)}
+    last = None
+    with open(hFile, newline="") as historyFile:
+        for lineNum, line in enumerate(csv.reader(historyFile), 1):
+            if (not line) or line[0].startswith("#") or (line[0].strip() == "Time"):
+                continue
+            try:
+                t = datetime.fromisoformat(line[0].strip())
+                idx = inputIdxs[line[1].strip()]
+                active = line[2].strip().upper() in ("1", "TRUE", "ACTIVE")
+            except Exception:
+                log.warning(f'Skipping history line {lineNum}, not a known input change : {line}')
+                continue
+            if last is not None and t < last:
+                log.warning(f'Skipping history line {lineNum}, out of time order : {line}')
+                continue
+            last = t
+            yield t, idx, active
+
+
+class ReplayController(SprinklerController):
+    """
+    Class to represent a sprinkler controller replayed offline.
+    The controller is never started, and IO is always on fake backends,
+    so replaying on a controller doesn't write its hardware outputs.
+    """
+
+    def __init__(self, config: Config, log: logging, iFile: str, oFile: str, pFile: str, rFile: str) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            config : Mainline configuration object.
+            log : Mainline logging object.
+            iFile : Name of inputs configuration (json) file.
+            oFile : Name of outputs configuration (json) file.
+            pFile : Name of controller program configuration (json) file.
+            rFile : Name of interlock rules configuration (json) file.
+        """
+
+        # No state checkpoint for replays.
+        SprinklerController.__init__(self, config, log, "Replay", iFile, oFile, pFile, rFile, "")
+
+    def createIoBackend(self, backend: dict, paths: list, writable: bool, initLevels: int) -> GenericIoBackend:
+        """
+        Create a fake backend for a bank of IO, whatever the IO configuration.
+        Parameters:
+            backend : Backend section of the IO configuration (not used).
+            paths : Value file path of each IO point.
+            writable : True if the bank is to be written (outputs).
+            initLevels : Initial levels of the bank.
+        Returns:
+            Fake backend for the bank of IO.
+        """
+
+        return FakeIoBackend(self.log, len(paths), initLevels)
+
+    def replay(self, history: Iterator[Tuple[datetime, int, bool]], mode: ControllerMode, start: Optional[datetime] = None, end: Optional[datetime] = None) -> dict:
+        """
+        Replay the program against an input history, with a virtual clock.
+        At each event the outputs are worked out as in a control cycle, and
+        held until the next event. Virtual monotonic time is seconds from the
+        start, and wall clock times are mapped to it in the schedule time zone.
+        Parameters:
+            history : Input changes in time order, as (local) time, input number and active.
+            mode : Controller mode to replay in.
+            start : Time to start the replay, None from the first input change.
+            end : Time to end the replay, None at the last input change.
+        Returns:
+            Replay period, and per station run totals and water use.
+        """
+
+        self.mode = mode
+        numStations = len(self.digitalOutputs) - 1
+
+        # Per station totals, seconds with the program wanting the station on,
+        # running, and suspended by interlocks, and number of runs.
+        scheduled = [0.0] * (numStations + 1)
+        running = [0.0] * (numStations + 1)
+        suspendedTime = [0.0] * (numStations + 1)
+        runs = [0] * (numStations + 1)
+
+        # Inputs before the start only set the initial input state.
+        activeInputs = 0
+        numEvents = 0
+        event = next(history, None)
+        if start is None:
+            if event is None:
+                raise ValueError("No start time, and no input history.")
+            start = event[0]
+        startEpoch = self.zoned.wallEpoch(start)
+        endTime = None if end is None else self.zoned.wallEpoch(end) - startEpoch
+        while event is not None and event[0] <= start:
+            activeInputs = (activeInputs | (1 << event[1])) if event[2] else (activeInputs & ~(1 << event[1]))
+            numEvents += 1
+            event = next(history, None)
+        eventTime = None if event is None else self.zoned.wallEpoch(event[0]) - startEpoch
+
+        now = 0.0
+        lastActive = 0
+        numSteps = 0
+        while (now < endTime) if endTime is not None else (event is not None):
+            # As a control cycle, at the virtual time.
+            demandMask = self.scheduledOutputs(startEpoch + now, now)
+            suspended = self.interlocks.evaluate(activeInputs, now)
+            activeMask = self.interlockedOutputs(demandMask, suspended)
+
+            # Outputs are held until the next event.
+            nextTime = self.zoned.nextChange(startEpoch + now) - startEpoch
+            resumeTime = self.interlocks.nextResume()
+            if resumeTime is not None:
+                nextTime = min(nextTime, resumeTime)
+            if eventTime is not None:
+                nextTime = min(nextTime, eventTime)
+            if endTime is not None:
+                nextTime = min(nextTime, endTime)
+            nextTime = max(nextTime, now + 1e-6)
+            held = nextTime - now
+
+            for st in range(1, numStations + 1):
+                bit = 1 << st
+                if demandMask & bit:
+                    scheduled[st] += held
+                    if not (activeMask & bit):
+                        suspendedTime[st] += held
+                if activeMask & bit:
+                    running[st] += held
+                    if not (lastActive & bit):
+                        runs[st] += 1
+            lastActive = activeMask
+            numSteps += 1
+
+            # Apply the input changes due.
+            now = nextTime
+            while eventTime is not None and eventTime <= now:
+                activeInputs = (activeInputs | (1 << event[1])) if event[2] else (activeInputs & ~(1 << event[1]))
+                numEvents += 1
+                event = next(history, None)
+                eventTime = None if event is None else self.zoned.wallEpoch(event[0]) - startEpoch
+
+        stations = []
+        for st in range(1, numStations + 1):
+            flow = self.stationFlows.get(st)
+            stations.append({
+                "station" : st,
+                "sName" : self.digitalOutputs[st].outputName,
+                "runs" : runs[st],
+                "scheduledMinutes" : scheduled[st] / 60.0,
+                "runMinutes" : running[st] / 60.0,
+                "suspendedMinutes" : suspendedTime[st] / 60.0,
+                "water" : None if flow is None else flow * running[st] / 60.0
+            })
+
+        return {
+            "start" : start.isoformat(),
+            "end" : self.clock.localTime(startEpoch + now).replace(tzinfo=None).isoformat(),
+            "mode" : mode.name,
+            "inputEvents" : numEvents,
+            "steps" : numSteps,
+            "stations" : stations,
+            "totalRunMinutes" : sum(running) / 60.0,
+            "totalWater" : sum(s["water"] for s in stations if s["water"] is not None)
+        }
+
+
+def printReplay(result: dict) -> None:
+    """
+    Print the results of a replay as a table.
+    Parameters:
+        result : Results of the replay.
+    """
+
+    print(f'Replay {result["start"]} to {result["end"]} in {result["mode"]} mode, {result["inputEvents"]} input changes.')
+    print(f'{"Station":>8s} {"Name":>10s} {"Runs":>6s} {"Scheduled":>10s} {"Run":>10s} {"Suspended":>10s} {"Water":>10s}')
+    for s in result["stations"]:
+        water = "-" if s["water"] is None else f'{s["water"]:.1f}'
+        print(f'{s["station"]:8d} {s["sName"]:>10s} {s["runs"]:6d} {s["scheduledMinutes"]:10.1f} {s["runMinutes"]:10.1f} {s["suspendedMinutes"]:10.1f} {water:>10s}')
+    print(f'Total run time {result["totalRunMinutes"]:.1f} minutes, water {result["totalWater"]:.1f}.')
+
+
+if __name__ == "__main__":
+
+    # Replay a program against an input history.
+    parser = argparse.ArgumentParser(description="Replay a controller program against an input history.")
+    parser.add_argument("history", type=str, help="Input history (csv) file.")
+    parser.add_argument("-c", "--config", type=str, default="./config/sprinklers.json", help="Controller configuration file.")
+    parser.add_argument("-i", "--inputs", type=str, default="./config/inputs.json", help="Inputs configuration file.")
+    parser.add_argument("-o", "--outputs", type=str, default="./config/outputs.json", help="Outputs configuration file.")
+    parser.add_argument("-p", "--program", type=str, default="./config/program.json", help="Program configuration file.")
+    parser.add_argument("-r", "--rules", type=str, default="./config/interlocks.json", help="Interlock rules configuration file.")
+    parser.add_argument("-m", "--mode", type=str, default="AUTO", choices=[m.name for m in ControllerMode], help="Controller mode.")
+    parser.add_argument("-s", "--start", type=datetime.fromisoformat, default=None, help="Start time (ISO), default first input change.")
+    parser.add_argument("-e", "--end", type=datetime.fromisoformat, default=None, help="End time (ISO), default last input change.")
+    parser.add_argument("-j", "--json", action="store_true", help="Print the results as json.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log interlocks and schedule changes.")
+    args = parser.parse_args()
+
+    log = logging.getLogger("replay")
+    log.setLevel(logging.DEBUG if args.verbose else logging.WARNING)
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(fmt="[%(levelname)-8s] %(message)s"))
+    log.addHandler(handler)
+
+    ctrl = ReplayController(Config(args.config), log, args.inputs, args.outputs, args.program, args.rules)
+    history = readHistory(args.history, [i.inputName for i in ctrl.digitalInputs], log)
+    result = ctrl.replay(history, ControllerMode[args.mode], args.start, args.end)
+
+    if args.json:
+        print(json.dumps(result, indent=4))
+    else:
+        printReplay(result)
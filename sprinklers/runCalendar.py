@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+
+from array import array
+from typing import List, Optional, Tuple
+
+from sprinklers.scheduler import *
+
+# Calendar index for no run.
+NO_RUN = -1
+
+
+class RunCalendar():
+    """
+    Class to represent the run calendar of a controller.
+    The weekly schedule repeats, so the calendar covers a rolling 7 days.
+    Built from the compiled schedule whenever the program changes, with
+    minute resolution lookup tables so that "what is next" queries for any
+    minute are answered in constant time.
+    """
+
+    def __init__(self, runs: List[StationRun]) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            runs : Station runs of the compiled schedule.
+        """
+
+        # Runs sorted by start minute within the week.
+        self.runs = sorted(runs, key=lambda r: (r.start % WEEK_MINUTES, r.station))
+        self.starts = [r.start % WEEK_MINUTES for r in self.runs]
+
+        # Index of the next run to start at (or after) each minute of the week.
+        self.nextRun = self.buildNext(list(range(len(self.runs))), False)
+
+        # For each station, index of the run active at each minute of the
+        # week, else the next run of the station to start.
+        stationIdxs = {}
+        for n, r in enumerate(self.runs):
+            stationIdxs.setdefault(r.station, []).append(n)
+        self.stationRuns = {st: self.buildNext(idxs, True) for st, idxs in stationIdxs.items()}
+
+    def buildNext(self, idxs: List[int], includeActive: bool) -> array:
+        """
+        Build a minute of the week table of run indexes.
+        Parameters:
+            idxs : Indexes of the runs to include, in start order.
+            includeActive : True if a run is also used for the minutes it is active.
+        Returns:
+            Run index for each minute of the week, NO_RUN if none.
+        """
+
+        table = array('i', [NO_RUN]) * WEEK_MINUTES
+        if not idxs:
+            return table
+
+        # Walk the minutes backwards, so the next run is the last one passed.
+        # After the last start of the week, the next run is the first of the
+        # following week.
+        current = idxs[0]
+        pos = len(idxs) - 1
+        for minute in range(WEEK_MINUTES - 1, -1, -1):
+            while pos >= 0 and self.starts[idxs[pos]] >= minute:
+                current = idxs[pos]
+                pos -= 1
+            table[minute] = current
+
+        # Minutes a run is active point at that run.
+        if includeActive:
+            for n in idxs:
+                r = self.runs[n]
+                for m in range(self.starts[n], self.starts[n] + r.end - r.start):
+                    table[m % WEEK_MINUTES] = n
+
+        return table
+
+    def minutesUntil(self, idx: int, minute: int) -> int:
+        """
+        Get minutes from a minute of the week until a run starts.
+        Parameters:
+            idx : Index of the run.
+            minute : Minute of the week.
+        Returns:
+            Minutes until the run starts.
+        """
+
+        return (self.starts[idx] - minute) % WEEK_MINUTES
+
+    def nextStart(self, minute: int) -> Optional[Tuple[StationRun, int]]:
+        """
+        Get the next run to start, at or after a minute of the week.
+        Parameters:
+            minute : Minute of the week.
+        Returns:
+            Next run and minutes until it starts, None if there are no runs.
+        """
+
+        idx = self.nextRun[minute % WEEK_MINUTES]
+        if idx == NO_RUN:
+            return None
+
+        return self.runs[idx], self.minutesUntil(idx, minute)
+
+    def station(self, station: int, minute: int) -> Tuple[int, int, int]:
+        """
+        Get the run state of a station at a minute of the week.
+        Parameters:
+            station : Station number.
+            minute : Minute of the week.
+        Returns:
+            Minutes remaining of an active run (0 if not active),
+            minutes until the next run starts (NO_RUN if none),
+            and duration of the next run (minutes).
+        """
+
+        table = self.stationRuns.get(station)
+        if table is None:
+            return 0, NO_RUN, 0
+
+        minute %= WEEK_MINUTES
+        idx = table[minute]
+        r = self.runs[idx]
+        sinceStart = (minute - self.starts[idx]) % WEEK_MINUTES
+        if sinceStart < r.end - r.start:
+            # Run is active, so the next run is the one after it.
+            # If it is the only run of the station, that is next week.
+            remaining = r.end - r.start - sinceStart
+            nextIdx = table[(self.starts[idx] + r.end - r.start) % WEEK_MINUTES]
+            if nextIdx == idx:
+                return remaining, WEEK_MINUTES - sinceStart, r.end - r.start
+            nr = self.runs[nextIdx]
+            return remaining, self.minutesUntil(nextIdx, minute), nr.end - nr.start
+
+        return 0, self.minutesUntil(idx, minute), r.end - r.start
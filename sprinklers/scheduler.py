@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+
+from bisect import bisect_right
+from datetime import datetime
+from typing import Dict, List
+import heapq
+import json
+import logging
+
+from sprinklers.constants import *
+
+# Minutes in a day and in a week. Schedule times are minutes of the week,
+# from 00:00 Monday.
+DAY_MINUTES = 24 * 60
+WEEK_MINUTES = 7 * DAY_MINUTES
+
+
+def minuteOfWeek(dt: datetime) -> int:
+    """
+    Get the minute of the week for a (local) time.
+    Parameters:
+        dt : Time to get minute of the week for.
+    Returns:
+        Minute of the week, from 00:00 Monday.
+    """
+
+    return dt.weekday() * DAY_MINUTES + dt.hour * 60 + dt.minute
+
+
+def parseProgram(pc: dict) -> dict:
+    """
+    Parse a controller program configuration, as read from a file.
+    Perform consistency and feasibility check on data, e.g. that
+    days exist, and start times and durations are valid.
+    Parameters:
+        pc : Controller program configuration.
+    Returns:
+        Controller program.
+    """
+
+    # Get the allocated days for the controller.
+    # Days that are not days of the week fail (ProgramDays).
+    myDays = []
+    for day in pc["MyDays"]:
+        myDays.append(ProgramDays[day])
+    # Import each of the programs.
+    pgs = []
+    for p in pc["Programs"]:
+        progName = p["Name"]
+        ots = []
+        for ot in p["OnTimes"]:
+            # Start times are HHMM in the day, durations whole minutes.
+            startTime = ot["Start"]
+            if (len(startTime) != 4) or (not startTime.isdigit()) or (int(startTime[0:2]) > 23) or (int(startTime[2:4]) > 59):
+                raise ValueError(f'Program {progName} start time not valid : {startTime}')
+            duration = ot["Duration"]
+            if (not isinstance(duration, int)) or (duration <= 0):
+                raise ValueError(f'Program {progName} duration not valid : {duration}')
+            stations = []
+            for st in ot["Stations"]:
+                if (not isinstance(st, int)) or (st < 1):
+                    raise ValueError(f'Program {progName} station not valid : {st}')
+                stations.append(st)
+            ots.append({"Start": startTime, "Duration": duration, "Stations": stations})
+        pgs.append({"Name": progName, "OnTimes": ots})
+
+    return {"MyDays": myDays, "Programs": pgs}
+
+
+def loadProgram(pFile: str) -> dict:
+    """
+    Load and parse a controller program configuration file.
+    Parameters:
+        pFile : Name of controller program configuration file.
+    Returns:
+        Controller program.
+    """
+
+    with open(pFile) as programConfig:
+        return parseProgram(json.load(programConfig))
+
+
+class StationRun():
+    """
+    Class to represent a run of a station in the compiled schedule.
+    Times are minutes of the week, and may pass the end of the week (wrap).
+    """
+
+    __slots__ = ('station', 'start', 'end', 'flow', 'program')
+
+    def __init__(self, station: int, start: int, end: int, flow: float, program: str) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            station : Station number (1 onwards).
+            start : Start minute of the week.
+            end : End minute of the week.
+            flow : Flow rate of the station.
+            program : Name of the program the run is for.
+        """
+
+        self.station = station
+        self.start = start
+        self.end = end
+        self.flow = flow
+        self.program = program
+
+
+class Scheduler():
+    """
+    Class to represent the program scheduler of a controller.
+    The controller program is compiled into a weekly schedule of station runs.
+    Stations of on times that overlap share the water supply, so runs are
+    packed into time slots to finish as soon as possible without the total
+    flow of concurrent stations going over the supply capacity.
+    """
+
+    def __init__(self, log: logging) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            log : Mainline logging object.
+        """
+
+        self.log = log
+
+        # Compiled schedule, runs sorted by start.
+        self.runs = []
+
+        # Station outputs active from each change point (minute of week),
+        # as sorted change point minutes and active station masks.
+        self.changeMinutes = [0]
+        self.changeMasks = [0]
+
+    def compile(self, program: dict, flows: Dict[int, float], capacity: float) -> None:
+        """
+        Compile the controller program into a weekly schedule.
+        Parameters:
+            program : Controller program, as imported.
+            flows : Flow rate of each station number.
+            capacity : Water supply capacity, 0 for no limit.
+        """
+
+        # Each station of each on time is a job, released at the on time start.
+        jobs = []
+        for day in program.get("MyDays", []):
+            dayStart = (day.value - 1) * DAY_MINUTES
+            for pg in program["Programs"]:
+                for ot in pg["OnTimes"]:
+                    release = dayStart + int(ot["Start"][0:2]) * 60 + int(ot["Start"][2:4])
+                    for st in ot["Stations"]:
+                        jobs.append((release, ot["Duration"], flows.get(st, capacity), st, pg["Name"]))
+
+        self.runs = self.pack(jobs, capacity)
+        self.buildChangePoints()
+
+        self.log.debug(f'Compiled schedule of {len(self.runs)} station runs.')
+
+    def pack(self, jobs: list, capacity: float) -> List[StationRun]:
+        """
+        Pack station jobs into runs, without exceeding the supply capacity.
+        Greedy list scheduling, at each time a job is released or a run ends,
+        start waiting jobs (earliest released, then largest flow first) that
+        fit in the remaining capacity. A station only runs once at a time, and
+        a station with a flow over the capacity runs on its own.
+        Parameters:
+            jobs : Jobs as (release minute, duration, flow, station, program).
+            capacity : Water supply capacity, 0 for no limit.
+        Returns:
+            Station runs, sorted by start.
+        """
+
+        if capacity <= 0:
+            capacity = float("inf")
+
+        # Jobs in release order, largest flow first for the same release.
+        jobs = sorted(jobs, key=lambda j: (j[0], -j[2], j[3]))
+        minFlow = min((j[2] for j in jobs), default=0.0)
+
+        runs = []
+        running = []
+        busy = set()
+        used = 0.0
+        waiting = []
+        nextJob = 0
+
+        while nextJob < len(jobs) or waiting:
+            # Time is the next release, or run end, whichever is sooner.
+            times = []
+            if running:
+                times.append(running[0][0])
+            if nextJob < len(jobs):
+                times.append(jobs[nextJob][0])
+            now = min(times)
+
+            # Finish runs that have ended.
+            while running and running[0][0] <= now:
+                _, flow, station = heapq.heappop(running)
+                used -= flow
+                busy.discard(station)
+
+            # Release jobs that are due.
+            while nextJob < len(jobs) and jobs[nextJob][0] <= now:
+                waiting.append(jobs[nextJob])
+                nextJob += 1
+
+            # Start waiting jobs that fit.
+            # Stop looking once no job could fit in the remaining capacity.
+            stillWaiting = []
+            for n, job in enumerate(waiting):
+                if capacity - used < minFlow and running:
+                    stillWaiting.extend(waiting[n:])
+                    break
+                release, duration, flow, station, progName = job
+                fits = (used + flow <= capacity) or (not running and flow > capacity)
+                if fits and station not in busy:
+                    if flow > capacity:
+                        self.log.warning(f'Station {station} flow exceeds supply capacity, running alone.')
+                    runs.append(StationRun(station, now, now + duration, flow, progName))
+                    heapq.heappush(running, (now + duration, flow, station))
+                    used += flow
+                    busy.add(station)
+                else:
+                    stillWaiting.append(job)
+            waiting = stillWaiting
+
+        runs.sort(key=lambda r: (r.start, r.station))
+
+        return runs
+
+    def buildChangePoints(self) -> None:
+        """
+        Build the change points of the active stations over the week,
+        so that the stations active at any minute are found by bisection.
+        Runs past the end of the week wrap to the start of the week.
+        """
+
+        # Station bit count changes at each minute.
+        deltas = {}
+        for r in self.runs:
+            if r.end <= r.start:
+                continue
+            start = r.start % WEEK_MINUTES
+            end = start + r.end - r.start
+            spans = [(start, end)] if end <= WEEK_MINUTES else [(start, WEEK_MINUTES), (0, end - WEEK_MINUTES)]
+            for s, e in spans:
+                deltas.setdefault(s, {}).setdefault(r.station, 0)
+                deltas[s][r.station] += 1
+                deltas.setdefault(e, {}).setdefault(r.station, 0)
+                deltas[e][r.station] -= 1
+
+        counts = {}
+        self.changeMinutes = [0]
+        self.changeMasks = [0]
+        for minute in sorted(deltas):
+            for station, delta in deltas[minute].items():
+                counts[station] = counts.get(station, 0) + delta
+            mask = 0
+            for station, count in counts.items():
+                if count > 0:
+                    mask |= 1 << station
+            if minute == self.changeMinutes[-1]:
+                self.changeMasks[-1] = mask
+            else:
+                self.changeMinutes.append(minute)
+                self.changeMasks.append(mask)
+
+    def stationsAt(self, minute: int) -> int:
+        """
+        Get the stations the schedule has active at a minute of the week.
+        Parameters:
+            minute : Minute of the week.
+        Returns:
+            Active station outputs, bit n for output n (station n).
+        """
+
+        return self.changeMasks[bisect_right(self.changeMinutes, minute % WEEK_MINUTES) - 1]
+
+    def totalMinutes(self) -> int:
+        """
+        Get the total run time of the schedule, i.e. the time that any
+        station is running, with concurrent runs counted once.
+        Returns:
+            Total run time (minutes).
+        """
+
+        total = 0
+        spanStart = None
+        spanEnd = None
+        for r in self.runs:
+            if spanEnd is None or r.start >= spanEnd:
+                if spanEnd is not None:
+                    total += spanEnd - spanStart
+                spanStart = r.start
+                spanEnd = r.end
+            else:
+                spanEnd = max(spanEnd, r.end)
+        if spanEnd is not None:
+            total += spanEnd - spanStart
+
+        return total
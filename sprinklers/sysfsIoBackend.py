@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+from typing import List, Tuple
+import logging
+import os
+import select
+
+from generic.genericIoBackend import *
+
+
+class SysfsIoBackend(GenericIoBackend):
+    """
+    Class to represent a file backed IO backend.
+    Each IO point is a value file holding "0" or "1", as for Linux sysfs GPIO
+    lines (e.g. /sys/class/gpio/gpio17/value). GPIO lines must already be
+    exported with their direction set. Any plain files can be used instead,
+    so the backend can be run on any Linux box.
+    Files are kept open, and a write only touches points that have changed.
+    If edges are enabled, GPIO lines are set to interrupt on both edges, and
+    the value files are polled (POLLPRI) for edges. Plain files never signal.
+    """
+
+    def __init__(self, log: logging, paths: List[str], writable: bool, edges: bool = False) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            log : Mainline logging object.
+            paths : Value file path for each IO point, in bank order.
+            writable : True if the bank is to be written (outputs).
+            edges : True if edges of the bank are to be signalled (inputs).
+        """
+
+        # Super class initialisations.
+        GenericIoBackend.__init__(self, log, len(paths))
+
+        self.paths = paths
+
+        # Open all the value files up front.
+        # If any fails to open, close those already open before failing.
+        flags = os.O_RDWR if writable else os.O_RDONLY
+        self.fds = []
+        try:
+            for p in paths:
+                self.fds.append(os.open(p, flags))
+        except OSError:
+            self.close()
+            raise
+
+        # Levels last written, so that only changed points are written.
+        self.written = None
+
+        # Set GPIO lines to interrupt on both edges, using the edge file
+        # next to each value file. Not all lines (or files) support this.
+        self.edges = edges
+        if edges:
+            for p in paths:
+                try:
+                    with open(os.path.join(os.path.dirname(p), "edge"), "w") as edgeFile:
+                        edgeFile.write("both")
+                except Exception:
+                    self.log.warning(f'Failed to set edge detection for : {p}')
+
+        self.log.debug(f'Opened sysfs IO backend with {len(paths)} points.')
+
+    def readAll(self) -> int:
+        """
+        Read the levels of all points in the bank.
+        Returns:
+            Levels of the bank, bit n for point n.
+        """
+
+        levels = 0
+        for n, fd in enumerate(self.fds):
+            if os.pread(fd, 1, 0) == b"1":
+                levels |= 1 << n
+
+        return levels
+
+    def writeMask(self, levelMask: int) -> None:
+        """
+        Write the levels of all points in the bank.
+        Parameters:
+            levelMask : Levels to write, bit n for point n.
+        """
+
+        levelMask &= self.allMask
+
+        # Only write points whose level has changed since the last write.
+        changed = self.allMask if self.written is None else levelMask ^ self.written
+        n = 0
+        while changed:
+            if changed & 1:
+                os.pwrite(self.fds[n], b"1" if (levelMask >> n) & 1 else b"0", 0)
+            changed >>= 1
+            n += 1
+
+        self.written = levelMask
+
+    def edgeFds(self) -> List[Tuple[int, int]]:
+        """
+        Get file descriptors to poll for input edges.
+        Returns:
+            List of (file descriptor, poll event mask), empty if edges not enabled.
+        """
+
+        if not self.edges:
+            return []
+
+        return [(fd, select.POLLPRI | select.POLLERR) for fd in self.fds]
+
+    def clearEdges(self) -> None:
+        """
+        Acknowledge input edges, reading each value file clears its edge.
+        """
+
+        self.readAll()
+
+    def close(self) -> None:
+        """
+        Close all the value files.
+        """
+
+        for fd in self.fds:
+            os.close(fd)
+        self.fds = []
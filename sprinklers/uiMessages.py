@@ -3,6 +3,7 @@
 from datetime import datetime
 import logging
 import json
+import time
 
 import grpc
 import sprinklers.ui_pb2 as ui_pb2
@@ -29,6 +30,16 @@ class UiCommands(ui_pb2_grpc.UiMessages):
         self.log = log
         self.ctrl = ctrl
 
+        # Version of the controller status, changes when the status
+        # (other than time) changes, so the UI can tell if it has changed.
+        # Starts from the time (ms), so versions aren't reused after a restart,
+        # and goes up with the controller snapshots.
+        self.versionBase = time.time_ns() // 1000000
+
+        # Snapshot last serialised, and its serialised program, inputs and outputs.
+        # Replaced as a whole, so threads read it without locks.
+        self.serialised = (None, "", "", "")
+
     def GetControllerStatus(self, request, context):
         """
         Respond to controller status request from UI.
@@ -36,18 +47,18 @@ class UiCommands(ui_pb2_grpc.UiMessages):
 
         if request.cmd == ui_pb2.UiCmd.U_CNTRL_STATUS:
             try:
-                # Respond to the UI.
+                # Respond to the UI, all from the same snapshot of the controller state.
+                snap = self.ctrl.snapshot
                 resp = ui_pb2.ControllerStatusResp()
                 resp.status = ui_pb2.StatusCmdStatus.US_GOOD
                 resp.name = self.cfg.ControllerName
-                resp.state = self.ctrl.state.name
+                resp.state = snap.state.name
                 # Show day of the week in controller time, so that user can compare with program.
-                resp.cTime = datetime.now().strftime("%A, %d/%m/%Y, %H:%M:%S")
-                resp.mode = self.ctrl.mode.name
+                resp.cTime = self.ctrl.clock.localTime().strftime("%A, %d/%m/%Y, %H:%M:%S")
+                resp.mode = snap.mode.name
                 # Serialise controller data - inputs, outputs, controller program.
-                resp.program = self.programSerialised()
-                resp.inputs = self.inputsSerialised()
-                resp.outputs = self.outputsSerialised()
+                _, resp.program, resp.inputs, resp.outputs = self.snapshotSerialised(snap)
+                resp.version = self.versionBase + snap.seq
                 return resp
 
             except grpc.RpcError as e:
@@ -63,6 +74,35 @@ class UiCommands(ui_pb2_grpc.UiMessages):
             self.log.error(f'Unexpected command from UI : {request.cmd}')
             return ui_pb2.ui_pb2.ControllerStatusResp()
 
+    def GetUpcomingRuns(self, request, context):
+        """
+        Respond to upcoming runs request from UI.
+        """
+
+        if request.cmd == ui_pb2.UiCmd.U_UPCOMING_RUNS:
+            try:
+                # Respond to the UI.
+                resp = ui_pb2.UpcomingRunsResp()
+                resp.status = ui_pb2.StatusCmdStatus.US_GOOD
+                now = self.ctrl.clock.localTime()
+                resp.cTime = now.strftime("%A, %d/%m/%Y, %H:%M:%S")
+                # Serialise upcoming runs from the run calendar.
+                resp.runs = self.upcomingRunsSerialised(minuteOfWeek(now))
+                return resp
+
+            except grpc.RpcError as e:
+                # Server-side GRPC error.
+                context.set_code(ui_pb2.StatusCmdStatus.US_SERVER_EXCEPTION)
+                context.set_details(f"Server exception, status : {e.code()}; details : {e.details()}")
+                self.log.error(f'Server exception, status : {e.code()}; details : {e.details()}')
+                return ui_pb2.UpcomingRunsResp()
+        else:
+            # Unexpected command in upcoming runs request.
+            context.set_code(ui_pb2.StatusCmdStatus.US_UNEXPECTED_CMD)
+            context.set_details("Unexpected command.")
+            self.log.error(f'Unexpected command from UI : {request.cmd}')
+            return ui_pb2.UpcomingRunsResp()
+
     def SetControllerMode(self, request, context):
         """
         Respond to controller mode set request from UI.
@@ -94,21 +134,101 @@ class UiCommands(ui_pb2_grpc.UiMessages):
             self.log.error(f'Unexpected command from UI : {request.cmd}')
             return ui_pb2.ui_pb2.SetControllerModeResp()
 
-    def inputsSerialised(self) -> str:
+    def StartStation(self, request, context):
+        """
+        Respond to start station (manual run) request from UI.
+        """
+
+        if request.cmd == ui_pb2.UiModeControl.C_START_STATION:
+            return self.manualRunResp(self.ctrl.startStation(request.station, float(request.seconds)))
+        else:
+            return self.unexpectedManualCmd(request, context)
+
+    def StopStation(self, request, context):
+        """
+        Respond to stop station (manual run) request from UI.
+        """
+
+        if request.cmd == ui_pb2.UiModeControl.C_STOP_STATION:
+            return self.manualRunResp(self.ctrl.stopStation(request.station))
+        else:
+            return self.unexpectedManualCmd(request, context)
+
+    def QueueStations(self, request, context):
+        """
+        Respond to queue stations (manual runs) request from UI.
+        """
+
+        if request.cmd == ui_pb2.UiModeControl.C_QUEUE_STATIONS:
+            return self.manualRunResp(self.ctrl.queueStations([(r.station, float(r.seconds)) for r in request.runs]))
+        else:
+            return self.unexpectedManualCmd(request, context)
+
+    def manualRunResp(self, result: tuple) -> ui_pb2.ManualRunResp:
+        """
+        Make the response to a manual run request, with the manual runs after the request.
+        Parameters:
+            result : Status and reason of the manual run command.
+        Returns:
+            Response.
+        """
+
+        setStatus, setReason = result
+        resp = ui_pb2.ManualRunResp()
+        resp.status = setStatus
+        resp.reason = setReason.name
+        try:
+            resp.runs = json.dumps(self.ctrl.manualRuns())
+        except (CommandQueueFullError, CommandTimeoutError):
+            # Command was done, but the runs aren't available.
+            pass
+
+        return resp
+
+    def unexpectedManualCmd(self, request, context) -> ui_pb2.ManualRunResp:
+        """
+        Respond to an unexpected command in a manual run request.
+        """
+
+        context.set_code(ui_pb2.UiModeStatus.CS_UNEXPECTED_CMD)
+        context.set_details("Unexpected command.")
+        self.log.error(f'Unexpected command from UI : {request.cmd}')
+        return ui_pb2.ManualRunResp()
+
+    def snapshotSerialised(self, snap: ControllerSnapshot) -> tuple:
+        """
+        Get the serialised program, inputs and outputs of a snapshot.
+        Each snapshot is only serialised once.
+        Parameters:
+            snap : Snapshot of the controller state.
+        Returns:
+            Snapshot, and its serialised program, inputs and outputs.
+        """
+
+        serialised = self.serialised
+        if serialised[0] is not snap:
+            serialised = (snap, self.programSerialised(snap), self.inputsSerialised(snap), self.outputsSerialised(snap))
+            self.serialised = serialised
+
+        return serialised
+
+    def inputsSerialised(self, snap: ControllerSnapshot) -> str:
         """
         Get inputs and put into a dictionary,
         and then convert to json string.
         Serialising to send to UI if requested.
+        Parameters:
+            snap : Snapshot of the controller state.
         Returns:
             serialised dictionary of input IO.
         """
 
         ins = []
         # Serialise all the inputs.
-        for di in self.ctrl.digitalInputs:
+        for n, di in enumerate(self.ctrl.digitalInputs):
             iData = {
                 "iName" : di.inputName,
-                "iActive" : di.active
+                "iActive" : bool((snap.inputMask >> n) & 1)
             }
             ins.append(iData)
         # Complete dictionaty with header and inputs.
@@ -119,21 +239,23 @@ class UiCommands(ui_pb2_grpc.UiMessages):
 
         return json.dumps(iDict)
 
-    def outputsSerialised(self) -> str:
+    def outputsSerialised(self, snap: ControllerSnapshot) -> str:
         """
         Get outputs and put into a dictionary,
         and then convert to json string.
         Serialising to send to UI if requested.
+        Parameters:
+            snap : Snapshot of the controller state.
         Returns:
             serialised dictionary of output IO.
         """
 
         outs = []
         # Serialise all the outputs.
-        for do in self.ctrl.digitalOutputs:
+        for n, do in enumerate(self.ctrl.digitalOutputs):
             oData = {
                 "oName" : do.outputName,
-                "oActive" : do.active
+                "oActive" : bool((snap.outputMask >> n) & 1)
             }
             outs.append(oData)
         # Complete dictionaty with header and outputs.
@@ -144,20 +266,66 @@ class UiCommands(ui_pb2_grpc.UiMessages):
 
         return json.dumps(oDict)
 
-    def programSerialised(self) -> str:
+    def upcomingRunsSerialised(self, minute: int) -> str:
+        """
+        Get the next run and the run state of each station
+        from the run calendar, and convert to json string.
+        Serialising to send to UI if requested.
+        Parameters:
+            minute : Minute of the week to get runs from.
+        Returns:
+            serialised dictionary of upcoming runs.
+        """
+
+        # Take a reference, the calendar is replaced when the program changes.
+        calendar = self.ctrl.calendar
+
+        nextRun = {}
+        nr = calendar.nextStart(minute)
+        if nr is not None:
+            run, until = nr
+            nextRun = {
+                "sName" : self.ctrl.digitalOutputs[run.station].outputName,
+                "program" : run.program,
+                "nextIn" : until,
+                "duration" : run.end - run.start
+            }
+
+        # Run state of all the stations, i.e. outputs after the master.
+        stations = []
+        for st, do in enumerate(self.ctrl.digitalOutputs[1:], start=1):
+            remaining, nextIn, duration = calendar.station(st, minute)
+            sData = {
+                "sName" : do.outputName,
+                "remaining" : remaining,
+                "nextIn" : nextIn,
+                "duration" : duration
+            }
+            stations.append(sData)
+        # Complete dictionary with next run and stations.
+        rDict = {
+            "next" : nextRun,
+            "stations" : stations
+        }
+
+        return json.dumps(rDict)
+
+    def programSerialised(self, snap: ControllerSnapshot) -> str:
         """
         Get controller program and convert to json string.
         Serialising to send to UI if requested.
+        Parameters:
+            snap : Snapshot of the controller state.
         Returns:
             serialised dictionary of controller program data.
         """
 
         myDays = []
-        for d in self.ctrl.program["MyDays"]:
+        for d in snap.program["MyDays"]:
             # Only send day name to UI.
             myDays.append(d.name)
         pgs = []
-        for p in self.ctrl.program["Programs"]:
+        for p in snap.program["Programs"]:
             pgs.append(p)
         pDict = {
             "MyDays" : myDays,
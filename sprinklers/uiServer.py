@@ -6,8 +6,12 @@ import time
 import grpc
 import sprinklers.ui_pb2_grpc as ui_pb2_grpc
 
+from generic.authTokens import *
+from generic.grpcInterceptors import *
+from generic.priorityLanes import *
 from sprinklers.constants import *
 from sprinklers.uiMessages import *
+from utils.filePaths import *
 
 
 class UIServer(Thread):   
@@ -33,6 +37,10 @@ class UIServer(Thread):
         # Initialise state of the controller.
         self.stayAlive = True
 
+        # Executor and interceptors of UI calls, made when the server starts.
+        self.executor = None
+        self.interceptors = []
+
     def run(self) -> None:
         """
         Run threaded method.
@@ -42,15 +50,71 @@ class UIServer(Thread):
 
         # Configure and start the server to listen for messages from UI.
         # Add servicers for all UI services.
-        server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-        ui_pb2_grpc.add_UiMessagesServicer_to_server(UiCommands(self.cfg, self.log, self.ctrl), server)
-        ui_pb2_grpc.add_UiControlModeServicer_to_server(UiCommands(self.cfg, self.log, self.ctrl), server)
+        # Calls wait in priority lanes, if configured, so control calls don't wait for status calls.
+        # If required, only calls with a valid token get to the services.
+        interceptors = []
+        if self.cfg.UI["Lanes"]:
+            self.executor = PriorityLaneExecutor(self.cfg.UI["Workers"], self.cfg.UI["Lanes"], self.cfg.UI["DefaultLane"])
+            interceptors.append(LaneInterceptor(self.executor))
+        else:
+            self.executor = futures.ThreadPoolExecutor(max_workers=self.cfg.UI["Workers"])
+        if self.cfg.Auth["Required"]:
+            chkPath(self.cfg.Auth["SecretFile"])
+            secret = loadSecret(self.cfg.Auth["SecretFile"], create=True)
+            verifier = TokenVerifier(secret, self.cfg.Auth["CacheSize"], self.cfg.Auth["Rate"], self.cfg.Auth["Burst"])
+            interceptors.append(TokenAuthInterceptor(verifier, self.log))
+            self.log.info(f'UI server requires API tokens, secret : {self.cfg.Auth["SecretFile"]}')
+
+        # Configured interceptors, e.g. request IDs, latency metrics and limits.
+        self.interceptors = makeInterceptors(self.cfg.UI["Interceptors"], self.log, self.cfg.UI["MaxInFlight"],
+                                             self.cfg.UI["DefaultInFlight"], self.cfg.UI["SlowCall"])
+        interceptors.extend(self.interceptors)
+
+        server = grpc.server(self.executor, interceptors=interceptors)
+        cmds = UiCommands(self.cfg, self.log, self.ctrl)
+        ui_pb2_grpc.add_UiMessagesServicer_to_server(cmds, server)
+        ui_pb2_grpc.add_UiControlModeServicer_to_server(cmds, server)
         server.add_insecure_port(f'[::]:{self.cfg.UI["UIPort"]}')
         server.start()
 
+        nextStats = time.monotonic() + self.cfg.UI["StatsPeriod"]
         while self.stayAlive:
             time.sleep(self.cfg.UI["UISleep"])
 
+            # Periodically log call latencies, and calls rejected.
+            if self.cfg.UI["StatsPeriod"] and (time.monotonic() >= nextStats):
+                nextStats += self.cfg.UI["StatsPeriod"]
+                self.logStats()
+
+    def logStats(self) -> None:
+        """
+        Log the latencies of each method, calls rejected as too many in flight,
+        controller command latencies, and control cycle timing.
+        """
+
+        for interceptor in self.interceptors:
+            if isinstance(interceptor, MetricsInterceptor):
+                for method, stats in interceptor.summary().items():
+                    self.log.info(f'UI calls {method} : {stats["count"]} calls; mean {stats["mean"]:.2f} ms; '
+                                  f'p50 {stats["p50"]:.2f} ms; p99 {stats["p99"]:.2f} ms; max {stats["max"]:.2f} ms')
+            elif isinstance(interceptor, ConcurrencyLimitInterceptor):
+                for method, rejected in list(interceptor.rejected.items()):
+                    self.log.info(f'UI calls {method} : {rejected} rejected, too many in flight')
+
+        stats = self.ctrl.commands.stats()
+        self.log.info(f'Controller commands : {stats["submitted"]} submitted; {stats["rejected"]} rejected; '
+                      f'{stats["batches"]} batches (largest {stats["largestBatch"]}); '
+                      f'wait p50 {stats["wait"]["p50"]:.2f} ms; p99 {stats["wait"]["p99"]:.2f} ms')
+
+        stats = self.ctrl.timer.stats()
+        self.log.info(f'Controller cycles : {stats["cycles"]} cycles; {stats["missed"]} missed; '
+                      f'late p50 {stats["lateness"]["p50"]:.2f} ms; p99 {stats["lateness"]["p99"]:.2f} ms; '
+                      f'jitter p99 {stats["jitter"]["p99"]:.2f} ms; wall clock jumps {self.ctrl.clock.forwardJumps} forward, {self.ctrl.clock.backwardJumps} back')
+
+        if isinstance(self.executor, PriorityLaneExecutor):
+            for lane, stats in self.executor.stats().items():
+                self.log.info(f'UI lane {lane} : {stats["submitted"]} calls; {stats["queued"]} waiting; {stats["shed"]} rejected, queue full')
+
     def stopServingUI(self) -> None:
         """
         Method to stop serving UI data.
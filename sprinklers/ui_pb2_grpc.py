@@ -22,6 +22,11 @@ class UiMessagesStub(object):
                 request_serializer=ui__pb2.ControllerStatusCmd.SerializeToString,
                 response_deserializer=ui__pb2.ControllerStatusResp.FromString,
                 )
+        self.GetUpcomingRuns = channel.unary_unary(
+                '/ui.UiMessages/GetUpcomingRuns',
+                request_serializer=ui__pb2.UpcomingRunsCmd.SerializeToString,
+                response_deserializer=ui__pb2.UpcomingRunsResp.FromString,
+                )
 
 
 class UiMessagesServicer(object):
@@ -36,6 +41,12 @@ class UiMessagesServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetUpcomingRuns(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_UiMessagesServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -44,6 +55,11 @@ def add_UiMessagesServicer_to_server(servicer, server):
                     request_deserializer=ui__pb2.ControllerStatusCmd.FromString,
                     response_serializer=ui__pb2.ControllerStatusResp.SerializeToString,
             ),
+            'GetUpcomingRuns': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetUpcomingRuns,
+                    request_deserializer=ui__pb2.UpcomingRunsCmd.FromString,
+                    response_serializer=ui__pb2.UpcomingRunsResp.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'ui.UiMessages', rpc_method_handlers)
@@ -74,6 +90,23 @@ class UiMessages(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def GetUpcomingRuns(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/ui.UiMessages/GetUpcomingRuns',
+            ui__pb2.UpcomingRunsCmd.SerializeToString,
+            ui__pb2.UpcomingRunsResp.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
 
 class UiControlModeStub(object):
     """*****************************************
@@ -92,6 +125,21 @@ class UiControlModeStub(object):
                 request_serializer=ui__pb2.SetControllerModeCmd.SerializeToString,
                 response_deserializer=ui__pb2.SetControllerModeResp.FromString,
                 )
+        self.StartStation = channel.unary_unary(
+                '/ui.UiControlMode/StartStation',
+                request_serializer=ui__pb2.StartStationCmd.SerializeToString,
+                response_deserializer=ui__pb2.ManualRunResp.FromString,
+                )
+        self.StopStation = channel.unary_unary(
+                '/ui.UiControlMode/StopStation',
+                request_serializer=ui__pb2.StopStationCmd.SerializeToString,
+                response_deserializer=ui__pb2.ManualRunResp.FromString,
+                )
+        self.QueueStations = channel.unary_unary(
+                '/ui.UiControlMode/QueueStations',
+                request_serializer=ui__pb2.QueueStationsCmd.SerializeToString,
+                response_deserializer=ui__pb2.ManualRunResp.FromString,
+                )
 
 
 class UiControlModeServicer(object):
@@ -106,6 +154,24 @@ class UiControlModeServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StartStation(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StopStation(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def QueueStations(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_UiControlModeServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -114,6 +180,21 @@ def add_UiControlModeServicer_to_server(servicer, server):
                     request_deserializer=ui__pb2.SetControllerModeCmd.FromString,
                     response_serializer=ui__pb2.SetControllerModeResp.SerializeToString,
             ),
+            'StartStation': grpc.unary_unary_rpc_method_handler(
+                    servicer.StartStation,
+                    request_deserializer=ui__pb2.StartStationCmd.FromString,
+                    response_serializer=ui__pb2.ManualRunResp.SerializeToString,
+            ),
+            'StopStation': grpc.unary_unary_rpc_method_handler(
+                    servicer.StopStation,
+                    request_deserializer=ui__pb2.StopStationCmd.FromString,
+                    response_serializer=ui__pb2.ManualRunResp.SerializeToString,
+            ),
+            'QueueStations': grpc.unary_unary_rpc_method_handler(
+                    servicer.QueueStations,
+                    request_deserializer=ui__pb2.QueueStationsCmd.FromString,
+                    response_serializer=ui__pb2.ManualRunResp.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'ui.UiControlMode', rpc_method_handlers)
@@ -143,3 +224,157 @@ class UiControlMode(object):
             ui__pb2.SetControllerModeResp.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def StartStation(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/ui.UiControlMode/StartStation',
+            ui__pb2.StartStationCmd.SerializeToString,
+            ui__pb2.ManualRunResp.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def StopStation(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/ui.UiControlMode/StopStation',
+            ui__pb2.StopStationCmd.SerializeToString,
+            ui__pb2.ManualRunResp.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def QueueStations(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/ui.UiControlMode/QueueStations',
+            ui__pb2.QueueStationsCmd.SerializeToString,
+            ui__pb2.ManualRunResp.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+
+class UiFleetStub(object):
+    """*****************************************
+    Fleet status service
+    *****************************************
+    """
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.GetFleetStatus = channel.unary_unary(
+                '/ui.UiFleet/GetFleetStatus',
+                request_serializer=ui__pb2.FleetStatusCmd.SerializeToString,
+                response_deserializer=ui__pb2.FleetStatusResp.FromString,
+                )
+        self.SetFleetMode = channel.unary_unary(
+                '/ui.UiFleet/SetFleetMode',
+                request_serializer=ui__pb2.FleetModeCmd.SerializeToString,
+                response_deserializer=ui__pb2.FleetModeResp.FromString,
+                )
+
+
+class UiFleetServicer(object):
+    """*****************************************
+    Fleet status service
+    *****************************************
+    """
+
+    def GetFleetStatus(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SetFleetMode(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_UiFleetServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'GetFleetStatus': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetFleetStatus,
+                    request_deserializer=ui__pb2.FleetStatusCmd.FromString,
+                    response_serializer=ui__pb2.FleetStatusResp.SerializeToString,
+            ),
+            'SetFleetMode': grpc.unary_unary_rpc_method_handler(
+                    servicer.SetFleetMode,
+                    request_deserializer=ui__pb2.FleetModeCmd.FromString,
+                    response_serializer=ui__pb2.FleetModeResp.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'ui.UiFleet', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+
+
+ # This class is part of an EXPERIMENTAL API.
+class UiFleet(object):
+    """*****************************************
+    Fleet status service
+    *****************************************
+    """
+
+    @staticmethod
+    def GetFleetStatus(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/ui.UiFleet/GetFleetStatus',
+            ui__pb2.FleetStatusCmd.SerializeToString,
+            ui__pb2.FleetStatusResp.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def SetFleetMode(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/ui.UiFleet/SetFleetMode',
+            ui__pb2.FleetModeCmd.SerializeToString,
+            ui__pb2.FleetModeResp.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+from bisect import bisect_right
+from datetime import datetime, timedelta, tzinfo
+from typing import Optional
+
+from sprinklers.scheduler import *
+
+
+class ZonedSchedule():
+    """
+    Class to represent the schedule of a controller in real time.
+    Schedule times are wall clock times in a time zone, so each run of the
+    weekly schedule is mapped to the real (epoch) time it starts, and runs
+    for its duration in real time. Across daylight saving changes, runs in a
+    skipped hour start that much later, and runs in a repeated hour run once
+    (the first time). Change points are built for the local week (and the
+    runs of the weeks either side of it), and rebuilt when time leaves it.
+    """
+
+    def __init__(self, scheduler: Scheduler, zone: Optional[tzinfo]) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            scheduler : Scheduler with the program compiled.
+            zone : Time zone of the schedule, None for the system time zone.
+        """
+
+        self.scheduler = scheduler
+        self.zone = zone
+
+        # Week the change points are built for (epoch seconds), and change
+        # points as sorted times (epoch seconds) and active station masks.
+        self.weekStart = None
+        self.weekEnd = None
+        self.changeTimes = []
+        self.changeMasks = []
+
+    def wallEpoch(self, wall: datetime) -> float:
+        """
+        Get the real time of a (naive) wall clock time in the time zone.
+        Times in a skipped hour are moved on by the skip, and times in a
+        repeated hour are the first of them.
+        Parameters:
+            wall : Wall clock time, naive.
+        Returns:
+            Real time (epoch seconds).
+        """
+
+        if self.zone is not None:
+            wall = wall.replace(tzinfo=self.zone)
+
+        return wall.replace(fold=0).timestamp()
+
+    def localWeekStart(self, epoch: float) -> datetime:
+        """
+        Get the start of the local week of a time.
+        Parameters:
+            epoch : Real time (epoch seconds).
+        Returns:
+            00:00 Monday of the week, naive wall clock time.
+        """
+
+        local = datetime.fromtimestamp(epoch, self.zone).replace(tzinfo=None)
+
+        return (local - timedelta(days=local.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def build(self, epoch: float) -> None:
+        """
+        Build the change points of the active stations for the week of a time.
+        Parameters:
+            epoch : Real time (epoch seconds).
+        """
+
+        weekStart = self.localWeekStart(epoch)
+
+        # Station bit count changes at each time. Runs of the week before may
+        # run into the week, and runs of the week after are included so the
+        # change points don't stop at the end of the week.
+        deltas = {}
+        for week in (-1, 0, 1):
+            base = weekStart + timedelta(weeks=week)
+            for r in self.scheduler.runs:
+                if r.end <= r.start:
+                    continue
+                start = self.wallEpoch(base + timedelta(minutes=r.start))
+                end = start + (r.end - r.start) * 60.0
+                for t, delta in ((start, 1), (end, -1)):
+                    deltas.setdefault(t, {}).setdefault(r.station, 0)
+                    deltas[t][r.station] += delta
+
+        counts = {}
+        self.changeTimes = [float("-inf")]
+        self.changeMasks = [0]
+        for t in sorted(deltas):
+            for station, delta in deltas[t].items():
+                counts[station] = counts.get(station, 0) + delta
+            mask = 0
+            for station, count in counts.items():
+                if count > 0:
+                    mask |= 1 << station
+            self.changeTimes.append(t)
+            self.changeMasks.append(mask)
+
+        self.weekStart = self.wallEpoch(weekStart)
+        self.weekEnd = self.wallEpoch(weekStart + timedelta(weeks=1))
+
+    def stationsAt(self, epoch: float) -> int:
+        """
+        Get the stations the schedule has active at a time.
+        Parameters:
+            epoch : Real time (epoch seconds).
+        Returns:
+            Active station outputs, bit n for output n (station n).
+        """
+
+        if (self.weekStart is None) or not (self.weekStart <= epoch < self.weekEnd):
+            self.build(epoch)
+
+        return self.changeMasks[bisect_right(self.changeTimes, epoch) - 1]
+
+    def nextChange(self, epoch: float) -> float:
+        """
+        Get the time of the next change point after a time.
+        Parameters:
+            epoch : Real time (epoch seconds).
+        Returns:
+            Time of the next change point, or the end of the week if sooner (epoch seconds).
+        """
+
+        if (self.weekStart is None) or not (self.weekStart <= epoch < self.weekEnd):
+            self.build(epoch)
+
+        idx = bisect_right(self.changeTimes, epoch)
+        if idx < len(self.changeTimes):
+            return min(self.changeTimes[idx], self.weekEnd)
+
+        return self.weekEnd
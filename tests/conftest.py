@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+
+from concurrent import futures
+import logging
+import os
+import time
+
+import grpc
+import pytest
+import sprinklers.ui_pb2_grpc as sprinklers_ui_pb2_grpc
+
+from sprinklers.uiMessages import *
+from webUI import create_app
+from webUI.db import init_db
+
+# Configuration files of the repository, whatever the current directory.
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config")
+
+
+def configFile(name: str) -> str:
+    """
+    Get a configuration file of the repository.
+    Parameters:
+        name : File name, e.g. "outputs.json".
+    Returns:
+        Path of the configuration file.
+    """
+
+    return os.path.join(CONFIG_DIR, name)
+
+
+def buildController(tmpDir: str, sleep: float = 1.0, pFile: str = "", rFile: str = "", cls=SprinklerController, **kwargs) -> SprinklerController:
+    """
+    Build a controller, not started, with the repository IO and program
+    configuration, and its configuration and checkpoint files in a folder.
+    Parameters:
+        tmpDir : Folder for the configuration and checkpoint files.
+        sleep : Controller (periodic) sleep time (seconds).
+        pFile : Name of program file, empty for the repository program.
+        rFile : Name of interlock rules file, empty for the repository rules.
+        cls : Controller class.
+        kwargs : Configuration settings to change, by section, e.g. Hydraulics={"SupplyCapacity" : 0.0}.
+    Returns:
+        Controller, not started.
+    """
+
+    log = logging.getLogger("test")
+    cfg = Config(os.path.join(tmpDir, "sprinklers.json"))
+    cfg.Timers["ControllerSleep"] = sleep
+    for section, settings in kwargs.items():
+        getattr(cfg, section).update(settings)
+
+    files = [configFile("inputs.json"), configFile("outputs.json"), pFile or configFile("program.json"), rFile or configFile("interlocks.json")]
+    if cls is SprinklerController:
+        return cls(cfg, log, "Test", *files, os.path.join(tmpDir, "sprinklers.ckpt"))
+
+    return cls(cfg, log, *files)
+
+
+def startController(ctrl: SprinklerController) -> SprinklerController:
+    """
+    Start a controller, waiting for it to be ACTIVE.
+    Parameters:
+        ctrl : Controller, not started.
+    Returns:
+        Controller, running and in the ACTIVE state.
+    """
+
+    ctrl.daemon = True
+    ctrl.start()
+    while ctrl.state != ControllerState.ACTIVE:
+        time.sleep(0.01)
+
+    return ctrl
+
+
+def stopController(ctrl: SprinklerController) -> None:
+    """
+    Stop a running controller, waiting for its thread to end.
+    Parameters:
+        ctrl : Running controller.
+    """
+
+    ctrl.stayAlive = False
+    ctrl.wakeup()
+    ctrl.join(5.0)
+    assert not ctrl.is_alive()
+
+
+@pytest.fixture
+def controller(tmp_path) -> SprinklerController:
+    """
+    Controller, not started, so its published state is served as is.
+    """
+
+    return buildController(str(tmp_path))
+
+
+@pytest.fixture
+def runningController(tmp_path) -> SprinklerController:
+    """
+    Controller, running and ACTIVE, stopped on teardown.
+    """
+
+    ctrl = startController(buildController(str(tmp_path)))
+
+    yield ctrl
+
+    stopController(ctrl)
+
+
+@pytest.fixture
+def uiServer(controller):
+    """
+    Controller, not started, served on a UI server on a free port.
+    Returns:
+        Controller and UI port.
+    """
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    cmds = UiCommands(controller.cfg, controller.log, controller)
+    sprinklers_ui_pb2_grpc.add_UiMessagesServicer_to_server(cmds, server)
+    sprinklers_ui_pb2_grpc.add_UiControlModeServicer_to_server(cmds, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+
+    yield controller, port
+
+    server.stop(None)
+
+
+@pytest.fixture
+def webConfig(uiServer, tmp_path) -> dict:
+    """
+    Configuration of a webUI of the UI server.
+    """
+
+    _, port = uiServer
+
+    return {
+        "TESTING" : True,
+        "SECRET_KEY" : "test",
+        "DATABASE" : os.path.join(tmp_path, "webUI.sqlite"),
+        "UI_IP" : "127.0.0.1",
+        "UI_PORT" : f'{port}',
+        "UI_REFRESH_PERIOD_SLOW" : 3,
+        "UI_REFRESH_PERIOD_FAST" : 1,
+        "UI_STATUS_DEADLINE" : 2.0,
+        "UI_CONTROL_DEADLINE" : 2.0,
+        "UI_BREAKER_FAILURES" : 3,
+        "UI_BREAKER_RESET" : 5.0,
+        "STATUS_CACHE_TTL" : 3600.0,
+        "STATUS_CACHE_DIR" : ""
+    }
+
+
+def loggedIn(app):
+    """
+    Make a test client of a webUI, registered and logged in.
+    Parameters:
+        app : webUI application.
+    Returns:
+        Logged in test client.
+    """
+
+    with app.app_context():
+        init_db()
+    client = app.test_client()
+    client.post("/auth/register", data={"username" : "test", "password" : "test"})
+    client.post("/auth/login", data={"username" : "test", "password" : "test"})
+
+    return client
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+
+import pytest
+
+from webUI import create_app
+from webUI.serving import production
+from tests.conftest import loggedIn
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br", "identity"])
+@pytest.mark.parametrize("path", ["/api/status", "/api/io", "/api/program"])
+def test_revalidation_production(webConfig, path, encoding):
+    """
+    Revalidating with the ETag of a (compressed) response is not modified.
+    """
+
+    if encoding == "br":
+        pytest.importorskip("brotli")
+    webConfig["COMPRESS_MIN_SIZE"] = 0
+    client = loggedIn(production(create_app(webConfig)))
+
+    resp = client.get(path, headers={"Accept-Encoding" : encoding})
+    assert resp.status_code == 200
+    etag = resp.headers["ETag"]
+    if encoding != "identity":
+        assert resp.headers["Content-Encoding"] == encoding
+        assert etag.endswith(f'-{encoding}"')
+
+    resp = client.get(path, headers={"Accept-Encoding" : encoding, "If-None-Match" : etag})
+    assert resp.status_code == 304
+    assert resp.get_data() == b""
+
+
+def test_revalidation_stale(webConfig):
+    """
+    Revalidating with the ETag of another version gets the response.
+    """
+
+    webConfig["COMPRESS_MIN_SIZE"] = 0
+    client = loggedIn(production(create_app(webConfig)))
+
+    resp = client.get("/api/io", headers={"Accept-Encoding" : "gzip", "If-None-Match" : '"io-0-gzip"'})
+    assert resp.status_code == 200
+    assert resp.headers["Content-Encoding"] == "gzip"
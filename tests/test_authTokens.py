@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+
+from concurrent import futures
+import logging
+import time
+
+import grpc
+import pytest
+
+from generic.authTokens import *
+
+SECRET = b"test-secret"
+
+
+def tampered(text: str, idx: int) -> str:
+    """
+    Change one character of a token part.
+    """
+
+    return text[:idx] + ("A" if text[idx] != "A" else "B") + text[idx + 1:]
+
+
+@pytest.fixture
+def verifier():
+    return TokenVerifier(SECRET, 4, 100.0, 100)
+
+
+def test_valid_token(verifier):
+    token = makeToken(SECRET, "fleet", 60.0)
+    assert verifier.verify(token) == "fleet"
+    assert verifier.check(token)[1] > time.time()
+
+
+def test_tampered_payload(verifier):
+    """
+    A token with its payload changed (e.g. the subject or expiry) is rejected.
+    """
+
+    payload, signature = makeToken(SECRET, "fleet", 60.0).split(".")
+    forged = b64encode(f'admin|{int(time.time() + 86400)}'.encode())
+    for bad in (f'{forged}.{signature}', f'{tampered(payload, 0)}.{signature}'):
+        with pytest.raises(TokenError):
+            verifier.verify(bad)
+    assert not verifier.cache
+
+
+def test_tampered_signature(verifier):
+    payload, signature = makeToken(SECRET, "fleet", 60.0).split(".")
+    for bad in (f'{payload}.{tampered(signature, 0)}', f'{payload}.', f'{payload}.{signature[:-4]}'):
+        with pytest.raises(TokenError):
+            verifier.verify(bad)
+
+
+def test_other_secret(verifier):
+    with pytest.raises(TokenError):
+        verifier.verify(makeToken(b"other-secret", "fleet", 60.0))
+
+
+@pytest.mark.parametrize("token", ["", "garbage", "a.b.c", ".", "!!!.???", b64encode(b"no expiry") + ".x"])
+def test_malformed_token(verifier, token):
+    with pytest.raises(TokenError) as e:
+        verifier.verify(token)
+    assert not isinstance(e.value, TokenRateLimitedError)
+
+
+def test_malformed_signed_payload(verifier):
+    """
+    A correctly signed payload without a valid expiry is malformed.
+    """
+
+    payload = b64encode(b"fleet|never")
+    signature = b64encode(hmac.new(SECRET, payload.encode(), hashlib.sha256).digest())
+    with pytest.raises(TokenError, match="Malformed"):
+        verifier.verify(f'{payload}.{signature}')
+
+
+def test_expired_token(verifier):
+    with pytest.raises(TokenError, match="Expired"):
+        verifier.verify(makeToken(SECRET, "fleet", -10.0))
+
+
+def test_expired_while_cached(verifier, monkeypatch):
+    """
+    A cached token is refused once it expires.
+    """
+
+    token = makeToken(SECRET, "fleet", 60.0)
+    assert verifier.verify(token) == "fleet"
+    assert token in verifier.cache
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120.0)
+    with pytest.raises(TokenError, match="Expired"):
+        verifier.verify(token)
+
+
+def test_cache_eviction(verifier):
+    """
+    The cache holds at most CacheSize tokens, evicting the oldest.
+    """
+
+    tokens = [makeToken(SECRET, f'client{n}', 60.0) for n in range(6)]
+    for token in tokens:
+        verifier.verify(token)
+    assert list(verifier.cache) == tokens[2:]
+
+    # Evicted tokens are checked again, and still valid.
+    assert verifier.verify(tokens[0]) == "client0"
+    assert list(verifier.cache) == tokens[3:] + tokens[:1]
+
+    uncached = TokenVerifier(SECRET, 0, 100.0, 100)
+    assert uncached.verify(tokens[0]) == "client0"
+    assert not uncached.cache
+
+
+def test_token_source_renews():
+    source = TokenSource(SECRET, "webUI", 100.0)
+    metadata = source.metadata()
+    assert metadata is source.metadata()
+    key, value = metadata[0]
+    assert (key, value[:7]) == (AUTH_METADATA, "Bearer ")
+    assert TokenVerifier(SECRET, 4, 100.0, 100).verify(value[7:]) == "webUI"
+
+    source.renewAt = 0.0
+    assert source.metadata() is not metadata
+
+
+@pytest.fixture
+def echoServer():
+    """
+    Echo service behind the token interceptor, limited to 5 calls per token.
+    Returns:
+        Echo method of a channel to the server.
+    """
+
+    handler = grpc.method_handlers_generic_handler("test.Echo", {"Echo" : grpc.unary_unary_rpc_method_handler(lambda request, context: request)})
+    interceptor = TokenAuthInterceptor(TokenVerifier(SECRET, 16, 0.001, 5), logging.getLogger("test"))
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2), handlers=[handler], interceptors=[interceptor])
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+    channel = grpc.insecure_channel(f'127.0.0.1:{port}')
+
+    yield channel.unary_unary("/test.Echo/Echo")
+
+    channel.close()
+    server.stop(None)
+
+
+def callCode(echo, metadata: tuple) -> grpc.StatusCode:
+    """
+    Call the echo service, returning the status code.
+    """
+
+    try:
+        assert echo(b"ping", metadata=metadata, timeout=5.0) == b"ping"
+        return grpc.StatusCode.OK
+    except grpc.RpcError as e:
+        return e.code()
+
+
+def test_interceptor_rejects_unauthenticated(echoServer):
+    token = makeToken(SECRET, "fleet", 60.0)
+    for metadata in ((), ((AUTH_METADATA, token),), ((AUTH_METADATA, f'Basic {token}'),), ((AUTH_METADATA, "Bearer "),),
+                     ((AUTH_METADATA, f'Bearer {makeToken(b"other-secret", "fleet", 60.0)}'),),
+                     ((AUTH_METADATA, f'Bearer {makeToken(SECRET, "fleet", -10.0)}'),)):
+        assert callCode(echoServer, metadata) == grpc.StatusCode.UNAUTHENTICATED
+
+
+def test_interceptor_rate_limit(echoServer):
+    """
+    Calls with a token beyond its rate limit are RESOURCE_EXHAUSTED, other tokens still get through.
+    """
+
+    metadata = ((AUTH_METADATA, f'Bearer {makeToken(SECRET, "fleet", 60.0)}'),)
+    codes = [callCode(echoServer, metadata) for _ in range(8)]
+    assert codes == [grpc.StatusCode.OK] * 5 + [grpc.StatusCode.RESOURCE_EXHAUSTED] * 3
+
+    other = ((AUTH_METADATA, f'Bearer {makeToken(SECRET, "webUI", 60.0)}'),)
+    assert callCode(echoServer, other) == grpc.StatusCode.OK
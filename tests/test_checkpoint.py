@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+import logging
+import os
+import time
+
+from sprinklers.checkpoint import *
+from sprinklers.controller import *
+from tests.conftest import buildController, startController, stopController
+
+
+def test_manual_runs_round_trip(tmp_path):
+    """
+    Manual runs are packed into and loaded from a checkpoint.
+    """
+
+    manual = ManualRuns(logging.getLogger("test"))
+    manual.start(2, None, 100.0)
+    manual.enqueue([(3, 120.0), (4, 60.0)], 100.0)
+    ckpt = ControllerCheckpoint(logging.getLogger("test"), str(tmp_path / "sprinklers.ckpt"), 60.0)
+    assert ckpt.save(3, 0b11101, [], 130.0, manual)
+    assert not ckpt.save(3, 0b11101, [], 131.0, manual)
+
+    state = ckpt.load()
+    assert state["manual"] == {"running" : [(2, None), (3, 90.0)], "queued" : [(4, 60.0)], "queuedStation" : 3}
+
+    restored = ManualRuns(logging.getLogger("test"))
+    restored.restore(state["manual"]["running"], state["manual"]["queued"], state["manual"]["queuedStation"], 100.0, 500.0)
+    assert restored.advance(500.0) == 0b10100
+    assert restored.runs(500.0)["running"] == [{"station" : 2, "remaining" : -1.0}, {"station" : 4, "remaining" : 60.0}]
+
+
+def test_version_1_checkpoint(tmp_path):
+    """
+    Checkpoints from before manual runs load, with no manual runs.
+    """
+
+    ckpt = ControllerCheckpoint(logging.getLogger("test"), str(tmp_path / "sprinklers.ckpt"), 60.0)
+    record = HEADER.pack(CHECKPOINT_MAGIC, 1, time.time()) + STATE.pack(2, 0, 1) + bytes([0b101])
+    ckpt.write(record + TRAILER.pack(zlib.crc32(record)))
+
+    state = ckpt.load()
+    assert (state["mode"], state["outputMask"]) == (2, 0b101)
+    assert state["manual"] == {"running" : [], "queued" : [], "queuedStation" : None}
+
+
+def test_restart_restores_manual_runs(runningController, tmp_path):
+    """
+    A restarted controller carries on with its manual runs.
+    """
+
+    ctrl = runningController
+    ctrl.setMode(ControllerMode.MANUAL)
+    ctrl.startStation(2, 600.0)
+    ctrl.queueStations([(3, 120.0), (4, 60.0)])
+    stopController(ctrl)
+
+    restarted = startController(buildController(str(tmp_path)))
+    try:
+        assert restarted.mode == ControllerMode.MANUAL
+        runs = restarted.manualRuns()
+        assert [r["station"] for r in runs["running"]] == [2, 3]
+        assert 590.0 < runs["running"][0]["remaining"] <= 600.0
+        assert [(r["station"], r["seconds"]) for r in runs["queued"]] == [(4, 60.0)]
+    finally:
+        stopController(restarted)
+
+
+def test_old_checkpoint_drops_manual_runs(tmp_path, caplog):
+    """
+    Manual runs of a checkpoint older than MaxAge are dropped, and logged.
+    """
+
+    cfg = Config(str(tmp_path / "sprinklers.json"))
+    manual = ManualRuns(logging.getLogger("test"))
+    manual.start(2, None, 0.0)
+    ckpt = ControllerCheckpoint(logging.getLogger("test"), str(tmp_path / "sprinklers.ckpt"), 60.0)
+    ckpt.write(ckpt.pack(ControllerMode.MANUAL.value, 0b101, [], 0.0, time.time() - cfg.Checkpoint["MaxAge"] - 10.0, manual))
+
+    with caplog.at_level(logging.WARNING, logger="test"):
+        ctrl = startController(buildController(str(tmp_path)))
+    try:
+        assert ctrl.mode == ControllerMode.MANUAL
+        assert ctrl.manualRuns() == {"running" : [], "queued" : []}
+        assert "manual runs of stations dropped : [2]" in caplog.text
+    finally:
+        stopController(ctrl)
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+from threading import Thread
+
+import pytest
+
+from generic.commandQueue import *
+from generic.grpcInterceptors import requestIdVar
+
+
+def test_request_id_context():
+    """
+    Commands run on the draining thread in the context they were submitted in.
+    """
+
+    commands = CommandQueue(8, 8)
+    results = []
+
+    def submit(requestId: str) -> None:
+        requestIdVar.set(requestId)
+        results.append(commands.submit(requestIdVar.get))
+
+    threads = [Thread(target=submit, args=(f'req-{n}',)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert commands.drain() == 4
+    assert sorted(f.result() for f in results) == [f'req-{n}' for n in range(4)]
+    assert requestIdVar.get() == "-"
+
+
+def test_bounded_batches():
+    """
+    Commands are rejected when the queue is full, and run in batches.
+    """
+
+    commands = CommandQueue(4, 3)
+    results = [commands.submit(lambda n: n * 2, n) for n in range(4)]
+    with pytest.raises(CommandQueueFullError):
+        commands.submit(lambda: None)
+
+    assert commands.drain() == 3
+    assert commands.drain() == 1
+    assert [f.result() for f in results] == [0, 2, 4, 6]
+    assert commands.stats()["rejected"] == 1
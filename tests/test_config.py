@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+
+import json
+import os
+
+from sprinklers.config import Config
+
+
+def test_checkpoint_defaults(tmp_path):
+    """
+    Default checkpoint MaxAge covers a checkpoint Period and a control cycle.
+    """
+
+    cfg = Config(str(tmp_path / "sprinklers.json"))
+    assert cfg.Checkpoint["MaxAge"] >= cfg.Checkpoint["Period"] + cfg.Timers["ControllerSleep"]
+
+    with open(os.path.join(os.path.dirname(__file__), "..", "config", "sprinklers.json")) as configFile:
+        shipped = json.load(configFile)
+    assert shipped["Checkpoint"]["MaxAge"] >= shipped["Checkpoint"]["Period"] + shipped["Timers"]["ControllerSleep"]
+
+
+def test_checkpoint_max_age_rejected(tmp_path):
+    """
+    A checkpoint MaxAge less than the Period is increased, and saved.
+    """
+
+    cFile = tmp_path / "sprinklers.json"
+    cfg = Config(str(cFile))
+    cfg.Checkpoint = {"Period" : 60.0, "MaxAge" : 30.0}
+    cfg.saveConfig()
+
+    cfg = Config(str(cFile))
+    assert cfg.Checkpoint == {"Period" : 60.0, "MaxAge" : 60.0 + cfg.Timers["ControllerSleep"]}
+    with open(cFile) as configFile:
+        assert json.load(configFile)["Checkpoint"]["MaxAge"] == cfg.Checkpoint["MaxAge"]
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+
+from datetime import datetime
+import logging
+
+import pytest
+
+from generic.controlClock import *
+from sprinklers.replay import *
+from benchmarks.controlClock import FakeClocks, jumpedMinutes, dstMinutes
+from tests.conftest import buildController
+
+
+def runCycles(period: float, numCycles: int, work: float, fixedRate: bool) -> tuple:
+    """
+    Run cycles of work on a virtual clock, sleeping until the next deadline after each.
+    Returns:
+        Drift of the start of the last cycle from the expected time (seconds), and the timer.
+    """
+
+    now = 0.0
+    timer = FixedRateTimer(period, now)
+    cycles = 0
+    while cycles < numCycles:
+        if timer.due(now):
+            cycles += 1
+            lastStart = now
+            now += work
+            if not fixedRate:
+                timer.deadline = now + period
+        now = max(now, timer.deadline)
+
+    return lastStart - (numCycles - 1) * period, timer
+
+
+def test_fixed_rate_drift():
+    """
+    Fixed rate cycles don't drift by the work time, fixed delay cycles do.
+    """
+
+    drift, timer = runCycles(1.0, 100, 0.3, True)
+    assert drift == pytest.approx(0.0)
+    assert (timer.cycles, timer.missed) == (100, 0)
+    assert timer.stats()["jitter"]["max"] == pytest.approx(0.0)
+
+    drift, _ = runCycles(1.0, 100, 0.3, False)
+    assert drift == pytest.approx(99 * 0.3)
+
+
+def test_missed_deadlines_skipped():
+    """
+    Deadlines missed entirely are skipped, not run back to back.
+    """
+
+    timer = FixedRateTimer(1.0, 0.0)
+    assert not timer.due(-0.5)
+    assert timer.due(0.0)
+    assert timer.due(3.5)
+    assert timer.missed == 2
+    assert timer.deadline == 4.0
+    assert not timer.due(3.9)
+    assert timer.stats()["lateness"]["max"] == pytest.approx(2500.0, rel=0.05)
+
+
+def test_wall_clock_jumps():
+    """
+    Wall clock steps beyond the threshold are counted, drift within it isn't.
+    """
+
+    clocks = FakeClocks(1.6e9)
+    clock = WallClock(logging.getLogger("test"), 2.0, "", clocks.wall, clocks.monotonic)
+    assert clock.read() == (0.0, 1.6e9)
+
+    for offset, forward, back in ((1.0, 0, 0), (300.0, 1, 0), (-1800.0, 1, 1), (-1.0, 1, 1)):
+        clocks.mono += 1.0
+        clocks.offset += offset
+        clock.read()
+        assert (clock.forwardJumps, clock.backwardJumps) == (forward, back)
+
+
+def test_unknown_time_zone():
+    """
+    An unknown time zone falls back to the system time zone.
+    """
+
+    clock = WallClock(logging.getLogger("test"), 2.0, "Nowhere/Special")
+    assert clock.zone is None
+    assert WallClock(logging.getLogger("test"), 2.0, "Australia/Sydney").zone == ZoneInfo("Australia/Sydney")
+
+
+@pytest.fixture
+def ctrl(tmp_path):
+    ctrl = buildController(str(tmp_path), cls=ReplayController)
+    ctrl.mode = ControllerMode.AUTO
+
+    return ctrl
+
+
+def test_no_rerun_after_backward_step(ctrl):
+    """
+    Runs aren't run again when the wall clock steps back during them.
+    """
+
+    monday = datetime(2021, 1, 4, 6, 0)
+    expected, forward, back = jumpedMinutes(ctrl, monday, 2.0, 0.0, 0.0, True)
+    assert expected > 0
+    assert (forward, back) == (0, 0)
+
+    unguarded, _, _ = jumpedMinutes(ctrl, monday, 2.0, 0.84, -1800.0, False)
+    minutes, forward, back = jumpedMinutes(ctrl, monday, 2.0, 0.84, -1800.0, True)
+    assert unguarded > expected
+    assert minutes == pytest.approx(expected)
+    assert (forward, back) == (0, 1)
+
+
+def test_dst_spring_forward():
+    """
+    A run in the skipped hour starts that much later, and runs its whole duration.
+    """
+
+    (minutes, starts), (wallMinutes, wallStarts) = dstMinutes("Australia/Sydney", datetime(2021, 10, 3), "0230", 20)
+    assert (minutes, starts) == (20, ["03:30"])
+    assert wallMinutes == 0
+
+
+def test_dst_fall_back():
+    """
+    A run in the repeated hour runs once, for its duration.
+    """
+
+    (minutes, starts), (wallMinutes, wallStarts) = dstMinutes("Australia/Sydney", datetime(2021, 4, 4), "0230", 20)
+    assert (minutes, starts) == (20, ["02:30"])
+    assert (wallMinutes, wallStarts) == (40, ["02:30", "02:30"])
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+import json
+
+import sprinklers.ui_pb2 as ui_pb2
+
+from sprinklers.uiMessages import *
+
+
+def test_zero_seconds_rejected(runningController):
+    """
+    Manual runs of 0 seconds are rejected, not run and ended straight away.
+    """
+
+    ctrl = runningController
+    ctrl.setMode(ControllerMode.MANUAL)
+
+    assert ctrl.startStation(2, 0.0) == (ui_pb2.UiModeStatus.CS_MODE_FAIL, ManualRunReason.NO_TIME)
+    assert ctrl.queueStations([(2, 10.0), (3, 0.0)]) == (ui_pb2.UiModeStatus.CS_MODE_FAIL, ManualRunReason.NO_TIME)
+    assert ctrl.manualRuns() == {"running" : [], "queued" : []}
+
+    # Stations that aren't outputs are still the reason, whatever the time.
+    assert ctrl.startStation(99, 0.0) == (ui_pb2.UiModeStatus.CS_MODE_FAIL, ManualRunReason.NO_STATION)
+
+    assert ctrl.startStation(2, 10.0) == (ui_pb2.UiModeStatus.CS_GOOD, ManualRunReason.NONE)
+    assert ctrl.setStation(3, True) == (ui_pb2.UiModeStatus.CS_GOOD, ManualRunReason.NONE)
+    assert [r["station"] for r in ctrl.manualRuns()["running"]] == [2, 3]
+
+
+def test_seconds_left_out_of_request(runningController):
+    """
+    Requests without the seconds (proto3 default 0) are rejected with reason NO_TIME.
+    """
+
+    ctrl = runningController
+    ctrl.setMode(ControllerMode.MANUAL)
+    cmds = UiCommands(ctrl.cfg, ctrl.log, ctrl)
+
+    start = ui_pb2.StartStationCmd(cmd=ui_pb2.UiModeControl.C_START_STATION, station=2)
+    resp = cmds.StartStation(start, None)
+    assert (resp.status, resp.reason) == (ui_pb2.UiModeStatus.CS_MODE_FAIL, "NO_TIME")
+    assert json.loads(resp.runs) == {"running" : [], "queued" : []}
+
+    queue = ui_pb2.QueueStationsCmd(cmd=ui_pb2.UiModeControl.C_QUEUE_STATIONS, runs=[ui_pb2.StationRun(station=2, seconds=10), ui_pb2.StationRun(station=3)])
+    resp = cmds.QueueStations(queue, None)
+    assert (resp.status, resp.reason) == (ui_pb2.UiModeStatus.CS_MODE_FAIL, "NO_TIME")
+
+    start.seconds = 10
+    resp = cmds.StartStation(start, None)
+    assert (resp.status, resp.reason) == (ui_pb2.UiModeStatus.CS_GOOD, "NONE")
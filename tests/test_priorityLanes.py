@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+
+import statistics
+
+from generic.priorityLanes import *
+from benchmarks.priorityLanes import offLatency
+
+# Status call time, and bound on setting the mode OFF while status calls
+# flood the server. With a single queue OFF waits for status calls ahead of it.
+DELAY = 0.05
+OFF_BOUND = 25.0
+
+
+def test_off_under_status_flood(runningController):
+    """
+    Setting the mode OFF isn't held up by a status flood, and status calls are shed.
+    """
+
+    ctrl = runningController
+    lanes = {
+        "control" : {"Priority" : 0, "Reserved" : 1, "MaxQueue" : 0, "Methods" : ["SetControllerMode"]},
+        "read" : {"Priority" : 1, "Reserved" : 0, "MaxQueue" : 8, "Methods" : ["GetControllerStatus", "GetUpcomingRuns"]}
+    }
+    executor = PriorityLaneExecutor(4, lanes, "read")
+
+    latencies, ok, rejected = offLatency(ctrl, executor, [LaneInterceptor(executor)], 16, DELAY, 20)
+
+    assert statistics.median(latencies) < OFF_BOUND
+    assert max(latencies) < DELAY * 1000.0 * 2
+    assert ok > 0
+    assert rejected > 0
+    assert executor.stats()["read"]["shed"] == rejected
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+import logging
+
+import pytest
+
+from sprinklers.scheduler import *
+from tests.conftest import configFile
+
+# Start of Monday 06:00 and Sunday, minutes of the week.
+MONDAY_0600 = 6 * 60
+SUNDAY = 6 * DAY_MINUTES
+
+
+def makeProgram(days: list, onTimes: list) -> dict:
+    """
+    Make and parse a controller program of one program.
+    Parameters:
+        days : Day names.
+        onTimes : On times, as start (HHMM), duration and stations.
+    Returns:
+        Controller program.
+    """
+
+    return parseProgram({"MyDays" : days, "Programs" : [{"Name" : "Test", "OnTimes" : [
+        {"Start" : start, "Duration" : duration, "Stations" : stations} for start, duration, stations in onTimes]}]})
+
+
+def compiled(program: dict, flows: dict, capacity: float) -> list:
+    """
+    Compile a program, returning its runs as station, start and end.
+    """
+
+    scheduler = Scheduler(logging.getLogger("test"))
+    scheduler.compile(program, flows, capacity)
+
+    return [(r.station, r.start, r.end) for r in scheduler.runs]
+
+
+def test_pack_capacity():
+    """
+    Stations run together up to the supply capacity, the rest wait for runs to end.
+    """
+
+    program = makeProgram(["Monday"], [("0600", 10, [1, 2, 3])])
+    assert compiled(program, {1 : 20.0, 2 : 20.0, 3 : 20.0}, 40.0) == [
+        (1, MONDAY_0600, MONDAY_0600 + 10), (2, MONDAY_0600, MONDAY_0600 + 10), (3, MONDAY_0600 + 10, MONDAY_0600 + 20)]
+
+
+def test_pack_largest_flow_first():
+    """
+    Waiting jobs are started largest flow first, and smaller flows fill the remaining capacity.
+    """
+
+    program = makeProgram(["Monday"], [("0600", 10, [1, 2, 3])])
+    assert compiled(program, {1 : 10.0, 2 : 30.0, 3 : 25.0}, 40.0) == [
+        (1, MONDAY_0600, MONDAY_0600 + 10), (2, MONDAY_0600, MONDAY_0600 + 10), (3, MONDAY_0600 + 10, MONDAY_0600 + 20)]
+
+
+def test_pack_no_flow_rate_runs_alone():
+    """
+    A station without a flow rate takes the whole supply, so runs alone.
+    """
+
+    program = makeProgram(["Monday"], [("0600", 10, [1, 2, 3])])
+    assert compiled(program, {1 : 10.0, 2 : 10.0}, 40.0) == [
+        (3, MONDAY_0600, MONDAY_0600 + 10), (1, MONDAY_0600 + 10, MONDAY_0600 + 20), (2, MONDAY_0600 + 10, MONDAY_0600 + 20)]
+
+
+def test_pack_flow_over_capacity_runs_alone(caplog):
+    program = makeProgram(["Monday"], [("0600", 10, [1, 2])])
+    with caplog.at_level(logging.WARNING, logger="test"):
+        runs = compiled(program, {1 : 50.0, 2 : 5.0}, 40.0)
+    assert runs == [(1, MONDAY_0600, MONDAY_0600 + 10), (2, MONDAY_0600 + 10, MONDAY_0600 + 20)]
+    assert "Station 1 flow exceeds supply capacity" in caplog.text
+
+
+def test_pack_no_capacity_limit():
+    """
+    A supply capacity of 0 is no limit, all stations run together, with or without flow rates.
+    """
+
+    program = makeProgram(["Monday"], [("0600", 10, [1, 2, 3])])
+    assert compiled(program, {1 : 50.0, 2 : 50.0}, 0.0) == [
+        (1, MONDAY_0600, MONDAY_0600 + 10), (2, MONDAY_0600, MONDAY_0600 + 10), (3, MONDAY_0600, MONDAY_0600 + 10)]
+
+
+def test_pack_station_runs_once_at_a_time():
+    """
+    Overlapping on times of a station run one after the other.
+    """
+
+    program = makeProgram(["Monday"], [("0600", 10, [1]), ("0605", 10, [1])])
+    assert compiled(program, {1 : 10.0}, 0.0) == [(1, MONDAY_0600, MONDAY_0600 + 10), (1, MONDAY_0600 + 10, MONDAY_0600 + 20)]
+
+
+def test_week_wrap():
+    """
+    Runs past the end of the week carry on at the start of the week.
+    """
+
+    scheduler = Scheduler(logging.getLogger("test"))
+    scheduler.compile(makeProgram(["Sunday"], [("2350", 30, [2])]), {}, 0.0)
+    assert [(r.station, r.start, r.end) for r in scheduler.runs] == [(2, SUNDAY + 1430, SUNDAY + 1460)]
+    assert scheduler.stationsAt(SUNDAY + 1429) == 0
+    assert scheduler.stationsAt(SUNDAY + 1435) == 1 << 2
+    assert scheduler.stationsAt(WEEK_MINUTES - 1) == 1 << 2
+    assert scheduler.stationsAt(0) == 1 << 2
+    assert scheduler.stationsAt(19) == 1 << 2
+    assert scheduler.stationsAt(20) == 0
+    assert scheduler.totalMinutes() == 30
+
+
+def test_week_wrap_packed():
+    """
+    Runs held back by the supply capacity past the end of the week wrap too.
+    """
+
+    scheduler = Scheduler(logging.getLogger("test"))
+    scheduler.compile(makeProgram(["Sunday"], [("2340", 15, [1, 2])]), {1 : 30.0, 2 : 30.0}, 40.0)
+    assert [(r.station, r.start, r.end) for r in scheduler.runs] == [(1, SUNDAY + 1420, SUNDAY + 1435), (2, SUNDAY + 1435, SUNDAY + 1450)]
+    assert scheduler.stationsAt(SUNDAY + 1425) == 1 << 1
+    assert scheduler.stationsAt(SUNDAY + 1438) == 1 << 2
+    assert scheduler.stationsAt(5) == 1 << 2
+    assert scheduler.stationsAt(10) == 0
+
+
+@pytest.mark.parametrize("start", ["600", "06000", "2400", "0660", "06:0", "abcd", "-600", ""])
+def test_bad_start(start):
+    with pytest.raises(ValueError, match="start time"):
+        makeProgram(["Monday"], [(start, 10, [1])])
+
+
+@pytest.mark.parametrize("duration", [0, -5, 1.5, "10", None])
+def test_bad_duration(duration):
+    with pytest.raises(ValueError, match="duration"):
+        makeProgram(["Monday"], [("0600", duration, [1])])
+
+
+@pytest.mark.parametrize("station", [0, -1, "1", 1.0])
+def test_bad_station(station):
+    with pytest.raises(ValueError, match="station"):
+        makeProgram(["Monday"], [("0600", 10, [1, station])])
+
+
+def test_bad_day():
+    with pytest.raises(KeyError):
+        makeProgram(["Someday"], [("0600", 10, [1])])
+
+
+def test_load_program():
+    """
+    The repository program loads and compiles.
+    """
+
+    program = loadProgram(configFile("program.json"))
+    assert program["Programs"]
+    scheduler = Scheduler(logging.getLogger("test"))
+    scheduler.compile(program, {}, 0.0)
+    assert scheduler.runs
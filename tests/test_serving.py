@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+
+import pytest
+
+from webUI import create_app
+from webUI.serving import production
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br", "identity"])
+@pytest.mark.parametrize("versioned", [False, True])
+@pytest.mark.parametrize("filename", ["index.js", "style.css"])
+def test_static_revalidation(webConfig, filename, versioned, encoding):
+    """
+    Revalidating a (compressed) static file with its ETag is not modified.
+    """
+
+    if encoding == "br":
+        pytest.importorskip("brotli")
+    webConfig["COMPRESS_MIN_SIZE"] = 0
+    app = production(create_app(webConfig))
+    client = app.test_client()
+    path = f'/static/{filename}'
+    if versioned:
+        path += f'?v={app.extensions["staticAssets"].hash(filename)}'
+
+    resp = client.get(path, headers={"Accept-Encoding" : encoding})
+    assert resp.status_code == 200
+    etag = resp.headers["ETag"]
+    if encoding != "identity":
+        assert resp.headers["Content-Encoding"] == encoding
+        assert etag.endswith(f'-{encoding}"')
+
+    resp = client.get(path, headers={"Accept-Encoding" : encoding, "If-None-Match" : etag})
+    assert resp.status_code == 304
+    assert resp.get_data() == b""
+    assert resp.headers["ETag"] == etag
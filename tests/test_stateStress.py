@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+
+from datetime import datetime, timedelta
+import json
+
+import pytest
+
+from sprinklers.controller import *
+from benchmarks.stateStress import stressState
+from tests.conftest import buildController, startController, stopController
+
+
+@pytest.fixture
+def stressController(tmp_path):
+    """
+    Controller running stations 1 to 3 now, with no interlocks or supply limit,
+    so changing inputs don't stop the stations. Stopped on teardown.
+    """
+
+    start = datetime.now() - timedelta(minutes=1)
+    pFile = tmp_path / "program.json"
+    pFile.write_text(json.dumps({
+        "MyDays" : [d.name for d in ProgramDays],
+        "Programs" : [{"Name" : "Stress", "OnTimes" : [{"Start" : start.strftime("%H%M"), "Duration" : 120, "Stations" : [1, 2, 3]}]}]
+    }))
+    rFile = tmp_path / "interlocks.json"
+    rFile.write_text(json.dumps({"Interlocks" : []}))
+
+    ctrl = startController(buildController(str(tmp_path), 0.05, str(pFile), str(rFile), Hydraulics={"SupplyCapacity" : 0.0}))
+
+    yield ctrl
+
+    stopController(ctrl)
+
+
+def test_state_publication_consistent(stressController):
+    """
+    Status responses and snapshots stay consistent while the mode is set and inputs change.
+    """
+
+    counts, setLatencies, errors = stressState(stressController, 8, 2, 2.0)
+
+    assert errors == []
+    assert counts["reads"] > 0
+    assert counts["running"] > 0
+    assert counts["writes"] > 0
+    assert counts["timeouts"] == 0
+    assert counts["inputs"] > 0
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+from webUI.statusCache import *
+
+
+def test_invalidate_other_processes(tmp_path):
+    """
+    Invalidating an entry in one process invalidates the copies cached by others.
+    """
+
+    cacheA = FileStatusCache(3600.0, str(tmp_path))
+    cacheB = FileStatusCache(3600.0, str(tmp_path))
+    assert cacheA.get("status", lambda: "old") == "old"
+    assert cacheB.get("status", lambda: "other") == "old"
+    assert cacheB.stats()["shared"] == 1
+
+    cacheA.invalidate("status")
+    assert cacheB.get("status", lambda: "new") == "new"
+    assert cacheA.get("status", lambda: "other") == "new"
+
+
+def test_invalidate_during_load(tmp_path):
+    """
+    A load started before an invalidation isn't used by any process.
+    """
+
+    cacheA = FileStatusCache(3600.0, str(tmp_path))
+    cacheB = FileStatusCache(3600.0, str(tmp_path))
+
+    def staleLoad():
+        cacheB.invalidate("status")
+        return "old"
+
+    assert cacheA.get("status", staleLoad) == "old"
+    assert cacheB.get("status", lambda: "new") == "new"
+    assert cacheA.get("status", lambda: "other") == "new"
+
+
+def test_process_cache():
+    """
+    Entries are cached, and loaded again once invalidated.
+    """
+
+    cache = StatusCache(3600.0)
+    assert cache.get("status", lambda: "old") == "old"
+    assert cache.get("status", lambda: "other") == "old"
+    cache.invalidate("status")
+    assert cache.get("status", lambda: "new") == "new"
+    assert cache.stats() == {"entries" : 1, "hits" : 1, "misses" : 2, "coalesced" : 0}
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+import logging
+import os
+
+import pytest
+
+from sprinklers.sysfsIoBackend import *
+
+
+def valueFiles(tmp_path, levels: str) -> list:
+    """
+    Make a value file for each IO point, with its level.
+    """
+
+    paths = []
+    for n, level in enumerate(levels):
+        path = tmp_path / f'gpio{n}' / "value"
+        path.parent.mkdir()
+        path.write_text(level)
+        paths.append(str(path))
+
+    return paths
+
+
+def test_read_write(tmp_path):
+    """
+    Levels are read from, and written to, the value files.
+    """
+
+    paths = valueFiles(tmp_path, "0101")
+    backend = SysfsIoBackend(logging.getLogger("test"), paths, True)
+    assert backend.readAll() == 0b1010
+    backend.writeMask(0b0110)
+    assert [open(p).read(1) for p in paths] == ["0", "1", "1", "0"]
+    backend.close()
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="Needs /proc to count open files.")
+def test_failed_open_closes_files(tmp_path):
+    """
+    Value files already open are closed if one of the files fails to open.
+    """
+
+    paths = valueFiles(tmp_path, "000") + [str(tmp_path / "missing" / "value")]
+    numOpen = len(os.listdir("/proc/self/fd"))
+    with pytest.raises(FileNotFoundError):
+        SysfsIoBackend(logging.getLogger("test"), paths, False)
+    assert len(os.listdir("/proc/self/fd")) == numOpen
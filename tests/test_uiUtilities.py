@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+import grpc
+import pytest
+
+from webUI import create_app
+from webUI.circuitBreaker import *
+from webUI.uiUtilities import callServer
+
+
+class CallError(grpc.RpcError):
+    """
+    Error of a failed call, with a status code.
+    """
+
+    def __init__(self, code: grpc.StatusCode) -> None:
+        self.statusCode = code
+
+    def code(self) -> grpc.StatusCode:
+        return self.statusCode
+
+
+def failing(code: grpc.StatusCode):
+    """
+    Make a stub method that always fails with a status code, counting calls.
+    """
+
+    def method(request, timeout=None, metadata=()):
+        method.calls += 1
+        raise CallError(code)
+    method.calls = 0
+
+    return method
+
+
+@pytest.fixture
+def app(webConfig):
+    app = create_app(webConfig)
+    with app.app_context():
+        yield app
+
+
+@pytest.mark.parametrize("code", [grpc.StatusCode.RESOURCE_EXHAUSTED, grpc.StatusCode.UNAUTHENTICATED, grpc.StatusCode.INTERNAL])
+def test_breaker_server_responding(app, code):
+    """
+    Errors from a server that is up don't open its breaker.
+    """
+
+    target = f'responding-{code.name}'
+    method = failing(code)
+    for _ in range(10):
+        with pytest.raises(CallError):
+            callServer(method, None, target, 1.0)
+    assert method.calls == 10
+    assert breakers[target].state == BreakerState.CLOSED
+
+
+@pytest.mark.parametrize("code", [grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED])
+def test_breaker_server_down(app, code):
+    """
+    Calls that don't reach the server open its breaker, then fail fast.
+    """
+
+    target = f'down-{code.name}'
+    method = failing(code)
+    for _ in range(app.config["UI_BREAKER_FAILURES"]):
+        with pytest.raises(CallError):
+            callServer(method, None, target, 1.0)
+    assert breakers[target].state == BreakerState.OPEN
+
+    with pytest.raises(BreakerOpenError):
+        callServer(method, None, target, 1.0)
+    assert method.calls == app.config["UI_BREAKER_FAILURES"]
+
+
+def test_breaker_control_bypass(app):
+    """
+    Control calls are tried while the breaker is open, and don't open it.
+    """
+
+    target = "control"
+    down = failing(grpc.StatusCode.UNAVAILABLE)
+    for _ in range(10):
+        with pytest.raises(CallError):
+            callServer(down, None, target, 1.0, control=True)
+    assert down.calls == 10
+    assert target not in breakers
+
+    for _ in range(app.config["UI_BREAKER_FAILURES"]):
+        with pytest.raises(CallError):
+            callServer(down, None, target, 1.0)
+    assert breakers[target].state == BreakerState.OPEN
+    assert callServer(lambda request, timeout=None, metadata=(): "done", None, target, 1.0, control=True) == "done"
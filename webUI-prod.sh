@@ -0,0 +1,7 @@
+#!/bin/bash
+
+source "./venv.sh"
+
+echo "Starting production web server..."
+
+gunicorn -c config/gunicorn.py webUI.wsgi:app
@@ -30,6 +30,12 @@ def create_app(test_config=None):
     from . import db
     db.init_app(app)
 
+    from . import statusCache
+    statusCache.init_app(app)
+
+    from . import passwordHashing
+    passwordHashing.init_app(app)
+
     from . import auth
     app.register_blueprint(auth.bp)
 
@@ -37,4 +43,7 @@ def create_app(test_config=None):
     app.register_blueprint(webUI.bp)
     app.add_url_rule('/', endpoint='index')
 
+    from . import api
+    app.register_blueprint(api.bp)
+
     return app
\ No newline at end of file
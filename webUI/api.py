@@ -0,0 +1,132 @@
+import functools
+import hashlib
+import json
+
+from flask import Blueprint, Response, abort, current_app, g, request
+
+from webUI.uiUtilities import *
+
+bp = Blueprint('api', __name__, url_prefix='/api')
+
+def api_login_required(view):
+    """
+    Wrapper to require user to be logged in to use the API.
+    Unauthorised (rather than redirect to login page) if not.
+    """
+    @functools.wraps(view)
+    def wrapped_view(**kwargs):
+        if g.user is None:
+            abort(401)
+
+        return view(**kwargs)
+
+    return wrapped_view
+
+def clientHasEtag(etag: str) -> bool:
+    """
+    Check if the client has the response of an ETag (If-None-Match).
+    Compressed responses have the encoding added to their ETags (serving.py),
+    so ETags sent back with an encoding suffix also match.
+    Parameters:
+        etag : ETag of the response, without an encoding.
+    Returns:
+        True if the client has the response.
+    """
+
+    if request.if_none_match.star_tag:
+        return True
+    for tag in request.if_none_match:
+        for encoding in ("-gzip", "-br"):
+            if tag.endswith(encoding):
+                tag = tag[:-len(encoding)]
+        if tag == etag:
+            return True
+
+    return False
+
+def jsonResponse(etag: str, build) -> Response:
+    """
+    Make a JSON response with an ETag, not modified if the client has it.
+    Parameters:
+        etag : ETag of the response.
+        build : Function to build the response data, only called if modified.
+    Returns:
+        Response.
+    """
+
+    if clientHasEtag(etag):
+        resp = Response(status=304)
+    else:
+        resp = Response(json.dumps(build(), separators=(",", ":")), mimetype="application/json")
+
+    # Clients must check with the server each time, so they see changes.
+    resp.set_etag(etag)
+    resp.cache_control.no_cache = True
+
+    return resp
+
+def noStatus() -> Response:
+    """
+    Response if no status from the controller (yet).
+    """
+    return Response(json.dumps({"stale" : True}), status=503, mimetype="application/json")
+
+@bp.route('/status')
+@api_login_required
+def status():
+    """
+    Controller status, next run and running stations.
+    Includes the status version, so clients know when to get IO and program.
+    """
+
+    staleData, cntrlData, _, _, _, updatePeriod = getControllerStatus()
+    if not cntrlData:
+        return noStatus()
+
+    runsData = {}
+    if staleData == False:
+        _, runsData = getUpcomingRuns()
+
+    data = {
+        "version" : cntrlData.get("version", 0),
+        "stale" : staleData,
+        "refresh" : updatePeriod,
+        "name" : cntrlData["name"],
+        "state" : cntrlData["state"],
+        "cTime" : cntrlData["cTime"],
+        "mode" : cntrlData["mode"],
+        "next" : runsData.get("next", {}),
+        "running" : [st for st in runsData.get("stations", []) if st["remaining"] > 0]
+    }
+
+    # Time changes every second, so the ETag is of the content.
+    body = json.dumps(data, separators=(",", ":"))
+    return jsonResponse(f's{data["version"]}-{hashlib.sha1(body.encode()).hexdigest()[:12]}', lambda: data)
+
+@bp.route('/io')
+@api_login_required
+def io():
+    """
+    Controller inputs and outputs.
+    """
+
+    _, cntrlData, inputData, outputData, _, _ = getControllerStatus()
+    if not cntrlData:
+        return noStatus()
+
+    version = cntrlData.get("version", 0)
+    return jsonResponse(f'io-{version}', lambda: {"version" : version, "inputs" : inputData, "outputs" : outputData})
+
+@bp.route('/program')
+@api_login_required
+def program():
+    """
+    Controller program.
+    """
+
+    _, cntrlData, _, _, programData, _ = getControllerStatus()
+    if not cntrlData:
+        return noStatus()
+
+    version = cntrlData.get("version", 0)
+    return jsonResponse(f'pg-{version}', lambda: {"version" : version, "program" : programData})
@@ -1,20 +1,57 @@
 import functools
+import threading
+import time
 
-from flask import Blueprint, flash, g, redirect, render_template, request, session, url_for
-from werkzeug.security import check_password_hash, generate_password_hash
+from flask import Blueprint, current_app, flash, g, redirect, render_template, request, session, url_for
 from webUI.db import get_db
+from webUI.passwordHashing import *
 
 bp = Blueprint('auth', __name__, url_prefix='/auth')
 
+# Logged in users, by user id, as (monotonic) expiry time and user.
+# Shared by the requests of the process, so users aren't read each request.
+users = {}
+usersLock = threading.Lock()
+
+def get_user(user_id):
+    """
+    Get a user, from the user cache if cached (and not expired).
+    Returns None if no user.
+    """
+    entry = users.get(user_id)
+    if (entry is not None) and (entry[0] > time.monotonic()):
+        return entry[1]
+
+    row = get_db().execute(
+        'SELECT * FROM user WHERE id = ?', (user_id,)
+    ).fetchone()
+    user = dict(row) if row is not None else None
+
+    # Cache users for a time, so changes by other processes are seen.
+    if user is not None:
+        with usersLock:
+            users[user_id] = (time.monotonic() + current_app.config.get("USER_CACHE_TTL", 60.0), user)
+
+    return user
+
+def invalidate_user(user_id):
+    """
+    Remove a user from the user cache, e.g. after the user has changed.
+    """
+    with usersLock:
+        users.pop(user_id, None)
+
 @bp.route('/register', methods=('GET', 'POST'))
 def register():
     """
     Register new user.
     """
+    status = 200
     if request.method == 'POST':
         username = request.form['username']
         password = request.form['password']
         db = get_db()
+        hasher = get_hasher()
         error = None
 
         if not username:
@@ -24,67 +61,108 @@ def register():
 
         if error is None:
             try:
+                # Hash the password on the hashing pool, if not too busy.
+                hasher.limit(request.remote_addr, "")
                 db.execute(
                     "INSERT INTO user (username, password) VALUES (?, ?)",
-                    (username, generate_password_hash(password)),
+                    (username, hasher.generate(password)),
                 )
                 db.commit()
             except db.IntegrityError:
                 error = f"User {username} is already registered."
+            except RateLimitedError:
+                error = 'Too many attempts, try again later.'
+                status = 429
+            except HashPoolBusyError:
+                error = 'Server busy, try again.'
+                status = 503
             else:
                 return redirect(url_for("auth.login"))
 
         flash(error)
 
-    return render_template('auth/register.html')
+    return render_template('auth/register.html'), status
 
 @bp.route('/login', methods=('GET', 'POST'))
 def login():
     """
     Login registered user.
     """
+    status = 200
     if request.method == 'POST':
         username = request.form['username']
         password = request.form['password']
         db = get_db()
+        hasher = get_hasher()
         error = None
-        user = db.execute(
-            'SELECT * FROM user WHERE username = ?', (username,)
-        ).fetchone()
+        checked = False
 
-        if user is None:
-            error = 'Incorrect username.'
-        elif not check_password_hash(user['password'], password):
-            error = 'Incorrect password.'
+        try:
+            # Check the rate limits before the (slow) password check.
+            hasher.limit(request.remote_addr, username)
+
+            user = db.execute(
+                'SELECT * FROM user WHERE username = ?', (username,)
+            ).fetchone()
+
+            if user is None:
+                error = 'Incorrect username.'
+            elif not hasher.check(user['password'], password):
+                error = 'Incorrect password.'
+            else:
+                checked = True
+
+            if checked and hasher.needsRehash(user['password']):
+                # Hash cost has changed, so hash the password again now it is known.
+                db.execute(
+                    'UPDATE user SET password = ? WHERE id = ?', (hasher.generate(password), user['id'])
+                )
+                db.commit()
+        except RateLimitedError:
+            error = 'Too many login attempts, try again later.'
+            status = 429
+        except HashPoolBusyError:
+            # If busy while rehashing the user is logged in,
+            # and the password will be hashed again next login.
+            if not checked:
+                error = 'Server busy, try again.'
+                status = 503
 
         if error is None:
             session.clear()
             session['user_id'] = user['id']
+            invalidate_user(user['id'])
             return redirect(url_for('index'))
 
         flash(error)
 
-    return render_template('auth/login.html')
+    return render_template('auth/login.html'), status
 
 @bp.before_app_request
 def load_logged_in_user():
     """
     For newly logged in user create user object.
     """
+    # Static files don't need the user.
+    if request.endpoint == 'static':
+        g.user = None
+        return
+
     user_id = session.get('user_id')
 
     if user_id is None:
         g.user = None
     else:
-        g.user = get_db().execute(
-            'SELECT * FROM user WHERE id = ?', (user_id,)
-        ).fetchone()
+        g.user = get_user(user_id)
 
 @bp.route('/logout')
 def logout():
     """
     Log user out.
     """
+    user_id = session.get('user_id')
+    if user_id is not None:
+        invalidate_user(user_id)
     session.clear()
     return redirect(url_for('index'))
 
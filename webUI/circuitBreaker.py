@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+
+from enum import Enum
+from threading import Lock, Thread
+from typing import Callable
+import time
+
+import grpc
+
+
+class BreakerState(Enum):
+    """
+    Circuit breaker states.
+    """
+    CLOSED = 0
+    OPEN = 1
+    HALF_OPEN = 2
+
+
+class BreakerOpenError(grpc.RpcError):
+    """
+    Error for a call failed fast, as the circuit breaker of the server is open.
+    Is a gRPC error, so is handled the same as the server not responding.
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            name : Name of the server, e.g. its address.
+        """
+
+        self.name = name
+
+    def code(self) -> grpc.StatusCode:
+        """
+        Status code of the error, as for a server that is down.
+        """
+        return grpc.StatusCode.UNAVAILABLE
+
+    def details(self) -> str:
+        """
+        Details of the error.
+        """
+        return f'Circuit breaker open : {self.name}'
+
+
+class CircuitBreaker():
+    """
+    Class to represent a circuit breaker for calls to a server (controller).
+    After a number of failed calls in a row the breaker opens, and calls fail
+    fast rather than waiting for the server. While open, a background thread
+    probes the server (half open) after the reset time, backing off if the
+    server is still down, and closes the breaker once the server is back.
+    """
+
+    # Maximum backoff of the reset time, while probes keep failing.
+    MAX_BACKOFF = 8
+
+    def __init__(self, name: str, maxFailures: int, resetTime: float, probe: Callable[[], bool]) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            name : Name of the server, e.g. its address.
+            maxFailures : Number of failed calls in a row to open the breaker.
+            resetTime : Time open before probing the server (seconds).
+            probe : Function to probe the server, returns True if the server is up.
+        """
+
+        self.name = name
+        self.maxFailures = maxFailures
+        self.resetTime = resetTime
+        self.probe = probe
+
+        self.lock = Lock()
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+
+        # True while the background probe thread is running.
+        self.probingActive = False
+
+        # Number of calls failed fast, and times opened.
+        self.rejected = 0
+        self.trips = 0
+
+    def allow(self) -> bool:
+        """
+        Check if a call to the server is allowed.
+        Only the background probe calls the server while not closed.
+        Returns:
+            True if the call is allowed, False to fail fast.
+        """
+
+        if self.state == BreakerState.CLOSED:
+            return True
+
+        self.rejected += 1
+
+        return False
+
+    def recordSuccess(self) -> None:
+        """
+        Record a successful call to the server.
+        """
+
+        with self.lock:
+            self.failures = 0
+            self.state = BreakerState.CLOSED
+
+    def recordFailure(self) -> None:
+        """
+        Record a failed call to the server, opening the breaker if too many.
+        """
+
+        with self.lock:
+            self.failures += 1
+            if (self.state == BreakerState.CLOSED) and (self.failures >= self.maxFailures):
+                self.state = BreakerState.OPEN
+                self.trips += 1
+                if not self.probingActive:
+                    self.probingActive = True
+                    Thread(target=self.probing, daemon=True).start()
+
+    def probing(self) -> None:
+        """
+        Probe the server while the breaker is open, until it is back.
+        Time between probes doubles each failed probe, up to the maximum backoff.
+        """
+
+        backoff = 1
+        while True:
+            time.sleep(self.resetTime * backoff)
+
+            # A call in flight when the breaker opened may have closed it.
+            with self.lock:
+                if self.state == BreakerState.CLOSED:
+                    self.probingActive = False
+                    return
+                self.state = BreakerState.HALF_OPEN
+            try:
+                up = self.probe()
+            except Exception:
+                up = False
+
+            with self.lock:
+                if up:
+                    # Closed on trial, a single failed call opens it again.
+                    self.state = BreakerState.CLOSED
+                    self.failures = self.maxFailures - 1
+                    self.probingActive = False
+                    return
+                self.state = BreakerState.OPEN
+            backoff = min(backoff * 2, self.MAX_BACKOFF)
+
+
+# Circuit breakers by server, shared by all requests of the process.
+breakers = {}
+breakersLock = Lock()
+
+
+def getBreaker(name: str, maxFailures: int, resetTime: float, probe: Callable[[], bool]) -> CircuitBreaker:
+    """
+    Get the circuit breaker for a server, creating it if it doesn't exist.
+    Parameters:
+        name : Name of the server, e.g. its address.
+        maxFailures : Number of failed calls in a row to open the breaker.
+        resetTime : Time open before probing the server (seconds).
+        probe : Function to probe the server, returns True if the server is up.
+    Returns:
+        Circuit breaker for the server.
+    """
+
+    breaker = breakers.get(name)
+    if breaker is None:
+        with breakersLock:
+            breaker = breakers.setdefault(name, CircuitBreaker(name, maxFailures, resetTime, probe))
+
+    return breaker
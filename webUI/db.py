@@ -1,30 +1,63 @@
+import os
 import sqlite3
+import threading
 
 import click
 from flask import current_app, g
 from flask.cli import with_appcontext
 
+# Connections of each thread, by database, reused between requests.
+connections = threading.local()
+
+def connect(database: str) -> sqlite3.Connection:
+    """
+    Connect to the auth database, and tune it for concurrent requests.
+    WAL journal so reads don't wait for writes, and writes wait (rather
+    than fail) for other writers.
+    """
+    db = sqlite3.connect(
+        database,
+        detect_types=sqlite3.PARSE_DECLTYPES
+    )
+    db.row_factory = sqlite3.Row
+
+    db.execute('PRAGMA journal_mode = WAL')
+    db.execute('PRAGMA synchronous = NORMAL')
+    db.execute(f'PRAGMA busy_timeout = {current_app.config.get("DB_BUSY_TIMEOUT", 5000)}')
+    db.execute('PRAGMA temp_store = MEMORY')
+    db.execute('PRAGMA cache_size = -2000')
+
+    return db
+
 def get_db():
     """
     Get the auth database.
+    Each thread has its own connection, reused by its requests.
     """
     if 'db' not in g:
-        g.db = sqlite3.connect(
-            current_app.config['DATABASE'],
-            detect_types=sqlite3.PARSE_DECLTYPES
-        )
-        g.db.row_factory = sqlite3.Row
+        database = current_app.config['DATABASE']
+        dbs = getattr(connections, 'dbs', None)
+        # New connections in a new (forked) process.
+        if (dbs is None) or (connections.pid != os.getpid()):
+            dbs = connections.dbs = {}
+            connections.pid = os.getpid()
+        db = dbs.get(database)
+        if db is None:
+            db = dbs[database] = connect(database)
+        g.db = db
 
     return g.db
 
 def close_db(e=None):
     """
-    Close the auth database.
+    Release the auth database at the end of the request.
+    The connection stays open for the next request of the thread,
+    so roll back anything not committed.
     """
     db = g.pop('db', None)
 
-    if db is not None:
-        db.close()
+    if (db is not None) and db.in_transaction:
+        db.rollback()
 
 def init_db():
     """
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+from concurrent import futures
+from threading import BoundedSemaphore
+
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from generic.rateLimiter import *
+
+
+class RateLimitedError(Exception):
+    """
+    Error for a request rejected, as too many from the client or for the user.
+    """
+    pass
+
+
+class HashPoolBusyError(Exception):
+    """
+    Error for a password hash rejected, as too many already waiting.
+    """
+    pass
+
+
+class PasswordHasher():
+    """
+    Class to represent password hashing on a bounded pool of threads, so that
+    slow hashes don't use the CPU needed by other requests. Hashes wait in a
+    bounded queue, and are rejected if it is full. Logins are rate limited by
+    client address and by user.
+    """
+
+    def __init__(self, method: str, workers: int, queue: int, addrLimiter: RateLimiter, userLimiter: RateLimiter) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            method : Password hash method, including cost parameters.
+            workers : Number of hashes at the same time.
+            queue : Number of hashes allowed to wait.
+            addrLimiter : Rate limits by client address.
+            userLimiter : Rate limits by user.
+        """
+
+        self.method = method
+        self.pool = futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hash")
+        self.slots = BoundedSemaphore(workers + queue)
+        self.addrLimiter = addrLimiter
+        self.userLimiter = userLimiter
+
+        # Prefix of hashes made with the method, as stored, found on first use.
+        self.prefix = None
+
+        # Number of hashes rejected as the queue was full.
+        self.busy = 0
+
+    def limit(self, addr: str, username: str) -> None:
+        """
+        Check the rate limits of a login (or registration).
+        Parameters:
+            addr : Client address.
+            username : User name.
+        """
+
+        if not self.addrLimiter.allow(addr):
+            raise RateLimitedError(addr)
+        if username and (not self.userLimiter.allow(username)):
+            raise RateLimitedError(username)
+
+    def run(self, fn, *args):
+        """
+        Run a hash on the pool, and wait for the result.
+        Parameters:
+            fn : Hash function.
+            args : Arguments of the hash function.
+        Returns:
+            Result of the hash function.
+        """
+
+        if not self.slots.acquire(blocking=False):
+            self.busy += 1
+            raise HashPoolBusyError()
+        try:
+            return self.pool.submit(fn, *args).result()
+        finally:
+            self.slots.release()
+
+    def generate(self, password: str) -> str:
+        """
+        Hash a password.
+        Parameters:
+            password : Password.
+        Returns:
+            Password hash, to store.
+        """
+
+        return self.run(generate_password_hash, password, self.method)
+
+    def check(self, pwhash: str, password: str) -> bool:
+        """
+        Check a password against its hash.
+        Parameters:
+            pwhash : Stored password hash.
+            password : Password.
+        Returns:
+            True if the password matches.
+        """
+
+        return self.run(check_password_hash, pwhash, password)
+
+    def needsRehash(self, pwhash: str) -> bool:
+        """
+        Check if a password hash was made with a different method or cost.
+        Parameters:
+            pwhash : Stored password hash.
+        Returns:
+            True if the password should be hashed again.
+        """
+
+        if self.prefix is None:
+            self.prefix = self.run(generate_password_hash, "", self.method).split("$", 1)[0]
+
+        return pwhash.split("$", 1)[0] != self.prefix
+
+
+def get_hasher() -> PasswordHasher:
+    """
+    Get the password hasher of the application.
+    """
+    return current_app.extensions["passwordHasher"]
+
+def init_app(app):
+    """
+    Initialise application.
+    """
+    app.extensions["passwordHasher"] = PasswordHasher(
+        app.config.get("PASSWORD_HASH_METHOD", "scrypt:32768:8:1"),
+        app.config.get("HASH_WORKERS", 2),
+        app.config.get("HASH_QUEUE", 8),
+        RateLimiter(app.config.get("LOGIN_ADDR_RATE", 1.0), app.config.get("LOGIN_ADDR_BURST", 10)),
+        RateLimiter(app.config.get("LOGIN_USER_RATE", 0.2), app.config.get("LOGIN_USER_BURST", 5))
+    )
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+
+from threading import Lock
+import gzip
+import hashlib
+import os
+import re
+
+from flask import Flask, request
+from jinja2 import ChoiceLoader, ModuleLoader
+
+try:
+    import brotli
+except ImportError:
+    # No brotli module, so only gzip compression.
+    brotli = None
+
+
+# Mime types of responses that are compressed.
+COMPRESS_TYPES = ("text/html", "text/css", "text/plain", "text/javascript", "application/javascript", "application/json")
+
+# Encoding suffix of the ETags of compressed responses.
+ETAG_ENCODING = re.compile(r'-(gzip|br)"')
+
+
+class StaticAssets():
+    """
+    Class to represent the static assets of the application, with content hashes
+    for versioned (cache busting) URLs, and compressed content of each file.
+    """
+
+    def __init__(self, staticFolder: str) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            staticFolder : Folder of the static files.
+        """
+
+        self.staticFolder = staticFolder
+        self.lock = Lock()
+
+        # Content hash of files, by file name.
+        self.hashes = {}
+
+        # Compressed content of files, by file name, hash and encoding.
+        self.compressed = {}
+
+    def hash(self, filename: str) -> str:
+        """
+        Get the content hash of a static file.
+        Files are hashed once, static files don't change while the server is running.
+        Parameters:
+            filename : File name, relative to the static folder.
+        Returns:
+            Content hash of the file, blank if no file.
+        """
+
+        fHash = self.hashes.get(filename)
+        if fHash is None:
+            try:
+                with open(os.path.join(self.staticFolder, filename), "rb") as f:
+                    fHash = hashlib.sha1(f.read()).hexdigest()[:12]
+            except OSError:
+                fHash = ""
+            with self.lock:
+                self.hashes[filename] = fHash
+
+        return fHash
+
+    def compress(self, filename: str, fHash: str, encoding: str, data: bytes, level: int) -> bytes:
+        """
+        Get the compressed content of a static file, compressing it once.
+        Parameters:
+            filename : File name, relative to the static folder.
+            fHash : Content hash of the file.
+            encoding : Content encoding, "br" or "gzip".
+            data : Content of the file.
+            level : Compression level.
+        Returns:
+            Compressed content of the file.
+        """
+
+        key = (filename, fHash, encoding)
+        cData = self.compressed.get(key)
+        if cData is None:
+            cData = compressData(encoding, data, level)
+            with self.lock:
+                self.compressed[key] = cData
+
+        return cData
+
+
+def compressData(encoding: str, data: bytes, level: int) -> bytes:
+    """
+    Compress response data.
+    Parameters:
+        encoding : Content encoding, "br" or "gzip".
+        data : Response data.
+        level : Compression level (gzip 1 to 9, brotli quality is capped at 11).
+    Returns:
+        Compressed data.
+    """
+
+    if encoding == "br":
+        return brotli.compress(data, quality=min(level, 11))
+
+    return gzip.compress(data, compresslevel=level)
+
+def precompileTemplates(app: Flask) -> None:
+    """
+    Compile all the templates to python modules, and load templates from the modules.
+    Template sources aren't parsed or checked for changes while serving.
+    Parameters:
+        app : Flask application.
+    """
+
+    compiledDir = os.path.join(app.instance_path, "templates-compiled")
+    os.makedirs(compiledDir, exist_ok=True)
+
+    env = app.jinja_env
+    names = env.list_templates()
+    env.compile_templates(compiledDir, zip=None, ignore_errors=False)
+
+    # Compiled templates first, template sources for any that aren't compiled.
+    env.loader = ChoiceLoader([ModuleLoader(compiledDir), env.loader])
+    env.auto_reload = False
+
+    # Load all the templates now, rather than on first request.
+    for name in names:
+        env.get_template(name)
+
+def production(app: Flask) -> Flask:
+    """
+    Configure the application for production serving.
+    Templates are precompiled, static URLs have content hashes and are cached
+    by browsers for a long time, and responses are compressed (brotli or gzip).
+    Parameters:
+        app : Flask application.
+    Returns:
+        Flask application.
+    """
+
+    maxAge = app.config.get("STATIC_MAX_AGE", 31536000)
+    minSize = app.config.get("COMPRESS_MIN_SIZE", 500)
+    level = app.config.get("COMPRESS_LEVEL", 6)
+
+    precompileTemplates(app)
+
+    assets = StaticAssets(app.static_folder)
+    app.extensions["staticAssets"] = assets
+
+    @app.url_defaults
+    def hashedStatic(endpoint, values):
+        """
+        Add the content hash of static files to their URLs.
+        """
+        if (endpoint == "static") and ("filename" in values):
+            fHash = assets.hash(values["filename"])
+            if fHash:
+                values["v"] = fHash
+
+    @app.before_request
+    def uncompressedEtags():
+        """
+        Strip the encoding suffix from ETags the client has (If-None-Match),
+        so views (e.g. static files) compare them with their own ETags.
+        """
+        ifNoneMatch = request.environ.get("HTTP_IF_NONE_MATCH")
+        if ifNoneMatch:
+            match = ETAG_ENCODING.search(ifNoneMatch)
+            if match:
+                request.environ["HTTP_IF_NONE_MATCH"] = ETAG_ENCODING.sub('"', ifNoneMatch)
+                request.environ["webUI.etagEncoding"] = match.group(1)
+                request.__dict__.pop("if_none_match", None)
+
+    @app.after_request
+    def cacheAndCompress(response):
+        """
+        Set cache headers of static files, and compress responses.
+        """
+
+        isStatic = request.endpoint == "static"
+        fHash = ""
+        if isStatic:
+            filename = request.view_args.get("filename", "")
+            fHash = assets.hash(filename)
+            if fHash and (request.args.get("v") == fHash):
+                # URL has the content hash, so the file never changes.
+                response.cache_control.no_cache = None
+                response.cache_control.public = True
+                response.cache_control.max_age = maxAge
+                response.cache_control.immutable = True
+
+        # Not modified, the client has the response compressed with its ETag.
+        encoding = request.environ.get("webUI.etagEncoding")
+        if (response.status_code == 304) and encoding:
+            etag, weak = response.get_etag()
+            if etag:
+                response.set_etag(f'{etag}-{encoding}', weak)
+
+        if (response.status_code != 200) or ("Content-Encoding" in response.headers) or (response.mimetype not in COMPRESS_TYPES):
+            return response
+
+        # Prefer brotli if available and accepted, else gzip.
+        encoding = ""
+        if (brotli is not None) and request.accept_encodings["br"]:
+            encoding = "br"
+        elif request.accept_encodings["gzip"]:
+            encoding = "gzip"
+        response.vary.add("Accept-Encoding")
+        if not encoding:
+            return response
+
+        # Static files are sent directly from the file, so read them for compression.
+        response.direct_passthrough = False
+        data = response.get_data()
+        if len(data) < minSize:
+            return response
+
+        if isStatic:
+            cData = assets.compress(filename, fHash, encoding, data, level)
+        else:
+            cData = compressData(encoding, data, level)
+
+        response.set_data(cData)
+        response.headers["Content-Encoding"] = encoding
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(f'{etag}-{encoding}', weak)
+
+        return response
+
+    return app
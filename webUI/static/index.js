@@ -0,0 +1,127 @@
+// Index page updates.
+// Polls the controller status, and updates the page from it.
+// Inputs and outputs are only requested when the status version changes,
+// and the page is reloaded if the program changes.
+// Requests are conditional (ETag), so unchanged data isn't sent again.
+
+"use strict";
+
+let version = null;
+let program = null;
+
+// Get JSON from the webUI API, null if not modified or no data.
+async function getJson(url) {
+  const resp = await fetch(url, { cache: "no-cache", credentials: "same-origin" });
+  if (resp.status === 401) {
+    // Logged out, so show the login page.
+    window.location.reload();
+    return null;
+  }
+  if (!resp.ok) {
+    return null;
+  }
+  return resp.json();
+}
+
+// Set the text of an element, if it has changed.
+function setText(id, text) {
+  const el = document.getElementById(id);
+  if (el && el.textContent !== text) {
+    el.textContent = text;
+  }
+}
+
+// Update the controller status, and the next runs.
+function updateStatus(s) {
+  document.getElementById("staleNote").hidden = !s.stale;
+  setText("cState", s.state);
+  setText("cTime", s.cTime);
+
+  for (const div of document.querySelectorAll("div[data-mode]")) {
+    const active = div.dataset.mode === s.mode;
+    div.className = active ? "modebtnDisabled" : "modebtn";
+    div.querySelector("button").disabled = active;
+  }
+
+  if (s.stale) {
+    // Runs are only known while the controller is responding.
+    return;
+  }
+  const next = s.next;
+  setText("nextRun", (next && next.sName) ?
+    `${next.sName} (${next.program}) in ${next.nextIn} minutes, for ${next.duration} minutes` : "None scheduled");
+
+  const running = document.getElementById("running");
+  const rows = [];
+  for (const st of s.running) {
+    const row = document.createElement("tr");
+    const pad = document.createElement("th");
+    pad.setAttribute("width", "75px");
+    const cell = document.createElement("th");
+    const text = document.createElement("a-dyn");
+    text.textContent = `${st.sName} running, ${st.remaining} minutes remaining`;
+    cell.appendChild(text);
+    row.append(pad, cell);
+    rows.push(row);
+  }
+  running.replaceChildren(...rows);
+}
+
+// Update the inputs and outputs.
+function updateIo(io) {
+  io.inputs.inputs.forEach((i, idx) => {
+    const el = document.getElementById(`in-${idx}`);
+    if (el) {
+      el.className = i.iActive ? "activeIO" : "inactiveIO";
+    }
+  });
+  io.outputs.outputs.forEach((o, idx) => {
+    const el = document.getElementById(`out-${idx}`);
+    if (el) {
+      el.className = o.oActive ? "activeIO" : "inactiveIO";
+    }
+  });
+}
+
+// Poll the controller, and schedule the next poll.
+async function poll(refresh) {
+  try {
+    const s = await getJson("/api/status");
+    if (s && document.getElementById("waiting")) {
+      // Controller has connected, so show the whole page.
+      window.location.reload();
+      return;
+    }
+    if (s) {
+      updateStatus(s);
+      refresh = s.refresh;
+      if (s.version !== version) {
+        const io = await getJson("/api/io");
+        if (io) {
+          updateIo(io);
+        }
+        const pg = await getJson("/api/program");
+        if (pg) {
+          const pgText = JSON.stringify(pg.program);
+          if (program !== null && pgText !== program) {
+            // Program has changed, so show the whole page.
+            window.location.reload();
+            return;
+          }
+          program = pgText;
+        }
+        version = s.version;
+      }
+    }
+  } catch (e) {
+    // Web server not responding, try again next poll.
+  }
+  window.setTimeout(() => poll(refresh), refresh * 1000);
+}
+
+document.addEventListener("DOMContentLoaded", () => {
+  const el = document.getElementById("status") || document.getElementById("waiting");
+  if (el) {
+    window.setTimeout(() => poll(Number(el.dataset.refresh)), Number(el.dataset.refresh) * 1000);
+  }
+});
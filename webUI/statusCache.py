@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+
+from threading import Event, Lock
+from typing import Any, Callable
+import hashlib
+import json
+import os
+import time
+
+from flask import current_app
+
+try:
+    import fcntl
+except ImportError:
+    # No file locks (Windows), so no shared cache between processes.
+    fcntl = None
+
+
+class Flight():
+    """
+    Class to represent a load of a cache entry in progress.
+    Requests for the entry while it is loading wait for the load.
+    """
+
+    __slots__ = ('done', 'value', 'valid')
+
+    def __init__(self) -> None:
+        """
+        Initialisation method.
+        """
+
+        self.done = Event()
+        self.value = None
+
+        # Cleared if the entry is invalidated while loading.
+        self.valid = True
+
+
+class StatusCache():
+    """
+    Class to represent a TTL cache of controller data, shared by all the
+    requests of the web server process.
+    Loads are coalesced (single flight), so concurrent requests for an entry
+    that isn't cached share one load, i.e. one call to the controller.
+    Failed loads (None) are shared with waiting requests, but not cached.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            ttl : Time entries are cached for (seconds).
+        """
+
+        self.ttl = ttl
+        self.lock = Lock()
+
+        # Entries by key, as (monotonic) expiry time, value and generation.
+        self.entries = {}
+
+        # Loads in progress by key.
+        self.flights = {}
+
+        # Counters of requests served from the cache, loaded, and
+        # waited for a load in progress.
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, key: str, loader: Callable[[], Any]) -> Any:
+        """
+        Get an entry, loading it if not cached (or expired).
+        Parameters:
+            key : Key of the entry.
+            loader : Function to load the entry, returns None if it failed.
+        Returns:
+            Value of the entry, None if the load failed.
+        """
+
+        generation = self.generation(key)
+        with self.lock:
+            entry = self.entries.get(key)
+            if (entry is not None) and (entry[0] > time.monotonic()) and (entry[2] == generation):
+                self.hits += 1
+                return entry[1]
+
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = Flight()
+                self.flights[key] = flight
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            return flight.value
+
+        # Only the first request loads the entry.
+        value = None
+        try:
+            value = self.load(key, loader, generation)
+        finally:
+            with self.lock:
+                if (value is not None) and flight.valid:
+                    self.entries[key] = (time.monotonic() + self.ttl, value, generation)
+                if self.flights.get(key) is flight:
+                    del self.flights[key]
+            flight.value = value
+            flight.done.set()
+
+        return value
+
+    def generation(self, key: str) -> int:
+        """
+        Get the generation of an entry, changed when the entry is invalidated
+        elsewhere. Entries cached in an older generation are loaded again.
+        Parameters:
+            key : Key of the entry.
+        Returns:
+            Generation of the entry, always 0 as only invalidated in this process.
+        """
+
+        return 0
+
+    def load(self, key: str, loader: Callable[[], Any], generation: int) -> Any:
+        """
+        Load an entry.
+        Parameters:
+            key : Key of the entry.
+            loader : Function to load the entry, returns None if it failed.
+            generation : Generation of the entry when the load started.
+        Returns:
+            Value of the entry, None if the load failed.
+        """
+
+        return loader()
+
+    def invalidate(self, key: str) -> None:
+        """
+        Invalidate an entry, e.g. after the controller has changed.
+        A load in progress is not cached, and later requests load again.
+        Parameters:
+            key : Key of the entry.
+        """
+
+        with self.lock:
+            self.entries.pop(key, None)
+            flight = self.flights.pop(key, None)
+            if flight is not None:
+                flight.valid = False
+
+    def stats(self) -> dict:
+        """
+        Get the cache counters.
+        Returns:
+            Cache counters.
+        """
+
+        return {
+            "entries" : len(self.entries),
+            "hits" : self.hits,
+            "misses" : self.misses,
+            "coalesced" : self.coalesced
+        }
+
+
+class FileStatusCache(StatusCache):
+    """
+    Class to represent a TTL cache of controller data shared between web server
+    processes (e.g. gunicorn workers), through files in a cache folder.
+    Each process has its own cache in front of the files. A file lock per entry
+    coalesces loads across processes, so only one process calls the controller.
+    Invalidating an entry changes its generation (the modified time of a
+    generation file), which every process checks on each get, so cached copies
+    in all the processes, and loads in progress, are not used.
+    """
+
+    def __init__(self, ttl: float, cacheDir: str) -> None:
+        """
+        Initialisation method.
+        Parameters:
+            ttl : Time entries are cached for (seconds).
+            cacheDir : Folder for the cache files.
+        """
+
+        StatusCache.__init__(self, ttl)
+        self.cacheDir = cacheDir
+        os.makedirs(cacheDir, exist_ok=True)
+
+        # Counter of loads served by another process.
+        self.shared = 0
+
+    def path(self, key: str) -> str:
+        """
+        Get the file of an entry.
+        Parameters:
+            key : Key of the entry.
+        Returns:
+            File name of the entry.
+        """
+
+        return os.path.join(self.cacheDir, hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+    def generation(self, key: str) -> int:
+        """
+        Get the generation of an entry, the modified time of its generation file.
+        Parameters:
+            key : Key of the entry.
+        Returns:
+            Generation of the entry, 0 if never invalidated.
+        """
+
+        try:
+            return os.stat(self.path(key) + ".gen").st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def readEntry(self, path: str, generation: int) -> Any:
+        """
+        Read an entry file, if it hasn't expired and is of the generation.
+        Parameters:
+            path : File name of the entry.
+            generation : Generation of the entry.
+        Returns:
+            Value of the entry, None if missing, expired or of another generation.
+        """
+
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if (entry["expires"] <= time.time()) or (entry.get("generation") != generation):
+            return None
+
+        return entry["value"]
+
+    def writeEntry(self, path: str, value: Any, generation: int) -> None:
+        """
+        Write an entry file atomically.
+        Parameters:
+            path : File name of the entry.
+            value : Value of the entry.
+            generation : Generation of the entry when it was loaded.
+        """
+
+        tmpPath = f'{path}.{os.getpid()}.tmp'
+        with open(tmpPath, "w") as f:
+            json.dump({"expires" : time.time() + self.ttl, "generation" : generation, "value" : value}, f)
+        os.replace(tmpPath, path)
+
+    def load(self, key: str, loader: Callable[[], Any], generation: int) -> Any:
+        """
+        Load an entry, from its file if another process has loaded it.
+        Parameters:
+            key : Key of the entry.
+            loader : Function to load the entry, returns None if it failed.
+            generation : Generation of the entry when the load started.
+        Returns:
+            Value of the entry, None if the load failed.
+        """
+
+        path = self.path(key)
+        value = self.readEntry(path, generation)
+        if value is not None:
+            self.shared += 1
+            return value
+
+        # Only one process loads the entry, others wait and then read it.
+        with open(path + ".lock", "a") as lockFile:
+            fcntl.flock(lockFile, fcntl.LOCK_EX)
+            try:
+                value = self.readEntry(path, generation)
+                if value is not None:
+                    self.shared += 1
+                    return value
+                value = loader()
+                if value is not None:
+                    self.writeEntry(path, value, generation)
+                return value
+            finally:
+                fcntl.flock(lockFile, fcntl.LOCK_UN)
+
+    def invalidate(self, key: str) -> None:
+        """
+        Invalidate an entry, in all the processes.
+        The generation of the entry is moved on, so other processes don't use
+        their cached copies, or entry files of loads started before now.
+        Parameters:
+            key : Key of the entry.
+        """
+
+        StatusCache.invalidate(self, key)
+        genPath = self.path(key) + ".gen"
+        generation = max(time.time_ns(), self.generation(key) + 1)
+        with open(genPath, "a"):
+            pass
+        os.utime(genPath, ns=(generation, generation))
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> dict:
+        """
+        Get the cache counters.
+        Returns:
+            Cache counters.
+        """
+
+        return {**StatusCache.stats(self), "shared" : self.shared}
+
+
+def get_cache() -> StatusCache:
+    """
+    Get the status cache of the application.
+    """
+    return current_app.extensions["statusCache"]
+
+def init_app(app):
+    """
+    Initialise application.
+    The cache is shared between processes if a cache folder is configured.
+    """
+    cacheDir = app.config.get("STATUS_CACHE_DIR", "")
+    ttl = app.config.get("STATUS_CACHE_TTL", 1.0)
+    if cacheDir and (fcntl is not None):
+        app.extensions["statusCache"] = FileStatusCache(ttl, cacheDir)
+    else:
+        app.extensions["statusCache"] = StatusCache(ttl)
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 from typing import Tuple
+import functools
 
 from flask import flash
 import grpc
@@ -11,7 +12,94 @@ import webUI.ui_pb2_grpc as ui_pb2_grpc
 
 from flask import current_app
 
+from generic.authTokens import *
 from generic.genericConstants import *
+from webUI.circuitBreaker import *
+from webUI.statusCache import get_cache
+
+# Last known status of each controller, served (as stale) if it doesn't respond.
+lastStatus = {}
+
+# API token of the web server, by secret file.
+tokenSources = {}
+
+def probeServer(target: str, deadline: float) -> bool:
+    """
+    Probe a server (controller), for its circuit breaker.
+    Parameters:
+        target : Server address, as ip:port.
+        deadline : Time the server has to accept a connection (seconds).
+    Returns:
+        True if the server is up.
+    """
+
+    channel = grpc.insecure_channel(target)
+    try:
+        grpc.channel_ready_future(channel).result(timeout=deadline)
+        return True
+    except grpc.FutureTimeoutError:
+        return False
+    finally:
+        channel.close()
+
+def authMetadata() -> tuple:
+    """
+    Get call metadata with the API token of the web server, if configured.
+    Returns:
+        Call metadata.
+    """
+
+    sFile = current_app.config.get("UI_AUTH_SECRET_FILE", "")
+    if not sFile:
+        return ()
+
+    source = tokenSources.get(sFile)
+    if source is None:
+        source = tokenSources.setdefault(sFile, TokenSource(loadSecret(sFile), "webUI", current_app.config.get("UI_AUTH_LIFETIME", 3600.0)))
+
+    return source.metadata()
+
+# Call errors of a server that isn't responding, failures for its circuit breaker.
+# Other errors (e.g. rejected as too busy, or unauthenticated) are from a server that is up.
+BREAKER_FAILURES = (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED)
+
+def callServer(method, request, target: str, deadline: float, control: bool = False):
+    """
+    Call a server (controller) gRPC method, with a deadline, and through the
+    circuit breaker of the server, so calls fail fast while the server is down.
+    Control calls (e.g. setting the mode) bypass the breaker, so they are always
+    tried, and don't open it for status calls.
+    Parameters:
+        method : Stub method to call.
+        request : Request message.
+        target : Server address, as ip:port.
+        deadline : Time the server has to respond (seconds).
+        control : True for a control call, not through the breaker.
+    Returns:
+        Response message.
+    Raises:
+        grpc.RpcError : Server didn't respond, or call failed fast.
+    """
+
+    if control:
+        return method(request, timeout=deadline, metadata=authMetadata())
+
+    breaker = getBreaker(target, current_app.config["UI_BREAKER_FAILURES"], current_app.config["UI_BREAKER_RESET"],
+                         functools.partial(probeServer, target, current_app.config["UI_STATUS_DEADLINE"]))
+    if not breaker.allow():
+        raise BreakerOpenError(target)
+
+    try:
+        response = method(request, timeout=deadline, metadata=authMetadata())
+    except grpc.RpcError as e:
+        if e.code() in BREAKER_FAILURES:
+            breaker.recordFailure()
+        else:
+            breaker.recordSuccess()
+        raise
+    breaker.recordSuccess()
+
+    return response
 
 def setControllerMode(reqMode: str) -> Tuple[bool, bool]:
     """
@@ -30,7 +118,8 @@ def setControllerMode(reqMode: str) -> Tuple[bool, bool]:
     isError = False
 
     # Set up channel to controller to get interface with controller.
-    channel = grpc.insecure_channel(f'{current_app.config["UI_IP"]}:{current_app.config["UI_PORT"]}')
+    target = f'{current_app.config["UI_IP"]}:{current_app.config["UI_PORT"]}'
+    channel = grpc.insecure_channel(target)
     stub = ui_pb2_grpc.UiControlModeStub(channel)
 
     # Construct controller status request message object.
@@ -40,12 +129,15 @@ def setControllerMode(reqMode: str) -> Tuple[bool, bool]:
 
     try:
         # Send mode command to the server.
-        response = stub.SetControllerMode(setModeCmd)
+        response = callServer(stub.SetControllerMode, setModeCmd, target, current_app.config["UI_CONTROL_DEADLINE"], control=True)
 
         if response.status == ui_pb2.UiModeStatus.CS_GOOD:
             # Status response is good, so nothing to do.
-            # Status will be updated next time GET refreshed.
+            # Status will be updated next time GET refreshed,
+            # so it must not come from the cache.
             staleData = False
+            get_cache().invalidate(f'status:{target}')
+            get_cache().invalidate(f'runs:{target}')
         else:
             # Status was not good, so need to display an error to the user.
             if response.status == ui_pb2.UiModeStatus.CS_MODE_FAIL:
@@ -55,13 +147,60 @@ def setControllerMode(reqMode: str) -> Tuple[bool, bool]:
                     flash('Controller must be in ACTIVE state to change mode.', 'error')
                 elif response.reason == ControllerModeReason.NO_CHANGE.name:
                     flash('Attempting to change to current mode.', 'warning')
+                elif response.reason in (ControllerModeReason.TIMEOUT.name, ControllerModeReason.BUSY.name):
+                    flash('Controller busy, mode not set.', 'error')
 
     except grpc.RpcError as e:
         # Failed to receive response from server.
-        pass
+        flash('Controller not responding, mode not set.', 'error')
 
     return staleData, isError
 
+def loadControllerStatus(target: str) -> Tuple[dict, dict, dict, dict]:
+    """
+    Load the controller status from the controller.
+    Parameters:
+        target : Controller address, as ip:port.
+    Returns:
+        Controller status, input, outputs and program data, None if no good status.
+    """
+
+    # Set up channel to controller to get interface with controller.
+    channel = grpc.insecure_channel(target)
+    stub = ui_pb2_grpc.UiMessagesStub(channel)
+
+    # Construct controller status request message object.
+    getStatusCmd = ui_pb2.ControllerStatusCmd()
+    getStatusCmd.cmd = ui_pb2.UiCmd.U_CNTRL_STATUS
+
+    try:
+        # Send status request command to the server.
+        response = callServer(stub.GetControllerStatus, getStatusCmd, target, current_app.config["UI_STATUS_DEADLINE"])
+
+        if response.status == ui_pb2.StatusCmdStatus.US_GOOD:
+            # Status response good, so update controller status object.
+            cntrlData = {
+                "name" : response.name,
+                "state" : response.state,
+                "cTime" : response.cTime,
+                "mode" : response.mode,
+                "program" : response.program,
+                "version" : response.version
+            }
+            inputData = json.loads(response.inputs)
+            outputData = json.loads(response.outputs)
+            programData = json.loads(response.program)
+            return cntrlData, inputData, outputData, programData
+        else:
+            # Failed to get good status from controller.
+            print("Failed to get good status from controller.")
+
+    except grpc.RpcError as e:
+        # Failed to receive response from server.
+        pass
+
+    return None
+
 def getControllerStatus() -> Tuple[bool, dict, dict, dict, dict, int]:
     """
     Get the controller status.
@@ -86,43 +225,181 @@ def getControllerStatus() -> Tuple[bool, dict, dict, dict, dict, int]:
     outputData = {}
     programData = {}
 
+    # Get the controller status through the status cache, so that
+    # concurrent requests share one call to the controller.
+    target = f'{current_app.config["UI_IP"]}:{current_app.config["UI_PORT"]}'
+    status = get_cache().get(f'status:{target}', functools.partial(loadControllerStatus, target))
+
+    if status is not None:
+        staleData = False
+        cntrlData, inputData, outputData, programData = status
+        lastStatus[target] = status
+
+        # Speed up web page refresh rate now that we are connected.
+        updatePeriod = current_app.config["UI_REFRESH_PERIOD_FAST"]
+    elif target in lastStatus:
+        # If the controller didn't respond, use its last known status (still stale).
+        cntrlData, inputData, outputData, programData = lastStatus[target]
+
+    return staleData, cntrlData, inputData, outputData, programData, updatePeriod
+
+def loadUpcomingRuns(target: str) -> dict:
+    """
+    Load the upcoming runs from the controller.
+    Parameters:
+        target : Controller address, as ip:port.
+    Returns:
+        Next run and run state of each station, None if no good response.
+    """
+
     # Set up channel to controller to get interface with controller.
-    channel = grpc.insecure_channel(f'{current_app.config["UI_IP"]}:{current_app.config["UI_PORT"]}')
+    channel = grpc.insecure_channel(target)
     stub = ui_pb2_grpc.UiMessagesStub(channel)
 
-    # Construct controller status request message object.
-    getStatusCmd = ui_pb2.ControllerStatusCmd()
-    getStatusCmd.cmd = ui_pb2.UiCmd.U_CNTRL_STATUS
+    # Construct upcoming runs request message object.
+    getRunsCmd = ui_pb2.UpcomingRunsCmd()
+    getRunsCmd.cmd = ui_pb2.UiCmd.U_UPCOMING_RUNS
+
+    try:
+        # Send upcoming runs request command to the server.
+        response = callServer(stub.GetUpcomingRuns, getRunsCmd, target, current_app.config["UI_STATUS_DEADLINE"])
+
+        if response.status == ui_pb2.StatusCmdStatus.US_GOOD:
+            return json.loads(response.runs)
+
+    except grpc.RpcError as e:
+        # Failed to receive response from server.
+        pass
+
+    return None
+
+def getUpcomingRuns() -> Tuple[bool, dict]:
+    """
+    Get the upcoming runs from the controller run calendar.
+    Returns:
+        staleData : Flag if controller responded or not
+        runsData : Next run and run state of each station.
+    """
+
+    # Get the upcoming runs through the status cache.
+    target = f'{current_app.config["UI_IP"]}:{current_app.config["UI_PORT"]}'
+    runsData = get_cache().get(f'runs:{target}', functools.partial(loadUpcomingRuns, target))
+
+    if runsData is None:
+        return True, {}
+
+    return False, runsData
+
+def getFleetStatus() -> Tuple[bool, dict, list, int]:
+    """
+    Get the status of all the controllers of the fleet, from the fleet aggregator.
+    Returns:
+        staleData : Flag if fleet aggregator responded or not
+        fleetData : Fleet status data.
+        ctrlsData : Status of each controller, with staleness markers.
+        updatePeriod : UI update / refresh period.
+    """
 
     # Initialise web page refresh rate to slow.
-    # If connected to a controller then can speed up.
     updatePeriod = current_app.config["UI_REFRESH_PERIOD_SLOW"]
+
+    # Initialise flag for stale data,
+    staleData = True
+
+    # Initialise fleet and controllers data.
+    fleetData = {}
+    ctrlsData = []
+
+    # Set up channel to fleet aggregator to get interface with fleet.
+    target = f'{current_app.config["FLEET_IP"]}:{current_app.config["FLEET_PORT"]}'
+    channel = grpc.insecure_channel(target)
+    stub = ui_pb2_grpc.UiFleetStub(channel)
+
+    # Construct fleet status request message object.
+    getFleetCmd = ui_pb2.FleetStatusCmd()
+    getFleetCmd.cmd = ui_pb2.FleetCmd.F_FLEET_STATUS
+
     try:
-        # Send status request command to the server.
-        response = stub.GetControllerStatus(getStatusCmd)
+        # Send fleet status request command to the server.
+        response = callServer(stub.GetFleetStatus, getFleetCmd, target, current_app.config["UI_STATUS_DEADLINE"])
 
         if response.status == ui_pb2.StatusCmdStatus.US_GOOD:
-            # Status response good, so update controller status object.
+            # Status response good, so update fleet status.
             staleData = False
-            cntrlData = {
-                "name" : response.name,
-                "state" : response.state,
-                "cTime" : response.cTime,
-                "mode" : response.mode,
-                "program" : response.program
+            fleetData = {
+                "fTime" : response.fTime,
+                "count" : len(response.controllers),
+                "stale" : sum(1 for c in response.controllers if c.stale)
             }
-            inputData = json.loads(response.inputs)
-            outputData = json.loads(response.outputs)
-            programData = json.loads(response.program)
+            for c in response.controllers:
+                outputs = json.loads(c.outputs) if c.outputs else {"outputs" : []}
+                ctrlsData.append({
+                    "name" : c.name,
+                    "address" : c.address,
+                    "tags" : list(c.tags),
+                    "stale" : c.stale,
+                    "age" : c.age,
+                    "error" : c.error,
+                    "state" : c.state,
+                    "mode" : c.mode,
+                    "cTime" : c.cTime,
+                    "active" : [o["oName"] for o in outputs["outputs"][1:] if o["oActive"]]
+                })
 
             # Speed up web page refresh rate now that we are connected.
             updatePeriod = current_app.config["UI_REFRESH_PERIOD_FAST"]
-        else:
-            # Failed to get good status from controller.
-            print("Failed to get good status from controller.")
 
     except grpc.RpcError as e:
         # Failed to receive response from server.
         pass
 
-    return staleData, cntrlData, inputData, outputData, programData, updatePeriod
+    return staleData, fleetData, ctrlsData, updatePeriod
+
+def setFleetMode(reqMode: str, tags: list, key: str) -> bool:
+    """
+    Set the mode of controllers of the fleet, through the fleet aggregator.
+    Parameters:
+        reqMode : Mode to set the controllers to.
+        tags : Tags of controllers to set, all controllers if empty.
+        key : Idempotency key, so a resubmitted form isn't dispatched again.
+    Returns:
+        staleData : Flag if fleet aggregator responded or not
+    """
+
+    # Initialise flag for stale data,
+    staleData = True
+
+    # Set up channel to fleet aggregator to get interface with fleet.
+    target = f'{current_app.config["FLEET_IP"]}:{current_app.config["FLEET_PORT"]}'
+    channel = grpc.insecure_channel(target)
+    stub = ui_pb2_grpc.UiFleetStub(channel)
+
+    # Construct fleet mode command message object.
+    setModeCmd = ui_pb2.FleetModeCmd()
+    setModeCmd.cmd = ui_pb2.FleetCmd.F_SET_MODE
+    setModeCmd.reqMode = reqMode
+    setModeCmd.tags.extend(tags)
+    setModeCmd.all = not tags
+    setModeCmd.idempotencyKey = key
+
+    try:
+        # Send fleet mode command to the server.
+        response = callServer(stub.SetFleetMode, setModeCmd, target, current_app.config["FLEET_CONTROL_DEADLINE"], control=True)
+
+        if response.status == ui_pb2.StatusCmdStatus.US_GOOD:
+            staleData = False
+            if response.replayed:
+                flash('Fleet mode already set, not sent again.', 'warning')
+            elif response.failed == 0:
+                flash(f'Fleet mode set to {reqMode} on {response.succeeded} controllers.')
+            else:
+                # Show which controllers failed, and why.
+                failed = [f'{r.name} ({r.error if r.error else r.reason})' for r in response.results
+                          if r.status != ui_pb2.UiModeStatus.CS_GOOD and r.reason != ControllerModeReason.NO_CHANGE.name]
+                flash(f'Fleet mode set to {reqMode} on {response.succeeded} controllers, failed on : {", ".join(failed)}', 'error')
+
+    except grpc.RpcError as e:
+        # Failed to receive response from server.
+        flash('Failed to set fleet mode.', 'error')
+
+    return staleData
@@ -1,5 +1,6 @@
 from flask import Blueprint, flash, g, redirect, render_template, request, url_for
 from werkzeug.exceptions import abort
+import uuid
 
 from flask import current_app
 from webUI.auth import login_required
@@ -25,6 +26,7 @@ def index():
     inputData = {}
     outputData = {}
     programData = {}
+    runsData = {}
 
     if request.method == 'POST':
         # Check for controller mode changes.
@@ -42,23 +44,50 @@ def index():
         staleData, isError = setControllerMode(reqMode)
 
         # If controller action was successful then get controller status.
+        # Else get the last known controller status, the controller is not responding.
         if staleData == False:
             # Get the latest controller data.
             staleData, cntrlData, inputData, outputData, programData, updatePeriod = getControllerStatus()
+            if staleData == False:
+                _, runsData = getUpcomingRuns()
 
             # If there was an error when doing the controller action,
             # then overwrite the update / represh period to give more time for the alert.
             if isError == True:
                 updatePeriod = current_app.config["UI_REFRESH_PERIOD_SLOW"]
+        else:
+            staleData, cntrlData, inputData, outputData, programData, updatePeriod = getControllerStatus()
 
         # Render the web page with controller data,
         # taking into account any action to change modes.
-        return render_template('webUI/index.html', refresh=updatePeriod, linkStale=staleData, cData=cntrlData, iData=inputData, oData=outputData, pData=programData)
+        return render_template('webUI/index.html', refresh=updatePeriod, linkStale=staleData, cData=cntrlData, iData=inputData, oData=outputData, pData=programData, rData=runsData)
     else:
         # Request is for a GET so just get controller status.
         # Get the latest controller data.
         staleData, cntrlData, inputData, outputData, programData, updatePeriod = getControllerStatus()
+        if staleData == False:
+            _, runsData = getUpcomingRuns()
 
         # Render the web page with controller data,
         # taking into account any action to change modes.
-        return render_template('webUI/index.html', refresh=updatePeriod, linkStale=staleData, cData=cntrlData, iData=inputData, oData=outputData, pData=programData)
+        return render_template('webUI/index.html', refresh=updatePeriod, linkStale=staleData, cData=cntrlData, iData=inputData, oData=outputData, pData=programData, rData=runsData)
+
+@bp.route('/fleet', methods=['GET', 'POST'])
+def fleet():
+    """
+    Fleet page for webUI, status of all the controllers.
+    """
+
+    # If POST then set the mode of the fleet, or controllers with a tag.
+    if request.method == 'POST':
+        reqMode = request.form.get('FLEETMODE', "")
+        if reqMode in ControllerMode.__members__:
+            tags = [t.strip() for t in request.form.get('TAGS', "").split(",") if t.strip()]
+            setFleetMode(reqMode, tags, request.form.get('KEY', ""))
+
+    # Get the latest fleet data, from the fleet aggregator.
+    staleData, fleetData, ctrlsData, updatePeriod = getFleetStatus()
+
+    # Render the web page with fleet data.
+    # Each render of the form has a new idempotency key.
+    return render_template('webUI/fleet.html', refresh=updatePeriod, linkStale=staleData, fData=fleetData, cData=ctrlsData, key=uuid.uuid4().hex)
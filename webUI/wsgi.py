@@ -0,0 +1,9 @@
+"""
+WSGI entry point of the webUI for production serving, e.g.
+gunicorn -c config/gunicorn.py webUI.wsgi:app
+"""
+
+from webUI import create_app
+from webUI.serving import production
+
+app = production(create_app())